@@ -0,0 +1,53 @@
+"""add_peer_benchmarks_table
+
+Revision ID: 4c2d9e7a1f38
+Revises: 303ab86e8774
+Create Date: 2025-12-01 03:00:00.000000
+
+Adds peer_benchmarks: nightly rollup of per-user job search metrics
+(applications, response/interview/offer rates) stored as fixed-bin
+histograms, used for peer comparison percentiles.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.db.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = '4c2d9e7a1f38'
+down_revision = '303ab86e8774'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'peer_benchmarks',
+        sa.Column('id', GUID(), primary_key=True),
+        sa.Column('metric', sa.String(50), nullable=False),
+        sa.Column('window_days', sa.Integer(), nullable=False),
+
+        # Histogram: bin boundaries and cumulative user counts per bin
+        sa.Column('bin_edges', JSONB, nullable=False),
+        sa.Column('cumulative_counts', JSONB, nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('mean', sa.Float(), nullable=False, server_default='0'),
+
+        # Metadata
+        sa.Column('computed_at', sa.DateTime(), server_default=func.now(), nullable=False),
+    )
+
+    # One distribution per metric and window
+    op.create_index(
+        'idx_peer_benchmarks_metric_window',
+        'peer_benchmarks',
+        ['metric', 'window_days'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_peer_benchmarks_metric_window', table_name='peer_benchmarks')
+    op.drop_table('peer_benchmarks')
@@ -0,0 +1,66 @@
+"""add_job_content_hash
+
+Revision ID: 9e1b5c7d3a24
+Revises: 4c2d9e7a1f38
+Create Date: 2025-12-03 09:00:00.000000
+
+Adds jobs.content_hash (hash of the ingested fields) and a unique index
+on (source, external_id), the conflict target of the batched
+INSERT ... ON CONFLICT DO UPDATE used by job ingestion.
+
+Earlier ingestion could store the same posting twice. Before the index
+is created, only the most recently updated row of each (source,
+external_id) keeps its external_id. The older copies are deactivated
+and their external_id cleared rather than deleted, so applications,
+match scores and other rows that reference them are kept.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e1b5c7d3a24'
+down_revision = '4c2d9e7a1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('content_hash', sa.String(64), nullable=True))
+
+    # Retire older duplicates; NULL external_ids never conflict
+    op.execute(
+        """
+        UPDATE jobs
+        SET external_id = NULL, is_active = false
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    row_number() OVER (
+                        PARTITION BY source, external_id
+                        ORDER BY updated_at DESC NULLS LAST,
+                            created_at DESC NULLS LAST,
+                            id DESC
+                    ) AS position
+                FROM jobs
+                WHERE external_id IS NOT NULL
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+
+    # Existing rows have no hash yet; they are rewritten (and re-embedded)
+    # once on their next ingestion
+    op.create_index(
+        'idx_jobs_source_external_id',
+        'jobs',
+        ['source', 'external_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_jobs_source_external_id', table_name='jobs')
+    op.drop_column('jobs', 'content_hash')
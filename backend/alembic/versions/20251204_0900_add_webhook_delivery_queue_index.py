@@ -0,0 +1,30 @@
+"""add_webhook_delivery_queue_index
+
+Revision ID: 6f3a8d2c1b57
+Revises: 9e1b5c7d3a24
+Create Date: 2025-12-04 09:00:00.000000
+
+Adds a composite (status, next_retry_at) index on webhook_deliveries for
+the webhook dispatcher, which claims due pending / retrying deliveries
+(and expired "delivering" leases) with SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3a8d2c1b57'
+down_revision = '9e1b5c7d3a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_webhook_deliveries_due',
+        'webhook_deliveries',
+        ['status', 'next_retry_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_webhook_deliveries_due', table_name='webhook_deliveries')
@@ -0,0 +1,52 @@
+"""add_bulk_job_upload_rows
+
+Revision ID: 2b7e4f9a6c13
+Revises: 6f3a8d2c1b57
+Create Date: 2025-12-05 09:00:00.000000
+
+Streamed CSV uploads persist parsed rows in chunks to bulk_job_upload_rows
+instead of one raw_jobs_data blob, and report progress through
+bulk_job_uploads.processed_jobs.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.db.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7e4f9a6c13'
+down_revision = '6f3a8d2c1b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'bulk_job_uploads',
+        sa.Column('processed_jobs', sa.Integer(), server_default='0'),
+    )
+
+    op.create_table(
+        'bulk_job_upload_rows',
+        sa.Column('id', GUID(), primary_key=True),
+        sa.Column('bulk_upload_id', GUID(), sa.ForeignKey('bulk_job_uploads.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('row_index', sa.Integer(), nullable=False),
+        sa.Column('job_data', JSONB(), nullable=False),
+        sa.Column('is_valid', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('validation_errors', JSONB()),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=func.now()),
+    )
+    op.create_index(
+        'idx_bulk_job_upload_rows_upload_row',
+        'bulk_job_upload_rows',
+        ['bulk_upload_id', 'row_index'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bulk_job_upload_rows_upload_row', table_name='bulk_job_upload_rows')
+    op.drop_table('bulk_job_upload_rows')
+    op.drop_column('bulk_job_uploads', 'processed_jobs')
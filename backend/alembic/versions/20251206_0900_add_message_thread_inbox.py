@@ -0,0 +1,74 @@
+"""add_message_thread_inbox
+
+Revision ID: 8c4d1e7b2a95
+Revises: 2b7e4f9a6c13
+Create Date: 2025-12-06 09:00:00.000000
+
+Per-participant thread inbox (one row per user and thread) holding the
+user's unread count, archive flag and sort time, so thread listing is a
+keyset scan of one index. Backfilled from non-deleted message_threads.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4d1e7b2a95'
+down_revision = '2b7e4f9a6c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'message_thread_inbox',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('thread_id', UUID(as_uuid=True), sa.ForeignKey('message_threads.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('role', sa.String(20), nullable=False),
+        sa.Column('application_id', UUID(as_uuid=True), nullable=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_archived', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('last_activity_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        'idx_message_thread_inbox_user_thread',
+        'message_thread_inbox',
+        ['user_id', 'thread_id'],
+        unique=True,
+    )
+    op.create_index(
+        'idx_message_thread_inbox_listing',
+        'message_thread_inbox',
+        ['user_id', 'is_archived', 'last_activity_at', 'thread_id'],
+    )
+    op.create_index(
+        'ix_message_thread_inbox_thread_id', 'message_thread_inbox', ['thread_id']
+    )
+
+    # One row for each participant of every live thread
+    op.execute("""
+        INSERT INTO message_thread_inbox (
+            id, user_id, thread_id, role, application_id,
+            unread_count, is_archived, last_activity_at
+        )
+        SELECT gen_random_uuid(), employer_id, id, 'employer', application_id,
+               unread_count_employer, archived_by_employer,
+               COALESCE(last_message_at, created_at)
+        FROM message_threads
+        WHERE is_deleted = false
+        UNION ALL
+        SELECT gen_random_uuid(), candidate_id, id, 'candidate', application_id,
+               unread_count_candidate, archived_by_candidate,
+               COALESCE(last_message_at, created_at)
+        FROM message_threads
+        WHERE is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_message_thread_inbox_thread_id', table_name='message_thread_inbox')
+    op.drop_index('idx_message_thread_inbox_listing', table_name='message_thread_inbox')
+    op.drop_index('idx_message_thread_inbox_user_thread', table_name='message_thread_inbox')
+    op.drop_table('message_thread_inbox')
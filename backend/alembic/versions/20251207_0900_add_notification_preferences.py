@@ -0,0 +1,62 @@
+"""add_notification_preferences
+
+Revision ID: 5e1a9c3d7f20
+Revises: 8c4d1e7b2a95
+Create Date: 2025-12-07 09:00:00.000000
+
+notification_preferences had a model but no migration, and its user_id
+was an Integer referencing the UUID users.id. The table is created here
+with a UUID user_id; users without a row get the model defaults.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1a9c3d7f20'
+down_revision = '8c4d1e7b2a95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_preferences',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('email_job_matches', sa.Boolean(), server_default=sa.true()),
+        sa.Column('email_application_updates', sa.Boolean(), server_default=sa.true()),
+        sa.Column('email_interview_reminders', sa.Boolean(), server_default=sa.true()),
+        sa.Column('email_credit_alerts', sa.Boolean(), server_default=sa.true()),
+        sa.Column('email_weekly_digest', sa.Boolean(), server_default=sa.true()),
+        sa.Column('email_marketing', sa.Boolean(), server_default=sa.false()),
+        sa.Column('inapp_job_matches', sa.Boolean(), server_default=sa.true()),
+        sa.Column('inapp_application_updates', sa.Boolean(), server_default=sa.true()),
+        sa.Column('inapp_interview_reminders', sa.Boolean(), server_default=sa.true()),
+        sa.Column('inapp_credit_alerts', sa.Boolean(), server_default=sa.true()),
+        sa.Column('inapp_system_updates', sa.Boolean(), server_default=sa.true()),
+        sa.Column('job_match_frequency', sa.String(20), server_default='immediate'),
+        sa.Column('digest_day', sa.String(10), server_default='monday'),
+        sa.Column('quiet_hours_start', sa.Integer(), nullable=True),
+        sa.Column('quiet_hours_end', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'ix_notification_preferences_id', 'notification_preferences', ['id']
+    )
+    op.create_index(
+        'ix_notification_preferences_user_id',
+        'notification_preferences',
+        ['user_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_notification_preferences_user_id', table_name='notification_preferences'
+    )
+    op.drop_index('ix_notification_preferences_id', table_name='notification_preferences')
+    op.drop_table('notification_preferences')
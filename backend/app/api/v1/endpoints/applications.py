@@ -16,6 +16,7 @@ from app.db.models.user import User
 from app.db.models.company import CompanyMember
 from app.services.application_service import ApplicationService
 from app.services.ranking_service import CandidateRankingService
+from app.workers.webhook_worker import publish_webhook_event
 from app.schemas.application import (
     ATSApplicationResponse,
     ATSApplicationListResponse,
@@ -236,6 +237,8 @@ def update_application_status(
             detail="You do not have access to this application",
         )
 
+    old_status = application.status
+
     # Update status via service (Issue #58: Enhanced with email support)
     try:
         app_service = ApplicationService(db)
@@ -246,11 +249,22 @@ def update_application_status(
             rejection_reason=status_data.rejection_reason,
             custom_message=status_data.custom_message,
         )
-        return ATSApplicationResponse.model_validate(updated_app)
-
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    publish_webhook_event(
+        db,
+        company_member.company_id,
+        "application.status_changed",
+        {
+            "application_id": str(updated_app.id),
+            "job_id": str(updated_app.job_id),
+            "old_status": old_status,
+            "new_status": updated_app.status,
+        },
+    )
+    return ATSApplicationResponse.model_validate(updated_app)
+
 
 @router.post(
     "/applications/{application_id}/notes",
@@ -3,20 +3,19 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-import csv
-import io
 from datetime import datetime
 
 from app.api.dependencies import get_db, get_current_user
 from app.db.models.user import User
 from app.services.bulk_job_upload_service import BulkJobUploadService
+from app.workers.bulk_upload_worker import detect_upload_duplicates
 from app.schemas.bulk_job_posting import (
-    BulkUploadCreate,
     BulkUploadResponse,
     BulkUploadDetail,
     BulkUploadListResponse,
     BulkUploadFilter,
-    CSVJobRow,
+    BulkUploadRowListResponse,
+    BulkUploadRowResponse,
     BulkUploadStatusEnum,
     DistributionChannelEnum,
 )
@@ -41,11 +40,11 @@ async def create_bulk_upload(
     - User must be an employer (have company_id)
     - CSV must have headers: title, department, location, location_type, employment_type,
       experience_level, salary_min, salary_max, description, requirements
-    - Maximum 500 jobs per upload
+    - Maximum BULK_UPLOAD_MAX_ROWS jobs per upload (rows are stored in chunks)
 
     **Returns:**
     - Upload session with validation results
-    - List of validation errors if any
+    - The first validation errors if any (all rows: GET /uploads/{id}/rows)
     - List of detected duplicates if any
     """
     # Verify user is an employer
@@ -70,70 +69,25 @@ async def create_bulk_upload(
     else:
         distribution_channels = [DistributionChannelEnum.INTERNAL]
 
-    # Read and parse CSV
-    try:
-        contents = await file.read()
-        csv_text = contents.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_text))
-
-        jobs_data = []
-        for row in csv_reader:
-            # Parse CSV row into CSVJobRow
-            job = CSVJobRow(
-                title=row.get("title", ""),
-                department=row.get("department"),
-                location=row.get("location"),
-                location_type=row.get("location_type"),
-                employment_type=row.get("employment_type"),
-                experience_level=row.get("experience_level"),
-                salary_min=int(row["salary_min"]) if row.get("salary_min") else None,
-                salary_max=int(row["salary_max"]) if row.get("salary_max") else None,
-                description=row.get("description"),
-                requirements=row.get("requirements"),
-            )
-            jobs_data.append(job)
-
-        if len(jobs_data) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="CSV file is empty or has no valid data rows",
-            )
-
-    except UnicodeDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file encoding. Please upload UTF-8 encoded CSV",
-        )
-    except KeyError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Missing required CSV column: {str(e)}",
-        )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid data format: {str(e)}",
-        )
-
-    # Create upload request
-    upload_request = BulkUploadCreate(
-        filename=file.filename or "upload.csv",
-        jobs_data=jobs_data,
-        distribution_channels=distribution_channels,
-        scheduled_publish_at=scheduled_at,
-    )
-
-    # Create upload session
+    # Stream, validate and store the CSV in chunks
     service = BulkJobUploadService(db)
     try:
-        upload = await service.create_upload_session(
+        upload = await service.create_upload_session_from_csv(
             company_id=str(current_user.company_id),
             user_id=str(current_user.id),
-            upload_request=upload_request,
+            csv_file=file.file,
+            filename=file.filename or "upload.csv",
+            distribution_channels=distribution_channels,
+            scheduled_publish_at=scheduled_at,
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    # Duplicate detection reads every stored row back, so it runs in the
+    # worker; the upload stays VALIDATING until it has finished
+
+    detect_upload_duplicates.delay(str(upload.id))
+
     return BulkUploadResponse.model_validate(upload)
 
 
@@ -215,6 +169,54 @@ async def get_upload_detail(
     return BulkUploadDetail.model_validate(upload)
 
 
+@router.get("/uploads/{upload_id}/rows", response_model=BulkUploadRowListResponse)
+async def list_upload_rows(
+    upload_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    invalid_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Page through the stored rows of a CSV upload.
+
+    **Query Parameters:**
+    - offset: First row index to return (default: 0)
+    - limit: Rows per page (default: 100, max: 500)
+    - invalid_only: Only rows with validation errors
+
+    **Returns:**
+    - Rows with parsed job data and per-row validation errors
+    """
+    if not current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can view uploads",
+        )
+
+    limit = min(limit, 500)
+
+    service = BulkJobUploadService(db)
+    try:
+        rows = await service.list_upload_rows(
+            upload_id,
+            str(current_user.company_id),
+            offset=offset,
+            limit=limit,
+            invalid_only=invalid_only,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return BulkUploadRowListResponse(
+        rows=[BulkUploadRowResponse.model_validate(row) for row in rows],
+        offset=offset,
+        limit=limit,
+        next_offset=rows[-1].row_index + 1 if len(rows) == limit else None,
+    )
+
+
 @router.patch("/uploads/{upload_id}/status")
 async def update_upload_status(
     upload_id: str,
@@ -240,7 +242,15 @@ async def update_upload_status(
             upload_id, str(current_user.company_id), new_status
         )
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        upload_missing = str(e) == "Upload not found"
+        raise HTTPException(
+            status_code=(
+                status.HTTP_404_NOT_FOUND
+                if upload_missing
+                else status.HTTP_409_CONFLICT
+            ),
+            detail=str(e),
+        )
 
     return {"message": "Status updated successfully"}
 
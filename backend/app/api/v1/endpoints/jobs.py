@@ -16,6 +16,7 @@ from app.db.models.user import User
 from app.db.models.company import CompanyMember
 from app.services.job_service import JobService
 from app.services.job_ai_service import JobAIService
+from app.workers.webhook_worker import publish_webhook_event
 from app.schemas.job import (
     JobCreate,
     JobUpdate,
@@ -115,6 +116,13 @@ def create_job(
         job = job_service.create_job(
             company_id=company_member.company_id, job_data=job_data
         )
+        # New jobs are created active
+        publish_webhook_event(
+            db,
+            company_member.company_id,
+            "job.published",
+            {"job_id": str(job.id), "status": "active"},
+        )
         return JobResponse.model_validate(job)
 
     except Exception as e:
@@ -301,16 +309,31 @@ def update_job_status(
             detail="You do not have access to this job",
         )
 
+    was_active = job.is_active
+
     # Update status
     try:
         updated_job = job_service.update_job_status(
             job_id=job_id, status=status_data.status
         )
-        return JobResponse.model_validate(updated_job)
-
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    # Notify subscribed webhooks when the job goes live or is closed
+    event_type = None
+    if updated_job.is_active and not was_active:
+        event_type = "job.published"
+    elif was_active and not updated_job.is_active:
+        event_type = "job.closed"
+    if event_type:
+        publish_webhook_event(
+            db,
+            job.company_id,
+            event_type,
+            {"job_id": str(updated_job.id), "status": status_data.status.value},
+        )
+    return JobResponse.model_validate(updated_job)
+
 
 @router.delete(
     "/{job_id}",
@@ -99,8 +99,9 @@ async def list_threads(
     application_id: Optional[UUID] = Query(None, description="Filter by job application"),
     unread_only: bool = Query(False, description="Show only threads with unread messages"),
     archived: bool = Query(False, description="Show archived threads"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored with a cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> ThreadListResponse:
@@ -111,6 +112,7 @@ async def list_threads(
     - application_id: Filter by specific job application
     - unread_only: Show only threads with unread messages
     - archived: Show archived threads (default: false)
+    - cursor: Continue after the previous page (preferred over page)
     - page: Page number (default: 1)
     - limit: Items per page (default: 20, max: 100)
 
@@ -120,17 +122,24 @@ async def list_threads(
     - page: Current page number
     - limit: Items per page
     - unread_count: Total unread messages across all threads
+    - next_cursor: Cursor for the next page (null on the last page)
     """
     service = MessagingService(db=db)
 
-    threads = service.list_threads(
-        user_id=current_user.id,
-        application_id=application_id,
-        unread_only=unread_only,
-        archived=archived,
-        page=page,
-        limit=limit
-    )
+    try:
+        thread_page = service.list_thread_page(
+            user_id=current_user.id,
+            application_id=application_id,
+            unread_only=unread_only,
+            archived=archived,
+            limit=limit,
+            cursor=cursor,
+            page=page
+        )
+    except BadRequestError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    threads = thread_page.threads
 
     # Get total count
     total = len(threads)  # TODO: Add proper count query
@@ -143,7 +152,8 @@ async def list_threads(
         total=total,
         page=page,
         limit=limit,
-        unread_count=unread_count
+        unread_count=unread_count,
+        next_cursor=thread_page.next_cursor
     )
 
 
@@ -250,11 +260,7 @@ async def get_unread_count(
     unread_count = service.get_unread_count(current_user.id)
 
     # Count threads with unread messages
-    threads = service.list_threads(
-        user_id=current_user.id,
-        unread_only=True
-    )
-    unread_threads = len(threads)
+    unread_threads = service.get_unread_thread_count(current_user.id)
 
     return UnreadCountResponse(
         unread_count=unread_count,
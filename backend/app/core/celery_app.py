@@ -1,6 +1,8 @@
 """Celery application configuration"""
 
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.core.config import settings
 
 # Create Celery app
@@ -8,7 +10,16 @@ celery_app = Celery(
     "hireflux",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.workers.auto_apply_worker"],
+    include=[
+        "app.workers.auto_apply_worker",
+        "app.workers.job_index_worker",
+        "app.workers.fit_index_worker",
+        "app.workers.analytics_worker",
+        "app.workers.usage_worker",
+        "app.workers.webhook_worker",
+        "app.workers.digest_worker",
+        "app.workers.bulk_upload_worker",
+    ],
 )
 
 # Configure Celery
@@ -41,5 +52,75 @@ celery_app.conf.update(
             "task": "app.workers.auto_apply_worker.cleanup_old_jobs",
             "schedule": 86400.0,  # Run daily
         },
+        # Safety net for refreshes whose scheduling message was lost
+        "refresh-fit-indexes": {
+            "task": "app.workers.fit_index_worker.refresh_fit_indexes",
+            "schedule": 300.0,  # Run every 5 minutes
+        },
+        "rollup-peer-benchmarks": {
+            "task": "app.workers.analytics_worker.rollup_peer_benchmarks",
+            "schedule": crontab(hour=3, minute=0),  # Nightly, off-peak
+        },
+        # Closes out yesterday and rebuilds days whose applications changed
+        "refresh-analytics-snapshots": {
+            "task": "app.workers.analytics_worker.refresh_analytics_snapshots",
+            "schedule": 3600.0,  # Run hourly
+        },
+        "write-back-usage-counters": {
+            "task": "app.workers.usage_worker.write_back_usage_counters",
+            "schedule": float(settings.USAGE_COUNTER_FLUSH_INTERVAL_SECONDS),
+        },
+        # Due retries, expired leases and events queued without a trigger
+        "dispatch-webhook-deliveries": {
+            "task": "app.workers.webhook_worker.dispatch_webhook_deliveries",
+            "schedule": float(settings.WEBHOOK_DISPATCH_INTERVAL_SECONDS),
+        },
+        # Each user's digest goes out on their preferred digest day
+        "send-weekly-digests": {
+            "task": "app.workers.digest_worker.send_weekly_digests",
+            "schedule": crontab(hour=14, minute=0),  # Daily, morning in the US
+        },
     },
 )
+
+
+@worker_process_init.connect
+def init_worker_clients(**kwargs):
+    """Create shared Pinecone/OpenAI clients once per worker process"""
+    from app.services.client_registry import init_clients
+
+    init_clients()
+
+
+@worker_process_shutdown.connect
+def save_worker_local_indexes(**kwargs):
+    """Merge vectors written by this worker into the saved local indexes"""
+    from app.services.client_registry import reset_clients
+
+    reset_clients()
+
+
+@worker_process_init.connect
+def init_worker_fit_index_tracking(**kwargs):
+    """Track Profile/Job changes made by tasks for fit-index refresh"""
+    if not settings.FIT_INDEX_REFRESH_ENABLED:
+        return
+
+    from app.services.fit_index_refresh_service import enable_fit_index_tracking
+    from app.workers.fit_index_worker import (
+        dispatch_fit_index_keys,
+        schedule_fit_index_refresh,
+    )
+
+    enable_fit_index_tracking(
+        on_enqueue=schedule_fit_index_refresh,
+        on_queue_failure=dispatch_fit_index_keys,
+    )
+
+
+@worker_process_init.connect
+def init_worker_dashboard_cache_invalidation(**kwargs):
+    """Drop cached employer dashboards when tasks create applications"""
+    from app.services.dashboard_cache import enable_dashboard_cache_invalidation
+
+    enable_dashboard_cache_invalidation()
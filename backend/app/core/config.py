@@ -29,6 +29,7 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
 
     # JWT
     JWT_SECRET_KEY: str = "dev-jwt-secret-change-in-production"
@@ -49,6 +50,52 @@ class Settings(BaseSettings):
     PINECONE_ENVIRONMENT: str = "us-west1-gcp"
     PINECONE_INDEX_NAME_JOBS: str = "job-embeddings"
     PINECONE_INDEX_NAME_USERS: str = "user-skills-embeddings"
+    # Namespace in the jobs index holding per-skill vectors (job vectors
+    # stay in the default namespace)
+    PINECONE_JOB_SKILLS_NAMESPACE: str = "job-skills"
+
+    # Vector store backend: "pinecone" (hosted) or "local" (in-process index)
+    VECTOR_STORE_BACKEND: str = "pinecone"
+    LOCAL_VECTOR_INDEX_DIR: str = "./data/vector_index"
+
+    # Embedding cache
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_TTL_HOURS: int = 24
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = False
+
+    # Incremental fit-index refresh (Profile/Job changes -> Application.fit_index)
+    FIT_INDEX_REFRESH_ENABLED: bool = True
+    FIT_INDEX_REFRESH_DELAY_SECONDS: int = 10
+    FIT_INDEX_REFRESH_BATCH_SIZE: int = 500
+
+    # Employer dashboard counters cache (dropped on new applications)
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+
+    # Job board ingestion (concurrent boards, per-host request pacing)
+    JOB_INGESTION_MAX_WORKERS: int = 20
+    JOB_INGESTION_RATE_PER_HOST: float = 10.0  # Requests per second
+    JOB_INGESTION_RATE_BURST: int = 20
+
+    # Bulk job uploads (CSV rows streamed and persisted in chunks)
+    BULK_UPLOAD_MAX_ROWS: int = 100000
+    BULK_UPLOAD_CHUNK_SIZE: int = 500
+    BULK_UPLOAD_ERROR_PREVIEW_LIMIT: int = 100  # Errors kept on the upload
+
+    # Outbound webhook delivery queue (pooled client, per-endpoint caps)
+    WEBHOOK_DISPATCH_BATCH_SIZE: int = 500
+    WEBHOOK_DISPATCH_MAX_IN_FLIGHT: int = 100
+    WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT: int = 4
+    WEBHOOK_DELIVERY_TIMEOUT_SECONDS: float = 30.0
+    WEBHOOK_CLAIM_LEASE_SECONDS: int = 300
+    WEBHOOK_DISPATCH_INTERVAL_SECONDS: int = 15
+
+    # Redis usage counters for subscription limits (written back periodically)
+    USAGE_COUNTERS_ENABLED: bool = True
+    USAGE_COUNTER_PLAN_TTL_SECONDS: int = 300
+    USAGE_COUNTER_FLUSH_INTERVAL_SECONDS: int = 60
+
+    # Employer analytics daily snapshots (closed days served from snapshots)
+    ANALYTICS_SNAPSHOT_BACKFILL_DAYS: int = 400
 
     # Stripe
     STRIPE_SECRET_KEY: str = ""
@@ -62,6 +109,20 @@ class Settings(BaseSettings):
     FROM_EMAIL: str = "noreply@hireflux.com"
     FROM_NAME: str = "HireFlux"
 
+    # Bulk email via Resend's batch API (paced to the API key's rate limit)
+    RESEND_API_URL: str = "https://api.resend.com"
+    EMAIL_BULK_BATCH_SIZE: int = 100  # Resend's maximum per batch request
+    EMAIL_BULK_MAX_IN_FLIGHT: int = 4
+    EMAIL_BULK_REQUESTS_PER_SECOND: float = 2.0
+    EMAIL_BULK_RATE_BURST: int = 2
+    EMAIL_BULK_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_BULK_MAX_RETRIES: int = 3
+
+    # Weekly digest pipeline (runs daily for users whose digest day it is)
+    WEEKLY_DIGEST_PAGE_SIZE: int = 1000
+    WEEKLY_DIGEST_TOP_JOBS: int = 3
+    WEEKLY_DIGEST_MIN_FIT_INDEX: int = 70
+
     # AWS S3
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
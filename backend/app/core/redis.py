@@ -0,0 +1,43 @@
+"""
+Shared Redis Client
+
+Lazily creates a single connection-pooled Redis client per process.
+Callers must treat Redis as optional and degrade gracefully when
+``get_redis_client()`` returns None or a command raises.
+"""
+
+import logging
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Get the process-wide Redis client (None if redis is unavailable)"""
+    global _redis_client
+
+    if _redis_client is None:
+        try:
+            import redis
+
+            _redis_client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        except Exception as e:
+            logger.warning(f"Redis client unavailable: {e}")
+            return None
+
+    return _redis_client
+
+
+def set_redis_client(client: Optional[object]) -> None:
+    """Override the shared Redis client (used by tests and worker init)"""
+    global _redis_client
+    _redis_client = client
@@ -41,6 +41,7 @@ from app.db.models.webhook import (
 )
 from app.db.models.bulk_job_posting import (
     BulkJobUpload,
+    BulkJobUploadRow,
     JobDistribution,
     BulkUploadStatus,
     DistributionStatus,
@@ -50,6 +51,7 @@ from app.db.models.analytics import (
     AnalyticsSnapshot,
     ApplicationStageHistory,
     CompanyAnalyticsConfig,
+    PeerBenchmark,
 )
 from app.db.models.api_key import (
     APIKey,
@@ -110,6 +112,7 @@ __all__ = [
     "CandidateAvailability",
     "PaymentMethod",
     "BulkJobUpload",
+    "BulkJobUploadRow",
     "JobDistribution",
     "BulkUploadStatus",
     "DistributionStatus",
@@ -117,6 +120,7 @@ __all__ = [
     "AnalyticsSnapshot",
     "ApplicationStageHistory",
     "CompanyAnalyticsConfig",
+    "PeerBenchmark",
     "APIKey",
     "APIKeyUsage",
     "Webhook",
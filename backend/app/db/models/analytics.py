@@ -8,7 +8,7 @@ from decimal import Decimal
 from typing import Optional, Dict, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text, Index, JSON
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, Numeric, String, Text, Index, JSON
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -123,3 +123,36 @@ class CompanyAnalyticsConfig(Base):
 
     def __repr__(self) -> str:
         return f"<CompanyAnalyticsConfig(company_id={self.company_id}, target_hire_days={self.target_time_to_hire_days})>"
+
+
+class PeerBenchmark(Base):
+    """
+    Platform-wide distribution of one job seeker metric.
+
+    Stores a fixed-bin histogram of per-user values (e.g. response rate over
+    the last 30 days) so percentiles can be answered without scanning
+    applications. Rebuilt nightly by the peer benchmark rollup.
+    """
+
+    __tablename__ = "peer_benchmarks"
+
+    id = Column(GUID(), primary_key=True, default=uuid4)
+    metric = Column(String(50), nullable=False)  # 'total_applications', 'response_rate', ...
+    window_days = Column(Integer, nullable=False)
+
+    # Histogram: bin boundaries and cumulative user counts per bin
+    bin_edges = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    cumulative_counts = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    sample_size = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+
+    # Metadata
+    computed_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_peer_benchmarks_metric_window', 'metric', 'window_days', unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PeerBenchmark(metric={self.metric}, window={self.window_days}d, n={self.sample_size})>"
@@ -12,6 +12,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -266,7 +267,7 @@ class WebhookDelivery(Base):
     status = Column(
         String(50),
         nullable=False,
-        comment='Delivery status: "pending", "success", "failed", "retrying"',
+        comment='Delivery status: "pending", "delivering", "success", "failed", "retrying"',
     )
 
     # Response details
@@ -303,6 +304,11 @@ class WebhookDelivery(Base):
     webhook = relationship("Webhook", back_populates="deliveries")
     company = relationship("Company")
 
+    # Serves the dispatcher's claim of due deliveries (status + due time)
+    __table_args__ = (
+        Index("idx_webhook_deliveries_due", "status", "next_retry_at"),
+    )
+
     def __repr__(self):
         return f"<WebhookDelivery {self.event_type} - {self.status} (attempt {self.attempt_number})>"
 
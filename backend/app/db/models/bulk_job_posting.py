@@ -10,6 +10,7 @@ from sqlalchemy import (
     Boolean,
     JSON,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -73,6 +74,7 @@ class BulkJobUpload(Base):
     # Upload metadata
     filename = Column(String(255), nullable=False)
     total_jobs = Column(Integer, default=0)
+    processed_jobs = Column(Integer, default=0)  # Rows persisted so far
     valid_jobs = Column(Integer, default=0)
     invalid_jobs = Column(Integer, default=0)
     duplicate_jobs = Column(Integer, default=0)
@@ -87,9 +89,9 @@ class BulkJobUpload(Base):
     error_message = Column(Text)  # Error details if failed
 
     # Parsed job data
-    raw_jobs_data = Column(JSON)  # Original parsed CSV data
+    raw_jobs_data = Column(JSON)  # Original parsed data (JSON uploads only)
     enriched_jobs_data = Column(JSON)  # After AI normalization
-    validation_errors = Column(JSON)  # Per-job validation errors
+    validation_errors = Column(JSON)  # Per-job validation errors (CSV: first N)
     duplicate_info = Column(JSON)  # Duplicate detection results
 
     # AI enrichment tracking
@@ -114,6 +116,36 @@ class BulkJobUpload(Base):
     )
 
 
+class BulkJobUploadRow(Base):
+    """One row of a streamed CSV upload, persisted in chunks"""
+
+    __tablename__ = "bulk_job_upload_rows"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    bulk_upload_id = Column(
+        GUID(),
+        ForeignKey("bulk_job_uploads.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    row_index = Column(Integer, nullable=False)  # 0-based data row in the file
+
+    # Parsed CSVJobRow, or the raw CSV values if the row did not parse
+    job_data = Column(JSON, nullable=False)
+    is_valid = Column(Boolean, nullable=False, default=False)
+    validation_errors = Column(JSON)  # Errors for this row
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "idx_bulk_job_upload_rows_upload_row",
+            "bulk_upload_id",
+            "row_index",
+            unique=True,
+        ),
+    )
+
+
 class JobDistribution(Base):
     """Individual job distribution tracking for multi-board publishing"""
 
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Integer,
     Boolean,
     JSON,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -55,6 +56,8 @@ class Job(Base):
     )
     source = Column(String(50))  # 'greenhouse', 'lever', 'manual', 'employer'
     external_id = Column(String(255))  # ID from job board
+    # SHA-256 of the ingested fields, used to skip unchanged board jobs
+    content_hash = Column(String(64))
     title = Column(String(255), index=True)
     company = Column(String(255), index=True)  # Company name (string for external jobs)
     description = Column(Text)
@@ -103,6 +106,11 @@ class Job(Base):
         "JobDistribution", back_populates="job", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Upsert target for board ingestion (NULL external_ids never conflict)
+        Index("idx_jobs_source_external_id", "source", "external_id", unique=True),
+    )
+
 
 class MatchScore(Base):
     """Job matching scores for users"""
@@ -5,13 +5,14 @@ Purpose: Enable direct communication between employers and candidates
 Business Impact: 60% on-platform communication target, improve engagement
 """
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, ForeignKey, ARRAY
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, ForeignKey, ARRAY, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 
 from app.db.base import Base
+from app.db.types import GUID
 
 
 class MessageThread(Base):
@@ -23,11 +24,11 @@ class MessageThread(Base):
     """
     __tablename__ = "message_threads"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4, index=True)
 
     # Application context (optional - threads can exist without application)
     application_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("applications.id", ondelete="SET NULL"),
         nullable=True,
         index=True
@@ -35,13 +36,13 @@ class MessageThread(Base):
 
     # Participants (2-person threads only for MVP)
     employer_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
     )
     candidate_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -70,15 +71,73 @@ class MessageThread(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
-    application = relationship("JobApplication", back_populates="message_threads")
-    employer = relationship("User", foreign_keys=[employer_id], back_populates="employer_threads")
-    candidate = relationship("User", foreign_keys=[candidate_id], back_populates="candidate_threads")
+    application = relationship("Application")
+    employer = relationship("User", foreign_keys=[employer_id])
+    candidate = relationship("User", foreign_keys=[candidate_id])
     messages = relationship("Message", back_populates="thread", cascade="all, delete-orphan")
+    inbox_entries = relationship(
+        "MessageThreadInbox", back_populates="thread", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<MessageThread {self.id} employer={self.employer_id} candidate={self.candidate_id}>"
 
 
+class MessageThreadInbox(Base):
+    """
+    Per-participant view of a thread (one row per user and thread)
+
+    Holds the participant's unread count, archive flag and sort time, so a
+    user's inbox is a range scan of one index instead of OR-ed
+    employer/candidate predicates over message_threads. Maintained by
+    MessagingService alongside the thread; deleted threads have no rows.
+    """
+    __tablename__ = "message_thread_inbox"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+
+    user_id = Column(
+        GUID(),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    thread_id = Column(
+        GUID(),
+        ForeignKey("message_threads.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    role = Column(String(20), nullable=False)  # "employer" or "candidate"
+
+    # Copied from the thread for filtering
+    application_id = Column(GUID(), nullable=True)
+
+    # This participant's state
+    unread_count = Column(Integer, default=0, nullable=False)
+    is_archived = Column(Boolean, default=False, nullable=False)
+
+    # Thread last_message_at, or its creation time before the first message
+    last_activity_at = Column(DateTime, nullable=False)
+
+    # Relationships
+    thread = relationship("MessageThread", back_populates="inbox_entries")
+
+    __table_args__ = (
+        Index("idx_message_thread_inbox_user_thread", "user_id", "thread_id", unique=True),
+        # Inbox listing: equality on (user_id, is_archived), keyset on the rest
+        Index(
+            "idx_message_thread_inbox_listing",
+            "user_id",
+            "is_archived",
+            "last_activity_at",
+            "thread_id"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<MessageThreadInbox user={self.user_id} thread={self.thread_id} unread={self.unread_count}>"
+
+
 class Message(Base):
     """
     Individual message within a thread
@@ -88,11 +147,11 @@ class Message(Base):
     """
     __tablename__ = "messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4, index=True)
 
     # Thread relationship
     thread_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("message_threads.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -100,13 +159,13 @@ class Message(Base):
 
     # Sender and recipient
     sender_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
     )
     recipient_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -150,8 +209,8 @@ class Message(Base):
 
     # Relationships
     thread = relationship("MessageThread", back_populates="messages")
-    sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
-    recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_messages")
+    sender = relationship("User", foreign_keys=[sender_id])
+    recipient = relationship("User", foreign_keys=[recipient_id])
 
     def __repr__(self):
         return f"<Message {self.id} from={self.sender_id} to={self.recipient_id} read={self.is_read}>"
@@ -166,17 +225,17 @@ class MessageBlocklist(Base):
     """
     __tablename__ = "message_blocklist"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4, index=True)
 
     # Who is blocking whom
     blocker_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
     )
     blocked_id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -190,8 +249,8 @@ class MessageBlocklist(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
-    blocker = relationship("User", foreign_keys=[blocker_id], back_populates="blocked_users")
-    blocked = relationship("User", foreign_keys=[blocked_id], back_populates="blocked_by_users")
+    blocker = relationship("User", foreign_keys=[blocker_id])
+    blocked = relationship("User", foreign_keys=[blocked_id])
 
     def __repr__(self):
         return f"<MessageBlocklist blocker={self.blocker_id} blocked={self.blocked_id}>"
@@ -265,6 +265,31 @@ async def startup_event():
     print(f"Environment: {settings.ENVIRONMENT}")
     print(f"API Docs: {settings.API_V1_PREFIX}/docs")
 
+    # Create shared Pinecone/OpenAI clients once per process
+    from app.services.client_registry import init_clients
+
+    init_clients()
+
+    # Queue fit-index refreshes when Profile/Job scoring fields change
+    if settings.FIT_INDEX_REFRESH_ENABLED:
+        from app.services.fit_index_refresh_service import (
+            enable_fit_index_tracking,
+        )
+        from app.workers.fit_index_worker import (
+            dispatch_fit_index_keys,
+            schedule_fit_index_refresh,
+        )
+
+        enable_fit_index_tracking(
+            on_enqueue=schedule_fit_index_refresh,
+            on_queue_failure=dispatch_fit_index_keys,
+        )
+
+    # Drop cached employer dashboards when applications are committed
+    from app.services.dashboard_cache import enable_dashboard_cache_invalidation
+
+    enable_dashboard_cache_invalidation()
+
     # TODO: Initialize database connection pool
     # TODO: Initialize Redis connection pool
     # TODO: Warm up cache
@@ -275,6 +300,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("Shutting down gracefully...")
+
+    from app.services.client_registry import reset_clients
+
+    reset_clients()
     # TODO: Close database connections
     # TODO: Close Redis connections
 
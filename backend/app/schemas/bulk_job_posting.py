@@ -95,7 +95,9 @@ class DuplicateInfo(BaseModel):
     """Information about duplicate jobs"""
 
     row_index: int
-    duplicate_of: int  # Index of original job
+    duplicate_of: Optional[int] = None  # Index of original job in the upload
+    existing_job_id: Optional[str] = None  # Active job it duplicates instead
+    existing_job_title: Optional[str] = None
     similarity_score: float = Field(..., ge=0.0, le=1.0)
     matching_fields: List[str]
 
@@ -130,6 +132,7 @@ class BulkUploadResponse(BaseModel):
     company_id: str
     filename: str
     total_jobs: int
+    processed_jobs: int = 0  # Rows validated and stored so far
     valid_jobs: int
     invalid_jobs: int
     duplicate_jobs: int
@@ -161,6 +164,27 @@ class BulkUploadDetail(BulkUploadResponse):
         from_attributes = True
 
 
+class BulkUploadRowResponse(BaseModel):
+    """One stored row of a CSV upload"""
+
+    row_index: int
+    job_data: Dict[str, Any]
+    is_valid: bool
+    validation_errors: Optional[List[JobValidationError]] = Field(default_factory=list)
+
+    class Config:
+        from_attributes = True
+
+
+class BulkUploadRowListResponse(BaseModel):
+    """Page of stored CSV upload rows"""
+
+    rows: List[BulkUploadRowResponse]
+    offset: int
+    limit: int
+    next_offset: Optional[int] = None  # Pass as offset for the next page
+
+
 # AI Enrichment Schemas
 
 
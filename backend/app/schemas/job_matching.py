@@ -269,3 +269,21 @@ class BatchEmbeddingResponse(BaseModel):
     success_count: int
     failed_count: int
     errors: List[str] = []
+
+
+class JobReindexReport(BaseModel):
+    """Throughput report for a bulk job re-index run"""
+
+    completed: bool
+    jobs_indexed: int
+    vectors_upserted: int
+    batches: int
+    failed_batches: int = 0
+    embeddings_generated: int
+    cache_hit_rate: float
+    duration_seconds: float
+    jobs_per_second: float
+    embeddings_per_second: float
+    resumed_from: Optional[str] = None
+    last_job_id: Optional[str] = None
+    errors: List[str] = []
@@ -293,6 +293,7 @@ class ThreadListResponse(BaseModel):
     page: int
     limit: int
     unread_count: int  # Total unread count across all threads
+    next_cursor: Optional[str] = None  # Pass as cursor for the next page
 
     class Config:
         from_attributes = True
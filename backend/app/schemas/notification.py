@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+from uuid import UUID
 
 
 class NotificationType(str, Enum):
@@ -132,7 +133,7 @@ class NotificationPreferenceResponse(BaseModel):
     """Response schema for notification preferences"""
 
     id: int
-    user_id: int
+    user_id: UUID
     email_job_matches: bool
     email_application_updates: bool
     email_interview_reminders: bool
@@ -0,0 +1,200 @@
+"""
+SQL-side aggregation of a job seeker's applications for AnalyticsService
+
+One GROUP BY (day, status) query per user and time range returns a
+compact day x status grid: at most one row per active day and status,
+regardless of how many applications there are. Pipeline counts,
+success metrics, daily trends and activity streaks are all derived from
+that grid instead of loading Application rows into Python.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, and_, case, cast, func
+from sqlalchemy.orm import Session
+
+from app.db.models.application import Application
+
+# Statuses that don't count as an employer response
+NO_RESPONSE_STATUSES = ("saved", "applied")
+INTERVIEW_STATUSES = (
+    "phone_screen",
+    "technical_interview",
+    "onsite_interview",
+    "final_interview",
+)
+
+
+@dataclass
+class DayStatusBucket:
+    """Applications created on one day that are currently in one status"""
+
+    day: date
+    status: Optional[str]
+    count: int
+    last_7_days: int = 0  # created within 7 days of ``now``
+    last_30_days: int = 0
+    response_days_total: int = 0  # sum of whole days applied -> response
+    response_days_count: int = 0  # applications contributing to the sum
+
+
+@dataclass
+class ApplicationAggregates:
+    """Day x status grid for one user and time range"""
+
+    start_date: datetime
+    end_date: datetime
+    now: datetime
+    buckets: List[DayStatusBucket] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(b.count for b in self.buckets)
+
+    @property
+    def status_counts(self) -> Dict[Optional[str], int]:
+        counts: Dict[Optional[str], int] = defaultdict(int)
+        for bucket in self.buckets:
+            counts[bucket.status] += bucket.count
+        return counts
+
+    def count_in(self, statuses) -> int:
+        """Applications currently in any of ``statuses``"""
+        return sum(b.count for b in self.buckets if b.status in statuses)
+
+    @property
+    def responses(self) -> int:
+        return sum(
+            b.count for b in self.buckets if b.status not in NO_RESPONSE_STATUSES
+        )
+
+    @property
+    def last_7_days(self) -> int:
+        return sum(b.last_7_days for b in self.buckets)
+
+    @property
+    def last_30_days(self) -> int:
+        return sum(b.last_30_days for b in self.buckets)
+
+    @property
+    def avg_response_days(self) -> Optional[float]:
+        count = sum(b.response_days_count for b in self.buckets)
+        if not count:
+            return None
+        return sum(b.response_days_total for b in self.buckets) / count
+
+    @property
+    def active_days(self) -> List[date]:
+        """Sorted days with at least one application"""
+        return sorted({b.day for b in self.buckets})
+
+    @property
+    def longest_streak(self) -> int:
+        """Longest run of consecutive active days"""
+        days = self.active_days
+        if not days:
+            return 0
+
+        longest = current = 1
+        for previous, day in zip(days, days[1:]):
+            current = current + 1 if (day - previous).days == 1 else 1
+            longest = max(longest, current)
+        return longest
+
+    def by_day(self) -> Dict[date, List[DayStatusBucket]]:
+        """Buckets grouped by day, in date order"""
+        grouped: Dict[date, List[DayStatusBucket]] = defaultdict(list)
+        for bucket in sorted(self.buckets, key=lambda b: b.day):
+            grouped[bucket.day].append(bucket)
+        return grouped
+
+
+def _whole_days_between(db: Session, start, end):
+    """SQL expression for whole days from ``start`` to ``end``"""
+    if db.get_bind().dialect.name == "sqlite":
+        # Truncation equals floor for the positive deltas we keep
+        return cast(func.julianday(end) - func.julianday(start), Integer)
+    return func.floor(func.extract("epoch", end - start) / 86400)
+
+
+def to_date(value) -> date:
+    """Normalize a SQL DATE() result (an ISO string on SQLite) to a date"""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def aggregate_applications(
+    db: Session,
+    user_id: UUID,
+    start_date: datetime,
+    end_date: datetime,
+    now: Optional[datetime] = None,
+) -> ApplicationAggregates:
+    """
+    Aggregate a user's applications created in [start_date, end_date].
+
+    Returns:
+        ApplicationAggregates with one bucket per (day, status)
+    """
+    now = now or datetime.utcnow()
+    day = func.date(Application.created_at)
+
+    response_days = _whole_days_between(
+        db, Application.applied_at, Application.updated_at
+    )
+    timed_response = and_(
+        Application.status.notin_(NO_RESPONSE_STATUSES),
+        Application.applied_at.isnot(None),
+        Application.updated_at.isnot(None),
+        response_days > 0,
+    )
+
+    rows = (
+        db.query(
+            day.label("day"),
+            Application.status,
+            func.count(Application.id),
+            func.sum(
+                case((Application.created_at >= now - timedelta(days=7), 1), else_=0)
+            ),
+            func.sum(
+                case((Application.created_at >= now - timedelta(days=30), 1), else_=0)
+            ),
+            func.sum(case((timed_response, response_days), else_=0)),
+            func.sum(case((timed_response, 1), else_=0)),
+        )
+        .filter(
+            and_(
+                Application.user_id == user_id,
+                Application.created_at >= start_date,
+                Application.created_at <= end_date,
+            )
+        )
+        .group_by(day, Application.status)
+        .all()
+    )
+
+    return ApplicationAggregates(
+        start_date=start_date,
+        end_date=end_date,
+        now=now,
+        buckets=[
+            DayStatusBucket(
+                day=to_date(row[0]),
+                status=row[1],
+                count=int(row[2]),
+                last_7_days=int(row[3] or 0),
+                last_30_days=int(row[4] or 0),
+                response_days_total=int(row[5] or 0),
+                response_days_count=int(row[6] or 0),
+            )
+            for row in rows
+        ],
+    )
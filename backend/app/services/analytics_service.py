@@ -1,7 +1,7 @@
 """Analytics Service for Job Insights Dashboard"""
 
 import logging
-from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from uuid import UUID
@@ -14,6 +14,16 @@ from app.db.models.audit import EventAudit
 from app.db.models.interview import InterviewSession
 from app.db.models.job import Job, MatchScore
 from app.db.models.webhook import ApplicationStatusHistory, InterviewSchedule
+from app.services.analytics_aggregation import (
+    INTERVIEW_STATUSES,
+    NO_RESPONSE_STATUSES,
+    ApplicationAggregates,
+    aggregate_applications,
+)
+from app.services.peer_benchmark_service import (
+    BENCHMARK_WINDOW_DAYS,
+    PeerBenchmarkService,
+)
 from app.schemas.analytics import (
     ActivityItem,
     ActivityTimeline,
@@ -40,12 +50,22 @@ from app.schemas.analytics import (
 
 logger = logging.getLogger(__name__)
 
+# Used until the first peer benchmark rollup has run
+DEFAULT_PLATFORM_AVERAGES = {
+    "total_applications": 15.0,
+    "response_rate": 35.0,
+    "interview_rate": 18.0,
+    "offer_rate": 8.0,
+}
+
 
 class AnalyticsService:
     """Service for calculating analytics and insights"""
 
     def __init__(self, db: Session):
         self.db = db
+        # Per-request memo, only set inside _shared_results()
+        self._results: Optional[Dict[tuple, object]] = None
 
     # =========================================================================
     # TIME RANGE HELPERS
@@ -66,6 +86,43 @@ class AnalyticsService:
 
         return start_date, end_date
 
+    # =========================================================================
+    # SHARED AGGREGATES
+    # =========================================================================
+
+    @contextmanager
+    def _shared_results(self):
+        """Reuse aggregates and metrics across the sub-metrics of one call"""
+        if self._results is not None:
+            yield
+            return
+
+        self._results = {}
+        try:
+            yield
+        finally:
+            self._results = None
+
+    def _memoized(self, key: tuple, compute):
+        if self._results is None:
+            return compute()
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def _get_aggregates(
+        self, user_id: UUID, time_range: TimeRange
+    ) -> ApplicationAggregates:
+        """Day x status application grid for the time range (one query)"""
+
+        def compute():
+            start_date, end_date = self._get_date_range(time_range)
+            return aggregate_applications(
+                self.db, user_id, start_date, end_date, now=end_date
+            )
+
+        return self._memoized(("aggregates", user_id, time_range), compute)
+
     # =========================================================================
     # APPLICATION PIPELINE STATS
     # =========================================================================
@@ -74,27 +131,9 @@ class AnalyticsService:
         self, user_id: UUID, time_range: TimeRange = TimeRange.LAST_30_DAYS
     ) -> ApplicationPipelineStats:
         """Calculate application pipeline statistics"""
-        start_date, end_date = self._get_date_range(time_range)
-
-        # Get all applications in time range
-        applications = (
-            self.db.query(Application)
-            .filter(
-                and_(
-                    Application.user_id == user_id,
-                    Application.created_at >= start_date,
-                    Application.created_at <= end_date,
-                )
-            )
-            .all()
-        )
-
-        # Count applications by status
-        status_counts = defaultdict(int)
-        for app in applications:
-            status_counts[app.status] += 1
-
-        total = len(applications)
+        aggregates = self._get_aggregates(user_id, time_range)
+        status_counts = aggregates.status_counts
+        total = aggregates.total
 
         # Calculate rates
         if total > 0:
@@ -181,29 +220,18 @@ class AnalyticsService:
         self, user_id: UUID, time_range: TimeRange = TimeRange.LAST_30_DAYS
     ) -> SuccessMetrics:
         """Calculate comprehensive success metrics"""
-        start_date, end_date = self._get_date_range(time_range)
-
-        # Get applications
-        applications = (
-            self.db.query(Application)
-            .filter(
-                and_(
-                    Application.user_id == user_id,
-                    Application.created_at >= start_date,
-                )
-            )
-            .all()
+        return self._memoized(
+            ("success_metrics", user_id, time_range),
+            lambda: self._compute_success_metrics(user_id, time_range),
         )
 
-        total_apps = len(applications)
-
-        # Count by time periods
-        now = datetime.utcnow()
-        last_7_days = now - timedelta(days=7)
-        last_30_days = now - timedelta(days=30)
-
-        apps_last_7 = sum(1 for app in applications if app.created_at >= last_7_days)
-        apps_last_30 = sum(1 for app in applications if app.created_at >= last_30_days)
+    def _compute_success_metrics(
+        self, user_id: UUID, time_range: TimeRange
+    ) -> SuccessMetrics:
+        aggregates = self._get_aggregates(user_id, time_range)
+        start_date, end_date = aggregates.start_date, aggregates.end_date
+        status_counts = aggregates.status_counts
+        total_apps = aggregates.total
 
         # Calculate averages
         days_in_range = (end_date - start_date).days or 1
@@ -212,89 +240,48 @@ class AnalyticsService:
         avg_per_day = total_apps / days_in_range if days_in_range > 0 else 0
 
         # Response metrics
-        responses = sum(
-            1 for app in applications if app.status not in ["saved", "applied"]
-        )
+        responses = aggregates.responses
         response_rate = (responses / total_apps * 100) if total_apps > 0 else 0.0
-
-        # Calculate avg response time
-        response_times = []
-        for app in applications:
-            if (
-                app.status not in ["saved", "applied"]
-                and app.applied_at
-                and app.updated_at
-            ):
-                delta = (app.updated_at - app.applied_at).days
-                if delta > 0:
-                    response_times.append(delta)
-        avg_response_time = (
-            sum(response_times) / len(response_times) if response_times else None
-        )
+        avg_response_time = aggregates.avg_response_days
 
         # Interview metrics
-        interview_statuses = [
-            "phone_screen",
-            "technical_interview",
-            "onsite_interview",
-            "final_interview",
-        ]
-        total_interviews = sum(
-            1 for app in applications if app.status in interview_statuses
-        )
-
+        total_interviews = aggregates.count_in(INTERVIEW_STATUSES)
         interview_conversion = (
             (total_interviews / total_apps * 100) if total_apps > 0 else 0.0
         )
 
-        # Get interview schedules
-        interviews = (
-            self.db.query(InterviewSchedule)
+        # Interview schedules by status
+        schedule_counts = dict(
+            self.db.query(InterviewSchedule.status, func.count(InterviewSchedule.id))
             .filter(
                 and_(
                     InterviewSchedule.user_id == user_id,
                     InterviewSchedule.created_at >= start_date,
                 )
             )
+            .group_by(InterviewSchedule.status)
             .all()
         )
-
         interviews_scheduled = sum(
-            1 for i in interviews if i.status in ["scheduled", "confirmed"]
+            schedule_counts.get(status, 0) for status in ("scheduled", "confirmed")
         )
-        interviews_completed = sum(1 for i in interviews if i.status == "completed")
+        interviews_completed = schedule_counts.get("completed", 0)
 
         # Offer metrics
-        total_offers = sum(1 for app in applications if app.status == "offer")
+        total_offers = status_counts.get("offer", 0)
         offer_rate = (total_offers / total_apps * 100) if total_apps > 0 else 0.0
         pending_offers = total_offers  # Simplification
 
         # Rejection metrics
-        total_rejections = sum(1 for app in applications if app.status == "rejected")
+        total_rejections = status_counts.get("rejected", 0)
         rejection_rate = (
             (total_rejections / total_apps * 100) if total_apps > 0 else 0.0
         )
 
-        # Activity metrics
-        active_dates = set(app.created_at.date() for app in applications)
-        active_days = len(active_dates)
-
-        # Calculate longest streak
-        sorted_dates = sorted(active_dates)
-        longest_streak = 1
-        current_streak = 1
-
-        for i in range(1, len(sorted_dates)):
-            if (sorted_dates[i] - sorted_dates[i - 1]).days == 1:
-                current_streak += 1
-                longest_streak = max(longest_streak, current_streak)
-            else:
-                current_streak = 1
-
         return SuccessMetrics(
             total_applications=total_apps,
-            applications_last_7_days=apps_last_7,
-            applications_last_30_days=apps_last_30,
+            applications_last_7_days=aggregates.last_7_days,
+            applications_last_30_days=aggregates.last_30_days,
             avg_applications_per_week=round(avg_per_week, 2),
             total_responses=responses,
             response_rate=round(response_rate, 2),
@@ -310,9 +297,9 @@ class AnalyticsService:
             pending_offers=pending_offers,
             total_rejections=total_rejections,
             rejection_rate=round(rejection_rate, 2),
-            active_days=active_days,
+            active_days=len(aggregates.active_days),
             avg_daily_applications=round(avg_per_day, 2),
-            longest_streak_days=longest_streak if active_dates else 0,
+            longest_streak_days=aggregates.longest_streak,
         )
 
     # =========================================================================
@@ -706,52 +693,29 @@ class AnalyticsService:
         self, user_id: UUID, time_range: TimeRange = TimeRange.LAST_30_DAYS
     ) -> List[ApplicationTrend]:
         """Get application trends over time"""
-        start_date, end_date = self._get_date_range(time_range)
-
-        applications = (
-            self.db.query(Application)
-            .filter(
-                and_(
-                    Application.user_id == user_id,
-                    Application.created_at >= start_date,
-                    Application.created_at <= end_date,
+        aggregates = self._get_aggregates(user_id, time_range)
+
+        trends = []
+        for day, buckets in aggregates.by_day().items():
+            trends.append(
+                ApplicationTrend(
+                    date=datetime.combine(day, datetime.min.time()),
+                    applications_submitted=sum(b.count for b in buckets),
+                    responses_received=sum(
+                        b.count
+                        for b in buckets
+                        if b.status not in NO_RESPONSE_STATUSES
+                    ),
+                    interviews_scheduled=sum(
+                        b.count for b in buckets if b.status in INTERVIEW_STATUSES
+                    ),
+                    offers_received=sum(
+                        b.count for b in buckets if b.status == "offer"
+                    ),
                 )
             )
-            .all()
-        )
-
-        # Group by date
-        trends_dict: Dict[datetime, ApplicationTrend] = {}
-
-        for app in applications:
-            date_key = app.created_at.date()
-
-            if date_key not in trends_dict:
-                trends_dict[date_key] = ApplicationTrend(
-                    date=datetime.combine(date_key, datetime.min.time()),
-                    applications_submitted=0,
-                    responses_received=0,
-                    interviews_scheduled=0,
-                    offers_received=0,
-                )
-
-            trends_dict[date_key].applications_submitted += 1
-
-            if app.status not in ["saved", "applied"]:
-                trends_dict[date_key].responses_received += 1
-
-            if app.status in [
-                "phone_screen",
-                "technical_interview",
-                "onsite_interview",
-                "final_interview",
-            ]:
-                trends_dict[date_key].interviews_scheduled += 1
-
-            if app.status == "offer":
-                trends_dict[date_key].offers_received += 1
 
-        return sorted(trends_dict.values(), key=lambda x: x.date)
+        return trends
 
     def get_time_series_chart(
         self, user_id: UUID, metric: str, time_range: TimeRange
@@ -858,58 +822,45 @@ class AnalyticsService:
     def get_peer_comparison(self, user_id: UUID) -> PeerComparison:
         """Compare user metrics with platform benchmarks"""
         user_metrics = self.get_success_metrics(user_id, TimeRange.LAST_30_DAYS)
+        benchmarks = PeerBenchmarkService(self.db).get_benchmarks(
+            BENCHMARK_WINDOW_DAYS
+        )
 
-        # Platform averages (these would come from aggregated data in production)
-        platform_avg_applications = 15.0
-        platform_avg_response_rate = 35.0
-        platform_avg_interview_rate = 18.0
-        platform_avg_offer_rate = 8.0
-
-        return PeerComparison(
-            total_applications=BenchmarkComparison(
-                metric_name="Total Applications",
-                user_value=float(user_metrics.total_applications),
-                platform_average=platform_avg_applications,
-                percentile=self._calculate_percentile(
-                    user_metrics.total_applications, platform_avg_applications
-                ),
-                performance=self._get_performance_level(
-                    user_metrics.total_applications, platform_avg_applications
-                ),
-            ),
-            response_rate=BenchmarkComparison(
-                metric_name="Response Rate",
-                user_value=user_metrics.response_rate,
-                platform_average=platform_avg_response_rate,
-                percentile=self._calculate_percentile(
-                    user_metrics.response_rate, platform_avg_response_rate
-                ),
+        def compare(metric: str, metric_name: str, user_value: float):
+            benchmark = benchmarks.get(metric)
+            if benchmark is not None and benchmark.sample_size:
+                platform_average = benchmark.mean
+                percentile = PeerBenchmarkService.percentile(benchmark, user_value)
+            else:
+                # No rollup yet: fall back to static estimates
+                platform_average = DEFAULT_PLATFORM_AVERAGES[metric]
+                percentile = self._calculate_percentile(user_value, platform_average)
+
+            return BenchmarkComparison(
+                metric_name=metric_name,
+                user_value=user_value,
+                platform_average=round(platform_average, 2),
+                percentile=round(percentile, 1),
                 performance=self._get_performance_level(
-                    user_metrics.response_rate, platform_avg_response_rate
+                    user_value, platform_average
                 ),
+            )
+
+        return PeerComparison(
+            total_applications=compare(
+                "total_applications",
+                "Total Applications",
+                float(user_metrics.total_applications),
             ),
-            interview_rate=BenchmarkComparison(
-                metric_name="Interview Rate",
-                user_value=user_metrics.interview_conversion_rate,
-                platform_average=platform_avg_interview_rate,
-                percentile=self._calculate_percentile(
-                    user_metrics.interview_conversion_rate, platform_avg_interview_rate
-                ),
-                performance=self._get_performance_level(
-                    user_metrics.interview_conversion_rate, platform_avg_interview_rate
-                ),
+            response_rate=compare(
+                "response_rate", "Response Rate", user_metrics.response_rate
             ),
-            offer_rate=BenchmarkComparison(
-                metric_name="Offer Rate",
-                user_value=user_metrics.offer_rate,
-                platform_average=platform_avg_offer_rate,
-                percentile=self._calculate_percentile(
-                    user_metrics.offer_rate, platform_avg_offer_rate
-                ),
-                performance=self._get_performance_level(
-                    user_metrics.offer_rate, platform_avg_offer_rate
-                ),
+            interview_rate=compare(
+                "interview_rate",
+                "Interview Rate",
+                user_metrics.interview_conversion_rate,
             ),
+            offer_rate=compare("offer_rate", "Offer Rate", user_metrics.offer_rate),
         )
 
     def _calculate_percentile(self, user_value: float, platform_avg: float) -> float:
@@ -952,6 +903,10 @@ class AnalyticsService:
 
     def get_dashboard_overview(self, user_id: UUID) -> DashboardOverview:
         """Get complete dashboard overview"""
+        with self._shared_results():
+            return self._build_dashboard_overview(user_id)
+
+    def _build_dashboard_overview(self, user_id: UUID) -> DashboardOverview:
         pipeline_stats = self.get_pipeline_stats(user_id, TimeRange.LAST_30_DAYS)
         success_metrics = self.get_success_metrics(user_id, TimeRange.LAST_30_DAYS)
         health_score = self.get_health_score(user_id)
@@ -1004,6 +959,12 @@ class AnalyticsService:
         self, user_id: UUID, time_range: TimeRange = TimeRange.LAST_30_DAYS
     ) -> DetailedAnalytics:
         """Get detailed analytics with trends"""
+        with self._shared_results():
+            return self._build_detailed_analytics(user_id, time_range)
+
+    def _build_detailed_analytics(
+        self, user_id: UUID, time_range: TimeRange
+    ) -> DetailedAnalytics:
         pipeline_stats = self.get_pipeline_stats(user_id, time_range)
         pipeline_distribution = self.get_pipeline_distribution(user_id, time_range)
         success_metrics = self.get_success_metrics(user_id, time_range)
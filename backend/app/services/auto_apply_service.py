@@ -29,6 +29,7 @@ from app.core.exceptions import NotFoundError, ValidationError, ServiceError
 from app.services.credit_service import CreditService
 from app.services.greenhouse_service import GreenhouseService
 from app.services.lever_service import LeverService
+from app.workers.webhook_worker import publish_webhook_event
 
 
 class AutoApplyService:
@@ -536,6 +537,20 @@ class AutoApplyService:
         self.db.commit()
         self.db.refresh(auto_apply_job)
 
+        # Only jobs posted by a company on the platform have subscribers
+        job = auto_apply_job.job
+        if job.company_id:
+            publish_webhook_event(
+                self.db,
+                job.company_id,
+                "application.created",
+                {
+                    "application_id": str(auto_apply_job.application_id),
+                    "job_id": str(job.id),
+                    "status": "applied",
+                },
+            )
+
         return AutoApplyJobResponse.model_validate(auto_apply_job)
 
     def _submit_application(self, auto_apply_job: AutoApplyJob) -> bool:
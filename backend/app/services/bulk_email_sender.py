@@ -0,0 +1,188 @@
+"""
+Bulk email sender for Resend's batch API
+
+Emails are grouped into batches of up to EMAIL_BULK_BATCH_SIZE (Resend
+accepts 100 per request) and POSTed to /emails/batch over one pooled
+``httpx.AsyncClient``. Batches are sent concurrently, up to
+EMAIL_BULK_MAX_IN_FLIGHT at a time, and paced with a token bucket at
+EMAIL_BULK_REQUESTS_PER_SECOND so a large send stays under the API key's
+rate limit. Rate-limited and 5xx responses are retried; a batch that
+still fails marks every email in it failed.
+
+Every attempt at a batch carries the same ``Idempotency-Key`` (the send's
+run id plus the batch's offset), so a retry after a timeout whose request
+Resend had already accepted does not email those recipients twice.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import settings
+from app.services.job_board_client import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Resend rejects batch requests with more emails than this
+RESEND_MAX_BATCH_SIZE = 100
+
+
+@dataclass
+class OutgoingEmail:
+    """A rendered email plus the fields its delivery log row needs"""
+
+    to_email: str
+    subject: str
+    html: str
+    text: Optional[str] = None
+    email_type: str = "transactional"
+    user_id: Optional[str] = None
+    template_name: Optional[str] = None
+
+
+@dataclass
+class SendResult:
+    """Outcome of one email within a batch"""
+
+    success: bool
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkEmailSender:
+    """Send many emails through Resend's batch endpoint concurrently"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        api_key: str,
+        from_address: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key
+        self.from_address = from_address
+        # Tests pass an httpx.MockTransport
+        self.transport = transport
+
+    async def send(self, emails: Sequence[OutgoingEmail]) -> List[SendResult]:
+        """
+        Send emails in rate-limited, concurrent batches
+
+        Args:
+            emails: Rendered emails
+
+        Returns:
+            One result per email, in order
+        """
+        batch_size = max(
+            1, min(settings.EMAIL_BULK_BATCH_SIZE, RESEND_MAX_BATCH_SIZE)
+        )
+        max_in_flight = settings.EMAIL_BULK_MAX_IN_FLIGHT
+        bucket = TokenBucket(
+            settings.EMAIL_BULK_REQUESTS_PER_SECOND, settings.EMAIL_BULK_RATE_BURST
+        )
+        slots = asyncio.Semaphore(max_in_flight)
+        results: List[Optional[SendResult]] = [None] * len(emails)
+        run_id = uuid.uuid4().hex
+
+        async with httpx.AsyncClient(
+            base_url=settings.RESEND_API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+            timeout=settings.EMAIL_BULK_TIMEOUT_SECONDS,
+            transport=self.transport,
+        ) as client:
+
+            async def send_batch(start: int):
+                batch = emails[start : start + batch_size]
+                async with slots:
+                    results[start : start + len(batch)] = await self._send_batch(
+                        client, bucket, batch, f"{run_id}-{start}"
+                    )
+
+            await asyncio.gather(
+                *(send_batch(start) for start in range(0, len(emails), batch_size))
+            )
+
+        return results
+
+    async def _send_batch(
+        self,
+        client: httpx.AsyncClient,
+        bucket: TokenBucket,
+        batch: Sequence[OutgoingEmail],
+        idempotency_key: str,
+    ) -> List[SendResult]:
+        payload = [self._payload(email) for email in batch]
+        max_retries = settings.EMAIL_BULK_MAX_RETRIES
+
+        for attempt in range(max_retries + 1):
+            await bucket.acquire()
+
+            try:
+                response = await client.post(
+                    "/emails/batch",
+                    json=payload,
+                    headers={"Idempotency-Key": idempotency_key},
+                )
+            except httpx.HTTPError as e:
+                if attempt < max_retries:
+                    await asyncio.sleep(2**attempt)
+                    continue
+                return self._failed(batch, f"Resend batch error: {str(e)}")
+
+            if response.status_code in self.RETRY_STATUSES and attempt < max_retries:
+                await asyncio.sleep(self._retry_delay(response, attempt))
+                continue
+
+            if response.status_code >= 400:
+                return self._failed(
+                    batch,
+                    f"Resend batch error: HTTP {response.status_code}: "
+                    f"{response.text[:500]}",
+                )
+
+            data = response.json().get("data") or []
+            if len(data) != len(batch):
+                logger.warning(
+                    f"Resend batch returned {len(data)} ids for {len(batch)} emails"
+                )
+            results = [
+                SendResult(success=True, message_id=item.get("id")) for item in data
+            ]
+            results.extend(
+                SendResult(success=False, error="No message id returned")
+                for _ in range(len(batch) - len(results))
+            )
+            return results[: len(batch)]
+
+    def _payload(self, email: OutgoingEmail) -> Dict[str, Any]:
+        payload = {
+            "from": self.from_address,
+            "to": [email.to_email],
+            "subject": email.subject,
+            "html": email.html,
+        }
+        if email.text:
+            payload["text"] = email.text
+        return payload
+
+    @staticmethod
+    def _failed(batch: Sequence[OutgoingEmail], error: str) -> List[SendResult]:
+        logger.error(f"{error} ({len(batch)} emails)")
+        return [SendResult(success=False, error=error) for _ in batch]
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return float(2**attempt)
@@ -3,21 +3,145 @@
 Handles CSV parsing, validation, duplicate detection, and upload session management.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO, List, Dict, Any, NamedTuple, Optional, Tuple
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert
+from sqlalchemy.orm import Session
 from datetime import datetime
 import uuid
-from difflib import SequenceMatcher
 
-from app.db.models.bulk_job_posting import BulkJobUpload, BulkUploadStatus
+from app.core.config import settings
+from app.db.models.bulk_job_posting import (
+    BulkJobUpload,
+    BulkJobUploadRow,
+    BulkUploadStatus,
+)
+from app.db.models.job import Job
 from app.schemas.bulk_job_posting import (
     CSVJobRow,
     BulkUploadCreate,
     BulkUploadStatusEnum,
+    DistributionChannelEnum,
     JobValidationError,
     DuplicateInfo,
 )
+from app.services.job_duplicate_detector import (
+    DuplicateDetector,
+    PostingKey,
+    job_similarity,
+)
+
+CSV_INT_FIELDS = ("salary_min", "salary_max")
+CSV_TEXT_FIELDS = (
+    "title",
+    "department",
+    "location",
+    "location_type",
+    "employment_type",
+    "experience_level",
+    "description",
+    "requirements",
+)
+
+
+class _DuplicateKey(NamedTuple):
+    """The fields of a CSV row that duplicate detection needs"""
+
+    title: str
+    location: Optional[str]
+    department: Optional[str]
+    experience_level: Optional[str]
+
+
+def parse_csv_row(row: Dict[str, Optional[str]]) -> CSVJobRow:
+    """
+    Parse one csv.DictReader row into a CSVJobRow.
+
+    Raises:
+        ValidationError: If a value is missing or malformed
+    """
+    data: Dict[str, Any] = {field: row.get(field) for field in CSV_TEXT_FIELDS}
+    data["title"] = data["title"] or ""
+    for field in CSV_INT_FIELDS:
+        data[field] = (row.get(field) or "").strip() or None
+    return CSVJobRow.model_validate(data)
+
+
+def _active_company_jobs(company_id: uuid.UUID):
+    """Select the fields duplicate detection compares for active company jobs"""
+    return select(
+        Job.id, Job.title, Job.location, Job.department, Job.experience_level
+    ).where(
+        and_(
+            Job.company_id == company_id,
+            Job.is_active.is_(True),
+            Job.title.isnot(None),
+        )
+    )
+
+
+def _duplicate_key(job_data: Dict[str, Any]) -> Optional[_DuplicateKey]:
+    """Comparison fields of a stored row, or None if the row did not parse"""
+    try:
+        job = CSVJobRow.model_validate(job_data)
+    except ValidationError:
+        # Unparseable rows are stored with their raw CSV values
+        return None
+    return _DuplicateKey(job.title, job.location, job.department, job.experience_level)
+
+
+def scan_upload_duplicates(
+    db: Session, upload_id: str, similarity_threshold: float = 0.85
+) -> Optional[BulkJobUpload]:
+    """
+    Detect duplicates of a streamed upload and mark it UPLOADED.
+
+    Runs in the bulk upload worker with a synchronous session: the rows are
+    read back from bulk_job_upload_rows, compared with each other and with
+    the company's active jobs, and the matches stored on the upload.
+
+    Args:
+        db: Database session
+        upload_id: Upload session ID
+        similarity_threshold: Minimum similarity score (0-1) to consider duplicate
+
+    Returns:
+        The upload, or None if it was deleted. Uploads no longer VALIDATING
+        (cancelled, or already scanned) are returned unchanged.
+    """
+    upload = db.get(BulkJobUpload, uuid.UUID(upload_id))
+    if upload is None or upload.status != BulkUploadStatus.VALIDATING:
+        return upload
+
+    jobs: List[_DuplicateKey] = []
+    row_indexes: List[int] = []
+    rows = db.execute(
+        select(BulkJobUploadRow.row_index, BulkJobUploadRow.job_data)
+        .where(BulkJobUploadRow.bulk_upload_id == upload.id)
+        .order_by(BulkJobUploadRow.row_index)
+        .execution_options(yield_per=settings.BULK_UPLOAD_CHUNK_SIZE)
+    )
+    for row_index, job_data in rows:
+        key = _duplicate_key(job_data)
+        if key is not None:
+            jobs.append(key)
+            row_indexes.append(row_index)
+
+    existing_jobs = db.execute(_active_company_jobs(upload.company_id)).all()
+    duplicate_info = BulkJobUploadService._build_duplicate_info(
+        jobs, existing_jobs, similarity_threshold, row_indexes
+    )
+
+    upload.duplicate_jobs = len(duplicate_info)
+    upload.duplicate_info = [d.model_dump() for d in duplicate_info]
+    upload.status = BulkUploadStatus.UPLOADED
+    db.commit()
+    return upload
 
 
 class BulkJobUploadService:
@@ -49,8 +173,10 @@ class BulkJobUploadService:
         # Validate jobs
         validation_result = await self.validate_jobs(upload_request.jobs_data)
 
-        # Detect duplicates
-        duplicate_info = await self.detect_duplicates(upload_request.jobs_data)
+        # Detect duplicates (within the upload and against active jobs)
+        duplicate_info = await self.detect_duplicates(
+            upload_request.jobs_data, company_id=company_id
+        )
 
         # Convert jobs_data to JSON-serializable format
         raw_jobs_data = [job.model_dump() for job in upload_request.jobs_data]
@@ -83,6 +209,215 @@ class BulkJobUploadService:
 
         return upload
 
+    async def create_upload_session_from_csv(
+        self,
+        company_id: str,
+        user_id: str,
+        csv_file: BinaryIO,
+        filename: str,
+        distribution_channels: List[DistributionChannelEnum],
+        scheduled_publish_at: Optional[datetime] = None,
+    ) -> BulkJobUpload:
+        """
+        Create a bulk upload session by streaming a CSV file.
+
+        Rows are parsed (in a worker thread) and validated one chunk at a
+        time, and each chunk is written to bulk_job_upload_rows in one
+        statement and committed with the progress counters, so memory does
+        not grow with the file. Only the first
+        BULK_UPLOAD_ERROR_PREVIEW_LIMIT errors are kept.
+
+        The upload stays VALIDATING until duplicate detection, which reads
+        the stored rows back, has run in the worker (scan_upload_duplicates).
+
+        Args:
+            company_id: ID of the company
+            user_id: ID of the user uploading
+            csv_file: Uploaded file, opened in binary mode
+            filename: Original file name
+            distribution_channels: Selected distribution channels
+            scheduled_publish_at: Optional future publish time
+
+        Returns:
+            Created BulkJobUpload instance
+
+        Raises:
+            ValueError: If the file is empty, unreadable or too large
+        """
+        chunk_size = settings.BULK_UPLOAD_CHUNK_SIZE
+        max_rows = settings.BULK_UPLOAD_MAX_ROWS
+        text_file = io.TextIOWrapper(csv_file, encoding="utf-8", newline="")
+
+        try:
+            reader = csv.DictReader(text_file, restkey="extra_columns")
+            chunk = await asyncio.to_thread(self._read_csv_chunk, reader, chunk_size)
+            if reader.fieldnames is None or "title" not in reader.fieldnames:
+                raise ValueError("Missing required CSV column: 'title'")
+            if not chunk:
+                raise ValueError("CSV file is empty or has no valid data rows")
+
+            upload_id = uuid.uuid4()
+            upload = BulkJobUpload(
+                id=upload_id,
+                company_id=uuid.UUID(company_id),
+                uploaded_by_user_id=uuid.UUID(user_id),
+                filename=filename,
+                total_jobs=0,
+                processed_jobs=0,
+                valid_jobs=0,
+                invalid_jobs=0,
+                duplicate_jobs=0,
+                status=BulkUploadStatus.VALIDATING,
+                validation_errors=[],
+                duplicate_info=[],
+                distribution_channels=[c.value for c in distribution_channels],
+                scheduled_publish_at=scheduled_publish_at,
+            )
+            self.db.add(upload)
+            await self.db.commit()
+
+            processed = valid = 0
+            error_limit = settings.BULK_UPLOAD_ERROR_PREVIEW_LIMIT
+            error_preview: List[Dict[str, Any]] = []
+
+            try:
+                while chunk:
+                    if processed + len(chunk) > max_rows:
+                        raise ValueError(f"Maximum {max_rows} jobs allowed per upload")
+
+                    rows = []
+                    for row_index, raw_row in enumerate(chunk, start=processed):
+                        job, errors = self._parse_and_validate_row(raw_row, row_index)
+                        if not errors:
+                            valid += 1
+                        if len(error_preview) < error_limit:
+                            error_preview.extend(
+                                errors[: error_limit - len(error_preview)]
+                            )
+
+                        rows.append(
+                            {
+                                "id": uuid.uuid4(),
+                                "bulk_upload_id": upload_id,
+                                "row_index": row_index,
+                                "job_data": (
+                                    job.model_dump() if job is not None else raw_row
+                                ),
+                                "is_valid": not errors,
+                                "validation_errors": errors or None,
+                            }
+                        )
+
+                    processed += len(chunk)
+                    await self.db.execute(insert(BulkJobUploadRow), rows)
+                    upload.processed_jobs = processed
+                    upload.total_jobs = processed
+                    upload.valid_jobs = valid
+                    upload.invalid_jobs = processed - valid
+                    await self.db.commit()
+
+                    chunk = await asyncio.to_thread(
+                        self._read_csv_chunk, reader, chunk_size
+                    )
+
+            except (UnicodeDecodeError, csv.Error, ValueError) as e:
+                message = self._csv_error_message(e)
+                upload.status = BulkUploadStatus.FAILED
+                upload.error_message = message
+                await self.db.commit()
+                raise ValueError(message) from e
+
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise ValueError(self._csv_error_message(e)) from e
+
+        finally:
+            # Leave closing the upload to its owner
+            text_file.detach()
+
+        upload.validation_errors = error_preview
+        await self.db.commit()
+        await self.db.refresh(upload)
+
+        return upload
+
+    @staticmethod
+    def _read_csv_chunk(
+        reader: csv.DictReader, chunk_size: int
+    ) -> List[Dict[str, Optional[str]]]:
+        return list(islice(reader, chunk_size))
+
+    @staticmethod
+    def _csv_error_message(error: Exception) -> str:
+        if isinstance(error, UnicodeDecodeError):
+            return "Invalid file encoding. Please upload UTF-8 encoded CSV"
+        if isinstance(error, csv.Error):
+            return f"Invalid CSV file: {str(error)}"
+        return str(error)
+
+    def _parse_and_validate_row(
+        self, raw_row: Dict[str, Optional[str]], row_index: int
+    ) -> Tuple[Optional[CSVJobRow], List[Dict[str, Any]]]:
+        """
+        Parse and validate one CSV row.
+
+        Returns:
+            Tuple of (parsed job or None if it did not parse, validation errors)
+        """
+        try:
+            job = parse_csv_row(raw_row)
+        except ValidationError as e:
+            return None, [
+                {
+                    "row_index": row_index,
+                    "field": ".".join(str(part) for part in error["loc"]) or "row",
+                    "error_message": error["msg"],
+                }
+                for error in e.errors()
+            ]
+
+        return job, self._validate_single_job(job, row_index)
+
+    async def list_upload_rows(
+        self,
+        upload_id: str,
+        company_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        invalid_only: bool = False,
+    ) -> List[BulkJobUploadRow]:
+        """
+        Page through the stored rows of a CSV upload.
+
+        Args:
+            upload_id: Upload session ID
+            company_id: Company ID (for authorization)
+            offset: Row index to start after (rows are ordered by row_index)
+            limit: Maximum rows to return
+            invalid_only: Only return rows with validation errors
+
+        Returns:
+            List of BulkJobUploadRow instances
+        """
+        upload = await self.get_upload_by_id(upload_id, company_id)
+        if not upload:
+            raise ValueError("Upload not found")
+
+        conditions = [
+            BulkJobUploadRow.bulk_upload_id == upload.id,
+            BulkJobUploadRow.row_index >= offset,
+        ]
+        if invalid_only:
+            conditions.append(BulkJobUploadRow.is_valid.is_(False))
+
+        query = (
+            select(BulkJobUploadRow)
+            .where(and_(*conditions))
+            .order_by(BulkJobUploadRow.row_index)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
     async def validate_job_count(self, jobs: List[CSVJobRow]) -> None:
         """
         Validate that job count is within limits.
@@ -195,36 +530,90 @@ class BulkJobUploadService:
         return errors
 
     async def detect_duplicates(
-        self, jobs: List[CSVJobRow], similarity_threshold: float = 0.85
+        self,
+        jobs: List[Any],
+        similarity_threshold: float = 0.85,
+        company_id: Optional[str] = None,
+        row_indexes: Optional[List[int]] = None,
     ) -> List[DuplicateInfo]:
         """
         Detect duplicate jobs using fuzzy string matching.
 
+        Candidate pairs are blocked by title (see job_duplicate_detector) and
+        scored in a worker thread, so large uploads don't block the event loop.
+
         Args:
-            jobs: List of job data
+            jobs: List of job data (CSVJobRow or anything with the same fields)
             similarity_threshold: Minimum similarity score (0-1) to consider duplicate
+            company_id: Also compare against this company's active jobs
+            row_indexes: Upload row index of each job (defaults to its position)
 
         Returns:
             List of duplicate information
         """
-        duplicates = []
-
-        for i in range(len(jobs)):
-            for j in range(i + 1, len(jobs)):
-                similarity = self._calculate_job_similarity(jobs[i], jobs[j])
-
-                if similarity >= similarity_threshold:
-                    duplicates.append(
-                        DuplicateInfo(
-                            row_index=j,
-                            duplicate_of=i,
-                            similarity_score=similarity,
-                            matching_fields=self._get_matching_fields(jobs[i], jobs[j]),
-                        )
-                    )
+        existing_jobs = (
+            await self._get_active_company_jobs(company_id) if company_id else []
+        )
+        return await asyncio.to_thread(
+            self._build_duplicate_info,
+            jobs,
+            existing_jobs,
+            similarity_threshold,
+            row_indexes,
+        )
+
+    @classmethod
+    def _build_duplicate_info(
+        cls,
+        jobs: List[Any],
+        existing_jobs: List[Any],
+        similarity_threshold: float = 0.85,
+        row_indexes: Optional[List[int]] = None,
+    ) -> List[DuplicateInfo]:
+        """Run the detector and describe each match (CPU-bound)"""
+        within, against = DuplicateDetector(similarity_threshold).find_duplicates(
+            [cls._posting_key(job) for job in jobs],
+            [cls._posting_key(job) for job in existing_jobs],
+        )
+
+        if row_indexes is None:
+            row_indexes = list(range(len(jobs)))
+
+        duplicates = [
+            DuplicateInfo(
+                row_index=row_indexes[pair.index],
+                duplicate_of=row_indexes[pair.duplicate_of],
+                similarity_score=pair.similarity,
+                matching_fields=cls._get_matching_fields(
+                    jobs[pair.duplicate_of], jobs[pair.index]
+                ),
+            )
+            for pair in within
+        ]
+        duplicates.extend(
+            DuplicateInfo(
+                row_index=row_indexes[pair.index],
+                existing_job_id=str(existing_jobs[pair.duplicate_of].id),
+                existing_job_title=existing_jobs[pair.duplicate_of].title,
+                similarity_score=pair.similarity,
+                matching_fields=cls._get_matching_fields(
+                    existing_jobs[pair.duplicate_of], jobs[pair.index]
+                ),
+            )
+            for pair in against
+        )
 
         return duplicates
 
+    async def _get_active_company_jobs(self, company_id: str) -> List[Any]:
+        """Load the fields duplicate detection compares for active company jobs"""
+        result = await self.db.execute(_active_company_jobs(uuid.UUID(company_id)))
+        return result.all()
+
+    @staticmethod
+    def _posting_key(job: Any) -> PostingKey:
+        return PostingKey(title=job.title, location=job.location)
+
     def _calculate_job_similarity(self, job1: CSVJobRow, job2: CSVJobRow) -> float:
         """
         Calculate similarity score between two jobs.
@@ -238,31 +627,15 @@ class BulkJobUploadService:
         Returns:
             Similarity score between 0 and 1
         """
-        # Calculate title similarity
-        title1 = job1.title.lower().strip()
-        title2 = job2.title.lower().strip()
-        title_similarity = SequenceMatcher(None, title1, title2).ratio()
-
-        # Calculate location similarity
-        location1 = (job1.location or "").lower().strip()
-        location2 = (job2.location or "").lower().strip()
-        location_similarity = (
-            SequenceMatcher(None, location1, location2).ratio()
-            if location1 and location2
-            else 0
-        )
+        return job_similarity(job1.title, job1.location, job2.title, job2.location)
 
-        # Weighted average (title is more important)
-        similarity = (title_similarity * 0.7) + (location_similarity * 0.3)
-
-        return similarity
-
-    def _get_matching_fields(self, job1: CSVJobRow, job2: CSVJobRow) -> List[str]:
+    @staticmethod
+    def _get_matching_fields(job1: Any, job2: CSVJobRow) -> List[str]:
         """
         Get list of fields that match between two jobs.
 
         Args:
-            job1: First job
+            job1: First job (an upload row or an existing job)
             job2: Second job
 
         Returns:
@@ -313,11 +686,23 @@ class BulkJobUploadService:
             upload_id: Upload session ID
             company_id: Company ID (for authorization)
             status: New status
+
+        Raises:
+            ValueError: If the upload is not found, or is still VALIDATING
+                (duplicate detection has not run) and status would move it
+                towards publishing
         """
         upload = await self.get_upload_by_id(upload_id, company_id)
         if not upload:
             raise ValueError("Upload not found")
 
+        if upload.status == BulkUploadStatus.VALIDATING and status not in (
+            BulkUploadStatusEnum.VALIDATING,
+            BulkUploadStatusEnum.FAILED,
+            BulkUploadStatusEnum.CANCELLED,
+        ):
+            raise ValueError("Upload is still being checked for duplicates")
+
         upload.status = status
         await self.db.commit()
 
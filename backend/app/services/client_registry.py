@@ -0,0 +1,136 @@
+"""
+Process-wide registry for external AI/vector clients.
+
+Pinecone and OpenAI clients are expensive to build (``pinecone.init``,
+``list_indexes``, index creation, tiktoken loading), so they are created
+once per process and shared. The API initializes them in the startup
+hook and Celery in ``worker_process_init``; anything that runs earlier
+gets them lazily on first use. Tests can swap in fakes with the
+``set_*`` helpers.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.services.local_vector_index import LocalVectorIndex
+from app.services.openai_service import OpenAIService
+from app.services.pinecone_service import PineconeService
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_openai_service: Optional[OpenAIService] = None
+_pinecone_service: Optional[PineconeService] = None
+
+
+def get_openai_service() -> OpenAIService:
+    """Get the shared OpenAIService"""
+    global _openai_service
+
+    if _openai_service is None:
+        with _lock:
+            if _openai_service is None:
+                _openai_service = OpenAIService()
+
+    return _openai_service
+
+
+def get_pinecone_service() -> PineconeService:
+    """
+    Get the shared PineconeService.
+
+    Raises:
+        ServiceError: If Pinecone cannot be initialized
+    """
+    global _pinecone_service
+
+    if _pinecone_service is None:
+        openai_service = get_openai_service()
+        with _lock:
+            if _pinecone_service is None:
+                if settings.VECTOR_STORE_BACKEND == "local":
+                    _pinecone_service = PineconeService(
+                        jobs_index=_load_local_index(
+                            settings.PINECONE_INDEX_NAME_JOBS
+                        ),
+                        users_index=_load_local_index(
+                            settings.PINECONE_INDEX_NAME_USERS
+                        ),
+                        openai_service=openai_service,
+                    )
+                else:
+                    _pinecone_service = PineconeService(
+                        openai_service=openai_service
+                    )
+
+    return _pinecone_service
+
+
+def _load_local_index(index_name: str) -> LocalVectorIndex:
+    """Open (or create) an on-disk local vector index"""
+    path = Path(settings.LOCAL_VECTOR_INDEX_DIR) / index_name
+    index = LocalVectorIndex.load(
+        str(path), dimension=settings.OPENAI_EMBEDDING_DIMENSIONS
+    )
+    logger.info(
+        f"Loaded local vector index {index_name} "
+        f"({index.describe_index_stats().total_vector_count} vectors)"
+    )
+    return index
+
+
+def save_local_indexes() -> None:
+    """
+    Persist local vector indexes (no-op for hosted Pinecone)
+
+    Each process only merges its own changes into the saved index
+    (``LocalVectorIndex.sync``), so the API, workers and scripts can all
+    save without overwriting each other's writes.
+    """
+    service = _pinecone_service
+    if service is None:
+        return
+
+    for index in (service.jobs_index, service.users_index):
+        if isinstance(index, LocalVectorIndex) and index.path:
+            index.sync()
+
+
+def set_openai_service(service: Optional[OpenAIService]) -> None:
+    """Replace the shared OpenAIService (None forces re-creation)"""
+    global _openai_service
+    _openai_service = service
+
+
+def set_pinecone_service(service: Optional[PineconeService]) -> None:
+    """Replace the shared PineconeService (None forces re-creation)"""
+    global _pinecone_service
+    _pinecone_service = service
+
+
+def init_clients() -> None:
+    """
+    Eagerly create shared clients at process startup.
+
+    Failures are logged rather than raised so the process still boots
+    when Pinecone is unreachable; the next get_* call retries.
+    """
+    try:
+        get_pinecone_service()
+        logger.info("Initialized shared Pinecone/OpenAI clients")
+    except Exception as e:
+        logger.warning(f"Deferred Pinecone client initialization: {e}")
+
+
+def reset_clients() -> None:
+    """Drop shared clients (process shutdown and tests)"""
+    try:
+        save_local_indexes()
+    except Exception as e:
+        logger.error(f"Failed to save local vector indexes: {e}")
+
+    set_pinecone_service(None)
+    set_openai_service(None)
@@ -3,15 +3,24 @@
 import uuid
 from typing import Optional, List
 from datetime import datetime
+from sqlalchemy import case, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import ValidationError
 from app.db.models.billing import CreditWallet, CreditLedger
 from app.schemas.billing import CreditTransaction, CreditWalletResponse
 
+VALID_CREDIT_TYPES = ("ai", "cover_letter", "auto_apply", "job_suggestion")
+UNLIMITED = -1
+
 
 class CreditService:
-    """Credit wallet operations"""
+    """Credit wallet operations
+
+    Balance changes are single conditional UPDATE statements relative to
+    the stored value (``x = x - :n WHERE x >= :n``), so concurrent workers
+    never lose updates and don't need row locks or read-modify-write.
+    """
 
     def __init__(self, db: Session):
         self.db = db
@@ -55,61 +64,133 @@ class CreditService:
         description: str,
         reference_id: Optional[uuid.UUID] = None,
     ) -> bool:
-        """Deduct credits from wallet"""
-        wallet = (
-            self.db.query(CreditWallet).filter(CreditWallet.user_id == user_id).first()
-        )
-
-        if not wallet:
-            raise ValidationError("Credit wallet not found")
-
-        # Validate credit type
-        valid_types = ["ai", "cover_letter", "auto_apply", "job_suggestion"]
-        if credit_type not in valid_types:
-            raise ValidationError(f"Invalid credit type: {credit_type}")
-
-        # Check balance
-        credit_field = f"{credit_type}_credits"
-        current_balance = getattr(wallet, credit_field, 0)
-
-        if current_balance == -1:  # Unlimited
-            # Log transaction but don't deduct
-            self._log_transaction(
-                user_id=user_id,
-                credit_type=credit_type,
-                amount=-amount,
-                balance_after=-1,
-                operation="deduct",
-                description=f"{description} (unlimited plan)",
-                reference_id=reference_id,
-            )
-            return True
+        """Deduct credits from wallet
+
+        The balance check and the decrement happen in one conditional
+        UPDATE. On PostgreSQL the ledger row is written by the same
+        statement (UPDATE ... RETURNING in a CTE feeding the INSERT).
+        """
+        balance = self._balance_column(credit_type)
+        charge = self._charge_statement(user_id, balance, amount)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            ledger = CreditLedger.__table__
+            charged = charge.cte("charged")
+            balance_after = self.db.execute(
+                insert(ledger)
+                .from_select(
+                    [
+                        ledger.c.id,
+                        ledger.c.user_id,
+                        ledger.c.credit_type,
+                        ledger.c.amount,
+                        ledger.c.balance_after,
+                        ledger.c.operation,
+                        ledger.c.description,
+                        ledger.c.reference_id,
+                    ],
+                    select(
+                        literal(uuid.uuid4(), ledger.c.id.type),
+                        literal(user_id, ledger.c.user_id.type),
+                        literal(credit_type),
+                        literal(-amount),
+                        charged.c.balance,
+                        literal("deduct"),
+                        case(
+                            (
+                                charged.c.balance == UNLIMITED,
+                                literal(f"{description} (unlimited plan)"),
+                            ),
+                            else_=literal(description),
+                        ),
+                        literal(reference_id, ledger.c.reference_id.type),
+                    ),
+                )
+                .returning(ledger.c.balance_after)
+            ).scalar()
+        else:
+            balance_after = self.db.execute(charge).scalar()
+            if balance_after is not None:
+                self._log_transaction(
+                    user_id=user_id,
+                    credit_type=credit_type,
+                    amount=-amount,
+                    balance_after=balance_after,
+                    operation="deduct",
+                    description=(
+                        f"{description} (unlimited plan)"
+                        if balance_after == UNLIMITED
+                        else description
+                    ),
+                    reference_id=reference_id,
+                )
+
+        if balance_after is None:
+            self._raise_not_charged(user_id, credit_type, amount)
 
-        if current_balance < amount:
-            raise ValidationError(
-                f"Insufficient {credit_type} credits. "
-                f"Required: {amount}, Available: {current_balance}"
-            )
-
-        # Deduct credits
-        new_balance = current_balance - amount
-        setattr(wallet, credit_field, new_balance)
-        wallet.total_spent += amount
-        wallet.updated_at = datetime.utcnow()
+        self.db.commit()
+        return True
 
-        # Log transaction
-        self._log_transaction(
-            user_id=user_id,
-            credit_type=credit_type,
-            amount=-amount,
-            balance_after=new_balance,
-            operation="deduct",
-            description=description,
-            reference_id=reference_id,
+    def deduct_credits_batch(
+        self,
+        user_id: uuid.UUID,
+        credit_type: str,
+        reference_ids: List[uuid.UUID],
+        description: str,
+        amount_each: int = 1,
+    ) -> int:
+        """Charge several operations (e.g. queued auto-apply jobs) at once
+
+        All-or-nothing: the wallet is decremented by the combined amount in
+        one conditional UPDATE, then one ledger row per reference is
+        inserted in a single executemany.
+
+        Returns:
+            Balance after the charge (-1 for unlimited plans)
+        """
+        if not reference_ids:
+            raise ValidationError("No operations to charge")
+
+        balance = self._balance_column(credit_type)
+        total = amount_each * len(reference_ids)
+        balance_after = self.db.execute(
+            self._charge_statement(user_id, balance, total)
+        ).scalar()
+
+        if balance_after is None:
+            self._raise_not_charged(user_id, credit_type, total)
+
+        if balance_after == UNLIMITED:
+            running_balances = [UNLIMITED] * len(reference_ids)
+            description = f"{description} (unlimited plan)"
+        else:
+            # Ledger rows show the balance after each individual charge
+            running_balances = [
+                balance_after + amount_each * (len(reference_ids) - position)
+                for position in range(1, len(reference_ids) + 1)
+            ]
+
+        self.db.execute(
+            insert(CreditLedger.__table__),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "credit_type": credit_type,
+                    "amount": -amount_each,
+                    "balance_after": running_balance,
+                    "operation": "deduct",
+                    "description": description,
+                    "reference_id": reference_id,
+                }
+                for reference_id, running_balance in zip(
+                    reference_ids, running_balances
+                )
+            ],
         )
 
         self.db.commit()
-        return True
+        return balance_after
 
     def add_credits(
         self,
@@ -120,48 +201,34 @@ class CreditService:
         reference_id: Optional[uuid.UUID] = None,
     ):
         """Add credits to wallet"""
-        wallet = (
-            self.db.query(CreditWallet).filter(CreditWallet.user_id == user_id).first()
-        )
-
-        if not wallet:
-            raise ValidationError("Credit wallet not found")
-
-        # Validate credit type
-        valid_types = ["ai", "cover_letter", "auto_apply", "job_suggestion"]
-        if credit_type not in valid_types:
-            raise ValidationError(f"Invalid credit type: {credit_type}")
-
-        credit_field = f"{credit_type}_credits"
-        current_balance = getattr(wallet, credit_field, 0)
+        balance = self._balance_column(credit_type)
+        wallets = CreditWallet.__table__
+        unlimited = balance == UNLIMITED
 
         # Don't add to unlimited balance
-        if current_balance == -1:
-            self._log_transaction(
-                user_id=user_id,
-                credit_type=credit_type,
-                amount=amount,
-                balance_after=-1,
-                operation="add",
-                description=f"{description} (unlimited plan - not applied)",
-                reference_id=reference_id,
-            )
-            return
-
-        # Add credits
-        new_balance = current_balance + amount
-        setattr(wallet, credit_field, new_balance)
-        wallet.total_earned += amount
-        wallet.updated_at = datetime.utcnow()
+        balance_after = self._update_balance(
+            user_id,
+            balance,
+            {
+                balance.name: case((unlimited, balance), else_=balance + amount),
+                "total_earned": case(
+                    (unlimited, wallets.c.total_earned),
+                    else_=wallets.c.total_earned + amount,
+                ),
+            },
+        )
 
-        # Log transaction
         self._log_transaction(
             user_id=user_id,
             credit_type=credit_type,
             amount=amount,
-            balance_after=new_balance,
+            balance_after=balance_after,
             operation="add",
-            description=description,
+            description=(
+                f"{description} (unlimited plan - not applied)"
+                if balance_after == UNLIMITED
+                else description
+            ),
             reference_id=reference_id,
         )
 
@@ -176,48 +243,35 @@ class CreditService:
         reference_id: Optional[uuid.UUID] = None,
     ):
         """Refund credits (add back with refund operation)"""
-        wallet = (
-            self.db.query(CreditWallet).filter(CreditWallet.user_id == user_id).first()
-        )
-
-        if not wallet:
-            raise ValidationError("Credit wallet not found")
-
-        # Validate credit type
-        valid_types = ["ai", "cover_letter", "auto_apply", "job_suggestion"]
-        if credit_type not in valid_types:
-            raise ValidationError(f"Invalid credit type: {credit_type}")
-
-        credit_field = f"{credit_type}_credits"
-        current_balance = getattr(wallet, credit_field, 0)
+        balance = self._balance_column(credit_type)
+        wallets = CreditWallet.__table__
+        unlimited = balance == UNLIMITED
 
         # Skip if unlimited
-        if current_balance == -1:
-            self._log_transaction(
-                user_id=user_id,
-                credit_type=credit_type,
-                amount=amount,
-                balance_after=-1,
-                operation="refund",
-                description=f"Refund: {reason} (unlimited plan - not applied)",
-                reference_id=reference_id,
-            )
-            return
-
-        # Refund credits
-        new_balance = current_balance + amount
-        setattr(wallet, credit_field, new_balance)
-        wallet.total_spent = max(0, wallet.total_spent - amount)
-        wallet.updated_at = datetime.utcnow()
+        balance_after = self._update_balance(
+            user_id,
+            balance,
+            {
+                balance.name: case((unlimited, balance), else_=balance + amount),
+                "total_spent": case(
+                    (unlimited, wallets.c.total_spent),
+                    (wallets.c.total_spent > amount, wallets.c.total_spent - amount),
+                    else_=0,
+                ),
+            },
+        )
 
-        # Log transaction
         self._log_transaction(
             user_id=user_id,
             credit_type=credit_type,
             amount=amount,
-            balance_after=new_balance,
+            balance_after=balance_after,
             operation="refund",
-            description=f"Refund: {reason}",
+            description=(
+                f"Refund: {reason} (unlimited plan - not applied)"
+                if balance_after == UNLIMITED
+                else f"Refund: {reason}"
+            ),
             reference_id=reference_id,
         )
 
@@ -261,8 +315,7 @@ class CreditService:
             return False
 
         # Validate credit type
-        valid_types = ["ai", "cover_letter", "auto_apply", "job_suggestion"]
-        if credit_type not in valid_types:
+        if credit_type not in VALID_CREDIT_TYPES:
             return False
 
         credit_field = f"{credit_type}_credits"
@@ -293,3 +346,65 @@ class CreditService:
             reference_id=reference_id,
         )
         self.db.add(ledger_entry)
+
+    def _balance_column(self, credit_type: str):
+        """Wallet column holding the balance for a credit type"""
+        if credit_type not in VALID_CREDIT_TYPES:
+            raise ValidationError(f"Invalid credit type: {credit_type}")
+        return CreditWallet.__table__.c[f"{credit_type}_credits"]
+
+    def _charge_statement(self, user_id: uuid.UUID, balance, amount: int):
+        """Conditional decrement returning the new balance
+
+        Matches no row when the wallet is missing or the balance is too
+        low; unlimited balances (-1) match and are left untouched.
+        """
+        wallets = CreditWallet.__table__
+        unlimited = balance == UNLIMITED
+
+        return (
+            update(wallets)
+            .where(wallets.c.user_id == user_id, or_(unlimited, balance >= amount))
+            .values(
+                {
+                    balance.name: case((unlimited, balance), else_=balance - amount),
+                    "total_spent": case(
+                        (unlimited, wallets.c.total_spent),
+                        else_=wallets.c.total_spent + amount,
+                    ),
+                    "updated_at": datetime.utcnow(),
+                }
+            )
+            .returning(balance.label("balance"))
+        )
+
+    def _update_balance(self, user_id: uuid.UUID, balance, values: dict) -> int:
+        """Apply a relative wallet update and return the new balance"""
+        wallets = CreditWallet.__table__
+        balance_after = self.db.execute(
+            update(wallets)
+            .where(wallets.c.user_id == user_id)
+            .values({**values, "updated_at": datetime.utcnow()})
+            .returning(balance)
+        ).scalar()
+
+        if balance_after is None:
+            raise ValidationError("Credit wallet not found")
+
+        return balance_after
+
+    def _raise_not_charged(self, user_id: uuid.UUID, credit_type: str, amount: int):
+        """Explain why a conditional charge matched no wallet row"""
+        current_balance = self.db.execute(
+            select(self._balance_column(credit_type)).where(
+                CreditWallet.user_id == user_id
+            )
+        ).scalar()
+
+        if current_balance is None:
+            raise ValidationError("Credit wallet not found")
+
+        raise ValidationError(
+            f"Insufficient {credit_type} credits. "
+            f"Required: {amount}, Available: {current_balance}"
+        )
@@ -0,0 +1,191 @@
+"""
+Short-TTL per-company cache of employer dashboard counters
+
+DashboardService caches the counters it aggregates for a company (job
+and application counts, status breakdown, top jobs). Entries expire
+after DASHBOARD_CACHE_TTL_SECONDS and are dropped as soon as a new
+application for one of the company's jobs is committed, via session
+event hooks. Redis is used when available so API replicas and workers
+share entries and invalidations; otherwise the cache is in-process.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.db.models.application import Application
+from app.db.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_SESSION_INFO_KEY = "dashboard_cache_companies"
+
+
+class DashboardCache:
+    """Per-company dashboard counters with TTL and explicit invalidation"""
+
+    PREFIX = "hireflux:dashboard:"
+
+    def __init__(self, ttl_seconds: int = 60, redis_client=None):
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._local: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, company_id: UUID) -> Optional[Dict[str, Any]]:
+        """Cached counters for the company, or None"""
+        key = self.PREFIX + str(company_id)
+
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(key)
+                return json.loads(raw) if raw else None
+            except Exception as e:
+                logger.warning(f"Redis dashboard cache unavailable: {e}")
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._local[key]
+                return None
+            return value
+
+    def set(self, company_id: UUID, value: Dict[str, Any]) -> None:
+        key = self.PREFIX + str(company_id)
+
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.ttl_seconds, json.dumps(value))
+                return
+            except Exception as e:
+                logger.warning(f"Redis dashboard cache unavailable: {e}")
+
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, company_ids: Iterable[UUID]) -> None:
+        keys = [self.PREFIX + str(company_id) for company_id in company_ids]
+        if not keys:
+            return
+
+        if self._redis is not None:
+            try:
+                self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Redis dashboard cache unavailable: {e}")
+
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all local entries"""
+        with self._lock:
+            self._local.clear()
+
+
+_cache: Optional[DashboardCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_dashboard_cache() -> DashboardCache:
+    """Get the process-wide dashboard cache"""
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DashboardCache(
+                    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+                    redis_client=get_redis_client(),
+                )
+
+    return _cache
+
+
+def set_dashboard_cache(cache: Optional[DashboardCache]) -> None:
+    """Replace the shared cache (None forces re-creation)"""
+    global _cache
+    _cache = cache
+
+
+# ----------------------------------------------------------------------
+# Invalidation on new applications
+# ----------------------------------------------------------------------
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    job_ids = {
+        obj.job_id
+        for obj in session.new
+        if isinstance(obj, Application) and obj.job_id is not None
+    }
+    if not job_ids:
+        return
+
+    # Resolve companies on the flush's own connection
+    company_ids: Set[UUID] = set(
+        session.connection()
+        .execute(
+            select(Job.company_id)
+            .where(Job.id.in_(job_ids), Job.company_id.isnot(None))
+            .distinct()
+        )
+        .scalars()
+    )
+    if company_ids:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).update(company_ids)
+
+
+def _after_commit(session: Session) -> None:
+    company_ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if not company_ids:
+        return
+
+    try:
+        get_dashboard_cache().invalidate(company_ids)
+    except Exception as e:
+        # Never fail the caller's commit; the TTL bounds staleness
+        logger.error(f"Failed to invalidate dashboard cache: {e}")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+_tracking_enabled = False
+
+
+def enable_dashboard_cache_invalidation() -> None:
+    """Drop cached dashboards when applications are committed"""
+    global _tracking_enabled
+
+    if _tracking_enabled:
+        return
+
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _tracking_enabled = True
+
+
+def disable_dashboard_cache_invalidation() -> None:
+    """Stop invalidation tracking (tests and shutdown)"""
+    global _tracking_enabled
+
+    if _tracking_enabled:
+        event.remove(Session, "after_flush", _after_flush)
+        event.remove(Session, "after_commit", _after_commit)
+        event.remove(Session, "after_rollback", _after_rollback)
+    _tracking_enabled = False
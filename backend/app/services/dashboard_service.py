@@ -4,9 +4,8 @@ Provides dashboard statistics, activity feeds, and team analytics for employers.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional
-import sqlalchemy
-from sqlalchemy import func, and_, or_, desc
+from typing import Any, Dict, List
+from sqlalchemy import case, func, and_, desc
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -14,6 +13,7 @@ from app.db.models.company import Company, CompanyMember, CompanySubscription
 from app.db.models.job import Job
 from app.db.models.application import Application
 from app.db.models.user import User
+from app.services.dashboard_cache import get_dashboard_cache
 from app.schemas.dashboard import (
     DashboardStats,
     ApplicationStatusCount,
@@ -45,113 +45,40 @@ class DashboardService:
         Raises:
             Exception: If company not found
         """
-        # Verify company exists
-        company = self.db.query(Company).filter(Company.id == company_id).first()
-        if not company:
-            raise Exception(f"Company {company_id} not found")
-
-        # Get subscription for usage tracking
-        subscription = (
-            self.db.query(CompanySubscription)
-            .filter(CompanySubscription.company_id == company_id)
+        # Verify company exists (subscription for usage tracking)
+        row = (
+            self.db.query(Company, CompanySubscription)
+            .outerjoin(
+                CompanySubscription, CompanySubscription.company_id == Company.id
+            )
+            .filter(Company.id == company_id)
             .first()
         )
+        if not row:
+            raise Exception(f"Company {company_id} not found")
+        company, subscription = row
 
-        # Job metrics
-        active_jobs_count = (
-            self.db.query(func.count(Job.id))
-            .filter(Job.company_id == company_id, Job.is_active == True)
-            .scalar()
-        ) or 0
-
-        total_jobs_count = (
-            self.db.query(func.count(Job.id))
-            .filter(Job.company_id == company_id)
-            .scalar()
-        ) or 0
-
-        # Application metrics
-        job_ids = [
-            job_id[0]
-            for job_id in self.db.query(Job.id)
-            .filter(Job.company_id == company_id)
-            .all()
-        ]
-
-        total_applications = 0
-        new_applications_today = 0
-        new_applications_this_week = 0
-
-        if job_ids:
-            total_applications = (
-                self.db.query(func.count(Application.id))
-                .filter(Application.job_id.in_(job_ids))
-                .scalar()
-            ) or 0
-
-            # Applications today
-            today_start = datetime.utcnow().replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            new_applications_today = (
-                self.db.query(func.count(Application.id))
-                .filter(
-                    Application.job_id.in_(job_ids),
-                    Application.created_at >= today_start,
-                )
-                .scalar()
-            ) or 0
-
-            # Applications this week
-            week_start = datetime.utcnow() - timedelta(days=7)
-            new_applications_this_week = (
-                self.db.query(func.count(Application.id))
-                .filter(
-                    Application.job_id.in_(job_ids),
-                    Application.created_at >= week_start,
-                )
-                .scalar()
-            ) or 0
-
-        # Pipeline breakdown by status
-        applications_by_status: List[ApplicationStatusCount] = []
-        if job_ids:
-            status_counts = (
-                self.db.query(
-                    Application.status, func.count(Application.id).label("count")
-                )
-                .filter(Application.job_id.in_(job_ids))
-                .group_by(Application.status)
-                .all()
-            )
-
-            applications_by_status = [
-                ApplicationStatusCount(status=status, count=count)
-                for status, count in status_counts
-            ]
-
-        # Top performing jobs (by application volume in last 7 days)
-        top_jobs = self._get_top_jobs(company_id, limit=5)
-
-        # Quality metrics
-        avg_time_to_first_app = self._calculate_avg_time_to_first_application(
-            company_id
-        )
+        counters = self._get_counters(company_id)
 
         # Build stats object
         stats = DashboardStats(
             # Job metrics
-            active_jobs=active_jobs_count,
-            total_jobs_posted=total_jobs_count,
+            active_jobs=counters["active_jobs"],
+            total_jobs_posted=counters["total_jobs"],
             # Application metrics
-            total_applications=total_applications,
-            new_applications_today=new_applications_today,
-            new_applications_this_week=new_applications_this_week,
+            total_applications=counters["total_applications"],
+            new_applications_today=counters["applications_today"],
+            new_applications_this_week=counters["applications_this_week"],
             # Pipeline
-            applications_by_status=applications_by_status,
-            top_jobs=top_jobs,
+            applications_by_status=[
+                ApplicationStatusCount(status=status, count=count)
+                for status, count in counters["status_counts"].items()
+            ],
+            top_jobs=[TopJob(**job) for job in counters["top_jobs"]],
             # Quality metrics
-            avg_time_to_first_application_hours=avg_time_to_first_app,
+            avg_time_to_first_application_hours=counters[
+                "avg_time_to_first_application_hours"
+            ],
             avg_candidate_quality=None,  # TODO: Implement with match scores
             # Usage tracking
             jobs_posted_this_month=(
@@ -167,70 +94,88 @@ class DashboardService:
 
         return stats
 
-    def _get_top_jobs(self, company_id: UUID, limit: int = 5) -> List[TopJob]:
-        """Get top performing jobs by application volume"""
-        # Get jobs with application counts
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        today_start = datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
+    def _get_counters(self, company_id: UUID) -> Dict[str, Any]:
+        """
+        Job and application counters for the company's dashboard.
 
-        jobs_with_counts = (
+        Served from the short-TTL dashboard cache when possible, otherwise
+        aggregated with two grouped queries (per job and per status).
+        """
+        cache = get_dashboard_cache()
+        counters = cache.get(company_id)
+        if counters is None:
+            counters = self._aggregate_counters(company_id)
+            cache.set(company_id, counters)
+        return counters
+
+    def _aggregate_counters(self, company_id: UUID) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = now - timedelta(days=7)
+
+        # Per job: volume, today's volume and first application time
+        job_rows = (
             self.db.query(
                 Job.id,
                 Job.title,
-                func.count(Application.id).label("total_applications"),
-                func.sum(
-                    func.cast(Application.created_at >= today_start, sqlalchemy.Integer)
-                ).label("new_applications_24h"),
+                Job.is_active,
+                Job.posted_date,
+                func.count(Application.id),
+                func.sum(case((Application.created_at >= today_start, 1), else_=0)),
+                func.min(Application.applied_at),
             )
             .outerjoin(Application, Application.job_id == Job.id)
-            .filter(Job.company_id == company_id, Job.is_active == True)
-            .group_by(Job.id, Job.title)
-            .order_by(desc("total_applications"))
-            .limit(limit)
+            .filter(Job.company_id == company_id)
+            .group_by(Job.id, Job.title, Job.is_active, Job.posted_date)
             .all()
         )
 
-        top_jobs = []
-        for job_id, job_title, total_apps, new_apps_24h in jobs_with_counts:
-            top_jobs.append(
-                TopJob(
-                    job_id=job_id,
-                    job_title=job_title,
-                    total_applications=total_apps or 0,
-                    new_applications_24h=new_apps_24h or 0,
-                    avg_candidate_fit=None,  # TODO: Calculate from match scores
-                )
-            )
-
-        return top_jobs
-
-    def _calculate_avg_time_to_first_application(
-        self, company_id: UUID
-    ) -> Optional[float]:
-        """Calculate average time from job posting to first application (in hours)"""
-        # Get all jobs with their first application time
-        jobs = self.db.query(Job).filter(Job.company_id == company_id).all()
-
-        time_deltas = []
-        for job in jobs:
-            first_application = (
-                self.db.query(Application)
-                .filter(Application.job_id == job.id)
-                .order_by(Application.applied_at)
-                .first()
+        # Per status: totals and recent volume
+        status_rows = (
+            self.db.query(
+                Application.status,
+                func.count(Application.id),
+                func.sum(case((Application.created_at >= today_start, 1), else_=0)),
+                func.sum(case((Application.created_at >= week_start, 1), else_=0)),
             )
+            .join(Job, Application.job_id == Job.id)
+            .filter(Job.company_id == company_id)
+            .group_by(Application.status)
+            .all()
+        )
 
-            if first_application and job.posted_date:
-                delta = first_application.applied_at - job.posted_date
-                hours = delta.total_seconds() / 3600
-                time_deltas.append(hours)
+        # Top performing active jobs by application volume
+        active_jobs = [row for row in job_rows if row[2]]
+        top_jobs = sorted(active_jobs, key=lambda row: row[4], reverse=True)[:5]
 
-        if not time_deltas:
-            return None
+        # Average time from job posting to first application (in hours)
+        hours_to_first = [
+            (first_applied_at - posted_date).total_seconds() / 3600
+            for _, _, _, posted_date, _, _, first_applied_at in job_rows
+            if posted_date and first_applied_at
+        ]
 
-        return sum(time_deltas) / len(time_deltas)
+        return {
+            "active_jobs": len(active_jobs),
+            "total_jobs": len(job_rows),
+            "total_applications": sum(row[1] for row in status_rows),
+            "applications_today": sum(row[2] or 0 for row in status_rows),
+            "applications_this_week": sum(row[3] or 0 for row in status_rows),
+            "status_counts": {row[0]: row[1] for row in status_rows},
+            "top_jobs": [
+                {
+                    "job_id": str(job_id),
+                    "job_title": title,
+                    "total_applications": total or 0,
+                    "new_applications_24h": new_today or 0,
+                    "avg_candidate_fit": None,  # TODO: Calculate from match scores
+                }
+                for job_id, title, _, _, total, new_today, _ in top_jobs
+            ],
+            "avg_time_to_first_application_hours": (
+                sum(hours_to_first) / len(hours_to_first) if hours_to_first else None
+            ),
+        }
 
     def get_pipeline_metrics(self, company_id: UUID) -> PipelineMetrics:
         """
@@ -242,59 +187,17 @@ class DashboardService:
         Returns:
             PipelineMetrics with conversion rates
         """
-        # Get all applications for company's jobs
-        job_ids = [
-            job_id[0]
-            for job_id in self.db.query(Job.id)
-            .filter(Job.company_id == company_id)
-            .all()
-        ]
-
-        if not job_ids:
-            return PipelineMetrics(
-                total_applicants=0,
-                interviewed_count=0,
-                offered_count=0,
-                hired_count=0,
-                rejected_count=0,
-                application_to_interview_rate=0.0,
-                interview_to_offer_rate=0.0,
-                offer_acceptance_rate=0.0,
-            )
+        counters = self._get_counters(company_id)
+        status_counts = counters["status_counts"]
 
         # Count applications by status
-        total_applicants = (
-            self.db.query(func.count(Application.id))
-            .filter(Application.job_id.in_(job_ids))
-            .scalar()
-        ) or 0
-
-        interviewed_count = (
-            self.db.query(func.count(Application.id))
-            .filter(Application.job_id.in_(job_ids), Application.status == "interview")
-            .scalar()
-        ) or 0
-
-        offered_count = (
-            self.db.query(func.count(Application.id))
-            .filter(
-                Application.job_id.in_(job_ids),
-                or_(Application.status == "offered", Application.status == "offer"),
-            )
-            .scalar()
-        ) or 0
-
-        hired_count = (
-            self.db.query(func.count(Application.id))
-            .filter(Application.job_id.in_(job_ids), Application.status == "hired")
-            .scalar()
-        ) or 0
-
-        rejected_count = (
-            self.db.query(func.count(Application.id))
-            .filter(Application.job_id.in_(job_ids), Application.status == "rejected")
-            .scalar()
-        ) or 0
+        total_applicants = counters["total_applications"]
+        interviewed_count = status_counts.get("interview", 0)
+        offered_count = status_counts.get("offered", 0) + status_counts.get(
+            "offer", 0
+        )
+        hired_count = status_counts.get("hired", 0)
+        rejected_count = status_counts.get("rejected", 0)
 
         # Calculate conversion rates
         application_to_interview_rate = (
@@ -3,18 +3,28 @@ Email Service - Issue #52
 Handles sending emails via Resend with template support and delivery tracking
 """
 
+import asyncio
 import re
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
 import resend
 from jinja2 import Template
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.schemas.notification import EmailSend
 from app.core.config import settings
 from app.core.exceptions import ServiceError
-from app.db.models.email_delivery import EmailDeliveryLog
+from app.db.models.email_delivery import EmailDeliveryLog, EmailDeliveryStatus
 from app.core.logging import logger
+from app.services.bulk_email_sender import BulkEmailSender, OutgoingEmail, SendResult
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> Template:
+    """Parse and compile a template source once per process"""
+    return Template(source)
 
 
 class EmailService:
@@ -321,10 +331,15 @@ class EmailService:
         self, to_email: str, user_name: str, digest_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Send weekly digest email"""
-        subject = f"📊 Your Weekly Job Search Summary - {digest_data.get('jobs_matched', 0)} New Matches"
+        return self.send_email(
+            self.build_weekly_digest_email(to_email, user_name, digest_data)
+        )
 
+    @staticmethod
+    def render_digest_top_jobs(top_jobs: List[Dict[str, Any]]) -> str:
+        """Render the top job matches block of the weekly digest"""
         top_jobs_html = ""
-        for job in digest_data.get("top_jobs", [])[:3]:
+        for job in top_jobs[:3]:
             top_jobs_html += f"""
             <div style="background: white; padding: 15px; margin: 10px 0; border-left: 4px solid #10b981; border-radius: 4px;">
                 <h3 style="margin: 0 0 5px 0;">{job['title']}</h3>
@@ -332,6 +347,30 @@ class EmailService:
                 <p style="margin: 5px 0; color: #10b981; font-weight: bold;">{job['fit']}% Match</p>
             </div>
             """
+        return top_jobs_html
+
+    def build_weekly_digest_email(
+        self,
+        to_email: str,
+        user_name: str,
+        digest_data: Dict[str, Any],
+        top_jobs_html: Optional[str] = None,
+    ) -> EmailSend:
+        """
+        Build the weekly digest email without sending it
+
+        Args:
+            to_email: Recipient email address
+            user_name: Name used in the greeting
+            digest_data: jobs_matched, applications_sent, interviews_completed,
+                top_jobs and user_id
+            top_jobs_html: Pre-rendered top jobs block, shared by recipients
+                with the same top jobs (rendered from top_jobs when None)
+        """
+        subject = f"📊 Your Weekly Job Search Summary - {digest_data.get('jobs_matched', 0)} New Matches"
+
+        if top_jobs_html is None:
+            top_jobs_html = self.render_digest_top_jobs(digest_data.get("top_jobs", []))
 
         html_body = f"""
         <!DOCTYPE html>
@@ -384,15 +423,13 @@ class EmailService:
         </html>
         """
 
-        return self.send_email(
-            EmailSend(
-                to_email=to_email,
-                subject=subject,
-                html_body=html_body,
-                text_body=f"Weekly summary: {digest_data.get('jobs_matched', 0)} jobs matched, {digest_data.get('applications_sent', 0)} applications sent",
-                email_type="weekly_digest",
-                user_id=digest_data.get("user_id"),
-            )
+        return EmailSend(
+            to_email=to_email,
+            subject=subject,
+            html_body=html_body,
+            text_body=f"Weekly summary: {digest_data.get('jobs_matched', 0)} jobs matched, {digest_data.get('applications_sent', 0)} applications sent",
+            email_type="weekly_digest",
+            user_id=digest_data.get("user_id"),
         )
 
     def send_welcome_email(
@@ -793,25 +830,105 @@ class EmailService:
 
     def send_bulk_emails(
         self,
-        recipients: List[Dict[str, str]],
+        recipients: List[Dict[str, Any]],
         subject: str,
         template_name: str,
+        email_type: str = "transactional",
         **kwargs,
     ) -> List[Dict[str, Any]]:
-        """Send emails to multiple recipients"""
-        results = []
-        for recipient in recipients:
-            result = self.send_email(
-                EmailSend(
-                    to_email=recipient["email"],
-                    subject=subject,
-                    html_body="",
-                    template_name=template_name,
-                    template_variables={"user_name": recipient["name"], **kwargs},
+        """
+        Send a templated email to many recipients via Resend's batch API
+
+        The template is compiled once and rendered per recipient with
+        user_name, the shared kwargs and the recipient's own "variables".
+
+        Args:
+            recipients: Dicts with email, name and optional user_id/variables
+            subject: Subject line for every recipient
+            template_name: Template to render
+            email_type: Type recorded on the delivery logs
+            **kwargs: Template variables shared by all recipients
+
+        Returns:
+            One result dict per recipient, in order
+        """
+        template = compile_template(self._get_template(template_name))
+        emails = [
+            OutgoingEmail(
+                to_email=recipient["email"],
+                subject=subject,
+                html=self._sanitize_html(
+                    template.render(
+                        user_name=recipient["name"],
+                        **{**kwargs, **recipient.get("variables", {})},
+                    )
+                ),
+                email_type=email_type,
+                user_id=recipient.get("user_id"),
+                template_name=template_name,
+            )
+            for recipient in recipients
+        ]
+        return self._send_batched(emails)
+
+    def send_emails(self, requests: Sequence[EmailSend]) -> List[Dict[str, Any]]:
+        """
+        Send many prepared emails via Resend's batch API
+
+        Returns:
+            One result dict per request, in order
+        """
+        emails = []
+        for request in requests:
+            html_body = request.html_body
+            if request.template_name and request.template_variables:
+                html_body = self._render_template(
+                    request.template_name, request.template_variables
                 )
+            emails.append(
+                OutgoingEmail(
+                    to_email=request.to_email,
+                    subject=request.subject,
+                    html=self._sanitize_html(html_body),
+                    text=request.text_body,
+                    email_type=request.email_type,
+                    user_id=request.user_id,
+                    template_name=request.template_name,
+                )
+            )
+        return self._send_batched(emails)
+
+    def _send_batched(self, emails: List[OutgoingEmail]) -> List[Dict[str, Any]]:
+        """Send valid addresses in batches and log every attempt in one commit"""
+        results = [
+            SendResult(success=False, error="Invalid email address") for _ in emails
+        ]
+        valid = [
+            position
+            for position, email in enumerate(emails)
+            if self._validate_email(email.to_email)
+        ]
+
+        if valid:
+            sender = BulkEmailSender(
+                settings.RESEND_API_KEY, f"{self.from_name} <{self.from_email}>"
             )
-            results.append(result)
-        return results
+            sent = asyncio.run(sender.send([emails[position] for position in valid]))
+            for position, result in zip(valid, sent):
+                results[position] = result
+            self._log_emails_sent(
+                [emails[position] for position in valid],
+                [results[position] for position in valid],
+            )
+
+        return [
+            {
+                "success": result.success,
+                "message_id": result.message_id,
+                "error": result.error,
+            }
+            for result in results
+        ]
 
     def get_delivery_status(self, message_id: str) -> Optional[str]:
         """Get email delivery status from Resend"""
@@ -823,8 +940,7 @@ class EmailService:
 
     def _render_template(self, template_name: str, variables: Dict[str, Any]) -> str:
         """Render email template with variables"""
-        template_html = self._get_template(template_name)
-        template = Template(template_html)
+        template = compile_template(self._get_template(template_name))
         return template.render(**variables)
 
     def _get_template(self, template_name: str) -> str:
@@ -900,3 +1016,53 @@ class EmailService:
             logger.error(f"Failed to log email delivery: {str(e)}")
             self.db.rollback()
             # Don't fail email send if logging fails
+
+    def _log_emails_sent(
+        self, emails: Sequence[OutgoingEmail], results: Sequence[SendResult]
+    ):
+        """
+        Log a bulk send with one multi-row insert and one commit
+
+        Failed sends are logged too, with status "failed" and the error.
+        """
+        sent_count = sum(1 for result in results if result.success)
+        if not self.db:
+            logger.info(
+                f"Bulk email sent: {sent_count} of {len(results)} emails accepted"
+            )
+            return
+
+        now = datetime.now()
+        rows = [
+            {
+                "user_id": email.user_id,
+                "to_email": email.to_email,
+                "from_email": self.from_email,
+                "subject": email.subject,
+                "email_type": email.email_type,
+                "template_name": email.template_name,
+                "message_id": result.message_id,
+                "status": (
+                    EmailDeliveryStatus.SENT.value
+                    if result.success
+                    else EmailDeliveryStatus.FAILED.value
+                ),
+                "error_message": result.error,
+                "queued_at": now,
+                "sent_at": now if result.success else None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for email, result in zip(emails, results)
+        ]
+
+        try:
+            self.db.execute(insert(EmailDeliveryLog), rows)
+            self.db.commit()
+            logger.info(
+                f"Bulk email delivery logged: {sent_count} of {len(rows)} emails sent"
+            )
+        except Exception as e:
+            logger.error(f"Failed to log bulk email delivery: {str(e)}")
+            self.db.rollback()
+            # Don't fail the send if logging fails
@@ -0,0 +1,171 @@
+"""Process-wide embedding cache with optional Redis tier"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Size-bounded LRU cache of embedding vectors with TTL.
+
+    Vectors are stored as float32 arrays (~6KB for 1536 dims instead of
+    ~50KB for a list of Python floats). When a Redis client is supplied,
+    misses fall through to Redis so API replicas and workers share
+    embeddings; Redis failures are counted and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 24 * 3600,
+        redis_client: Optional[Any] = None,
+        redis_prefix: str = "hireflux:embedding:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = redis_client
+        self.redis_prefix = redis_prefix
+
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a cached vector, checking the local tier then Redis"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+                self.expirations += 1
+
+        vector = self._redis_get(key)
+        if vector is not None:
+            self._store_local(key, vector)
+            with self._lock:
+                self.hits += 1
+                self.redis_hits += 1
+            return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, vector: Sequence[float]) -> np.ndarray:
+        """Cache a vector in both tiers and return its float32 form"""
+        array = np.asarray(vector, dtype=np.float32)
+        self._store_local(key, array)
+        self._redis_set(key, array)
+        return array
+
+    def clear(self) -> None:
+        """Drop all local entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+            self.redis_hits = self.redis_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "redis_enabled": self.redis_client is not None,
+                "redis_hits": self.redis_hits,
+                "redis_errors": self.redis_errors,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() < entry[1]
+
+    def _store_local(self, key: str, array: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (array, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _redis_get(self, key: str) -> Optional[np.ndarray]:
+        if self.redis_client is None:
+            return None
+        try:
+            raw = self.redis_client.get(self.redis_prefix + key)
+        except Exception as e:
+            self._record_redis_error(e)
+            return None
+        if not raw:
+            return None
+        return np.frombuffer(raw, dtype=np.float32)
+
+    def _redis_set(self, key: str, array: np.ndarray) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.setex(
+                self.redis_prefix + key, self.ttl_seconds, array.tobytes()
+            )
+        except Exception as e:
+            self._record_redis_error(e)
+
+    def _record_redis_error(self, error: Exception) -> None:
+        with self._lock:
+            self.redis_errors += 1
+        logger.debug(f"Embedding cache Redis tier error: {error}")
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache"""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.EMBEDDING_CACHE_TTL_HOURS * 3600,
+                    redis_client=(
+                        get_redis_client()
+                        if settings.EMBEDDING_CACHE_REDIS_ENABLED
+                        else None
+                    ),
+                )
+
+    return _embedding_cache
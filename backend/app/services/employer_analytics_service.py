@@ -19,6 +19,8 @@ from uuid import UUID
 from sqlalchemy import and_, func, case
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.exceptions import ServiceError
 from app.db.models.application import Application
 from app.db.models.analytics import (
     AnalyticsSnapshot,
@@ -28,6 +30,16 @@ from app.db.models.analytics import (
 from app.db.models.company import Company, CompanySubscription
 from app.db.models.job import Job
 from app.db.models.webhook import InterviewSchedule
+from app.services.analytics_aggregation import to_date
+from app.services.employer_analytics_snapshots import (
+    DAILY_ROLLUP_METRIC,
+    aggregate_company_days,
+    date_span,
+    day_runs,
+    empty_day_metrics,
+    merge_day_metrics,
+    missing_day_ranges,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -65,46 +77,23 @@ class EmployerAnalyticsService:
                 ...
             }
         """
-        # Get all applications for company in date range
-        applications = (
-            self.db.query(Application)
-            .join(Job, Application.job_id == Job.id)
-            .filter(
-                and_(
-                    Job.company_id == company_id,
-                    Application.created_at >= datetime.combine(start_date, datetime.min.time()),
-                    Application.created_at <= datetime.combine(end_date, datetime.max.time()),
-                )
-            )
-            .all()
-        )
-
-        if not applications:
-            return {}
+        totals = merge_day_metrics(
+            self._get_day_metrics(company_id, start_date, end_date)
+        )["sourcing"]
 
-        # Group by source
         source_metrics = {}
-        sources = set(app.source for app in applications if app.source)
-
-        for source in sources:
-            source_apps = [app for app in applications if app.source == source]
-            total_count = len(source_apps)
-
-            # Calculate average Fit Index
-            fit_indices = [app.fit_index for app in source_apps if app.fit_index is not None]
-            avg_fit = sum(fit_indices) / len(fit_indices) if fit_indices else None
-
-            # Count hires
-            hires = len([app for app in source_apps if app.status == "hired"])
-
-            # Calculate conversion rate
-            conversion_rate = hires / total_count if total_count > 0 else 0.0
-
+        for source, counters in totals.items():
+            total_count = int(counters["count"])
+            hires = int(counters["hires"])
             source_metrics[source] = {
                 "count": total_count,
-                "avg_fit": avg_fit,
+                "avg_fit": (
+                    counters["fit_sum"] / counters["fit_count"]
+                    if counters["fit_count"]
+                    else None
+                ),
                 "hires": hires,
-                "conversion_rate": conversion_rate,
+                "conversion_rate": hires / total_count if total_count > 0 else 0.0,
             }
 
         return source_metrics
@@ -156,36 +145,12 @@ class EmployerAnalyticsService:
             Dict mapping stage to drop-off rate:
             {"reviewing": 0.70, "phone_screen": 0.50}
         """
-        # Get all stage transitions for company applications
-        stage_transitions = (
-            self.db.query(ApplicationStageHistory)
-            .join(Application, ApplicationStageHistory.application_id == Application.id)
-            .join(Job, Application.job_id == Job.id)
-            .filter(Job.company_id == company_id)
-            .all()
-        )
+        totals = merge_day_metrics(self._get_day_metrics(company_id))["stage_exits"]
 
-        # Count entries and exits per stage
-        stage_stats = {}
-        for transition in stage_transitions:
-            stage = transition.from_stage
-            if stage and stage not in stage_stats:
-                stage_stats[stage] = {"entered": 0, "moved_forward": 0}
-            
-            if stage:
-                stage_stats[stage]["entered"] += 1
-            
-            # If moved to next stage (not rejected)
-            if transition.to_stage and transition.to_stage != "rejected":
-                if stage and stage in stage_stats:
-                    stage_stats[stage]["moved_forward"] += 1
-
-        # Calculate drop-off rates
         drop_off_rates = {}
-        for stage, stats in stage_stats.items():
+        for stage, stats in totals.items():
             if stats["entered"] > 0:
-                drop_off = 1 - (stats["moved_forward"] / stats["entered"])
-                drop_off_rates[stage] = drop_off
+                drop_off_rates[stage] = 1 - (stats["moved_forward"] / stats["entered"])
 
         return drop_off_rates
 
@@ -202,45 +167,13 @@ class EmployerAnalyticsService:
             Dict mapping stage to avg days:
             {"reviewing": 5.0, "phone_screen": 7.0}
         """
-        # Get stage history for company
-        stage_history = (
-            self.db.query(ApplicationStageHistory)
-            .join(Application, ApplicationStageHistory.application_id == Application.id)
-            .join(Job, Application.job_id == Job.id)
-            .filter(Job.company_id == company_id)
-            .order_by(ApplicationStageHistory.application_id, ApplicationStageHistory.changed_at)
-            .all()
-        )
-
-        # Group by application
-        app_stages = {}
-        for history in stage_history:
-            app_id = history.application_id
-            if app_id not in app_stages:
-                app_stages[app_id] = []
-            app_stages[app_id].append(history)
-
-        # Calculate time in each stage
-        stage_durations = {}
-        for app_id, stages in app_stages.items():
-            for i in range(len(stages) - 1):
-                current_stage = stages[i].to_stage
-                next_transition = stages[i + 1].changed_at
-                current_transition = stages[i].changed_at
-
-                days = (next_transition - current_transition).days
+        totals = merge_day_metrics(self._get_day_metrics(company_id))["stage_days"]
 
-                if current_stage not in stage_durations:
-                    stage_durations[current_stage] = []
-                stage_durations[current_stage].append(days)
-
-        # Calculate averages
-        avg_days = {}
-        for stage, durations in stage_durations.items():
-            if durations:
-                avg_days[stage] = sum(durations) / len(durations)
-
-        return avg_days
+        return {
+            stage: stats["days"] / stats["count"]
+            for stage, stats in totals.items()
+            if stats["count"]
+        }
 
     # =========================================================================
     # TIME METRICS
@@ -640,6 +573,103 @@ class EmployerAnalyticsService:
     # SNAPSHOT MANAGEMENT
     # =========================================================================
 
+    def _get_day_metrics(
+        self,
+        company_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Dict]:
+        """
+        Per-day counters for a date range (None start = all history).
+
+        Closed days come from daily_rollup snapshots; the current day and
+        any closed days without a snapshot are aggregated from raw rows.
+        """
+        today = datetime.utcnow().date()
+        end_date = end_date or today
+        closed_end = min(end_date, today - timedelta(days=1))
+
+        snapshot_query = self.db.query(
+            AnalyticsSnapshot.snapshot_date, AnalyticsSnapshot.metrics
+        ).filter(
+            and_(
+                AnalyticsSnapshot.company_id == company_id,
+                AnalyticsSnapshot.metric_type == DAILY_ROLLUP_METRIC,
+                AnalyticsSnapshot.snapshot_date <= closed_end,
+            )
+        )
+        if start_date is not None:
+            snapshot_query = snapshot_query.filter(
+                AnalyticsSnapshot.snapshot_date >= start_date
+            )
+        snapshots = dict(snapshot_query.all())
+
+        live_ranges = []
+        if start_date is None:
+            if snapshots:
+                first_snapshot = min(snapshots)
+                live_ranges.append((None, first_snapshot - timedelta(days=1)))
+                live_ranges += missing_day_ranges(snapshots, first_snapshot, closed_end)
+            else:
+                live_ranges.append((None, closed_end))
+        elif start_date <= closed_end:
+            live_ranges += missing_day_ranges(snapshots, start_date, closed_end)
+
+        if end_date >= today:
+            live_ranges.append((max(start_date or today, today), end_date))
+
+        day_metrics = list(snapshots.values())
+        for range_start, range_end in live_ranges:
+            day_metrics.extend(
+                aggregate_company_days(
+                    self.db, company_id, range_start, range_end
+                ).values()
+            )
+
+        return day_metrics
+
+    def _store_day_snapshots(
+        self,
+        company_id: UUID,
+        start_date: date,
+        end_date: date,
+        computed_at: datetime,
+    ) -> int:
+        """Write daily_rollup rows for every day in the range (empty days too)"""
+        aggregated = aggregate_company_days(self.db, company_id, start_date, end_date)
+        existing = {
+            snapshot.snapshot_date: snapshot
+            for snapshot in self.db.query(AnalyticsSnapshot).filter(
+                and_(
+                    AnalyticsSnapshot.company_id == company_id,
+                    AnalyticsSnapshot.metric_type == DAILY_ROLLUP_METRIC,
+                    AnalyticsSnapshot.snapshot_date >= start_date,
+                    AnalyticsSnapshot.snapshot_date <= end_date,
+                )
+            )
+        }
+
+        day = start_date
+        while day <= end_date:
+            metrics = aggregated.get(day, empty_day_metrics())
+            snapshot = existing.get(day)
+            if snapshot is None:
+                self.db.add(
+                    AnalyticsSnapshot(
+                        company_id=company_id,
+                        snapshot_date=day,
+                        metric_type=DAILY_ROLLUP_METRIC,
+                        metrics=metrics,
+                        created_at=computed_at,
+                    )
+                )
+            else:
+                snapshot.metrics = metrics
+                snapshot.created_at = computed_at
+            day += timedelta(days=1)
+
+        return (end_date - start_date).days + 1
+
     def generate_daily_snapshot(self, company_id: UUID, snapshot_date: date):
         """
         Generate and cache daily analytics snapshot.
@@ -648,25 +678,96 @@ class EmployerAnalyticsService:
             company_id: Company UUID
             snapshot_date: Date for snapshot
         """
-        # Calculate all metrics for the day
-        metrics = {
-            "sourcing": self.calculate_sourcing_metrics(
-                company_id, snapshot_date, snapshot_date
-            ),
-            "pipeline": self.calculate_pipeline_funnel(company_id=company_id),
-        }
-
-        # Create snapshot
-        snapshot = AnalyticsSnapshot(
-            company_id=company_id,
-            snapshot_date=snapshot_date,
-            metric_type="daily_aggregate",
-            metrics=metrics,
+        self._store_day_snapshots(
+            company_id, snapshot_date, snapshot_date, datetime.utcnow()
         )
-
-        self.db.add(snapshot)
         self.db.commit()
 
+    def refresh_snapshots(self, backfill_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Bring daily_rollup snapshots up to date for all companies.
+
+        Writes missing closed days within the backfill window (normally
+        just yesterday) and rebuilds closed days whose applications have
+        changed since the previous refresh, e.g. a status moved to hired.
+
+        Returns:
+            Counts of companies touched and day rows written
+        """
+        backfill_days = backfill_days or settings.ANALYTICS_SNAPSHOT_BACKFILL_DAYS
+        computed_at = datetime.utcnow()
+        today = computed_at.date()
+        yesterday = today - timedelta(days=1)
+        window_start = today - timedelta(days=backfill_days)
+
+        try:
+            last_refresh = (
+                self.db.query(func.max(AnalyticsSnapshot.created_at))
+                .filter(AnalyticsSnapshot.metric_type == DAILY_ROLLUP_METRIC)
+                .scalar()
+            )
+
+            stale_days: Dict[UUID, set] = {}
+
+            # Closed days with no snapshot yet
+            present: Dict[UUID, set] = {}
+            for company_id, snapshot_date in self.db.query(
+                AnalyticsSnapshot.company_id, AnalyticsSnapshot.snapshot_date
+            ).filter(
+                and_(
+                    AnalyticsSnapshot.metric_type == DAILY_ROLLUP_METRIC,
+                    AnalyticsSnapshot.snapshot_date >= window_start,
+                )
+            ):
+                present.setdefault(company_id, set()).add(snapshot_date)
+
+            for company_id, created_at in self.db.query(Company.id, Company.created_at):
+                first_day = max(window_start, created_at.date())
+                missing = set(date_span(first_day, yesterday)) - present.get(
+                    company_id, set()
+                )
+                if missing:
+                    stale_days.setdefault(company_id, set()).update(missing)
+
+            # Closed days whose applications changed since the last refresh
+            if last_refresh is not None:
+                created_day = func.date(Application.created_at)
+                changed = (
+                    self.db.query(Job.company_id, created_day)
+                    .join(Job, Application.job_id == Job.id)
+                    .filter(
+                        and_(
+                            Job.company_id.isnot(None),
+                            Application.updated_at >= last_refresh,
+                            Application.created_at
+                            >= datetime.combine(window_start, datetime.min.time()),
+                            Application.created_at
+                            < datetime.combine(today, datetime.min.time()),
+                        )
+                    )
+                    .distinct()
+                )
+                for company_id, day in changed:
+                    stale_days.setdefault(company_id, set()).add(to_date(day))
+
+            written = 0
+            for company_id, days in stale_days.items():
+                for range_start, range_end in day_runs(days):
+                    written += self._store_day_snapshots(
+                        company_id, range_start, range_end, computed_at
+                    )
+                self.db.commit()
+
+            logger.info(
+                f"Refreshed analytics snapshots: {len(stale_days)} companies, "
+                f"{written} days"
+            )
+            return {"companies": len(stale_days), "days": written}
+
+        except Exception as e:
+            self.db.rollback()
+            raise ServiceError(f"Failed to refresh analytics snapshots: {str(e)}")
+
     def get_cached_metrics(
         self, company_id: UUID, metric_type: str, date_range: Tuple[date, date]
     ) -> Optional[Dict[str, any]]:
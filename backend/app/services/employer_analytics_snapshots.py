@@ -0,0 +1,214 @@
+"""
+Per-day employer analytics rollups
+
+Each closed day is summarized into one ``AnalyticsSnapshot`` row per
+company (metric_type ``daily_rollup``) holding additive counters:
+
+    {
+        "sourcing": {source: {"count", "fit_sum", "fit_count", "hires"}},
+        "stage_exits": {stage: {"entered", "moved_forward"}},
+        "stage_days": {stage: {"days", "count"}},
+    }
+
+Sourcing counters are bucketed by application creation day, stage exits
+by transition day, and time-in-stage by the day the application left the
+stage. Because every counter is a sum, any date range is answered by
+adding up its day rows; EmployerAnalyticsService only aggregates raw rows
+for the current partial day and for days that have no snapshot yet.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from app.db.models.analytics import ApplicationStageHistory
+from app.db.models.application import Application
+from app.db.models.job import Job
+from app.services.analytics_aggregation import to_date
+
+DAILY_ROLLUP_METRIC = "daily_rollup"
+
+DayMetrics = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def empty_day_metrics() -> DayMetrics:
+    return {"sourcing": {}, "stage_exits": {}, "stage_days": {}}
+
+
+def merge_day_metrics(days: Iterable[DayMetrics]) -> DayMetrics:
+    """Add up per-day counters"""
+    merged = {
+        section: defaultdict(lambda: defaultdict(float))
+        for section in empty_day_metrics()
+    }
+
+    for metrics in days:
+        for section, groups in metrics.items():
+            for key, counters in groups.items():
+                for name, value in counters.items():
+                    merged[section][key][name] += value
+
+    return merged
+
+
+def date_span(start_day: date, end_day: date) -> List[date]:
+    """Days from start_day to end_day, inclusive"""
+    return [
+        start_day + timedelta(days=offset)
+        for offset in range((end_day - start_day).days + 1)
+    ]
+
+
+def day_runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Group days into contiguous [start, end] runs"""
+    runs: List[Tuple[date, date]] = []
+    for day in sorted(set(days)):
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def missing_day_ranges(
+    present: Iterable[date], start_day: date, end_day: date
+) -> List[Tuple[date, date]]:
+    """Contiguous runs of days in [start_day, end_day] not in ``present``"""
+    present = set(present)
+    return day_runs(day for day in date_span(start_day, end_day) if day not in present)
+
+
+def _day_bounds(column, start_day: Optional[date], end_day: date) -> List:
+    bounds = [column <= datetime.combine(end_day, datetime.max.time())]
+    if start_day is not None:
+        bounds.append(column >= datetime.combine(start_day, datetime.min.time()))
+    return bounds
+
+
+def aggregate_company_days(
+    db: Session,
+    company_id: UUID,
+    start_day: Optional[date],
+    end_day: date,
+) -> Dict[date, DayMetrics]:
+    """
+    Aggregate raw applications and stage transitions into per-day counters.
+
+    Args:
+        db: Database session
+        company_id: Company UUID
+        start_day: First day (None for all history)
+        end_day: Last day, inclusive
+
+    Returns:
+        Dict mapping day to counters; days without activity are omitted
+    """
+    days: Dict[date, DayMetrics] = defaultdict(empty_day_metrics)
+    company_applications = (
+        db.query(Application.id)
+        .join(Job, Application.job_id == Job.id)
+        .filter(Job.company_id == company_id)
+    )
+
+    # Sourcing, by application creation day
+    created_day = func.date(Application.created_at)
+    sourcing_rows = (
+        db.query(
+            created_day,
+            Application.source,
+            func.count(Application.id),
+            func.sum(Application.fit_index),
+            func.count(Application.fit_index),
+            func.sum(case((Application.status == "hired", 1), else_=0)),
+        )
+        .join(Job, Application.job_id == Job.id)
+        .filter(
+            and_(
+                Job.company_id == company_id,
+                Application.source.isnot(None),
+                Application.source != "",
+                *_day_bounds(Application.created_at, start_day, end_day),
+            )
+        )
+        .group_by(created_day, Application.source)
+        .all()
+    )
+    for day, source, count, fit_sum, fit_count, hires in sourcing_rows:
+        days[to_date(day)]["sourcing"][source] = {
+            "count": count,
+            "fit_sum": fit_sum or 0,
+            "fit_count": fit_count,
+            "hires": hires or 0,
+        }
+
+    # Stage exits, by transition day
+    changed_day = func.date(ApplicationStageHistory.changed_at)
+    exit_rows = (
+        db.query(
+            changed_day,
+            ApplicationStageHistory.from_stage,
+            func.count(ApplicationStageHistory.id),
+            func.sum(
+                case((ApplicationStageHistory.to_stage != "rejected", 1), else_=0)
+            ),
+        )
+        .filter(
+            and_(
+                ApplicationStageHistory.application_id.in_(company_applications),
+                ApplicationStageHistory.from_stage.isnot(None),
+                *_day_bounds(ApplicationStageHistory.changed_at, start_day, end_day),
+            )
+        )
+        .group_by(changed_day, ApplicationStageHistory.from_stage)
+        .all()
+    )
+    for day, stage, entered, moved_forward in exit_rows:
+        days[to_date(day)]["stage_exits"][stage] = {
+            "entered": entered,
+            "moved_forward": moved_forward or 0,
+        }
+
+    # Time in stage, by the day the application moved on. Only
+    # applications with a transition in the range need their history.
+    history_query = db.query(
+        ApplicationStageHistory.application_id,
+        ApplicationStageHistory.to_stage,
+        ApplicationStageHistory.changed_at,
+    ).filter(*_day_bounds(ApplicationStageHistory.changed_at, None, end_day))
+    if start_day is None:
+        history_query = history_query.filter(
+            ApplicationStageHistory.application_id.in_(company_applications)
+        )
+    else:
+        moved_in_range = db.query(ApplicationStageHistory.application_id).filter(
+            and_(
+                ApplicationStageHistory.application_id.in_(company_applications),
+                *_day_bounds(ApplicationStageHistory.changed_at, start_day, end_day),
+            )
+        )
+        history_query = history_query.filter(
+            ApplicationStageHistory.application_id.in_(moved_in_range)
+        )
+
+    previous = None
+    for application_id, to_stage, changed_at in history_query.order_by(
+        ApplicationStageHistory.application_id, ApplicationStageHistory.changed_at
+    ):
+        if (
+            previous is not None
+            and previous[0] == application_id
+            and (start_day is None or changed_at.date() >= start_day)
+        ):
+            stage = previous[1]
+            counters = days[changed_at.date()]["stage_days"].setdefault(
+                stage, {"days": 0, "count": 0}
+            )
+            counters["days"] += (changed_at - previous[2]).days
+            counters["count"] += 1
+        previous = (application_id, to_stage, changed_at)
+
+    return dict(days)
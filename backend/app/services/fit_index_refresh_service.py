@@ -0,0 +1,366 @@
+"""
+Incremental Application.fit_index refresh
+
+Session event hooks detect committed changes to the Profile and Job
+fields that feed CandidateRankingService, and mark the affected
+candidates/jobs dirty in a set (Redis when available, otherwise
+in-process). Repeated changes to the same profile or job before the
+worker runs coalesce into one entry. A background worker drains the set
+and recomputes only the applications for those keys, so employer
+pipeline views can read stored scores instead of re-ranking. If Redis is
+configured but cannot take the keys, they are handed to a fallback
+(the worker task directly, or a synchronous refresh) instead of being
+dropped.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+from app.core.redis import get_redis_client
+from app.db.models.application import Application
+from app.db.session import SessionLocal
+from app.db.models.job import Job
+from app.db.models.user import Profile
+from app.services.ranking_service import CandidateRankingService
+
+logger = logging.getLogger(__name__)
+
+# Fields read by CandidateRankingService's factor scorers
+PROFILE_FIT_FIELDS = (
+    "skills",
+    "years_experience",
+    "location",
+    "expected_salary_min",
+    "expected_salary_max",
+    "availability_status",
+    "preferred_location_type",
+)
+JOB_FIT_FIELDS = (
+    "required_skills",
+    "preferred_skills",
+    "location",
+    "location_type",
+    "experience_min_years",
+    "experience_max_years",
+    "experience_level",
+    "salary_min",
+    "salary_max",
+)
+
+_SESSION_INFO_KEY = "fit_index_dirty_keys"
+
+
+class FitIndexDirtyQueue:
+    """
+    Coalescing set of dirty keys (``job:<id>``, ``user:<id>``,
+    ``application:<id>``).
+
+    Uses a Redis set shared by API and worker processes. Without Redis
+    (single-process setups and tests) an in-process set is used instead.
+    """
+
+    KEY = "fit_index:dirty"
+    SCHEDULE_KEY = "fit_index:scheduled"
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+        self._local: Set[str] = set()
+        self._scheduled_until = 0.0
+        self._lock = threading.Lock()
+
+    def mark(self, keys: Iterable[str]) -> bool:
+        """
+        Add keys to the dirty set
+
+        Returns:
+            False if Redis is configured but the keys could not be added.
+            The worker reads only Redis, so the caller must refresh them
+            some other way.
+        """
+        keys = list(keys)
+        if not keys:
+            return True
+
+        if self._redis is not None:
+            try:
+                self._redis.sadd(self.KEY, *keys)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to queue {len(keys)} fit-index keys: {e}")
+                return False
+
+        with self._lock:
+            self._local.update(keys)
+        return True
+
+    def drain(self, limit: int) -> List[str]:
+        """Remove and return up to ``limit`` dirty keys"""
+        keys: List[str] = []
+
+        if self._redis is not None:
+            try:
+                popped = self._redis.spop(self.KEY, limit) or []
+                keys = [k.decode() if isinstance(k, bytes) else k for k in popped]
+            except Exception as e:
+                logger.warning(f"Redis fit-index queue unavailable: {e}")
+
+        with self._lock:
+            while self._local and len(keys) < limit:
+                keys.append(self._local.pop())
+
+        return keys
+
+    def pending(self) -> int:
+        """Number of dirty keys waiting"""
+        count = len(self._local)
+        if self._redis is not None:
+            try:
+                count += int(self._redis.scard(self.KEY))
+            except Exception:
+                pass
+        return count
+
+    def claim_schedule(self, ttl_seconds: int) -> bool:
+        """
+        Claim the right to schedule a refresh run.
+
+        Only the first caller within ``ttl_seconds`` gets True, so a burst
+        of commits schedules one worker run instead of one per commit.
+        """
+        if self._redis is not None:
+            try:
+                return bool(
+                    self._redis.set(self.SCHEDULE_KEY, 1, nx=True, ex=ttl_seconds)
+                )
+            except Exception as e:
+                logger.warning(f"Redis fit-index queue unavailable: {e}")
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self._scheduled_until:
+                return False
+            self._scheduled_until = now + ttl_seconds
+            return True
+
+    def release_schedule(self) -> None:
+        """Allow the next commit to schedule a run (called by the worker)"""
+        if self._redis is not None:
+            try:
+                self._redis.delete(self.SCHEDULE_KEY)
+            except Exception:
+                pass
+
+        with self._lock:
+            self._scheduled_until = 0.0
+
+
+_queue: Optional[FitIndexDirtyQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_fit_index_queue() -> FitIndexDirtyQueue:
+    """Get the process-wide dirty queue"""
+    global _queue
+
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = FitIndexDirtyQueue(get_redis_client())
+
+    return _queue
+
+
+def set_fit_index_queue(queue: Optional[FitIndexDirtyQueue]) -> None:
+    """Replace the shared queue (None forces re-creation)"""
+    global _queue
+    _queue = queue
+
+
+# ----------------------------------------------------------------------
+# Dirty tracking
+# ----------------------------------------------------------------------
+
+
+def _has_changes(obj, fields: Iterable[str]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def collect_dirty_keys(session: Session) -> Set[str]:
+    """Keys whose fit indexes are affected by the session's pending flush"""
+    keys = set()
+
+    for obj in session.dirty:
+        if isinstance(obj, Profile) and _has_changes(obj, PROFILE_FIT_FIELDS):
+            keys.add(f"user:{obj.user_id}")
+        elif isinstance(obj, Job) and _has_changes(obj, JOB_FIT_FIELDS):
+            keys.add(f"job:{obj.id}")
+
+    for obj in session.new:
+        if isinstance(obj, Profile):
+            keys.add(f"user:{obj.user_id}")
+        elif isinstance(obj, Application) and obj.fit_index is None:
+            keys.add(f"application:{obj.id}")
+
+    return keys
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    keys = collect_dirty_keys(session)
+    if keys:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).update(keys)
+
+
+def _after_commit(session: Session) -> None:
+    keys = session.info.pop(_SESSION_INFO_KEY, None)
+    if not keys:
+        return
+
+    try:
+        queue = get_fit_index_queue()
+        if not queue.mark(keys):
+            (_on_queue_failure or refresh_fit_indexes_now)(keys)
+            return
+        if _on_enqueue and queue.claim_schedule(
+            settings.FIT_INDEX_REFRESH_DELAY_SECONDS
+        ):
+            _on_enqueue()
+    except Exception as e:
+        # Never fail the caller's commit over a missed refresh
+        logger.error(f"Failed to enqueue fit-index refresh: {e}")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+_on_enqueue: Optional[Callable[[], None]] = None
+_on_queue_failure: Optional[Callable[[Set[str]], None]] = None
+_tracking_enabled = False
+
+
+def refresh_fit_indexes_now(keys: Iterable[str]) -> None:
+    """Recompute fit indexes for keys synchronously, in a new session"""
+    db = SessionLocal()
+    try:
+        updated = FitIndexRefreshService(db).refresh(keys)
+        logger.info(f"Refreshed {updated} fit indexes without the queue")
+    except Exception as e:
+        logger.error(f"Failed to refresh fit indexes without the queue: {e}")
+    finally:
+        db.close()
+
+
+def enable_fit_index_tracking(
+    on_enqueue: Optional[Callable[[], None]] = None,
+    on_queue_failure: Optional[Callable[[Set[str]], None]] = None,
+) -> None:
+    """
+    Start marking fit indexes dirty on committed Profile/Job changes.
+
+    Args:
+        on_enqueue: Called (at most once per FIT_INDEX_REFRESH_DELAY_SECONDS)
+            after keys are queued, e.g. to schedule the refresh worker
+        on_queue_failure: Called with the keys when the dirty queue cannot
+            take them (defaults to refresh_fit_indexes_now)
+    """
+    global _on_enqueue, _on_queue_failure, _tracking_enabled
+
+    _on_enqueue = on_enqueue
+    _on_queue_failure = on_queue_failure
+    if _tracking_enabled:
+        return
+
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _tracking_enabled = True
+
+
+def disable_fit_index_tracking() -> None:
+    """Stop dirty tracking (tests and shutdown)"""
+    global _on_enqueue, _on_queue_failure, _tracking_enabled
+
+    if _tracking_enabled:
+        event.remove(Session, "after_flush", _after_flush)
+        event.remove(Session, "after_commit", _after_commit)
+        event.remove(Session, "after_rollback", _after_rollback)
+    _on_enqueue = None
+    _on_queue_failure = None
+    _tracking_enabled = False
+
+
+# ----------------------------------------------------------------------
+# Refresh
+# ----------------------------------------------------------------------
+
+
+class FitIndexRefreshService:
+    """Recompute fit indexes for dirty jobs, candidates and applications"""
+
+    def __init__(self, db: Session, queue: Optional[FitIndexDirtyQueue] = None):
+        self.db = db
+        self.queue = queue or get_fit_index_queue()
+        self.ranking = CandidateRankingService(db)
+
+    def process_pending(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Drain the dirty set in batches and refresh the affected rows.
+
+        Keys from a failed batch are put back so the next run retries them.
+
+        Returns:
+            Counts of keys processed and applications updated
+        """
+        batch_size = batch_size or settings.FIT_INDEX_REFRESH_BATCH_SIZE
+        stats = {"keys": 0, "applications": 0}
+
+        while True:
+            keys = self.queue.drain(batch_size)
+            if not keys:
+                break
+
+            try:
+                stats["applications"] += self.refresh(keys)
+            except Exception as e:
+                self.db.rollback()
+                if not self.queue.mark(keys):
+                    logger.error(f"Dropped {len(keys)} fit-index keys: {keys}")
+                raise ServiceError(f"Failed to refresh fit indexes: {str(e)}")
+
+            stats["keys"] += len(keys)
+
+        if stats["keys"]:
+            logger.info(
+                f"Refreshed fit indexes: {stats['keys']} keys, "
+                f"{stats['applications']} applications"
+            )
+        return stats
+
+    def refresh(self, keys: Iterable[str]) -> int:
+        """Recompute fit indexes for the given dirty keys"""
+        ids: Dict[str, List[UUID]] = {"job": [], "user": [], "application": []}
+
+        for key in keys:
+            kind, _, raw_id = key.partition(":")
+            if kind not in ids:
+                logger.warning(f"Ignoring unknown fit-index key: {key}")
+                continue
+            try:
+                ids[kind].append(UUID(raw_id))
+            except ValueError:
+                logger.warning(f"Ignoring malformed fit-index key: {key}")
+
+        return self.ranking.refresh_fit_indexes(
+            job_ids=ids["job"],
+            user_ids=ids["user"],
+            application_ids=ids["application"],
+        )
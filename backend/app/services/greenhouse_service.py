@@ -1,13 +1,15 @@
 """Greenhouse API integration service"""
 
+import asyncio
 import requests
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.exceptions import ServiceError
+from app.services.job_board_client import AsyncBoardClient, CachedValidators
 from app.schemas.job_feed import (
     JobSource,
     JobFetchResult,
@@ -77,60 +79,108 @@ class GreenhouseService:
         Returns:
             JobFetchResult with fetched jobs and metadata
         """
-        jobs = []
-        errors = []
-
         try:
-            # Fetch departments
             departments_data = self._make_request(f"{board_token}/departments")
-            departments = [
-                GreenhouseDepartment(id=str(dept["id"]), name=dept["name"])
-                for dept in departments_data.get("departments", [])
-            ]
-
-            # Fetch offices
             offices_data = self._make_request(f"{board_token}/offices")
-            offices = [
-                GreenhouseOffice(
-                    id=str(office["id"]),
-                    name=office["name"],
-                    location=office.get("location", {}).get("name"),
-                )
-                for office in offices_data.get("offices", [])
-            ]
-
-            # Fetch jobs
-            params = {}
-            if department_id:
-                params["department_id"] = department_id
-            if office_id:
-                params["office_id"] = office_id
-
-            jobs_data = self._make_request(f"{board_token}/jobs", params=params)
-
-            for job_data in jobs_data.get("jobs", []):
-                try:
-                    job = self._parse_greenhouse_job(job_data, departments, offices)
-                    jobs.append(job)
-                except Exception as e:
-                    errors.append(f"Error parsing job {job_data.get('id')}: {str(e)}")
-
-            metadata = JobMetadata(
-                total_fetched=len(jobs),
-                new_jobs=0,  # Will be calculated during ingestion
-                updated_jobs=0,
-                failed_jobs=len(errors),
-                fetch_duration_seconds=0.0,  # Calculated externally
-                errors=errors,
+            jobs_data = self._make_request(
+                f"{board_token}/jobs",
+                params=self._jobs_params(department_id, office_id),
+            )
+
+            return self._build_fetch_result(departments_data, offices_data, jobs_data)
+
+        except Exception as e:
+            raise ServiceError(f"Failed to fetch Greenhouse jobs: {str(e)}")
+
+    async def fetch_jobs_async(
+        self,
+        http: AsyncBoardClient,
+        board_token: str,
+        department_id: Optional[str] = None,
+        office_id: Optional[str] = None,
+        conditional: bool = True,
+    ) -> Tuple[Optional[JobFetchResult], Optional[CachedValidators]]:
+        """
+        Fetch jobs from a Greenhouse job board over a shared async client
+
+        The jobs listing is requested first (conditionally, if
+        ``conditional``); departments and offices are only fetched, in
+        parallel, when the listing changed.
+
+        Returns:
+            (JobFetchResult, validators to save once the jobs are stored),
+            or (None, None) when the board is unchanged
+        """
+        try:
+            jobs_response = await http.get_json(
+                f"{self.BASE_URL}/{board_token}/jobs",
+                params=self._jobs_params(department_id, office_id),
+                conditional=conditional,
             )
+            if jobs_response.not_modified:
+                return None, None
 
-            return JobFetchResult(
-                jobs=jobs, metadata=metadata, source=JobSource.GREENHOUSE
+            departments_response, offices_response = await asyncio.gather(
+                http.get_json(f"{self.BASE_URL}/{board_token}/departments"),
+                http.get_json(f"{self.BASE_URL}/{board_token}/offices"),
             )
 
+            result = self._build_fetch_result(
+                departments_response.data, offices_response.data, jobs_response.data
+            )
+            return result, jobs_response.validators
+
         except Exception as e:
             raise ServiceError(f"Failed to fetch Greenhouse jobs: {str(e)}")
 
+    def _jobs_params(
+        self, department_id: Optional[str], office_id: Optional[str]
+    ) -> Dict:
+        params = {}
+        if department_id:
+            params["department_id"] = department_id
+        if office_id:
+            params["office_id"] = office_id
+        return params
+
+    def _build_fetch_result(
+        self, departments_data: Dict, offices_data: Dict, jobs_data: Dict
+    ) -> JobFetchResult:
+        """Parse departments, offices and jobs payloads into a fetch result"""
+        jobs = []
+        errors = []
+
+        departments = [
+            GreenhouseDepartment(id=str(dept["id"]), name=dept["name"])
+            for dept in departments_data.get("departments", [])
+        ]
+        offices = [
+            GreenhouseOffice(
+                id=str(office["id"]),
+                name=office["name"],
+                location=office.get("location", {}).get("name"),
+            )
+            for office in offices_data.get("offices", [])
+        ]
+
+        for job_data in jobs_data.get("jobs", []):
+            try:
+                job = self._parse_greenhouse_job(job_data, departments, offices)
+                jobs.append(job)
+            except Exception as e:
+                errors.append(f"Error parsing job {job_data.get('id')}: {str(e)}")
+
+        metadata = JobMetadata(
+            total_fetched=len(jobs),
+            new_jobs=0,  # Will be calculated during ingestion
+            updated_jobs=0,
+            failed_jobs=len(errors),
+            fetch_duration_seconds=0.0,  # Calculated externally
+            errors=errors,
+        )
+
+        return JobFetchResult(jobs=jobs, metadata=metadata, source=JobSource.GREENHOUSE)
+
     def _parse_greenhouse_job(
         self,
         job_data: Dict,
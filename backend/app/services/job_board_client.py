@@ -0,0 +1,268 @@
+"""
+Async HTTP client for public job board APIs (Greenhouse, Lever)
+
+One pooled ``httpx.AsyncClient`` is shared by all boards in an ingestion
+run. Requests are paced per host with token buckets, so many boards can
+be fetched concurrently without exceeding a provider's rate limit.
+Conditional requests (ETag / Last-Modified) let unchanged boards answer
+with 304 and be skipped. Validators are cached in Redis when available
+(otherwise in-process) and only stored once a board's jobs were saved.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second, bursts of ``capacity``"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One token bucket per host"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+@dataclass
+class CachedValidators:
+    """ETag / Last-Modified of a board response"""
+
+    key: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class BoardResponse:
+    """Parsed board response; ``data`` is None when not modified"""
+
+    data: Any = None
+    not_modified: bool = False
+    validators: Optional[CachedValidators] = None
+
+
+class ValidatorStore:
+    """Conditional request validators per board URL"""
+
+    PREFIX = "hireflux:job_board:validators:"
+    TTL_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+        self._local: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedValidators]:
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self.PREFIX + key)
+                return CachedValidators(key=key, **json.loads(raw)) if raw else None
+            except Exception as e:
+                logger.warning(f"Redis validator store unavailable: {e}")
+
+        with self._lock:
+            stored = self._local.get(key)
+        return CachedValidators(key=key, **stored) if stored else None
+
+    def save(self, validators: CachedValidators) -> None:
+        value = {
+            "etag": validators.etag,
+            "last_modified": validators.last_modified,
+        }
+
+        if self._redis is not None:
+            try:
+                self._redis.setex(
+                    self.PREFIX + validators.key, self.TTL_SECONDS, json.dumps(value)
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Redis validator store unavailable: {e}")
+
+        with self._lock:
+            self._local[validators.key] = value
+
+
+_validator_store: Optional[ValidatorStore] = None
+_validator_store_lock = threading.Lock()
+
+
+def get_validator_store() -> ValidatorStore:
+    """Get the process-wide validator store"""
+    global _validator_store
+
+    if _validator_store is None:
+        with _validator_store_lock:
+            if _validator_store is None:
+                _validator_store = ValidatorStore(get_redis_client())
+
+    return _validator_store
+
+
+def set_validator_store(store: Optional[ValidatorStore]) -> None:
+    """Replace the shared store (None forces re-creation)"""
+    global _validator_store
+    _validator_store = store
+
+
+class AsyncBoardClient:
+    """
+    Pooled async client for job board APIs.
+
+    Use as an async context manager; the underlying connection pool is
+    closed on exit.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        rate_per_host: Optional[float] = None,
+        burst: Optional[int] = None,
+        validator_store: Optional[ValidatorStore] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+    ):
+        self.max_connections = max_connections or settings.JOB_INGESTION_MAX_WORKERS
+        self.limiter = HostRateLimiter(
+            rate_per_host or settings.JOB_INGESTION_RATE_PER_HOST,
+            burst or settings.JOB_INGESTION_RATE_BURST,
+        )
+        self.validators = validator_store or get_validator_store()
+        self.max_retries = max_retries
+        self._transport = transport
+        self._timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncBoardClient":
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    async def get_json(
+        self, url: str, params: Optional[Dict] = None, conditional: bool = False
+    ) -> BoardResponse:
+        """
+        GET a JSON document, pacing, retrying and revalidating as needed.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            conditional: Send stored validators and return not_modified on 304
+
+        Raises:
+            ServiceError: On transport errors or non-retryable error statuses
+        """
+        key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        headers = {}
+        if conditional:
+            cached = self.validators.get(key)
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(url)
+
+            try:
+                response = await self._client.get(url, params=params, headers=headers)
+            except httpx.HTTPError as e:
+                if attempt == self.max_retries:
+                    raise ServiceError(f"Job board API error: {str(e)}")
+                await asyncio.sleep(2**attempt)
+                continue
+
+            if response.status_code == 304:
+                return BoardResponse(not_modified=True)
+
+            if (
+                response.status_code in self.RETRY_STATUSES
+                and attempt < self.max_retries
+            ):
+                await asyncio.sleep(self._retry_delay(response, attempt))
+                continue
+
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise ServiceError(f"Job board API error: {str(e)}")
+
+            validators = None
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if conditional and (etag or last_modified):
+                validators = CachedValidators(key, etag, last_modified)
+
+            return BoardResponse(data=response.json(), validators=validators)
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return float(2**attempt)
+
+    def save_validators(self, validators: Optional[CachedValidators]) -> None:
+        """Remember validators once the response was fully processed"""
+        if validators is not None:
+            self.validators.save(validators)
@@ -0,0 +1,310 @@
+"""Near-duplicate detection for job postings
+
+Scoring every pair of postings with difflib is O(n²) fuzzy comparisons.
+The detector blocks first: postings whose normalized titles collide in a
+MinHash LSH band (character 3-gram shingles), or that share the same
+normalized title, become candidate pairs. Candidates are then pruned with
+cheap upper bounds on SequenceMatcher.ratio() (length ratio, then the
+quick_ratio() character-count bound) before the full ratio is computed,
+so only plausible pairs pay for difflib. Postings with the same title
+and location are blocked and scored once.
+
+A posting is reported at most once against earlier postings and once
+against existing ones, each time with its most similar match (the
+earliest on ties). Within a group of identical postings that is the
+group's first member, so n copies of one row give n - 1 results rather
+than n * (n - 1) / 2 pairs.
+
+The score is unchanged: 0.7 * title ratio + 0.3 * location ratio, with a
+location ratio of 0 when either location is missing. At the default 0.85
+threshold a duplicate needs a title ratio of about 0.79, which keeps the
+3-gram Jaccard similarity of real duplicates well above the ~0.3 where
+the LSH bands (16 bands of 2 rows) start to miss pairs.
+"""
+
+import hashlib
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+TITLE_WEIGHT = 0.7
+LOCATION_WEIGHT = 0.3
+
+SHINGLE_SIZE = 3
+LSH_BANDS = 16
+LSH_ROWS = 2
+
+# Every shingle gets one 16-bit hash per MinHash "permutation", all taken
+# from a single 64-byte BLAKE2b digest
+_HASH_FORMAT = f"<{LSH_BANDS * LSH_ROWS}H"
+_HASH_BYTES = struct.calcsize(_HASH_FORMAT)
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+@dataclass
+class PostingKey:
+    """The fields a posting is compared on"""
+
+    title: str
+    location: Optional[str] = None
+
+
+@dataclass
+class DuplicatePair:
+    """A later posting that duplicates an earlier one"""
+
+    index: int
+    duplicate_of: int
+    similarity: float
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase and collapse punctuation/whitespace for blocking"""
+    return " ".join(_NON_WORD.sub(" ", title.lower()).split())
+
+
+def title_shingles(title: str) -> Set[str]:
+    """Character shingles of the normalized title (padded for short words)"""
+    padded = f" {normalize_title(title)} "
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {
+        padded[i : i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)
+    }
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> Tuple[int, ...]:
+    digest = hashlib.blake2b(shingle.encode(), digest_size=_HASH_BYTES).digest()
+    return struct.unpack(_HASH_FORMAT, digest)
+
+
+def minhash_signature(shingles: Set[str]) -> List[int]:
+    """MinHash signature: the per-position minimum over the shingle hashes"""
+    return list(map(min, zip(*map(_shingle_hashes, shingles))))
+
+
+def job_similarity(
+    title1: str,
+    location1: Optional[str],
+    title2: str,
+    location2: Optional[str],
+) -> float:
+    """Weighted fuzzy similarity of two postings (title counts 70%)"""
+    title_similarity = SequenceMatcher(
+        None, title1.lower().strip(), title2.lower().strip()
+    ).ratio()
+
+    location1 = (location1 or "").lower().strip()
+    location2 = (location2 or "").lower().strip()
+    location_similarity = (
+        SequenceMatcher(None, location1, location2).ratio()
+        if location1 and location2
+        else 0
+    )
+
+    return (title_similarity * TITLE_WEIGHT) + (location_similarity * LOCATION_WEIGHT)
+
+
+# Slack so float rounding in a bound never prunes a pair exactly at threshold
+_BOUND_EPSILON = 1e-9
+
+
+def _length_bound(a: str, b: str) -> float:
+    """Upper bound of SequenceMatcher(None, a, b).ratio()"""
+    total = len(a) + len(b)
+    return 2.0 * min(len(a), len(b)) / total if total else 1.0
+
+
+class DuplicateDetector:
+    """Find near-duplicate postings without scoring every pair"""
+
+    def __init__(self, similarity_threshold: float = 0.85):
+        self.similarity_threshold = similarity_threshold
+
+    def find_duplicates(
+        self,
+        postings: Sequence[PostingKey],
+        existing: Sequence[PostingKey] = (),
+    ) -> Tuple[List[DuplicatePair], List[DuplicatePair]]:
+        """
+        Find duplicates within postings and against existing postings
+
+        Args:
+            postings: New postings (e.g. CSV rows), in upload order
+            existing: Postings already published; never compared to each other
+
+        Returns:
+            Tuple of (pairs within postings, pairs against existing), each
+            ordered by index with at most one pair per posting: its most
+            similar earlier posting or most similar existing posting. For
+            the latter, duplicate_of indexes into existing.
+        """
+        new_count = len(postings)
+
+        # Postings with the same title and location score the same against
+        # everything, so block and score each distinct (title, location) once
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, posting in enumerate(list(postings) + list(existing)):
+            key = (posting.title.lower().strip(), (posting.location or "").lower().strip())
+            groups.setdefault(key, []).append(index)
+
+        # Without a location the score tops out at TITLE_WEIGHT
+        if self.similarity_threshold > TITLE_WEIGHT:
+            groups = {key: members for key, members in groups.items() if key[1]}
+
+        keys = list(groups)
+        # Groups are in order of first appearance, so new postings come first
+        new_keys = sum(1 for members in groups.values() if members[0] < new_count)
+
+        scored = [(a, a) for a in range(new_keys) if len(groups[keys[a]]) > 1]
+        scored.extend(self._candidate_pairs(keys, new_keys))
+        char_counts = [Counter(title) for title, _ in keys]
+
+        # Best (similarity, earlier index) per posting, within and against
+        best: List[Dict[int, Tuple[float, int]]] = [{}, {}]
+        for a, b in scored:
+            similarity = self._score(keys[a], keys[b], char_counts[a], char_counts[b])
+            if similarity is None:
+                continue
+            for i, j in self._member_matches(
+                groups[keys[a]], groups[keys[b]], a == b, new_count
+            ):
+                matches = best[j >= new_count]
+                current = matches.get(i)
+                if current is None or (similarity, -j) > (current[0], -current[1]):
+                    matches[i] = (similarity, j)
+
+        within = [
+            DuplicatePair(i, j, similarity)
+            for i, (similarity, j) in sorted(best[0].items())
+        ]
+        against = [
+            DuplicatePair(i, j - new_count, similarity)
+            for i, (similarity, j) in sorted(best[1].items())
+        ]
+        return within, against
+
+    @staticmethod
+    def _member_matches(
+        first: List[int], second: List[int], same_group: bool, new_count: int
+    ):
+        """
+        (i, j) pairs of a new posting i and the earliest posting j of the
+        other group it can duplicate: an earlier new one or an existing one
+
+        Members of a group score the same, so only the earliest can be
+        reported and each new member is paired at most twice per group.
+        """
+        if same_group:
+            new_members = first[: bisect_left(first, new_count)]
+            for i in new_members[1:]:
+                yield i, new_members[0]
+            if len(new_members) < len(first):
+                for i in new_members:
+                    yield i, first[len(new_members)]
+            return
+
+        for members, other in ((first, second), (second, first)):
+            first_existing = bisect_left(other, new_count)
+            for i in members:
+                if i >= new_count:
+                    break
+                if first_existing and other[0] < i:
+                    yield i, other[0]
+                if first_existing < len(other):
+                    yield i, other[first_existing]
+
+    def _candidate_pairs(
+        self, keys: List[Tuple[str, str]], new_keys: int
+    ) -> Set[Tuple[int, int]]:
+        """(a, b) key pairs with a < b sharing a title key or an LSH band"""
+        pairs: Set[Tuple[int, int]] = set()
+        self._add_bucket_pairs(
+            (normalize_title(title) for title, _ in keys), new_keys, pairs
+        )
+
+        # Signatures are kept compactly and bucketed one band at a time, so
+        # large uploads hold one band's buckets at once
+        width = LSH_BANDS * LSH_ROWS
+        signatures = array("H")
+        for title, _ in keys:
+            signatures.extend(minhash_signature(title_shingles(title)))
+
+        for band in range(LSH_BANDS):
+            offset = band * LSH_ROWS
+            self._add_bucket_pairs(
+                (
+                    tuple(signatures[start : start + LSH_ROWS])
+                    for start in range(offset, len(signatures), width)
+                ),
+                new_keys,
+                pairs,
+            )
+        return pairs
+
+    @staticmethod
+    def _add_bucket_pairs(
+        bucket_keys: Iterable[Hashable],
+        new_keys: int,
+        pairs: Set[Tuple[int, int]],
+    ) -> None:
+        buckets: Dict[Hashable, List[int]] = {}
+        for index, bucket_key in enumerate(bucket_keys):
+            buckets.setdefault(bucket_key, []).append(index)
+
+        for members in buckets.values():
+            for position, a in enumerate(members[:-1]):
+                if a >= new_keys:
+                    # Indexes are ascending, so the rest are existing only
+                    break
+                for b in members[position + 1 :]:
+                    pairs.add((a, b))
+
+    def _score(
+        self,
+        first: Tuple[str, str],
+        second: Tuple[str, str],
+        first_chars: Counter,
+        second_chars: Counter,
+    ) -> Optional[float]:
+        """Similarity of two (title, location) keys, or None below threshold"""
+        threshold = self.similarity_threshold - _BOUND_EPSILON
+        (title1, location1), (title2, location2) = first, second
+
+        location_bound = (
+            _length_bound(location1, location2) if location1 and location2 else 0
+        )
+        bound = TITLE_WEIGHT * _length_bound(title1, title2)
+        if bound + LOCATION_WEIGHT * location_bound < threshold:
+            return None
+
+        # SequenceMatcher.quick_ratio() from precomputed character counts
+        if len(second_chars) < len(first_chars):
+            first_chars, second_chars = second_chars, first_chars
+        common = sum(
+            min(count, second_chars[char])
+            for char, count in first_chars.items()
+            if char in second_chars
+        )
+        total = len(title1) + len(title2)
+        bound = TITLE_WEIGHT * (2.0 * common / total if total else 1.0)
+        if bound + LOCATION_WEIGHT * location_bound < threshold:
+            return None
+
+        location_similarity = (
+            SequenceMatcher(None, location1, location2).ratio()
+            if location1 and location2
+            else 0
+        )
+        similarity = (
+            SequenceMatcher(None, title1, title2).ratio() * TITLE_WEIGHT
+        ) + (location_similarity * LOCATION_WEIGHT)
+        return similarity if similarity >= self.similarity_threshold else None
@@ -1,43 +1,113 @@
 """Job ingestion orchestration service"""
 
+import asyncio
+import hashlib
+import json
 import uuid
-from typing import List, Dict, Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.db.models.job import Job, JobSource as JobSourceModel
+from app.core.config import settings
 from app.services.greenhouse_service import GreenhouseService
+from app.services.job_board_client import (
+    AsyncBoardClient,
+    CachedValidators,
+    get_validator_store,
+)
 from app.services.lever_service import LeverService
 from app.services.job_normalization_service import JobNormalizationService
-from app.services.pinecone_service import PineconeService
+from app.services.client_registry import get_pinecone_service
+from app.services.pinecone_service import build_job_index_payload
 from app.core.exceptions import ServiceError
 from app.schemas.job_feed import (
     JobSource,
     JobIngestionRequest,
     JobIngestionResult,
+    JobFetchResult,
     JobMetadata,
     NormalizedJob,
 )
 
 
+# Columns written by ingestion, in hash order (everything except identity,
+# timestamps and is_active)
+INGESTED_COLUMNS = (
+    "title",
+    "company",
+    "description",
+    "location",
+    "location_type",
+    "required_skills",
+    "preferred_skills",
+    "experience_requirement",
+    "experience_min_years",
+    "experience_max_years",
+    "experience_level",
+    "salary_min",
+    "salary_max",
+    "department",
+    "employment_type",
+    "requires_visa_sponsorship",
+    "external_url",
+    "posted_date",
+)
+
+
+def job_content_hash(row: Dict[str, Any]) -> str:
+    """SHA-256 over the ingested columns of a job row"""
+    payload = json.dumps(
+        [row.get(column) for column in INGESTED_COLUMNS], default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class SourceFetch:
+    """Outcome of fetching one configured source"""
+
+    source_config: Any
+    result: Optional[JobFetchResult] = None
+    validators: Optional[CachedValidators] = None
+    error: Optional[str] = None
+
+    @property
+    def skipped(self) -> bool:
+        """Board unchanged since the last run (or an unsupported source)"""
+        return self.error is None and self.result is None
+
+
 class JobIngestionService:
     """
     Orchestrates job ingestion from multiple sources.
     Handles fetching, normalization, deduplication, and vector indexing.
     """
 
+    SAVE_BATCH_SIZE = 500  # Jobs per upsert statement / commit
+
     def __init__(self, db: Session):
         self.db = db
         self.greenhouse = GreenhouseService(db)
         self.lever = LeverService(db)
         self.normalizer = JobNormalizationService()
-        self.pinecone = PineconeService()
+        self.pinecone = get_pinecone_service()
+        self.validators = get_validator_store()
 
     def ingest_jobs(self, request: JobIngestionRequest) -> JobIngestionResult:
         """
         Ingest jobs from specified sources
 
+        Sources are fetched concurrently over one pooled HTTP client (see
+        ``_fetch_sources``); boards unchanged since the last run are skipped
+        when ``request.incremental`` is set. Must be called from
+        synchronous code (Celery tasks, scripts).
+
         Args:
             request: Ingestion configuration
 
@@ -48,39 +118,63 @@ class JobIngestionService:
         all_jobs = []
         errors = []
 
-        # Fetch from each source
-        if request.sources:
-            for source_config in request.sources:
-                try:
-                    if source_config.source == JobSource.GREENHOUSE:
-                        jobs = self._ingest_from_greenhouse(source_config)
-                        all_jobs.extend(jobs)
-                    elif source_config.source == JobSource.LEVER:
-                        jobs = self._ingest_from_lever(source_config)
-                        all_jobs.extend(jobs)
-                except Exception as e:
-                    errors.append(
-                        f"Error ingesting from {source_config.source.value}: {str(e)}"
-                    )
+        fetches = asyncio.run(
+            self._fetch_sources(request.sources or [], conditional=request.incremental)
+        )
+
+        # Jobs are saved in source order; each job remembers its source so a
+        # board's validators are only kept if all of its jobs were saved
+        job_fetches: List[SourceFetch] = []
+        for fetch in fetches:
+            if fetch.error is not None:
+                errors.append(
+                    f"Error ingesting from {fetch.source_config.source.value}: "
+                    f"{fetch.error}"
+                )
+                continue
+            if fetch.skipped:
+                continue
+
+            normalized_jobs = self._normalize_fetch_result(
+                fetch.source_config, fetch.result
+            )
+            all_jobs.extend(normalized_jobs)
+            job_fetches.extend([fetch] * len(normalized_jobs))
 
         # Process and save jobs
         new_count = 0
         updated_count = 0
         skipped_count = 0
 
-        for normalized_job in all_jobs:
+        # New/updated jobs are indexed together after saving so embeddings
+        # and upserts are batched across the whole run
+        jobs_to_index: List[Job] = []
+        failed_fetches = set()
+
+        for start in range(0, len(all_jobs), self.SAVE_BATCH_SIZE):
+            batch = all_jobs[start : start + self.SAVE_BATCH_SIZE]
             try:
-                result = self._save_or_update_job(normalized_job)
-                if result == "new":
-                    new_count += 1
-                elif result == "updated":
-                    updated_count += 1
-                else:
-                    skipped_count += 1
-            except Exception as e:
-                errors.append(
-                    f"Error saving job {normalized_job.external_id}: {str(e)}"
-                )
+                outcomes, saved_jobs = self._save_jobs_batch(batch)
+            except Exception:
+                # Isolate the bad rows so the rest of the batch is still saved
+                outcomes, saved_jobs, row_errors = self._save_jobs_row_by_row(batch)
+                for position, error in row_errors.items():
+                    failed_fetches.add(id(job_fetches[start + position]))
+                    errors.append(
+                        f"Error saving job {batch[position].external_id}: {error}"
+                    )
+
+            jobs_to_index.extend(saved_jobs)
+            new_count += outcomes.count("new")
+            updated_count += outcomes.count("updated")
+            skipped_count += outcomes.count("skipped")
+
+        self._index_jobs_in_pinecone(jobs_to_index)
+
+        # Only now is it safe to answer this board's next fetch with a 304
+        for fetch in fetches:
+            if fetch.validators is not None and id(fetch) not in failed_fetches:
+                self.validators.save(fetch.validators)
 
         duration = (datetime.utcnow() - start_time).total_seconds()
 
@@ -103,6 +197,87 @@ class JobIngestionService:
             error_messages=errors,
         )
 
+    async def _fetch_sources(
+        self, sources: List[Any], conditional: bool = True
+    ) -> List[SourceFetch]:
+        """
+        Fetch all sources concurrently with a bounded pool of workers
+
+        At most JOB_INGESTION_MAX_WORKERS boards are in flight at once, and
+        requests to each API host are paced by the client's token buckets.
+        Results are returned in the order of ``sources``.
+        """
+        fetches = [SourceFetch(source_config=config) for config in sources]
+        if not fetches:
+            return fetches
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for fetch in fetches:
+            queue.put_nowait(fetch)
+
+        async with AsyncBoardClient(validator_store=self.validators) as http:
+
+            async def worker():
+                while True:
+                    try:
+                        fetch = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    await self._fetch_source(http, fetch, conditional)
+
+            workers = min(settings.JOB_INGESTION_MAX_WORKERS, len(fetches))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+
+        return fetches
+
+    async def _fetch_source(
+        self, http: AsyncBoardClient, fetch: SourceFetch, conditional: bool
+    ) -> None:
+        """Fetch one source, recording the result or error on ``fetch``"""
+        source_config = fetch.source_config
+
+        try:
+            if source_config.source == JobSource.GREENHOUSE:
+                board_token = source_config.config.get("board_token")
+                if not board_token:
+                    raise ServiceError("board_token required for Greenhouse source")
+
+                fetch.result, fetch.validators = await (
+                    self.greenhouse.fetch_jobs_async(
+                        http,
+                        board_token=board_token,
+                        department_id=source_config.config.get("department_id"),
+                        office_id=source_config.config.get("office_id"),
+                        conditional=conditional,
+                    )
+                )
+            elif source_config.source == JobSource.LEVER:
+                company_site = source_config.config.get("company_site")
+                if not company_site:
+                    raise ServiceError("company_site required for Lever source")
+
+                fetch.result, fetch.validators = await self.lever.fetch_jobs_async(
+                    http,
+                    company_site=company_site,
+                    team=source_config.config.get("team"),
+                    location=source_config.config.get("location"),
+                    commitment=source_config.config.get("commitment"),
+                    conditional=conditional,
+                )
+        except Exception as e:
+            fetch.error = str(e)
+
+    def _normalize_fetch_result(
+        self, source_config, result: JobFetchResult
+    ) -> List[NormalizedJob]:
+        company_name = source_config.config.get("company_name", "Unknown")
+
+        if source_config.source == JobSource.GREENHOUSE:
+            return self._normalize_greenhouse_jobs(result, company_name)
+        if source_config.source == JobSource.LEVER:
+            return self._normalize_lever_jobs(result, company_name)
+        return []
+
     def _ingest_from_greenhouse(self, source_config) -> List[NormalizedJob]:
         """Fetch and normalize jobs from Greenhouse"""
 
@@ -119,7 +294,11 @@ class JobIngestionService:
             office_id=source_config.config.get("office_id"),
         )
 
-        # Normalize jobs
+        return self._normalize_greenhouse_jobs(result, company_name)
+
+    def _normalize_greenhouse_jobs(
+        self, result: JobFetchResult, company_name: str
+    ) -> List[NormalizedJob]:
         normalized_jobs = []
         for gh_job in result.jobs:
             try:
@@ -149,7 +328,11 @@ class JobIngestionService:
             commitment=source_config.config.get("commitment"),
         )
 
-        # Normalize jobs
+        return self._normalize_lever_jobs(result, company_name)
+
+    def _normalize_lever_jobs(
+        self, result: JobFetchResult, company_name: str
+    ) -> List[NormalizedJob]:
         normalized_jobs = []
         for lever_job in result.jobs:
             try:
@@ -162,157 +345,193 @@ class JobIngestionService:
 
         return normalized_jobs
 
-    def _save_or_update_job(self, normalized_job: NormalizedJob) -> str:
+    def _save_jobs_batch(
+        self, normalized_jobs: List[NormalizedJob]
+    ) -> Tuple[List[str], List[Job]]:
         """
-        Save new job or update existing job
+        Save a batch of jobs with one lookup, one upsert and one commit
+
+        Existing (source, external_id, content_hash) tuples for the batch
+        are loaded in a single query. New jobs and jobs whose content hash
+        changed are written with INSERT ... ON CONFLICT DO UPDATE; unchanged
+        jobs are not touched. If a job appears twice, the last one wins.
 
         Returns:
-            "new", "updated", or "skipped"
+            ("new" | "updated" | "skipped" per input job, saved Job rows to
+            re-index)
+        """
+        try:
+            outcomes, saved_jobs = self._upsert_jobs(normalized_jobs)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return outcomes, saved_jobs
+
+    def _save_jobs_row_by_row(
+        self, normalized_jobs: List[NormalizedJob]
+    ) -> Tuple[List[str], List[Job], Dict[int, str]]:
         """
+        Save jobs one at a time, each in its own savepoint, then commit once
 
-        # Check if job already exists
-        existing_job = (
-            self.db.query(Job)
+        Used after a batch fails, so one bad row only fails itself.
+
+        Returns:
+            (outcome per input job, "failed" for errors; saved Job rows;
+            error message by position)
+        """
+        outcomes: List[str] = []
+        saved_jobs: List[Job] = []
+        errors: Dict[int, str] = {}
+
+        for position, normalized_job in enumerate(normalized_jobs):
+            try:
+                with self.db.begin_nested():
+                    (outcome,), saved = self._upsert_jobs([normalized_job])
+            except Exception as e:
+                outcomes.append("failed")
+                errors[position] = str(e)
+                continue
+
+            outcomes.append(outcome)
+            saved_jobs.extend(saved)
+
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            return (
+                ["failed"] * len(normalized_jobs),
+                [],
+                {position: str(e) for position in range(len(normalized_jobs))},
+            )
+
+        return outcomes, saved_jobs, errors
+
+    def _upsert_jobs(
+        self, normalized_jobs: List[NormalizedJob]
+    ) -> Tuple[List[str], List[Job]]:
+        """Look up and upsert jobs without committing (see _save_jobs_batch)"""
+        rows = [self._job_row(normalized_job) for normalized_job in normalized_jobs]
+
+        ids_by_source = defaultdict(set)
+        for row in rows:
+            ids_by_source[row["source"]].add(row["external_id"])
+
+        existing_hashes = {
+            (source, external_id): content_hash
+            for source, external_id, content_hash in self.db.query(
+                Job.source, Job.external_id, Job.content_hash
+            )
             .filter(
-                and_(
-                    Job.external_id == normalized_job.external_id,
-                    Job.source == normalized_job.source.value,
+                or_(
+                    *(
+                        and_(Job.source == source, Job.external_id.in_(external_ids))
+                        for source, external_ids in ids_by_source.items()
+                    )
                 )
             )
-            .first()
-        )
+            .all()
+        }
 
-        if existing_job:
-            # Check if job needs updating (compare description hash or updated_at)
-            if self._job_needs_update(existing_job, normalized_job):
-                self._update_job(existing_job, normalized_job)
-                return "updated"
+        latest = {(row["source"], row["external_id"]): i for i, row in enumerate(rows)}
+
+        outcomes = ["skipped"] * len(rows)
+        rows_to_write = []
+        for key, position in latest.items():
+            row = rows[position]
+            if key not in existing_hashes:
+                outcomes[position] = "new"
+            elif existing_hashes[key] != row["content_hash"]:
+                outcomes[position] = "updated"
             else:
-                return "skipped"
-        else:
-            # Create new job
-            self._create_job(normalized_job)
-            return "new"
-
-    def _job_needs_update(
-        self, existing_job: Job, normalized_job: NormalizedJob
-    ) -> bool:
-        """Check if existing job needs updating"""
-
-        # Compare key fields
-        if existing_job.title != normalized_job.title:
-            return True
-        if existing_job.description != normalized_job.description:
-            return True
-        if existing_job.location != normalized_job.location:
-            return True
-
-        # Check if posted date changed
-        if normalized_job.posted_date and existing_job.posted_date:
-            if normalized_job.posted_date > existing_job.posted_date:
-                return True
-
-        return False
-
-    def _create_job(self, normalized_job: NormalizedJob):
-        """Create new job in database and index in Pinecone"""
-
-        job = Job(
-            id=uuid.uuid4(),
-            source=normalized_job.source.value,
-            external_id=normalized_job.external_id,
-            title=normalized_job.title,
-            company=normalized_job.company,
-            description=normalized_job.description,
-            location=normalized_job.location,
-            location_type=normalized_job.location_type,
-            required_skills=normalized_job.required_skills,
-            preferred_skills=normalized_job.preferred_skills,
-            experience_requirement=normalized_job.experience_requirement,
-            experience_min_years=normalized_job.experience_min_years,
-            experience_max_years=normalized_job.experience_max_years,
-            experience_level=normalized_job.experience_level,
-            salary_min=(
+                continue
+            rows_to_write.append(row)
+
+        if not rows_to_write:
+            return outcomes, []
+
+        saved_jobs = self.db.scalars(
+            self._upsert_statement(rows_to_write),
+            execution_options={"populate_existing": True},
+        ).all()
+        return outcomes, saved_jobs
+
+    def _job_row(self, normalized_job: NormalizedJob) -> Dict[str, Any]:
+        """Column values for a normalized job, including its content hash"""
+        row = {
+            "id": uuid.uuid4(),
+            "source": normalized_job.source.value,
+            "external_id": normalized_job.external_id,
+            "title": normalized_job.title,
+            "company": normalized_job.company,
+            "description": normalized_job.description,
+            "location": normalized_job.location,
+            "location_type": normalized_job.location_type,
+            "required_skills": normalized_job.required_skills,
+            "preferred_skills": normalized_job.preferred_skills,
+            "experience_requirement": normalized_job.experience_requirement,
+            "experience_min_years": normalized_job.experience_min_years,
+            "experience_max_years": normalized_job.experience_max_years,
+            "experience_level": normalized_job.experience_level,
+            "salary_min": (
                 normalized_job.salary.min_salary if normalized_job.salary else None
             ),
-            salary_max=(
+            "salary_max": (
                 normalized_job.salary.max_salary if normalized_job.salary else None
             ),
-            department=normalized_job.department,
-            employment_type=normalized_job.employment_type,
-            requires_visa_sponsorship=self.normalizer.detect_visa_sponsorship(
-                normalized_job.description
+            "department": normalized_job.department,
+            "employment_type": normalized_job.employment_type,
+            # Set by the normalizer's single scan of the description
+            "requires_visa_sponsorship": bool(
+                normalized_job.requires_visa_sponsorship
             ),
-            external_url=normalized_job.application_url,
-            posted_date=normalized_job.posted_date,
-            is_active=True,
-        )
+            "external_url": normalized_job.application_url,
+            "posted_date": normalized_job.posted_date,
+            "is_active": True,
+        }
+        row["content_hash"] = job_content_hash(row)
+        return row
 
-        self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
+    def _upsert_statement(self, rows: List[Dict[str, Any]]):
+        """INSERT ... ON CONFLICT (source, external_id) DO UPDATE ... RETURNING"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            stmt = postgresql_insert(Job).values(rows)
+        else:
+            stmt = sqlite_insert(Job).values(rows)
+
+        excluded = stmt.excluded
+        updates = {column: excluded[column] for column in INGESTED_COLUMNS}
+        # A posting without salary info keeps the salary we already have
+        updates["salary_min"] = func.coalesce(excluded.salary_min, Job.salary_min)
+        updates["salary_max"] = func.coalesce(excluded.salary_max, Job.salary_max)
+        updates["content_hash"] = excluded.content_hash
+        updates["updated_at"] = datetime.utcnow()
+
+        return stmt.on_conflict_do_update(
+            index_elements=[Job.source, Job.external_id], set_=updates
+        ).returning(Job)
+
+    def _index_jobs_in_pinecone(self, jobs: List[Job]):
+        """Index many jobs in Pinecone with batched embeddings"""
+        if not jobs:
+            return
 
-        # Index in Pinecone
         try:
-            self._index_job_in_pinecone(job)
+            self.pinecone.index_jobs([build_job_index_payload(job) for job in jobs])
         except Exception as e:
-            print(f"Warning: Failed to index job {job.id} in Pinecone: {e}")
-
-    def _update_job(self, existing_job: Job, normalized_job: NormalizedJob):
-        """Update existing job in database and reindex in Pinecone"""
-
-        # Update fields
-        existing_job.title = normalized_job.title
-        existing_job.description = normalized_job.description
-        existing_job.location = normalized_job.location
-        existing_job.location_type = normalized_job.location_type
-        existing_job.required_skills = normalized_job.required_skills
-        existing_job.preferred_skills = normalized_job.preferred_skills
-        existing_job.experience_requirement = normalized_job.experience_requirement
-        existing_job.experience_min_years = normalized_job.experience_min_years
-        existing_job.experience_max_years = normalized_job.experience_max_years
-        existing_job.experience_level = normalized_job.experience_level
-
-        if normalized_job.salary:
-            existing_job.salary_min = normalized_job.salary.min_salary
-            existing_job.salary_max = normalized_job.salary.max_salary
-
-        existing_job.department = normalized_job.department
-        existing_job.employment_type = normalized_job.employment_type
-        existing_job.requires_visa_sponsorship = (
-            self.normalizer.detect_visa_sponsorship(normalized_job.description)
-        )
-        existing_job.external_url = normalized_job.application_url
-        existing_job.updated_at = datetime.utcnow()
+            print(f"Warning: Failed to index {len(jobs)} jobs in Pinecone: {e}")
 
-        self.db.commit()
+    def _delete_jobs_from_pinecone(self, jobs: List[Job]):
+        """Remove many jobs' vectors from Pinecone"""
+        if not jobs:
+            return
 
-        # Reindex in Pinecone
         try:
-            self._index_job_in_pinecone(existing_job)
+            self.pinecone.delete_jobs_vectors([str(job.id) for job in jobs])
         except Exception as e:
-            print(f"Warning: Failed to reindex job {existing_job.id} in Pinecone: {e}")
-
-    def _index_job_in_pinecone(self, job: Job):
-        """Index job in Pinecone vector database"""
-
-        # Create searchable text from job
-        searchable_text = f"{job.title} {job.company} {' '.join(job.required_skills or [])} {' '.join(job.preferred_skills or [])} {job.description[:500]}"
-
-        # Index in Pinecone
-        self.pinecone.index_job(
-            job_id=str(job.id),
-            title=job.title,
-            company=job.company,
-            description=job.description,
-            required_skills=job.required_skills or [],
-            preferred_skills=job.preferred_skills or [],
-            location=job.location,
-            location_type=job.location_type or "onsite",
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            visa_sponsorship=job.requires_visa_sponsorship or False,
-        )
+            print(f"Warning: Failed to delete {len(jobs)} jobs from Pinecone: {e}")
 
     def deactivate_stale_jobs(self, source: JobSource, days_old: int = 30):
         """
@@ -341,6 +560,9 @@ class JobIngestionService:
 
         self.db.commit()
 
+        # Inactive jobs are never matched, so drop their vectors
+        self._delete_jobs_from_pinecone(stale_jobs)
+
         return len(stale_jobs)
 
     def get_source_health(self, source: JobSource) -> Dict:
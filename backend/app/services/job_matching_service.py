@@ -1,5 +1,7 @@
 """Job matching service with Fit Index calculation"""
 
+import logging
+import time
 import uuid
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -8,7 +10,7 @@ import numpy as np
 
 from app.db.models.resume import Resume
 from app.db.models.job import Job
-from app.services.pinecone_service import PineconeService
+from app.services.client_registry import get_pinecone_service
 from app.core.exceptions import ValidationError
 from app.schemas.job_matching import (
     JobMatchRequest,
@@ -22,6 +24,8 @@ from app.schemas.job_matching import (
     LocationType,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class JobMatchingService:
     """Job matching with Fit Index scoring algorithm"""
@@ -34,9 +38,18 @@ class JobMatchingService:
         "semantic": 10,  # Max 10 points for semantic similarity
     }
 
+    # Max job ids per IN (...) clause when hydrating vector hits
+    HYDRATION_CHUNK_SIZE = 500
+
+    # Extra vector hits fetched per page to make up for dropped hits
+    OVERFETCH_BUFFER = 20
+    # Pinecone's top_k limit when metadata is included
+    MAX_VECTOR_TOP_K = 1000
+
     def __init__(self, db: Session):
         self.db = db
-        self.pinecone = PineconeService()
+        self.pinecone = get_pinecone_service()
+        self.last_hydration_stats: Dict[str, float] = {}
 
     def find_matches(
         self, user_id: uuid.UUID, request: JobMatchRequest
@@ -56,25 +69,62 @@ class JobMatchingService:
             self._build_pinecone_filters(request.filters) if request.filters else None
         )
 
-        # Search for similar jobs using vector similarity
-        vector_results = self.pinecone.search_similar_jobs(
-            user_skills=user_skills,
-            top_k=request.limit + request.offset + 20,  # Extra buffer for filtering
-            filters=filters,
-        )
+        needed = request.offset + request.limit
+        top_k = needed + self.OVERFETCH_BUFFER
+        seen_ids = set()
+        matches = []
+
+        # Vectors of deactivated jobs and the min_fit_index filter both drop
+        # hits after the vector query, so widen the query until the page is
+        # full or the index has no more matches
+        while True:
+            vector_results = self.pinecone.search_similar_jobs(
+                user_skills=user_skills,
+                top_k=top_k,
+                filters=filters,
+            )
+            # Each query returns the previous one's hits first
+            new_results = [
+                result
+                for result in vector_results.matches
+                if result.id not in seen_ids
+            ]
+            seen_ids.update(result.id for result in new_results)
+
+            matches.extend(
+                self._score_vector_hits(
+                    new_results, user_skills, user_experience_years, request
+                )
+            )
+
+            if (
+                len(matches) >= needed
+                or len(vector_results.matches) < top_k
+                or top_k >= self.MAX_VECTOR_TOP_K
+            ):
+                break
+            top_k = min(top_k * 2, self.MAX_VECTOR_TOP_K)
+
+        # Sort by Fit Index and apply pagination
+        matches.sort(key=lambda x: x.fit_index, reverse=True)
+        return matches[request.offset : request.offset + request.limit]
+
+    def _score_vector_hits(
+        self,
+        vector_matches,
+        user_skills: List[SkillVector],
+        user_experience_years: int,
+        request: JobMatchRequest,
+    ) -> List[JobMatchResponse]:
+        """Fit Index responses for vector hits whose jobs are active"""
+        # Hydrate all matched jobs up front (one IN query per chunk)
+        jobs_by_id = self._hydrate_jobs(vector_matches)
 
-        # Calculate Fit Index for each job
+        # Calculate Fit Index for each job, preserving Pinecone score order
         matches = []
-        for result in vector_results.matches:
+        for result in vector_matches:
             try:
-                job = (
-                    self.db.query(Job)
-                    .filter(
-                        Job.id == uuid.UUID(result.metadata["job_id"]),
-                        Job.is_active == True,
-                    )
-                    .first()
-                )
+                job = jobs_by_id.get(result.metadata.get("job_id"))
 
                 if not job:
                     continue
@@ -127,9 +177,58 @@ class JobMatchingService:
                 print(f"Error processing job {result.id}: {e}")
                 continue
 
-        # Sort by Fit Index and apply pagination
-        matches.sort(key=lambda x: x.fit_index, reverse=True)
-        return matches[request.offset : request.offset + request.limit]
+        return matches
+
+    def _hydrate_jobs(self, vector_matches) -> Dict[str, Job]:
+        """
+        Batch-load active jobs for vector search hits.
+
+        Returns a mapping of the ``job_id`` metadata string to the Job row.
+        Hits with malformed ids, missing jobs and inactive jobs are dropped.
+        Stats for the last call are kept in ``last_hydration_stats``.
+        """
+        start = time.perf_counter()
+
+        job_ids: Dict[str, uuid.UUID] = {}
+        for result in vector_matches:
+            raw_id = result.metadata.get("job_id")
+            if not raw_id or raw_id in job_ids:
+                continue
+            try:
+                job_ids[raw_id] = uuid.UUID(str(raw_id))
+            except ValueError:
+                logger.warning(f"Skipping vector hit with invalid job_id {raw_id!r}")
+
+        jobs_by_uuid: Dict[uuid.UUID, Job] = {}
+        unique_ids = list(job_ids.values())
+        for i in range(0, len(unique_ids), self.HYDRATION_CHUNK_SIZE):
+            chunk = unique_ids[i : i + self.HYDRATION_CHUNK_SIZE]
+            rows = (
+                self.db.query(Job)
+                .filter(Job.id.in_(chunk), Job.is_active == True)
+                .all()
+            )
+            for job in rows:
+                jobs_by_uuid[job.id] = job
+
+        jobs_by_id = {
+            raw_id: jobs_by_uuid[job_uuid]
+            for raw_id, job_uuid in job_ids.items()
+            if job_uuid in jobs_by_uuid
+        }
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.last_hydration_stats = {
+            "requested": len(unique_ids),
+            "hydrated": len(jobs_by_id),
+            "duration_ms": round(elapsed_ms, 2),
+        }
+        logger.info(
+            f"Hydrated {len(jobs_by_id)}/{len(unique_ids)} matched jobs "
+            f"in {elapsed_ms:.1f}ms"
+        )
+
+        return jobs_by_id
 
     def _calculate_fit_index(
         self,
@@ -218,21 +317,27 @@ class JobMatchingService:
         user_skill_names = {s.skill.lower(): s for s in user_skills}
         skill_matches = []
 
+        # Score every missing required skill against every user skill in one
+        # batched embedding call + matmul instead of pairwise lookups
+        missing_skills = [
+            req for req in required_skills if req.lower() not in user_skill_names
+        ]
+        best_similarity: Dict[str, float] = {}
+        if missing_skills and user_skills:
+            similarity_matrix = self.pinecone.calculate_similarity_matrix(
+                missing_skills, [s.skill for s in user_skills]
+            )
+            for skill, row in zip(missing_skills, similarity_matrix):
+                best_similarity[skill] = max(0.0, min(1.0, float(np.max(row))))
+
         # REQUIRED SKILLS (50 points)
         required_matches = 0
         for req_skill in required_skills:
             req_lower = req_skill.lower()
             has_skill = req_lower in user_skill_names
 
-            # Check semantic similarity for transferable skills
-            similarity = 0.0
-            if not has_skill:
-                for user_skill in user_skills:
-                    sim = self.pinecone.calculate_semantic_similarity(
-                        req_skill, user_skill.skill
-                    )
-                    if sim > similarity:
-                        similarity = sim
+            # Best semantic similarity for transferable skills
+            similarity = 0.0 if has_skill else best_similarity.get(req_skill, 0.0)
 
             is_transferable = similarity > 0.7 and not has_skill
 
@@ -0,0 +1,257 @@
+"""Bulk (re)indexing of Job rows into the Pinecone jobs index"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models.job import Job
+from app.schemas.job_matching import JobReindexReport
+from app.services.client_registry import get_pinecone_service
+from app.services.embedding_cache import get_embedding_cache
+from app.services.pinecone_service import PineconeService, build_job_index_payload
+
+logger = logging.getLogger(__name__)
+
+
+class FileCheckpoint:
+    """Re-index checkpoint stored in a local JSON file (CLI runs)"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Optional[str]:
+        if not self.path.exists():
+            return None
+        try:
+            return json.loads(self.path.read_text()).get("last_job_id")
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable reindex checkpoint {self.path}")
+            return None
+
+    def save(self, last_job_id: str) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"last_job_id": last_job_id}))
+        tmp_path.replace(self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class RedisCheckpoint:
+    """Re-index checkpoint stored in Redis (shared by Celery workers)"""
+
+    def __init__(self, redis_client, key: str = "hireflux:job_reindex:checkpoint"):
+        self.redis_client = redis_client
+        self.key = key
+
+    def load(self) -> Optional[str]:
+        value = self.redis_client.get(self.key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def save(self, last_job_id: str) -> None:
+        self.redis_client.set(self.key, last_job_id)
+
+    def clear(self) -> None:
+        self.redis_client.delete(self.key)
+
+
+class JobReindexService:
+    """
+    Streams Job rows from the database into Pinecone.
+
+    Rows are read in primary-key order through a server-side cursor and
+    handed to a bounded thread pool as ``index_jobs`` batches, so
+    embeddings and upserts are batched and at most ``max_in_flight``
+    batches are buffered (the reader blocks until a slot frees up).
+    The checkpoint only advances past a batch once it and every batch
+    before it have been indexed, so a crash resumes without gaps.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(
+        self,
+        db: Session,
+        pinecone: Optional[PineconeService] = None,
+        checkpoint: Optional[Any] = None,
+    ):
+        self.db = db
+        self.pinecone = pinecone or get_pinecone_service()
+        self.checkpoint = checkpoint
+
+    def reindex(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_in_flight: Optional[int] = None,
+        resume: bool = True,
+        include_inactive: bool = False,
+    ) -> JobReindexReport:
+        """
+        Re-index all jobs, resuming from the checkpoint if present
+
+        Args:
+            batch_size: Jobs per index_jobs call (and per DB fetch)
+            max_workers: Concurrent batches against OpenAI/Pinecone
+            max_in_flight: Max batches buffered ahead of the workers
+                (defaults to 2x max_workers)
+            resume: Start after the last checkpointed job id
+            include_inactive: Also index inactive jobs
+
+        Returns:
+            JobReindexReport with throughput statistics
+        """
+        start = time.perf_counter()
+        cache_before = get_embedding_cache().stats()
+
+        resumed_from = self.checkpoint.load() if (resume and self.checkpoint) else None
+        if resumed_from:
+            logger.info(f"Resuming job reindex after {resumed_from}")
+
+        state = _RunState(self.checkpoint)
+        slots = threading.BoundedSemaphore(max_in_flight or max_workers * 2)
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job-reindex"
+        ) as executor:
+            batch: List[Dict[str, Any]] = []
+            for job in self._stream_jobs(batch_size, resumed_from, include_inactive):
+                batch.append(build_job_index_payload(job))
+                if len(batch) >= batch_size:
+                    if not self._submit(executor, slots, state, batch):
+                        break
+                    batch = []
+            else:
+                if batch:
+                    self._submit(executor, slots, state, batch)
+
+        duration = time.perf_counter() - start
+        cache_after = get_embedding_cache().stats()
+        embeddings = cache_after["misses"] - cache_before["misses"]
+        lookups = (cache_after["hits"] + cache_after["misses"]) - (
+            cache_before["hits"] + cache_before["misses"]
+        )
+        hits = cache_after["hits"] - cache_before["hits"]
+
+        completed = state.failed_batches == 0
+        if completed and self.checkpoint:
+            self.checkpoint.clear()
+
+        report = JobReindexReport(
+            completed=completed,
+            jobs_indexed=state.jobs_indexed,
+            vectors_upserted=state.vectors_upserted,
+            batches=state.batches,
+            failed_batches=state.failed_batches,
+            embeddings_generated=embeddings,
+            cache_hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+            duration_seconds=round(duration, 3),
+            jobs_per_second=round(state.jobs_indexed / duration, 2) if duration else 0,
+            embeddings_per_second=round(embeddings / duration, 2) if duration else 0,
+            resumed_from=resumed_from,
+            last_job_id=state.watermark,
+            errors=state.errors,
+        )
+        logger.info(
+            f"Job reindex {'completed' if completed else 'stopped'}: "
+            f"{report.jobs_indexed} jobs in {report.duration_seconds}s "
+            f"({report.jobs_per_second} jobs/s, "
+            f"{report.embeddings_per_second} embeddings/s, "
+            f"cache hit rate {report.cache_hit_rate:.1%})"
+        )
+        return report
+
+    def _stream_jobs(
+        self, batch_size: int, after_id: Optional[str], include_inactive: bool
+    ):
+        """Yield jobs in id order using a server-side cursor"""
+        query = self.db.query(Job)
+        if not include_inactive:
+            query = query.filter(Job.is_active == True)
+        if after_id:
+            query = query.filter(Job.id > after_id)
+
+        return query.order_by(Job.id).yield_per(batch_size)
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        slots: threading.BoundedSemaphore,
+        state: "_RunState",
+        batch: List[Dict[str, Any]],
+    ) -> bool:
+        """Submit a batch, blocking while max_in_flight batches are pending"""
+        slots.acquire()
+        if state.failed_batches:
+            slots.release()
+            return False
+
+        seq = state.register(batch[-1]["job_id"])
+        future = executor.submit(self.pinecone.index_jobs, batch)
+
+        def _done(f: Future, seq=seq, size=len(batch)):
+            try:
+                state.complete(seq, size, f.result())
+            except Exception as e:
+                state.fail(seq, str(e))
+            finally:
+                slots.release()
+
+        future.add_done_callback(_done)
+        return True
+
+
+class _RunState:
+    """Thread-safe progress and contiguous-checkpoint tracking"""
+
+    def __init__(self, checkpoint: Optional[Any]):
+        self.checkpoint = checkpoint
+        self.lock = threading.Lock()
+        self.last_ids: Dict[int, str] = {}
+        self.done: set = set()
+        self.next_seq = 0
+        self.low_water = 0  # Lowest batch seq not yet known to be done
+        self.watermark: Optional[str] = None
+
+        self.batches = 0
+        self.failed_batches = 0
+        self.jobs_indexed = 0
+        self.vectors_upserted = 0
+        self.errors: List[str] = []
+
+    def register(self, last_job_id: str) -> int:
+        with self.lock:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.last_ids[seq] = last_job_id
+            self.batches += 1
+            return seq
+
+    def complete(self, seq: int, jobs: int, vectors: int) -> None:
+        with self.lock:
+            self.jobs_indexed += jobs
+            self.vectors_upserted += vectors
+            self.done.add(seq)
+
+            advanced = False
+            while self.low_water in self.done:
+                self.done.discard(self.low_water)
+                self.watermark = self.last_ids.pop(self.low_water)
+                self.low_water += 1
+                advanced = True
+
+            if advanced and self.checkpoint:
+                self.checkpoint.save(self.watermark)
+
+    def fail(self, seq: int, error: str) -> None:
+        with self.lock:
+            self.failed_batches += 1
+            self.errors.append(f"Batch {seq} failed: {error}")
+        logger.error(f"Job reindex batch {seq} failed: {error}")
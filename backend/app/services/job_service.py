@@ -7,6 +7,7 @@ Issue #64: Integrated with UsageLimitService for atomic limit checking
 from datetime import datetime
 from typing import List, Optional, Tuple
 from uuid import UUID
+import logging
 import math
 
 from sqlalchemy import func
@@ -15,8 +16,12 @@ from sqlalchemy.orm import Session
 from app.db.models.company import Company
 from app.db.models.job import Job
 from app.schemas.job import JobCreate, JobUpdate, JobStatus
+from app.services.client_registry import get_pinecone_service
+from app.services.pinecone_service import build_job_index_payload
 from app.services.usage_limit_service import UsageLimitService
 
+logger = logging.getLogger(__name__)
+
 
 class JobService:
     """Service for managing employer job postings"""
@@ -194,6 +199,8 @@ class JobService:
         if not job:
             raise Exception(f"Job {job_id} not found")
 
+        was_active = job.is_active
+
         # Handle status changes
         if status == JobStatus.CLOSED:
             # Closed jobs are soft deleted (is_active = False)
@@ -210,6 +217,11 @@ class JobService:
         self.db.commit()
         self.db.refresh(job)
 
+        if was_active and not job.is_active:
+            self._remove_from_vector_index(job)
+        elif job.is_active and not was_active:
+            self._add_to_vector_index(job)
+
         return job
 
     def delete_job(self, job_id: UUID) -> bool:
@@ -235,8 +247,24 @@ class JobService:
 
         self.db.commit()
 
+        self._remove_from_vector_index(job)
+
         return True
 
+    def _remove_from_vector_index(self, job: Job) -> None:
+        """Drop an inactive job's vectors so matching stops returning it"""
+        try:
+            get_pinecone_service().delete_job_vectors(str(job.id))
+        except Exception as e:
+            logger.warning(f"Failed to delete vectors for job {job.id}: {e}")
+
+    def _add_to_vector_index(self, job: Job) -> None:
+        """Re-index a reactivated job"""
+        try:
+            get_pinecone_service().index_jobs([build_job_index_payload(job)])
+        except Exception as e:
+            logger.warning(f"Failed to index reactivated job {job.id}: {e}")
+
     def get_active_jobs_count(self, company_id: UUID) -> int:
         """
         Get count of active jobs for a company.
@@ -0,0 +1,361 @@
+"""
+Single-pass extraction of skills, levels, salary and sponsorship cues
+
+JobNormalizationService used to run one regex per skill (twice per job,
+for the required and preferred sections), plus separate passes for
+experience level, salary and visa sponsorship. JobTextScanner compiles
+the skill taxonomy, level keywords, sponsorship cues and salary patterns
+into one regex and collects every match in a single ``finditer`` over
+the lower-cased description.
+
+Term alternations are built from a character trie, so the regex engine
+follows one branch per character instead of trying each alias in turn.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.schemas.job_feed import SalaryRange
+
+# Canonical skill -> aliases. Aliases are lower-case phrases; a space
+# matches any run of whitespace or hyphens. Output follows this order.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "python": ["python"],
+    "javascript": [
+        "javascript",
+        "js",
+        "nodejs",
+        "node.js",
+        "react",
+        "vue",
+        "angular",
+    ],
+    "typescript": ["typescript"],
+    "java": ["java"],
+    "golang": ["go", "golang"],
+    "rust": ["rust"],
+    "c++": ["c++"],
+    "c#": ["c#"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "swift": ["swift"],
+    "kotlin": ["kotlin"],
+    "sql": ["sql", "postgres", "postgresql", "mysql", "mongodb"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud"],
+    "azure": ["azure"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ci/cd": ["ci/cd", "jenkins", "github actions", "gitlab"],
+    "machine learning": ["machine learning", "ml", "deep learning", "ai"],
+    "data science": ["data science"],
+    "react": ["react"],
+    "vue": ["vuejs", "vue.js"],
+    "angular": ["angular"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "graphql": ["graphql"],
+    "rest api": ["rest api", "restful api"],
+    "microservices": ["microservices"],
+    "agile": ["agile", "scrum", "kanban"],
+    "git": ["git", "github", "gitlab", "version control"],
+    "scala": ["scala"],
+    "elixir": ["elixir"],
+    "haskell": ["haskell"],
+    "dart": ["dart"],
+    "flutter": ["flutter"],
+    "react native": ["react native"],
+    "next.js": ["next.js", "nextjs"],
+    "express": ["express.js", "expressjs"],
+    "spring": ["spring", "spring boot"],
+    "rails": ["rails", "ruby on rails"],
+    "laravel": ["laravel"],
+    ".net": [".net", "asp.net", "dotnet"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "opensearch"],
+    "kafka": ["kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "spark": ["spark", "pyspark"],
+    "hadoop": ["hadoop"],
+    "airflow": ["airflow"],
+    "snowflake": ["snowflake"],
+    "dbt": ["dbt"],
+    "bigquery": ["bigquery"],
+    "redshift": ["redshift"],
+    "tableau": ["tableau"],
+    "power bi": ["power bi"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "pytorch": ["pytorch"],
+    "tensorflow": ["tensorflow", "keras"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision"],
+    "llm": ["llm", "llms", "large language models"],
+    "linux": ["linux", "unix"],
+    "bash": ["bash", "shell scripting"],
+    "ansible": ["ansible"],
+    "helm": ["helm"],
+    "observability": ["prometheus", "grafana", "datadog", "opentelemetry"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3", "sass", "scss", "tailwind"],
+    "redux": ["redux"],
+    "testing": ["jest", "pytest", "cypress", "selenium", "playwright"],
+    "grpc": ["grpc"],
+    "oauth": ["oauth", "oauth2"],
+    "android": ["android"],
+    "ios": ["ios"],
+}
+
+# Experience level keywords, highest level first (the first level found wins)
+EXPERIENCE_LEVELS: Dict[str, List[str]] = {
+    "principal": ["principal", "distinguished", "fellow"],
+    "staff": ["staff", "architect"],
+    "senior": ["senior", "sr.", "lead"],
+    "mid": ["mid level", "intermediate"],
+    "entry": ["entry level", "junior", "new grad"],
+}
+
+# Visa sponsorship cues. Unlike skills they need not end at a word
+# boundary, so "not sponsor" also matches "not sponsoring".
+NO_SPONSORSHIP_CUES = [
+    "us work authorization required",
+    "united states work authorization required",
+    "must have work authorization",
+    "must possess work authorization",
+    "no sponsorship",
+    "no visa sponsorship",
+    "not sponsor",
+    "cannot sponsor",
+]
+SPONSORSHIP_CUES = [
+    "h1b sponsor",
+    "eligible for sponsorship",
+    "eligible for support",
+    "eligible for visa sponsorship",
+    "eligible for visa support",
+    "eligible for work authorization sponsorship",
+    "eligible for work authorization support",
+    "sponsor work visas",
+    "work authorization support",
+]
+# Only an offer when preceded on the same line by one of these words
+QUALIFIED_SPONSORSHIP_CUE = "visa sponsorship"
+_SPONSORSHIP_QUALIFIER = re.compile(r"will|can|provide|offer")
+
+# Salary patterns in priority order (the first pattern that matches wins)
+SALARY_PATTERNS = [
+    r"\$\s?(?P<min0>\d{1,3}(?:,\d{3})+)\s?[-–to]+\s?\$?\s?"
+    r"(?P<max0>\d{1,3}(?:,\d{3})+)",
+    r"\$\s?(?P<min1>\d+)k?\s?[-–to]+\s?\$?\s?(?P<max1>\d+)k?",
+    r"(?P<min2>\d{1,3})k\s?[-–to]+\s?(?P<max2>\d{1,3})k",
+    r"salary:\s?\$?\s?(?P<min3>\d{1,3}(?:,\d{3})*)\s?[\-–to]+\s?\$?\s?"
+    r"(?P<max3>\d{1,3}(?:,\d{3})*)",
+]
+
+# Skill sections (searched on the lower-cased text)
+_REQUIRED_SECTION = re.compile(
+    r"(required|must[\s\-]have|qualifications?|requirements?):?\s*"
+    r"(.*?)(?=\n\n|preferred|nice[\s\-]to[\s\-]have|$)",
+    re.DOTALL,
+)
+_PREFERRED_SECTION = re.compile(
+    r"(preferred|nice[\s\-]to[\s\-]have|bonus|plus):?\s*(.*?)(?=\n\n|$)",
+    re.DOTALL,
+)
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+
+MAX_SKILLS = 20
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return _SEPARATORS.sub(" ", phrase.lower()).strip()
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """Regex matching any of ``phrases``, factored by common prefixes"""
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_regex(trie)
+
+
+def _node_regex(node: Dict) -> str:
+    branches = []
+    for char in sorted(key for key in node if key):
+        atom = r"[\s\-]+" if char == " " else re.escape(char)
+        branches.append(atom + _node_regex(node[char]))
+
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # Greedy: longer phrases are tried first, shorter ones on backtrack
+        return "(?:" + body + ")?"
+    return body
+
+
+@dataclass
+class JobTextFeatures:
+    """Everything extracted from one description"""
+
+    required_skills: List[str] = field(default_factory=list)
+    preferred_skills: List[str] = field(default_factory=list)
+    experience_level: Optional[str] = None  # Explicit keywords only
+    salary: Optional[SalaryRange] = None
+    offers_visa_sponsorship: bool = False
+
+
+class JobTextScanner:
+    """Compiled matcher over a skill taxonomy"""
+
+    def __init__(self, skill_taxonomy: Optional[Dict[str, List[str]]] = None):
+        taxonomy = skill_taxonomy or SKILL_TAXONOMY
+        self._skill_rank = {skill: rank for rank, skill in enumerate(taxonomy)}
+
+        aliases: Dict[str, Set[str]] = {}
+        for skill, skill_aliases in taxonomy.items():
+            for alias in skill_aliases:
+                aliases.setdefault(_normalize_phrase(alias), set()).add(skill)
+        levels = {
+            _normalize_phrase(keyword): level
+            for level, keywords in EXPERIENCE_LEVELS.items()
+            for keyword in keywords
+        }
+
+        # What a matched term counts for. The scan consumes the longest
+        # alias at each position, so a term also counts for every shorter
+        # alias it contains ("github actions" is ci/cd and git).
+        self._terms: Dict[str, Tuple[Set[str], Optional[str]]] = {}
+        for term in set(aliases) | set(levels):
+            skills = set().union(
+                *(
+                    alias_skills
+                    for alias, alias_skills in aliases.items()
+                    if re.search(rf"(?<!\w){re.escape(alias)}(?!\w)", term)
+                )
+            )
+            self._terms[term] = (skills, levels.get(term))
+
+        self._cues = {_normalize_phrase(cue): False for cue in NO_SPONSORSHIP_CUES}
+        self._cues.update({_normalize_phrase(cue): True for cue in SPONSORSHIP_CUES})
+        self._cues[QUALIFIED_SPONSORSHIP_CUE] = None
+
+        self._level_rank = {level: rank for rank, level in enumerate(EXPERIENCE_LEVELS)}
+        self._salary_groups = [f"salary{i}" for i in range(len(SALARY_PATTERNS))]
+
+        salary = "|".join(
+            f"(?P<salary{i}>{pattern})" for i, pattern in enumerate(SALARY_PATTERNS)
+        )
+        # Every alternative starts at the beginning of a word (or at "$"),
+        # so the engine skips positions inside words after one check
+        self.pattern = re.compile(
+            f"(?<!\\w)(?:{salary}"
+            f"|(?P<term>{_trie_regex(self._terms)})(?!\\w)"
+            f"|(?P<cue>{_trie_regex(self._cues)}))"
+        )
+
+    def scan(self, text: str) -> JobTextFeatures:
+        """Extract skills, level, salary and sponsorship in one pass"""
+        text_lower = text.lower()
+
+        required = _REQUIRED_SECTION.search(text_lower)
+        required_span = required.span(2) if required else (0, len(text_lower))
+        preferred = _PREFERRED_SECTION.search(text_lower)
+        preferred_span = preferred.span(2) if preferred else None
+
+        required_skills: Set[str] = set()
+        preferred_skills: Set[str] = set()
+        levels: Set[str] = set()
+        salary_matches: Dict[int, re.Match] = {}
+        denies = offers = False
+
+        for match in self.pattern.finditer(text_lower):
+            kind = match.lastgroup
+
+            if kind == "term":
+                skills, level = self._terms[_normalize_phrase(match.group(kind))]
+                if level:
+                    levels.add(level)
+                if skills:
+                    start, end = match.span()
+                    if required_span[0] <= start and end <= required_span[1]:
+                        required_skills.update(skills)
+                    if (
+                        preferred_span
+                        and preferred_span[0] <= start
+                        and end <= preferred_span[1]
+                    ):
+                        preferred_skills.update(skills)
+
+            elif kind == "cue":
+                offer = self._cues[_normalize_phrase(match.group(kind))]
+                if offer is None:
+                    line_start = text_lower.rfind("\n", 0, match.start()) + 1
+                    offer = bool(
+                        _SPONSORSHIP_QUALIFIER.search(
+                            text_lower, line_start, match.start()
+                        )
+                    )
+                    offers = offers or offer
+                elif offer:
+                    offers = True
+                else:
+                    denies = True
+
+            else:
+                index = self._salary_groups.index(kind)
+                salary_matches.setdefault(index, match)
+
+        return JobTextFeatures(
+            required_skills=self._ordered(required_skills),
+            preferred_skills=self._ordered(preferred_skills),
+            experience_level=min(levels, key=self._level_rank.get, default=None),
+            salary=self._salary(salary_matches),
+            offers_visa_sponsorship=offers and not denies,
+        )
+
+    def _ordered(self, skills: Set[str]) -> List[str]:
+        return sorted(skills, key=self._skill_rank.get)[:MAX_SKILLS]
+
+    @staticmethod
+    def _salary(matches: Dict[int, re.Match]) -> Optional[SalaryRange]:
+        for index in sorted(matches):
+            match = matches[index]
+            try:
+                min_salary = int(match.group(f"min{index}").replace(",", ""))
+                max_salary = int(match.group(f"max{index}").replace(",", ""))
+            except (ValueError, TypeError):
+                continue
+
+            # Figures under 1000 are in thousands ("150k")
+            if min_salary < 1000:
+                min_salary *= 1000
+            if max_salary < 1000:
+                max_salary *= 1000
+
+            return SalaryRange(
+                min_salary=min_salary, max_salary=max_salary, currency="USD"
+            )
+
+        return None
+
+
+_scanner: Optional[JobTextScanner] = None
+
+
+def get_job_text_scanner() -> JobTextScanner:
+    """Get the shared scanner over SKILL_TAXONOMY (compiled once)"""
+    global _scanner
+
+    if _scanner is None:
+        _scanner = JobTextScanner()
+
+    return _scanner
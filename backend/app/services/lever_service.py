@@ -2,12 +2,13 @@
 
 import requests
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.exceptions import ServiceError
+from app.services.job_board_client import AsyncBoardClient, CachedValidators
 from app.schemas.job_feed import (
     JobSource,
     JobFetchResult,
@@ -81,43 +82,80 @@ class LeverService:
         Returns:
             JobFetchResult with fetched jobs and metadata
         """
-        jobs = []
-        errors = []
-
         try:
-            # Build query parameters
-            params = {"mode": "json"}
-            if team:
-                params["team"] = team
-            if location:
-                params["location"] = location
-            if commitment:
-                params["commitment"] = commitment
-
-            # Fetch jobs
-            jobs_data = self._make_request(company_site, params=params)
+            jobs_data = self._make_request(
+                company_site, params=self._jobs_params(team, location, commitment)
+            )
+            return self._build_fetch_result(jobs_data)
 
-            for job_data in jobs_data:
-                try:
-                    job = self._parse_lever_job(job_data)
-                    jobs.append(job)
-                except Exception as e:
-                    errors.append(f"Error parsing job {job_data.get('id')}: {str(e)}")
-
-            metadata = JobMetadata(
-                total_fetched=len(jobs),
-                new_jobs=0,  # Will be calculated during ingestion
-                updated_jobs=0,
-                failed_jobs=len(errors),
-                fetch_duration_seconds=0.0,  # Calculated externally
-                errors=errors,
+        except Exception as e:
+            raise ServiceError(f"Failed to fetch Lever jobs: {str(e)}")
+
+    async def fetch_jobs_async(
+        self,
+        http: AsyncBoardClient,
+        company_site: str,
+        team: Optional[str] = None,
+        location: Optional[str] = None,
+        commitment: Optional[str] = None,
+        conditional: bool = True,
+    ) -> Tuple[Optional[JobFetchResult], Optional[CachedValidators]]:
+        """
+        Fetch jobs from a Lever company site over a shared async client
+
+        Returns:
+            (JobFetchResult, validators to save once the jobs are stored),
+            or (None, None) when the postings are unchanged
+        """
+        try:
+            response = await http.get_json(
+                f"{self.BASE_URL}/{company_site}",
+                params=self._jobs_params(team, location, commitment),
+                conditional=conditional,
             )
+            if response.not_modified:
+                return None, None
 
-            return JobFetchResult(jobs=jobs, metadata=metadata, source=JobSource.LEVER)
+            return self._build_fetch_result(response.data), response.validators
 
         except Exception as e:
             raise ServiceError(f"Failed to fetch Lever jobs: {str(e)}")
 
+    def _jobs_params(
+        self, team: Optional[str], location: Optional[str], commitment: Optional[str]
+    ) -> Dict:
+        params = {"mode": "json"}
+        if team:
+            params["team"] = team
+        if location:
+            params["location"] = location
+        if commitment:
+            params["commitment"] = commitment
+        return params
+
+    def _build_fetch_result(self, jobs_data: List[Dict]) -> JobFetchResult:
+        """Parse a postings payload into a fetch result"""
+        jobs = []
+        errors = []
+
+        for job_data in jobs_data:
+            try:
+                job = self._parse_lever_job(job_data)
+                jobs.append(job)
+            except Exception as e:
+                errors.append(f"Error parsing job {job_data.get('id')}: {str(e)}")
+
+        metadata = JobMetadata(
+            total_fetched=len(jobs),
+            new_jobs=0,  # Will be calculated during ingestion
+            updated_jobs=0,
+            failed_jobs=len(errors),
+            fetch_duration_seconds=0.0,  # Calculated externally
+            errors=errors,
+        )
+
+        return JobFetchResult(jobs=jobs, metadata=metadata, source=JobSource.LEVER)
+
     def _parse_lever_job(self, job_data: Dict) -> LeverJob:
         """Parse raw Lever job data into structured format"""
 
@@ -0,0 +1,605 @@
+"""
+In-process vector index compatible with the Pinecone ``Index`` API.
+
+Used as a drop-in backend for PineconeService (``VECTOR_STORE_BACKEND=local``)
+so matching runs without a network hop and in air-gapped environments.
+Vectors live in a float32 matrix of L2-normalized rows; saved indexes are
+memory-mapped on load. Search is exact (one matmul over the filtered
+rows) unless an IVF coarse quantizer has been built with ``build_ivf``,
+in which case only the ``n_probe`` nearest clusters are scanned.
+Namespaces partition the index the way Pinecone's do: ids are unique
+per namespace and every operation is scoped to one.
+
+Several processes (API, Celery workers, scripts) may open the same saved
+index. ``sync`` merges the changes this process made since it loaded the
+index into whatever is on disk, under a file lock, so one process saving
+does not discard another's writes.
+"""
+
+import fcntl
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+
+class VectorIndex(Protocol):
+    """Subset of the Pinecone ``Index`` API that PineconeService relies on"""
+
+    def upsert(
+        self,
+        vectors: Sequence[Tuple[str, Sequence[float], Dict]],
+        namespace: str = "",
+        **kwargs,
+    ):
+        ...
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        include_metadata: bool = False,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        **kwargs,
+    ):
+        ...
+
+    def delete(
+        self, ids: Optional[List[str]] = None, namespace: str = "", **kwargs
+    ):
+        ...
+
+    def describe_index_stats(self, **kwargs):
+        ...
+
+
+class LocalMatch:
+    """Single query match (mirrors Pinecone's ScoredVector)"""
+
+    __slots__ = ("id", "score", "metadata", "values")
+
+    def __init__(
+        self,
+        id: str,
+        score: float,
+        metadata: Optional[Dict[str, Any]],
+        values: Optional[List[float]] = None,
+    ):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+        self.values = values
+
+    def __repr__(self) -> str:
+        return f"LocalMatch(id={self.id!r}, score={self.score:.4f})"
+
+
+class LocalQueryResponse:
+    """Query response (mirrors Pinecone's QueryResponse)"""
+
+    def __init__(self, matches: List[LocalMatch]):
+        self.matches = matches
+
+
+class LocalIndexStats:
+    """Index statistics (mirrors Pinecone's DescribeIndexStatsResponse)"""
+
+    def __init__(
+        self,
+        total_vector_count: int,
+        dimension: int,
+        namespaces: Optional[Dict[str, Dict[str, int]]] = None,
+    ):
+        self.total_vector_count = total_vector_count
+        self.dimension = dimension
+        self.namespaces = namespaces or {}
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    """Evaluate one Pinecone metadata filter condition against a value"""
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+
+    for op, expected in condition.items():
+        if op == "$eq":
+            ok = value == expected
+        elif op == "$ne":
+            ok = value != expected
+        elif op == "$in":
+            ok = value in expected
+        elif op == "$nin":
+            ok = value not in expected
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None or isinstance(value, (list, dict)):
+                return False
+            try:
+                ok = {
+                    "$gt": value > expected,
+                    "$gte": value >= expected,
+                    "$lt": value < expected,
+                    "$lte": value <= expected,
+                }[op]
+            except TypeError:
+                return False
+        else:
+            raise ValueError(f"Unsupported metadata filter operator: {op}")
+        if not ok:
+            return False
+
+    return True
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Evaluate a Pinecone-style metadata filter ($and/$or supported)"""
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, f) for f in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, f) for f in condition):
+                return False
+        elif not _matches_condition(metadata.get(key), condition):
+            return False
+    return True
+
+
+class LocalVectorIndex:
+    """
+    Exact/IVF cosine-similarity index over a float32 matrix.
+
+    Thread-safe for concurrent queries and upserts. Deletes leave
+    tombstones that are dropped on ``save``.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, dimension: int = 1536, path: Optional[str] = None):
+        self.dimension = dimension
+        self.path = Path(path) if path else None
+
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._namespaces: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._row_by_id: Dict[Tuple[str, str], int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+        # IVF coarse quantizer (optional)
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self.n_probe = 8
+
+        self._lock = threading.RLock()
+        self._version = 0
+        self._mask_cache: Dict[str, Tuple[int, np.ndarray]] = {}
+
+        # Changes since the last load/sync, as (namespace, id) keys
+        self._upserted: set = set()
+        self._deleted: set = set()
+        self._ivf_changed = False
+
+    # ------------------------------------------------------------------
+    # Pinecone Index API
+    # ------------------------------------------------------------------
+
+    def upsert(
+        self, vectors: Sequence[Tuple], namespace: str = "", **kwargs
+    ) -> Dict[str, int]:
+        """Insert or overwrite (id, values, metadata) tuples in a namespace"""
+        if not vectors:
+            return {"upserted_count": 0}
+
+        ids = [v[0] for v in vectors]
+        matrix = self._normalize(np.asarray([v[1] for v in vectors], np.float32))
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {matrix.shape[1]} does not match index "
+                f"dimension {self.dimension}"
+            )
+
+        with self._lock:
+            self._ensure_capacity(len(vectors))
+            for vector_id, row_vector, item in zip(ids, matrix, vectors):
+                metadata = dict(item[2]) if len(item) > 2 and item[2] else {}
+                row = self._row_by_id.get((namespace, vector_id))
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._row_by_id[(namespace, vector_id)] = row
+                    self._ids[row] = vector_id
+                    self._namespaces[row] = namespace
+                self._vectors[row] = row_vector
+                self._metadata[row] = metadata
+                self._alive[row] = True
+                self._upserted.add((namespace, vector_id))
+                self._deleted.discard((namespace, vector_id))
+                if self._centroids is not None:
+                    self._assignments[row] = int(
+                        np.argmax(self._centroids @ row_vector)
+                    )
+            self._version += 1
+
+        return {"upserted_count": len(vectors)}
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 10,
+        include_metadata: bool = False,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        include_values: bool = False,
+        **kwargs,
+    ) -> LocalQueryResponse:
+        """Return the top_k most similar live vectors matching the filter"""
+        query = self._normalize(np.asarray(vector, np.float32).reshape(1, -1))[0]
+
+        with self._lock:
+            candidates = self._candidate_rows(query, filter, namespace)
+            if candidates.size == 0 or top_k <= 0:
+                return LocalQueryResponse([])
+
+            # Gathering most rows costs more than scoring all of them
+            if candidates.size > self._size // 2:
+                scores = (self._vectors[: self._size] @ query)[candidates]
+            else:
+                scores = self._vectors[candidates] @ query
+            k = min(top_k, candidates.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            matches = [
+                LocalMatch(
+                    id=self._ids[candidates[i]],
+                    # Clip float32 rounding (e.g. 1.0000001 for a self-match)
+                    score=min(1.0, max(-1.0, float(scores[i]))),
+                    metadata=(
+                        dict(self._metadata[candidates[i]])
+                        if include_metadata
+                        else None
+                    ),
+                    values=(
+                        self._vectors[candidates[i]].tolist()
+                        if include_values
+                        else None
+                    ),
+                )
+                for i in top
+            ]
+
+        return LocalQueryResponse(matches)
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+        **kwargs,
+    ) -> Dict:
+        """Delete vectors in a namespace by id, by metadata filter, or all"""
+        with self._lock:
+            if delete_all or filter:
+                rows = np.flatnonzero(self._filter_mask(filter, namespace))
+            else:
+                rows = [
+                    self._row_by_id[(namespace, i)]
+                    for i in ids or []
+                    if (namespace, i) in self._row_by_id
+                ]
+
+            for row in rows:
+                key = (namespace, self._ids[row])
+                self._upserted.discard(key)
+                self._deleted.add(key)
+                self._row_by_id.pop(key, None)
+                self._ids[row] = None
+                self._namespaces[row] = None
+                self._metadata[row] = None
+                self._alive[row] = False
+            self._version += 1
+
+        return {}
+
+    def fetch(
+        self, ids: List[str], namespace: str = "", **kwargs
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch stored vectors and metadata by id"""
+        with self._lock:
+            return {
+                vector_id: {
+                    "id": vector_id,
+                    "values": self._vectors[row].tolist(),
+                    "metadata": dict(self._metadata[row]),
+                }
+                for vector_id in ids
+                if (row := self._row_by_id.get((namespace, vector_id))) is not None
+            }
+
+    def describe_index_stats(self, **kwargs) -> LocalIndexStats:
+        """Get vector counts (total and per namespace) and dimension"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for namespace, _ in self._row_by_id:
+                counts[namespace] = counts.get(namespace, 0) + 1
+
+        return LocalIndexStats(
+            len(self._row_by_id),
+            self.dimension,
+            {ns: {"vector_count": n} for ns, n in counts.items()},
+        )
+
+    # ------------------------------------------------------------------
+    # Approximate search
+    # ------------------------------------------------------------------
+
+    def build_ivf(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: Optional[int] = None,
+        n_iter: int = 10,
+        sample_size: int = 20000,
+        seed: int = 0,
+    ) -> None:
+        """
+        Train an IVF coarse quantizer with spherical k-means.
+
+        Defaults to ~sqrt(n) lists. Queries then scan only the ``n_probe``
+        lists whose centroids are closest to the query vector.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._alive[: self._size])
+            if rows.size == 0:
+                return
+
+            n_lists = n_lists or max(1, int(np.sqrt(rows.size)))
+            n_lists = min(n_lists, rows.size)
+            rng = np.random.default_rng(seed)
+
+            sample = self._vectors[
+                rng.choice(rows, size=min(sample_size, rows.size), replace=False)
+            ]
+            centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+
+            for _ in range(n_iter):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = self._normalize(centroids)
+
+            self._centroids = centroids.astype(np.float32)
+            self._assignments = np.full(len(self._alive), -1, dtype=np.int32)
+            self._assignments[rows] = np.argmax(
+                self._vectors[rows] @ self._centroids.T, axis=1
+            )
+            if n_probe:
+                self.n_probe = n_probe
+            self._ivf_changed = True
+
+    def clear_ivf(self) -> None:
+        """Drop the IVF quantizer and go back to exact search"""
+        with self._lock:
+            self._centroids = None
+            self._assignments = np.full(len(self._alive), -1, dtype=np.int32)
+            self._ivf_changed = True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Compact and persist the index (vectors as .npy, metadata as JSON)"""
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path given for saving local vector index")
+        target.mkdir(parents=True, exist_ok=True)
+
+        # Write to temp files and swap them in, since the current vectors
+        # may be memory-mapped from the files being replaced
+        with self._lock:
+            rows = np.flatnonzero(self._alive[: self._size])
+            with open(target / "vectors.npy.tmp", "wb") as f:
+                np.save(f, self._vectors[rows])
+            with open(target / "metadata.json.tmp", "w") as f:
+                json.dump(
+                    {
+                        "dimension": self.dimension,
+                        "ids": [self._ids[r] for r in rows],
+                        "namespaces": [self._namespaces[r] for r in rows],
+                        "metadata": [self._metadata[r] for r in rows],
+                    },
+                    f,
+                )
+            os.replace(target / "vectors.npy.tmp", target / "vectors.npy")
+            os.replace(target / "metadata.json.tmp", target / "metadata.json")
+
+            if self._centroids is not None:
+                np.save(target / "centroids.npy", self._centroids)
+            elif (target / "centroids.npy").exists():
+                (target / "centroids.npy").unlink()
+
+    def sync(self, path: Optional[str] = None) -> None:
+        """
+        Merge this process's changes into the saved index and reload it
+
+        Under an exclusive lock on the index directory, the saved index is
+        read, the vectors upserted and deleted here since the last
+        load/sync are applied to it, and the result is written back. This
+        index then continues from the merged state, so it also picks up
+        writes other processes synced in the meantime.
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path given for saving local vector index")
+        target.mkdir(parents=True, exist_ok=True)
+
+        with self._lock, open(target / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self._upserted or self._deleted or self._ivf_changed:
+                    merged = LocalVectorIndex.load(str(target), self.dimension)
+                    self._merge_into(merged)
+                    merged.save(str(target))
+                self._adopt(LocalVectorIndex.load(str(target), self.dimension))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    def load(cls, path: str, dimension: int = 1536) -> "LocalVectorIndex":
+        """Open a saved index (vectors are memory-mapped read-only)"""
+        index = cls(dimension=dimension, path=path)
+        source = Path(path)
+        if not (source / "vectors.npy").exists():
+            return index
+
+        with open(source / "metadata.json") as f:
+            data = json.load(f)
+        index.dimension = data["dimension"]
+        if not data["ids"]:
+            return index
+
+        vectors = np.load(source / "vectors.npy", mmap_mode="r")
+        index._vectors = vectors
+        index._size = len(data["ids"])
+        index._ids = list(data["ids"])
+        index._namespaces = list(data.get("namespaces") or [""] * index._size)
+        index._metadata = list(data["metadata"])
+        index._row_by_id = {
+            (ns, vid): row
+            for row, (ns, vid) in enumerate(zip(index._namespaces, index._ids))
+        }
+        index._alive = np.ones(index._size, dtype=bool)
+        index._assignments = np.full(index._size, -1, dtype=np.int32)
+
+        if (source / "centroids.npy").exists():
+            index._centroids = np.load(source / "centroids.npy")
+            index._assignments = np.argmax(
+                np.asarray(vectors) @ index._centroids.T, axis=1
+            ).astype(np.int32)
+
+        return index
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _merge_into(self, other: "LocalVectorIndex") -> None:
+        """Apply this index's pending upserts, deletes and IVF to other"""
+        deleted: Dict[str, List[str]] = {}
+        for namespace, vector_id in self._deleted:
+            deleted.setdefault(namespace, []).append(vector_id)
+        for namespace, ids in deleted.items():
+            other.delete(ids=ids, namespace=namespace)
+
+        upserted: Dict[str, List[Tuple]] = {}
+        for namespace, vector_id in self._upserted:
+            row = self._row_by_id.get((namespace, vector_id))
+            if row is not None:
+                upserted.setdefault(namespace, []).append(
+                    (vector_id, self._vectors[row], self._metadata[row])
+                )
+        for namespace, vectors in upserted.items():
+            other.upsert(vectors, namespace=namespace)
+
+        if self._ivf_changed:
+            if self._centroids is None:
+                other.clear_ivf()
+            else:
+                other.build_ivf(n_lists=len(self._centroids), n_probe=self.n_probe)
+
+    def _adopt(self, other: "LocalVectorIndex") -> None:
+        """Take over other's contents (keeping this index's lock)"""
+        for name in (
+            "dimension",
+            "_vectors",
+            "_size",
+            "_ids",
+            "_namespaces",
+            "_metadata",
+            "_row_by_id",
+            "_alive",
+            "_centroids",
+            "_assignments",
+        ):
+            setattr(self, name, getattr(other, name))
+        self._upserted = set()
+        self._deleted = set()
+        self._ivf_changed = False
+        self._version += 1
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return (matrix / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+    def _ensure_capacity(self, extra_rows: int) -> None:
+        """Grow storage (and copy out of a read-only memory map) as needed"""
+        needed = self._size + extra_rows
+        if needed <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+
+        capacity = max(self.INITIAL_CAPACITY, len(self._vectors) * 2, needed)
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[: self._size] = self._vectors[: self._size]
+        self._vectors = grown
+
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._alive = alive
+
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[: self._size] = self._assignments[: self._size]
+        self._assignments = assignments
+
+        self._ids.extend([None] * (capacity - len(self._ids)))
+        self._namespaces.extend([None] * (capacity - len(self._namespaces)))
+        self._metadata.extend([None] * (capacity - len(self._metadata)))
+
+    def _filter_mask(
+        self, filter: Optional[Dict[str, Any]], namespace: str = ""
+    ) -> np.ndarray:
+        """Boolean mask of live namespace rows matching the filter (cached)"""
+        alive = self._alive[: self._size]
+
+        cache_key = json.dumps([namespace, filter], sort_keys=True, default=str)
+        cached = self._mask_cache.get(cache_key)
+        if cached and cached[0] == self._version:
+            return cached[1]
+
+        mask = alive & (
+            np.array(self._namespaces[: self._size], dtype=object) == namespace
+        )
+        if filter:
+            mask = np.fromiter(
+                (
+                    bool(mask[row]) and matches_filter(self._metadata[row], filter)
+                    for row in range(self._size)
+                ),
+                dtype=bool,
+                count=self._size,
+            )
+        if len(self._mask_cache) > 256:
+            self._mask_cache.clear()
+        self._mask_cache[cache_key] = (self._version, mask)
+        return mask
+
+    def _candidate_rows(
+        self, query: np.ndarray, filter: Optional[Dict[str, Any]], namespace: str
+    ) -> np.ndarray:
+        mask = self._filter_mask(filter, namespace)
+
+        if self._centroids is not None:
+            n_probe = min(self.n_probe, len(self._centroids))
+            probes = np.argpartition(-(self._centroids @ query), n_probe - 1)[
+                :n_probe
+            ]
+            mask = mask & np.isin(self._assignments[: self._size], probes)
+
+        return np.flatnonzero(mask)
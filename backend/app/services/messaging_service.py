@@ -6,13 +6,21 @@ Target: 60% on-platform communication, reduce disintermediation
 Compliance: EEOC audit trail for all communications
 """
 
+import base64
+import binascii
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import Optional, List
+from sqlalchemy import func, case, literal, tuple_
+from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
 from uuid import UUID
 
-from app.db.models.message import MessageThread, Message, MessageBlocklist
+from app.db.models.message import (
+    MessageThread,
+    MessageThreadInbox,
+    Message,
+    MessageBlocklist
+)
 from app.db.models.user import User
 from app.db.models.application import Application
 from app.schemas.message import (
@@ -36,6 +44,34 @@ from app.core.exceptions import (
 from app.services.email_service import EmailService
 
 
+@dataclass
+class ThreadPage:
+    """One page of a user's thread inbox"""
+    threads: List[MessageThread]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+def encode_thread_cursor(last_activity_at: datetime, thread_id: UUID) -> str:
+    """Opaque cursor for the inbox position after (last_activity_at, thread_id)"""
+    raw = f"{last_activity_at.isoformat()}|{thread_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_thread_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor from encode_thread_cursor
+
+    Raises:
+        BadRequestError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        last_activity_at, thread_id = raw.split("|")
+        return datetime.fromisoformat(last_activity_at), UUID(thread_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise BadRequestError("Invalid cursor")
+
+
 class MessagingService:
     """
     Service layer for messaging operations
@@ -105,16 +141,34 @@ class MessagingService:
                 raise BadRequestError("Thread already exists for this application")
 
         # Create new thread
+        now = datetime.utcnow()
         thread = MessageThread(
             employer_id=employer_id,
             candidate_id=candidate_id,
             application_id=application_id,
             subject=subject,
             unread_count_employer=0,
-            unread_count_candidate=0
+            unread_count_candidate=0,
+            created_at=now
         )
 
         self.db.add(thread)
+        self.db.flush()
+
+        # One inbox row per participant
+        for user_id, role in ((employer_id, "employer"), (candidate_id, "candidate")):
+            self.db.add(
+                MessageThreadInbox(
+                    user_id=user_id,
+                    thread_id=thread.id,
+                    role=role,
+                    application_id=application_id,
+                    unread_count=0,
+                    is_archived=False,
+                    last_activity_at=now
+                )
+            )
+
         self.db.commit()
         self.db.refresh(thread)
 
@@ -179,89 +233,105 @@ class MessagingService:
         unread_only: bool = False,
         archived: bool = False,
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> List[MessageThread]:
         """
         List threads for a user with filtering and pagination
 
+        See list_thread_page, which also returns the cursor of the next page.
+
+        Returns:
+            List of MessageThread objects
+        """
+        return self.list_thread_page(
+            user_id=user_id,
+            application_id=application_id,
+            unread_only=unread_only,
+            archived=archived,
+            limit=limit,
+            cursor=cursor,
+            page=page
+        ).threads
+
+    def list_thread_page(
+        self,
+        user_id: UUID,
+        application_id: Optional[UUID] = None,
+        unread_only: bool = False,
+        archived: bool = False,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1
+    ) -> ThreadPage:
+        """
+        List a page of a user's threads, most recent activity first
+
+        Reads the user's rows in message_thread_inbox, so the filters are
+        plain predicates on one index and each page continues after the
+        previous one (keyset) instead of skipping rows with OFFSET.
+
         Args:
             user_id: ID of the user viewing threads
             application_id: Filter by job application
             unread_only: Show only threads with unread messages
-            archived: Show archived threads
-            page: Page number (1-indexed)
+            archived: Show archived threads (only those) instead of the rest
             limit: Items per page
+            cursor: next_cursor of the previous page
+            page: Page number (1-indexed); only used without a cursor, for
+                clients that still page by number
 
         Returns:
-            List of MessageThread objects
+            ThreadPage with the threads and the cursor of the next page
+
+        Raises:
+            BadRequestError: If the cursor is malformed
         """
-        # Base query - threads where user is participant
-        query = self.db.query(MessageThread).filter(
-            or_(
-                MessageThread.employer_id == user_id,
-                MessageThread.candidate_id == user_id
-            ),
-            MessageThread.is_deleted == False
+        query = self.db.query(MessageThread, MessageThreadInbox.last_activity_at).join(
+            MessageThreadInbox, MessageThreadInbox.thread_id == MessageThread.id
+        ).filter(
+            MessageThreadInbox.user_id == user_id,
+            MessageThreadInbox.is_archived == archived
         )
 
         # Filter by application
         if application_id:
-            query = query.filter(MessageThread.application_id == application_id)
+            query = query.filter(MessageThreadInbox.application_id == application_id)
 
         # Filter by unread status
         if unread_only:
-            # Check which role the user has in each thread
-            query = query.filter(
-                or_(
-                    and_(
-                        MessageThread.employer_id == user_id,
-                        MessageThread.unread_count_employer > 0
-                    ),
-                    and_(
-                        MessageThread.candidate_id == user_id,
-                        MessageThread.unread_count_candidate > 0
-                    )
-                )
-            )
+            query = query.filter(MessageThreadInbox.unread_count > 0)
 
-        # Filter by archived status
-        # If archived=False, exclude archived threads
-        # If archived=True, show only archived threads
-        if not archived:
+        if cursor:
+            last_activity_at, thread_id = decode_thread_cursor(cursor)
+            # Row-value comparison, so the listing index serves the seek
             query = query.filter(
-                or_(
-                    and_(
-                        MessageThread.employer_id == user_id,
-                        MessageThread.archived_by_employer == False
-                    ),
-                    and_(
-                        MessageThread.candidate_id == user_id,
-                        MessageThread.archived_by_candidate == False
-                    )
-                )
-            )
-        else:
-            query = query.filter(
-                or_(
-                    and_(
-                        MessageThread.employer_id == user_id,
-                        MessageThread.archived_by_employer == True
-                    ),
-                    and_(
-                        MessageThread.candidate_id == user_id,
-                        MessageThread.archived_by_candidate == True
-                    )
+                tuple_(MessageThreadInbox.last_activity_at, MessageThreadInbox.thread_id)
+                < tuple_(
+                    literal(last_activity_at, MessageThreadInbox.last_activity_at.type),
+                    literal(thread_id, MessageThreadInbox.thread_id.type)
                 )
             )
 
-        # Order by most recent message first
-        query = query.order_by(MessageThread.last_message_at.desc().nullsfirst())
+        # Most recent activity first
+        query = query.order_by(
+            MessageThreadInbox.last_activity_at.desc(),
+            MessageThreadInbox.thread_id.desc()
+        )
+        if not cursor and page > 1:
+            query = query.offset((page - 1) * limit)
+
+        rows = query.limit(limit).all()
 
-        # Pagination
-        offset = (page - 1) * limit
-        threads = query.offset(offset).limit(limit).all()
+        next_cursor = None
+        if len(rows) == limit:
+            last_thread, last_activity_at = rows[-1]
+            next_cursor = encode_thread_cursor(last_activity_at, last_thread.id)
 
-        return threads
+        return ThreadPage(
+            threads=[thread for thread, _ in rows],
+            next_cursor=next_cursor
+        )
 
     def archive_thread(self, thread_id: UUID, user_id: UUID) -> MessageThread:
         """Archive a thread for a specific user"""
@@ -275,6 +345,10 @@ class MessagingService:
         else:
             raise ForbiddenError("You are not a participant in this thread")
 
+        self._inbox_entry(thread.id, user_id).update(
+            {MessageThreadInbox.is_archived: True}, synchronize_session=False
+        )
+
         self.db.commit()
         self.db.refresh(thread)
 
@@ -292,9 +366,12 @@ class MessagingService:
         if thread.employer_id != user_id and thread.candidate_id != user_id:
             raise ForbiddenError("You are not a participant in this thread")
 
-        # Soft delete
+        # Soft delete; the thread leaves both participants' inboxes
         thread.is_deleted = True
         thread.deleted_at = datetime.utcnow()
+        self.db.query(MessageThreadInbox).filter(
+            MessageThreadInbox.thread_id == thread.id
+        ).delete(synchronize_session=False)
 
         self.db.commit()
 
@@ -378,6 +455,8 @@ class MessagingService:
         else:
             thread.unread_count_candidate += 1
 
+        self._record_new_message(thread.id, recipient_id, thread.last_message_at)
+
         self.db.commit()
         self.db.refresh(message)
 
@@ -478,6 +557,8 @@ class MessagingService:
             else:
                 thread.unread_count_candidate = max(0, thread.unread_count_candidate - 1)
 
+            self._record_message_read(thread.id, user_id)
+
             self.db.commit()
             self.db.refresh(message)
 
@@ -497,25 +578,61 @@ class MessagingService:
 
     def get_unread_count(self, user_id: UUID) -> int:
         """Get total unread message count for user"""
-        # Sum unread counts from all threads where user is participant
         total_unread = self.db.query(
-            func.sum(
-                func.case(
-                    (MessageThread.employer_id == user_id, MessageThread.unread_count_employer),
-                    (MessageThread.candidate_id == user_id, MessageThread.unread_count_candidate),
-                    else_=0
-                )
-            )
+            func.sum(MessageThreadInbox.unread_count)
         ).filter(
-            or_(
-                MessageThread.employer_id == user_id,
-                MessageThread.candidate_id == user_id
-            ),
-            MessageThread.is_deleted == False
+            MessageThreadInbox.user_id == user_id
         ).scalar()
 
         return int(total_unread) if total_unread else 0
 
+    def get_unread_thread_count(self, user_id: UUID) -> int:
+        """Get number of threads with unread messages for user"""
+        return self.db.query(func.count(MessageThreadInbox.id)).filter(
+            MessageThreadInbox.user_id == user_id,
+            MessageThreadInbox.unread_count > 0
+        ).scalar()
+
+    # ========================================================================
+    # INBOX PROJECTION
+    # ========================================================================
+
+    def _inbox_entry(self, thread_id: UUID, user_id: UUID):
+        """Query for one participant's inbox row"""
+        return self.db.query(MessageThreadInbox).filter(
+            MessageThreadInbox.user_id == user_id,
+            MessageThreadInbox.thread_id == thread_id
+        )
+
+    def _record_new_message(
+        self, thread_id: UUID, recipient_id: UUID, sent_at: datetime
+    ) -> None:
+        """Move the thread up both inboxes and count it unread for the recipient"""
+        self.db.query(MessageThreadInbox).filter(
+            MessageThreadInbox.thread_id == thread_id
+        ).update(
+            {
+                MessageThreadInbox.last_activity_at: sent_at,
+                MessageThreadInbox.unread_count: case(
+                    (
+                        MessageThreadInbox.user_id == recipient_id,
+                        MessageThreadInbox.unread_count + 1
+                    ),
+                    else_=MessageThreadInbox.unread_count
+                )
+            },
+            synchronize_session=False
+        )
+
+    def _record_message_read(self, thread_id: UUID, user_id: UUID) -> None:
+        """Decrement the reader's unread count, never below zero"""
+        self._inbox_entry(thread_id, user_id).filter(
+            MessageThreadInbox.unread_count > 0
+        ).update(
+            {MessageThreadInbox.unread_count: MessageThreadInbox.unread_count - 1},
+            synchronize_session=False
+        )
+
     # ========================================================================
     # BLOCKING & SPAM PREVENTION
     # ========================================================================
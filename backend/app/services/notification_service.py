@@ -6,6 +6,7 @@ Handles creating and managing user notifications
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from uuid import UUID
 
 from app.db.models.notification import Notification, NotificationPreference
 from app.db.models.user import User
@@ -236,12 +237,12 @@ class NotificationService:
             recent_notifications=recent_notifications,
         )
 
-    def get_preferences(self, db: Session, user_id: int) -> NotificationPreference:
+    def get_preferences(self, db: Session, user_id: UUID) -> NotificationPreference:
         """Get user notification preferences"""
         return self._get_or_create_preferences(db, user_id)
 
     def update_preferences(
-        self, db: Session, user_id: int, updates: NotificationPreferenceUpdate
+        self, db: Session, user_id: UUID, updates: NotificationPreferenceUpdate
     ) -> NotificationPreference:
         """Update user notification preferences"""
         preferences = self._get_or_create_preferences(db, user_id)
@@ -257,7 +258,7 @@ class NotificationService:
         return preferences
 
     def _get_or_create_preferences(
-        self, db: Session, user_id: int
+        self, db: Session, user_id: UUID
     ) -> NotificationPreference:
         """Get or create notification preferences for user"""
         preferences = (
@@ -0,0 +1,203 @@
+"""
+Platform-wide peer benchmarks for job seeker analytics
+
+A rollup job computes each active user's application count and
+response/interview/offer rates over a trailing window with one grouped
+query, and stores the distribution of each metric as a fixed-bin
+histogram in ``peer_benchmarks``. Peer comparison then answers a user's
+percentile from the stored histogram (one small row per metric) instead
+of scanning applications at request time.
+"""
+
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ServiceError
+from app.db.models.analytics import PeerBenchmark
+from app.db.models.application import Application
+from app.services.analytics_aggregation import (
+    INTERVIEW_STATUSES,
+    NO_RESPONSE_STATUSES,
+)
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_WINDOW_DAYS = 30
+
+# 1-point bins for percentages
+RATE_BIN_EDGES = [float(edge) for edge in range(0, 101)]
+# Exact counts up to 30, then progressively wider bins
+APPLICATION_COUNT_BIN_EDGES = [float(edge) for edge in range(0, 31)] + [
+    35.0,
+    40.0,
+    50.0,
+    60.0,
+    80.0,
+    100.0,
+    150.0,
+    200.0,
+    300.0,
+    500.0,
+    1000.0,
+]
+
+BENCHMARK_BIN_EDGES = {
+    "total_applications": APPLICATION_COUNT_BIN_EDGES,
+    "response_rate": RATE_BIN_EDGES,
+    "interview_rate": RATE_BIN_EDGES,
+    "offer_rate": RATE_BIN_EDGES,
+}
+
+
+class Histogram:
+    """
+    Fixed-bin histogram of per-user metric values (used while building).
+
+    ``edges`` are ascending bin boundaries; bin ``i`` covers
+    ``[edges[i], edges[i + 1])``. Values beyond the last edge are counted
+    in the last bin and values below the first edge in the first.
+    """
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) - 1)
+        self.total = 0.0  # sum of values, for the mean
+
+    @property
+    def sample_size(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.sample_size if self.sample_size else 0.0
+
+    def cumulative_counts(self) -> List[int]:
+        cumulative, running = [], 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+        return cumulative
+
+    def _bin(self, value: float) -> int:
+        return min(max(bisect_right(self.edges, value) - 1, 0), len(self.counts) - 1)
+
+    def add(self, value: float) -> None:
+        self.counts[self._bin(value)] += 1
+        self.total += value
+
+
+class PeerBenchmarkService:
+    """Build and query platform-wide peer benchmark histograms"""
+
+    ROLLUP_CHUNK_SIZE = 5000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rollup(self, window_days: int = BENCHMARK_WINDOW_DAYS) -> Dict[str, int]:
+        """
+        Recompute benchmark histograms from applications in the window.
+
+        Per-user rates are aggregated in the database and streamed, so
+        memory stays bounded by the number of histogram bins.
+
+        Returns:
+            Number of users included per metric
+        """
+        try:
+            histograms = {
+                metric: Histogram(edges)
+                for metric, edges in BENCHMARK_BIN_EDGES.items()
+            }
+
+            for total, responses, interviews, offers in self._user_counts(
+                window_days
+            ):
+                histograms["total_applications"].add(float(total))
+                histograms["response_rate"].add(responses / total * 100)
+                histograms["interview_rate"].add(interviews / total * 100)
+                histograms["offer_rate"].add(offers / total * 100)
+
+            self._save(histograms, window_days)
+            self.db.commit()
+
+            logger.info(
+                f"Peer benchmarks rolled up for "
+                f"{histograms['total_applications'].sample_size} users"
+            )
+            return {metric: h.sample_size for metric, h in histograms.items()}
+
+        except Exception as e:
+            self.db.rollback()
+            raise ServiceError(f"Failed to roll up peer benchmarks: {str(e)}")
+
+    def _user_counts(self, window_days: int):
+        since = datetime.utcnow() - timedelta(days=window_days)
+        return (
+            self.db.query(
+                func.count(Application.id),
+                func.sum(
+                    case(
+                        (Application.status.notin_(NO_RESPONSE_STATUSES), 1),
+                        else_=0,
+                    )
+                ),
+                func.sum(
+                    case((Application.status.in_(INTERVIEW_STATUSES), 1), else_=0)
+                ),
+                func.sum(case((Application.status == "offer", 1), else_=0)),
+            )
+            .filter(Application.created_at >= since)
+            .group_by(Application.user_id)
+            .yield_per(self.ROLLUP_CHUNK_SIZE)
+        )
+
+    def _save(self, histograms: Dict[str, Histogram], window_days: int) -> None:
+        existing = self.get_benchmarks(window_days)
+        now = datetime.utcnow()
+
+        for metric, histogram in histograms.items():
+            benchmark = existing.get(metric)
+            if benchmark is None:
+                benchmark = PeerBenchmark(metric=metric, window_days=window_days)
+                self.db.add(benchmark)
+
+            benchmark.bin_edges = histogram.edges
+            benchmark.cumulative_counts = histogram.cumulative_counts()
+            benchmark.sample_size = histogram.sample_size
+            benchmark.mean = histogram.mean
+            benchmark.computed_at = now
+
+    def get_benchmarks(
+        self, window_days: int = BENCHMARK_WINDOW_DAYS
+    ) -> Dict[str, PeerBenchmark]:
+        """Stored benchmark rows for the window, keyed by metric"""
+        rows = (
+            self.db.query(PeerBenchmark)
+            .filter(PeerBenchmark.window_days == window_days)
+            .all()
+        )
+        return {row.metric: row for row in rows}
+
+    @staticmethod
+    def percentile(benchmark: PeerBenchmark, value: float) -> float:
+        """Percentile of ``value`` within a stored benchmark"""
+        cumulative = benchmark.cumulative_counts
+        size = cumulative[-1] if cumulative else 0
+        if not size:
+            return 50.0
+
+        # Cumulative counts make the lookup independent of bin count
+        edges = benchmark.bin_edges
+        index = min(max(bisect_right(edges, value) - 1, 0), len(cumulative) - 1)
+        below = cumulative[index - 1] if index else 0
+        in_bin = cumulative[index] - below
+        low, high = edges[index], edges[index + 1]
+        fraction = min(max((value - low) / (high - low), 0.0), 1.0)
+
+        return (below + in_bin * fraction) / size * 100
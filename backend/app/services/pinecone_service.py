@@ -2,11 +2,15 @@
 
 import pinecone
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import hashlib
+import time
+
+import numpy as np
 
 from app.core.config import settings
 from app.core.exceptions import ServiceError
+from app.services.embedding_cache import get_embedding_cache
 from app.services.openai_service import OpenAIService
 from app.schemas.job_matching import (
     VectorSearchRequest,
@@ -18,33 +22,85 @@ from app.schemas.job_matching import (
 )
 
 
+def build_job_index_payload(job) -> Dict[str, Any]:
+    """Build ``PineconeService.index_job`` arguments from a Job row"""
+    return {
+        "job_id": str(job.id),
+        "job_title": job.title,
+        "job_description": job.description or "",
+        "required_skills": job.required_skills or [],
+        "metadata": {
+            "company": job.company or "",
+            "location": job.location or "",
+            "location_type": job.location_type or "onsite",
+            "salary_min": job.salary_min or 0,
+            "salary_max": job.salary_max or 0,
+            "experience_level": job.experience_level or "",
+            "visa_sponsorship": job.requires_visa_sponsorship or False,
+            "posted_date": (job.posted_date or datetime.utcnow()).isoformat(),
+        },
+    }
+
+
 class PineconeService:
     """Pinecone vector database operations"""
 
-    def __init__(self):
-        """Initialize Pinecone connection"""
+    # Texts per embeddings API request when batching
+    EMBEDDING_BATCH_SIZE = 100
+    # Vectors per upsert request (Pinecone recommends <= 100)
+    UPSERT_BATCH_SIZE = 100
+    # Vectors moved per query/upsert/delete round by migrate_skill_vectors
+    # (Pinecone caps top_k at 1000 when values are included)
+    MIGRATION_BATCH_SIZE = 1000
+    # Rounds migrate_skill_vectors waits for deletes to land when a query
+    # returns only vectors it already moved, and the wait between them
+    MIGRATION_MAX_STALE_ROUNDS = 5
+    MIGRATION_STALE_WAIT_SECONDS = 2.0
+    # Jobs per delete round in delete_jobs_vectors; their skill vectors
+    # must fit in one 10,000-match query
+    JOB_DELETE_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        jobs_index: Optional[Any] = None,
+        users_index: Optional[Any] = None,
+        openai_service: Optional[OpenAIService] = None,
+    ):
+        """
+        Initialize Pinecone connection
+
+        Prebuilt index handles (e.g. a local fake index in tests) and a
+        shared OpenAIService can be injected; Pinecone is only contacted
+        when an index is not supplied. Prefer
+        ``client_registry.get_pinecone_service()`` over constructing this
+        per request.
+        """
         try:
-            # Initialize Pinecone
-            pinecone.init(
-                api_key=settings.PINECONE_API_KEY,
-                environment=settings.PINECONE_ENVIRONMENT,
-            )
+            if jobs_index is None or users_index is None:
+                # Initialize Pinecone
+                pinecone.init(
+                    api_key=settings.PINECONE_API_KEY,
+                    environment=settings.PINECONE_ENVIRONMENT,
+                )
 
             # Get or create indexes
-            self.jobs_index = self._get_or_create_index(
+            self.jobs_index = jobs_index or self._get_or_create_index(
                 settings.PINECONE_INDEX_NAME_JOBS,
                 dimension=1536,  # OpenAI ada-002 embeddings
             )
-            self.users_index = self._get_or_create_index(
+            self.users_index = users_index or self._get_or_create_index(
                 settings.PINECONE_INDEX_NAME_USERS, dimension=1536
             )
 
             # Initialize OpenAI service for embeddings
-            self.openai_service = OpenAIService()
+            self.openai_service = openai_service or OpenAIService()
 
-            # Embedding cache
-            self._embedding_cache: Dict[str, tuple[List[float], datetime]] = {}
-            self._cache_ttl = timedelta(hours=24)
+            # Process-wide embedding cache (LRU + TTL, optional Redis tier)
+            self._embedding_cache = get_embedding_cache()
+
+            # Per-skill job vectors live apart from whole-job vectors so
+            # job searches never spend top_k slots on them
+            self.skills_namespace = settings.PINECONE_JOB_SKILLS_NAMESPACE
 
         except Exception as e:
             raise ServiceError(f"Failed to initialize Pinecone: {str(e)}")
@@ -70,22 +126,17 @@ class PineconeService:
         cache_key = hashlib.sha256(text.encode()).hexdigest()
 
         # Check cache
-        if use_cache and cache_key in self._embedding_cache:
-            vector, cached_at = self._embedding_cache[cache_key]
-            if datetime.utcnow() - cached_at < self._cache_ttl:
-                return vector
+        if use_cache:
+            cached = self._embedding_cache.get(cache_key)
+            if cached is not None:
+                return cached.tolist()
 
         # Generate new embedding
         try:
             vector = self.openai_service.create_embedding(text)
 
             # Cache the result
-            self._embedding_cache[cache_key] = (vector, datetime.utcnow())
-
-            # Clean old cache entries
-            self._clean_cache()
-
-            return vector
+            return self._embedding_cache.set(cache_key, vector).tolist()
         except Exception as e:
             raise ServiceError(f"Failed to generate embedding: {str(e)}")
 
@@ -105,6 +156,37 @@ class PineconeService:
 
         return all_vectors
 
+    def generate_embeddings(
+        self, texts: List[str], use_cache: bool = True
+    ) -> List[List[float]]:
+        """Generate embeddings for texts, batching all cache misses together"""
+        return [vector.tolist() for vector in self._embed_texts(texts, use_cache)]
+
+    def _embed_texts(
+        self, texts: List[str], use_cache: bool = True
+    ) -> List[np.ndarray]:
+        """Embed texts as float32 arrays with one batched call for cache misses"""
+        vectors: Dict[str, np.ndarray] = {}
+        misses: List[str] = []
+
+        for text in dict.fromkeys(texts):
+            cache_key = hashlib.sha256(text.encode()).hexdigest()
+            cached = self._embedding_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                vectors[text] = cached
+            else:
+                misses.append(text)
+
+        if misses:
+            generated = self.batch_generate_embeddings(
+                misses, batch_size=self.EMBEDDING_BATCH_SIZE
+            )
+            for text, vector in zip(misses, generated):
+                cache_key = hashlib.sha256(text.encode()).hexdigest()
+                vectors[text] = self._embedding_cache.set(cache_key, vector)
+
+        return [vectors[text] for text in texts]
+
     def index_user_skills(
         self, user_id: str, skills: List[SkillVector], resume_id: Optional[str] = None
     ):
@@ -150,49 +232,111 @@ class PineconeService:
         metadata: Dict[str, Any],
     ):
         """Index job posting in Pinecone"""
+        self.index_jobs(
+            [
+                {
+                    "job_id": job_id,
+                    "job_title": job_title,
+                    "job_description": job_description,
+                    "required_skills": required_skills,
+                    "metadata": metadata,
+                }
+            ]
+        )
+
+    def index_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Index many job postings with batched embeddings and chunked upserts.
+
+        Each item takes the same keys as ``index_job`` arguments. Job texts
+        and the de-duplicated set of required skills across all jobs are
+        embedded together (cached skills are not re-embedded), then job
+        vectors and per-skill vectors (into ``skills_namespace``) are
+        upserted in chunks.
+
+        Returns:
+            Number of vectors upserted
+        """
+        if not jobs:
+            return 0
+
         try:
-            # Generate embedding for full job description
-            job_text = f"{job_title}\n{job_description}\nRequired skills: {', '.join(required_skills)}"
-            job_vector = self.generate_embedding(job_text)
-
-            # Prepare metadata
-            job_metadata = {
-                "job_id": job_id,
-                "title": job_title,
-                "company": metadata.get("company", ""),
-                "location": metadata.get("location", ""),
-                "location_type": metadata.get("location_type", ""),
-                "salary_min": metadata.get("salary_min", 0),
-                "salary_max": metadata.get("salary_max", 0),
-                "required_skills": required_skills,
-                "experience_level": metadata.get("experience_level", ""),
-                "visa_sponsorship": metadata.get("visa_sponsorship", False),
-                "posted_date": metadata.get(
-                    "posted_date", datetime.utcnow().isoformat()
-                ),
-                "indexed_at": datetime.utcnow().isoformat(),
-            }
+            job_texts = [
+                f"{job['job_title']}\n{job['job_description']}\n"
+                f"Required skills: {', '.join(job['required_skills'])}"
+                for job in jobs
+            ]
+            skills = list(
+                dict.fromkeys(
+                    skill for job in jobs for skill in job["required_skills"]
+                )
+            )
 
-            # Upsert to Pinecone
-            self.jobs_index.upsert(vectors=[(job_id, job_vector, job_metadata)])
-
-            # Also index individual skills
-            skill_vectors = []
-            for skill in required_skills:
-                skill_vector = self.generate_embedding(skill)
-                skill_id = f"job_{job_id}_skill_{skill.replace(' ', '_')}"
-                skill_metadata = {
-                    **job_metadata,
-                    "skill": skill,
-                    "is_skill_vector": True,
-                }
-                skill_vectors.append((skill_id, skill_vector, skill_metadata))
+            vectors = self._embed_texts(job_texts + skills)
+            job_vectors = vectors[: len(jobs)]
+            skill_vector_map = dict(zip(skills, vectors[len(jobs) :]))
 
-            if skill_vectors:
-                self.jobs_index.upsert(vectors=skill_vectors)
+            job_upserts = []
+            skill_upserts = []
+            for job, job_vector in zip(jobs, job_vectors):
+                job_id = job["job_id"]
+                job_metadata = self._build_job_metadata(
+                    job_id, job["job_title"], job["required_skills"], job["metadata"]
+                )
+                job_upserts.append((job_id, job_vector.tolist(), job_metadata))
+
+                # Also index individual skills
+                for skill in job["required_skills"]:
+                    skill_id = f"job_{job_id}_skill_{skill.replace(' ', '_')}"
+                    skill_metadata = {
+                        **job_metadata,
+                        "skill": skill,
+                        "is_skill_vector": True,
+                    }
+                    skill_upserts.append(
+                        (skill_id, skill_vector_map[skill].tolist(), skill_metadata)
+                    )
+
+            self._upsert_in_chunks(self.jobs_index, job_upserts)
+            self._upsert_in_chunks(
+                self.jobs_index, skill_upserts, namespace=self.skills_namespace
+            )
+
+            return len(job_upserts) + len(skill_upserts)
 
         except Exception as e:
-            raise ServiceError(f"Failed to index job: {str(e)}")
+            raise ServiceError(f"Failed to index jobs: {str(e)}")
+
+    def _build_job_metadata(
+        self,
+        job_id: str,
+        job_title: str,
+        required_skills: List[str],
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Build Pinecone metadata for a job vector"""
+        return {
+            "job_id": job_id,
+            "title": job_title,
+            "company": metadata.get("company", ""),
+            "location": metadata.get("location", ""),
+            "location_type": metadata.get("location_type", ""),
+            "salary_min": metadata.get("salary_min", 0),
+            "salary_max": metadata.get("salary_max", 0),
+            "required_skills": required_skills,
+            "experience_level": metadata.get("experience_level", ""),
+            "visa_sponsorship": metadata.get("visa_sponsorship", False),
+            "posted_date": metadata.get("posted_date", datetime.utcnow().isoformat()),
+            "indexed_at": datetime.utcnow().isoformat(),
+        }
+
+    def _upsert_in_chunks(
+        self, index, vectors: List[tuple], namespace: Optional[str] = None
+    ) -> None:
+        """Upsert vectors in UPSERT_BATCH_SIZE chunks"""
+        kwargs = {"namespace": namespace} if namespace else {}
+        for i in range(0, len(vectors), self.UPSERT_BATCH_SIZE):
+            index.upsert(vectors=vectors[i : i + self.UPSERT_BATCH_SIZE], **kwargs)
 
     def search_similar_jobs(
         self,
@@ -200,7 +344,12 @@ class PineconeService:
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
     ) -> VectorSearchResponse:
-        """Search for jobs similar to user skills"""
+        """
+        Search for jobs similar to user skills.
+
+        Only whole-job vectors are searched, so up to ``top_k`` job
+        matches are returned without over-fetching.
+        """
         try:
             start_time = datetime.utcnow()
 
@@ -212,8 +361,10 @@ class PineconeService:
             combined_text = " ".join(skill_texts)
             query_vector = self.generate_embedding(combined_text)
 
-            # Build filter
-            pinecone_filter = {}
+            # Build filter. Skill vectors live in their own namespace; the
+            # is_skill_vector clause also excludes any not yet migrated
+            # out of the default namespace.
+            pinecone_filter = {"is_skill_vector": {"$ne": True}}
             if filters:
                 if filters.get("visa_sponsorship") is not None:
                     pinecone_filter["visa_sponsorship"] = {
@@ -231,7 +382,7 @@ class PineconeService:
                 vector=query_vector,
                 top_k=top_k,
                 include_metadata=True,
-                filter=pinecone_filter if pinecone_filter else None,
+                filter=pinecone_filter,
             )
 
             # Convert to response format
@@ -240,9 +391,6 @@ class PineconeService:
                     id=match.id, score=match.score, metadata=match.metadata
                 )
                 for match in results.matches
-                if not match.metadata.get(
-                    "is_skill_vector", False
-                )  # Exclude skill vectors
             ]
 
             query_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -304,24 +452,130 @@ class PineconeService:
 
     def delete_job_vectors(self, job_id: str):
         """Delete all vectors for a job"""
+        self.delete_jobs_vectors([job_id])
+
+    def delete_jobs_vectors(self, job_ids: List[str]):
+        """
+        Delete all vectors (whole-job and per-skill) for many jobs
+
+        Skill vectors are deleted from ``skills_namespace`` and, for indexes
+        not yet migrated with migrate_skill_vectors, from the default
+        namespace, so a later migration cannot copy orphans across.
+        """
         try:
-            # Delete main job vector
-            self.jobs_index.delete(ids=[job_id])
+            for i in range(0, len(job_ids), self.JOB_DELETE_BATCH_SIZE):
+                chunk = job_ids[i : i + self.JOB_DELETE_BATCH_SIZE]
+
+                # Delete main job vectors
+                self.jobs_index.delete(ids=chunk)
+
+                # Delete skill vectors, then legacy ones in the default namespace
+                for namespace, skill_filter in (
+                    (self.skills_namespace, {"job_id": {"$in": chunk}}),
+                    (
+                        "",
+                        {
+                            "job_id": {"$in": chunk},
+                            "is_skill_vector": {"$eq": True},
+                        },
+                    ),
+                ):
+                    results = self.jobs_index.query(
+                        vector=[0.0] * 1536,  # Dummy vector
+                        top_k=10000,
+                        filter=skill_filter,
+                        include_metadata=False,
+                        namespace=namespace,
+                    )
 
-            # Delete skill vectors
-            results = self.jobs_index.query(
-                vector=[0.0] * 1536,  # Dummy vector
-                top_k=10000,
-                filter={"job_id": {"$eq": job_id}, "is_skill_vector": {"$eq": True}},
-                include_metadata=False,
-            )
+                    if results.matches:
+                        vector_ids = [match.id for match in results.matches]
+                        self.jobs_index.delete(ids=vector_ids, namespace=namespace)
 
-            if results.matches:
-                vector_ids = [match.id for match in results.matches]
+        except Exception as e:
+            raise ServiceError(f"Failed to delete job vectors: {str(e)}")
+
+    def migrate_skill_vectors(
+        self, batch_size: Optional[int] = None, dry_run: bool = False
+    ) -> int:
+        """
+        Move per-skill job vectors out of the default namespace.
+
+        Vectors indexed before skill vectors had their own namespace are
+        found by their ``is_skill_vector`` metadata, copied (values and
+        metadata unchanged) into ``skills_namespace``, then deleted from
+        the default namespace, one batch at a time, until a query finds
+        none left. Safe to re-run.
+
+        Deletes are eventually consistent, so a query can return only
+        vectors already moved. The delete is then repeated and the query
+        retried up to MIGRATION_MAX_STALE_ROUNDS times.
+
+        Returns:
+            Number of vectors moved (or found, up to 10000, for a dry run)
+
+        Raises:
+            ServiceError: If legacy vectors are still listed after the retries
+        """
+        batch_size = batch_size or self.MIGRATION_BATCH_SIZE
+        legacy_filter = {"is_skill_vector": {"$eq": True}}
+        moved = 0
+        seen = set()
+        stale_rounds = 0
+
+        try:
+            if dry_run:
+                results = self.jobs_index.query(
+                    vector=[0.0] * 1536,  # Dummy vector
+                    top_k=10000,
+                    filter=legacy_filter,
+                    include_metadata=False,
+                )
+                return len(results.matches)
+
+            while True:
+                results = self.jobs_index.query(
+                    vector=[0.0] * 1536,  # Dummy vector
+                    top_k=batch_size,
+                    filter=legacy_filter,
+                    include_metadata=True,
+                    include_values=True,
+                )
+                if not results.matches:
+                    break
+
+                batch = [m for m in results.matches if m.id not in seen]
+                if not batch:
+                    # Only vectors moved in an earlier round: their deletes
+                    # have not landed yet (or were lost), so retry them
+                    stale_rounds += 1
+                    if stale_rounds > self.MIGRATION_MAX_STALE_ROUNDS:
+                        raise ServiceError(
+                            f"{len(results.matches)} moved skill vectors still "
+                            f"listed in the default namespace after "
+                            f"{self.MIGRATION_MAX_STALE_ROUNDS} retries"
+                        )
+                    self.jobs_index.delete(ids=[m.id for m in results.matches])
+                    time.sleep(self.MIGRATION_STALE_WAIT_SECONDS)
+                    continue
+
+                stale_rounds = 0
+                vector_ids = [match.id for match in batch]
+                self._upsert_in_chunks(
+                    self.jobs_index,
+                    [(match.id, list(match.values), match.metadata) for match in batch],
+                    namespace=self.skills_namespace,
+                )
                 self.jobs_index.delete(ids=vector_ids)
+                seen.update(vector_ids)
+                moved += len(vector_ids)
 
+            return moved
+
+        except ServiceError:
+            raise
         except Exception as e:
-            raise ServiceError(f"Failed to delete job vectors: {str(e)}")
+            raise ServiceError(f"Failed to migrate skill vectors: {str(e)}")
 
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts"""
@@ -330,8 +584,6 @@ class PineconeService:
             vector2 = self.generate_embedding(text2)
 
             # Calculate cosine similarity
-            import numpy as np
-
             similarity = np.dot(vector1, vector2) / (
                 np.linalg.norm(vector1) * np.linalg.norm(vector2)
             )
@@ -341,16 +593,31 @@ class PineconeService:
         except Exception as e:
             raise ServiceError(f"Failed to calculate similarity: {str(e)}")
 
-    def _clean_cache(self):
-        """Remove expired cache entries"""
-        now = datetime.utcnow()
-        expired_keys = [
-            key
-            for key, (_, cached_at) in self._embedding_cache.items()
-            if now - cached_at > self._cache_ttl
-        ]
-        for key in expired_keys:
-            del self._embedding_cache[key]
+    def calculate_similarity_matrix(
+        self, texts_a: List[str], texts_b: List[str]
+    ) -> np.ndarray:
+        """
+        Calculate pairwise cosine similarity between two lists of texts.
+
+        All texts are embedded in one batched call and the result is a
+        ``len(texts_a) x len(texts_b)`` matrix from a single matmul over
+        L2-normalized vectors.
+        """
+        if not texts_a or not texts_b:
+            return np.zeros((len(texts_a), len(texts_b)), dtype=np.float32)
+
+        try:
+            vectors = np.stack(self._embed_texts(list(texts_a) + list(texts_b)))
+
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+
+            matrix_a = vectors[: len(texts_a)]
+            matrix_b = vectors[len(texts_a) :]
+            return matrix_a @ matrix_b.T
+
+        except Exception as e:
+            raise ServiceError(f"Failed to calculate similarity matrix: {str(e)}")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get Pinecone index statistics"""
@@ -368,6 +635,7 @@ class PineconeService:
                     "dimension": users_stats.dimension,
                 },
                 "cache_size": len(self._embedding_cache),
+                "embedding_cache": self._embedding_cache.stats(),
             }
         except Exception as e:
             raise ServiceError(f"Failed to get stats: {str(e)}")
@@ -9,10 +9,12 @@ Calculates 0-100 fit index based on weighted factors:
 - Availability: 10%
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session, joinedload
 
 from app.db.models.application import Application
@@ -21,6 +23,61 @@ from app.db.models.job import Job
 from app.schemas.application import FitIndexResponse
 
 
+# Typical years of experience per job experience_level
+EXPERIENCE_LEVEL_RANGES = {
+    "entry": (0, 2),
+    "mid": (3, 5),
+    "senior": (5, 10),
+    "lead": (8, 15),
+    "executive": (10, 99),
+}
+
+
+@dataclass(frozen=True)
+class JobRankingFeatures:
+    """Job-side inputs to fit scoring, normalized once per job"""
+
+    job: Job
+    required_skills: Tuple[str, ...]  # lowercased, in posting order
+    required_skill_set: FrozenSet[str]
+    preferred_skill_set: FrozenSet[str]
+    location: Optional[str]  # lowercased
+    location_parts: Tuple[str, ...]
+    location_type: Optional[str]
+    experience_band: Optional[Tuple[float, float]]  # (min_years, max_years)
+    salary_band: Optional[Tuple[int, int]]  # (min, max); None if no max
+
+    @classmethod
+    def from_job(cls, job: Job) -> "JobRankingFeatures":
+        required_skills = tuple(s.lower() for s in job.required_skills or [])
+        location = job.location.lower() if job.location else None
+
+        if job.experience_min_years and job.experience_max_years:
+            experience_band = (job.experience_min_years, job.experience_max_years)
+        elif job.experience_min_years:
+            experience_band = (job.experience_min_years, float("inf"))
+        elif job.experience_level:
+            experience_band = EXPERIENCE_LEVEL_RANGES.get(job.experience_level, (0, 99))
+        else:
+            experience_band = None
+
+        return cls(
+            job=job,
+            required_skills=required_skills,
+            required_skill_set=frozenset(required_skills),
+            preferred_skill_set=frozenset(
+                s.lower() for s in job.preferred_skills or []
+            ),
+            location=location,
+            location_parts=tuple(location.split(",")) if location else (),
+            location_type=job.location_type,
+            experience_band=experience_band,
+            salary_band=(
+                (job.salary_min or 0, job.salary_max) if job.salary_max else None
+            ),
+        )
+
+
 class CandidateRankingService:
     """Service for AI-powered candidate ranking"""
 
@@ -64,15 +121,23 @@ class CandidateRankingService:
         if not candidate or not job:
             raise Exception("Candidate or job not found")
 
-        profile = candidate.profile
+        return self._score_candidate(
+            candidate.profile, JobRankingFeatures.from_job(job)
+        )
+
+    def _score_candidate(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> FitIndexResponse:
+        """Score one candidate profile against precomputed job features"""
+        job = features.job
 
         # Calculate individual factor scores
-        skills_score = self._calculate_skills_match(profile, job)
-        experience_score = self._calculate_experience_match(profile, job)
-        location_score = self._calculate_location_match(profile, job)
-        culture_score = self._calculate_culture_fit(profile, job)
-        salary_score = self._calculate_salary_match(profile, job)
-        availability_score = self._calculate_availability_match(profile, job)
+        skills_score = self._calculate_skills_match(profile, features)
+        experience_score = self._calculate_experience_match(profile, features)
+        location_score = self._calculate_location_match(profile, features)
+        culture_score = self._calculate_culture_fit(profile, features)
+        salary_score = self._calculate_salary_match(profile, features)
+        availability_score = self._calculate_availability_match(profile, features)
 
         # Calculate weighted total
         total_score = (
@@ -94,13 +159,13 @@ class CandidateRankingService:
         # Skills
         if skills_score >= 80:
             explanations.append(f"Skills match: {int(skills_score)}%")
-            matched_skills = self._get_matched_skills(profile, job)
+            matched_skills = self._get_matched_skills(profile, features)
             strengths.append(
                 f"{len(matched_skills)}/{len(job.required_skills or [])} required skills match: {', '.join(matched_skills[:3])}"
             )
         elif skills_score >= 60:
             explanations.append(f"Skills match: {int(skills_score)}% (partial)")
-            matched_skills = self._get_matched_skills(profile, job)
+            matched_skills = self._get_matched_skills(profile, features)
             missing_skills = set(job.required_skills or []) - set(matched_skills)
             if missing_skills:
                 concerns.append(
@@ -171,24 +236,23 @@ class CandidateRankingService:
             concerns=concerns,
         )
 
-    def _calculate_skills_match(self, profile: Optional[Profile], job: Job) -> float:
+    def _calculate_skills_match(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> float:
         """Calculate skills match score (0-100)"""
-        if not profile or not profile.skills or not job.required_skills:
+        if not profile or not profile.skills or not features.required_skills:
             return 50.0  # Neutral score if no data
 
         candidate_skills = set([s.lower() for s in profile.skills])
-        required_skills = set([s.lower() for s in job.required_skills])
-
-        if not required_skills:
-            return 100.0
+        required_skills = features.required_skill_set
 
         # Calculate overlap
         matched_skills = candidate_skills.intersection(required_skills)
         match_ratio = len(matched_skills) / len(required_skills)
 
         # Also consider preferred skills
-        if job.preferred_skills:
-            preferred_skills = set([s.lower() for s in job.preferred_skills])
+        if features.preferred_skill_set:
+            preferred_skills = features.preferred_skill_set
             preferred_matched = candidate_skills.intersection(preferred_skills)
             # Bonus for preferred skills (up to 20%)
             bonus = min(
@@ -200,78 +264,56 @@ class CandidateRankingService:
         base_score = match_ratio * 100
         return min(100.0, base_score + bonus)
 
-    def _get_matched_skills(self, profile: Optional[Profile], job: Job) -> List[str]:
+    def _get_matched_skills(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> List[str]:
         """Get list of matched skills"""
-        if not profile or not profile.skills or not job.required_skills:
+        if not profile or not profile.skills or not features.required_skills:
             return []
 
         candidate_skills_lower = {s.lower(): s for s in profile.skills}
-        required_skills_lower = [s.lower() for s in job.required_skills]
 
         matched = []
-        for req_skill in required_skills_lower:
+        for req_skill in features.required_skills:
             if req_skill in candidate_skills_lower:
                 matched.append(candidate_skills_lower[req_skill])
 
         return matched
 
     def _calculate_experience_match(
-        self, profile: Optional[Profile], job: Job
+        self, profile: Optional[Profile], features: JobRankingFeatures
     ) -> float:
         """Calculate experience level match score (0-100)"""
         if not profile or profile.years_experience is None:
             return 50.0  # Neutral if no data
 
-        years_exp = profile.years_experience
+        if not features.experience_band:
+            return 50.0
 
-        # Check if within range
-        if job.experience_min_years and job.experience_max_years:
-            if job.experience_min_years <= years_exp <= job.experience_max_years:
-                return 100.0
-            elif years_exp < job.experience_min_years:
-                # Under-experienced
-                gap = job.experience_min_years - years_exp
-                return max(0.0, 100 - (gap * 15))  # -15 points per year short
-            else:
-                # Over-experienced (less penalized)
-                excess = years_exp - job.experience_max_years
-                return max(70.0, 100 - (excess * 5))  # -5 points per year over
-        elif job.experience_min_years:
-            if years_exp >= job.experience_min_years:
-                return 100.0
-            else:
-                gap = job.experience_min_years - years_exp
-                return max(0.0, 100 - (gap * 15))
-
-        # Map experience level to years if available
-        if job.experience_level:
-            level_ranges = {
-                "entry": (0, 2),
-                "mid": (3, 5),
-                "senior": (5, 10),
-                "lead": (8, 15),
-                "executive": (10, 99),
-            }
-            min_years, max_years = level_ranges.get(job.experience_level, (0, 99))
-            if min_years <= years_exp <= max_years:
-                return 100.0
-            elif years_exp < min_years:
-                return max(0.0, 100 - ((min_years - years_exp) * 15))
-            else:
-                return max(70.0, 100 - ((years_exp - max_years) * 5))
+        years_exp = profile.years_experience
+        min_years, max_years = features.experience_band
 
-        return 50.0
+        if min_years <= years_exp <= max_years:
+            return 100.0
+        elif years_exp < min_years:
+            # Under-experienced: -15 points per year short
+            return max(0.0, 100 - ((min_years - years_exp) * 15))
+        else:
+            # Over-experienced (less penalized): -5 points per year over
+            return max(70.0, 100 - ((years_exp - max_years) * 5))
 
-    def _calculate_location_match(self, profile: Optional[Profile], job: Job) -> float:
+    def _calculate_location_match(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> float:
         """Calculate location match score (0-100)"""
-        if job.location_type == "remote":
+        if features.location_type == "remote":
             return 100.0  # Perfect match for remote jobs
 
-        if not profile or not profile.location or not job.location:
+        if not profile or not profile.location or not features.location:
             return 50.0
 
         candidate_location = profile.location.lower()
-        job_location = job.location.lower()
+        job_location = features.location
 
         # Simple city/state matching
         if candidate_location == job_location:
@@ -279,22 +321,24 @@ class CandidateRankingService:
         elif any(part in job_location for part in candidate_location.split(",")):
             # Same metro area
             return 85.0
-        elif any(part in candidate_location for part in job_location.split(",")):
+        elif any(part in candidate_location for part in features.location_parts):
             # Related location
             return 70.0
         else:
             # Different location
-            if job.location_type == "onsite":
+            if features.location_type == "onsite":
                 return 20.0  # Low score for onsite mismatch
             else:  # hybrid
                 return 50.0  # Medium score for hybrid mismatch
 
-    def _calculate_culture_fit(self, profile: Optional[Profile], job: Job) -> float:
+    def _calculate_culture_fit(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> float:
         """Calculate culture fit score (0-100)"""
         # Placeholder: Could analyze resume tone, values, etc.
         # For now, use location type preference as proxy
         if profile and profile.preferred_location_type:
-            if profile.preferred_location_type == job.location_type:
+            if profile.preferred_location_type == features.location_type:
                 return 90.0
             elif profile.preferred_location_type == "any":
                 return 80.0
@@ -303,16 +347,17 @@ class CandidateRankingService:
 
         return 75.0  # Default neutral-positive
 
-    def _calculate_salary_match(self, profile: Optional[Profile], job: Job) -> float:
+    def _calculate_salary_match(
+        self, profile: Optional[Profile], features: JobRankingFeatures
+    ) -> float:
         """Calculate salary expectation match score (0-100)"""
-        if not profile or not profile.expected_salary_min or not job.salary_max:
+        if not profile or not profile.expected_salary_min or not features.salary_band:
             return 75.0  # Neutral if no data
 
         candidate_min = profile.expected_salary_min
         candidate_max = profile.expected_salary_max or candidate_min * 1.2
 
-        job_min = job.salary_min or 0
-        job_max = job.salary_max or 999999
+        job_min, job_max = features.salary_band
 
         # Check if ranges overlap
         if candidate_min <= job_max and candidate_max >= job_min:
@@ -335,7 +380,7 @@ class CandidateRankingService:
             return 100.0
 
     def _calculate_availability_match(
-        self, profile: Optional[Profile], job: Job
+        self, profile: Optional[Profile], features: JobRankingFeatures
     ) -> float:
         """Calculate availability match score (0-100)"""
         if not profile or not profile.availability_status:
@@ -355,6 +400,10 @@ class CandidateRankingService:
         """
         Rank all candidates for a job by fit index.
 
+        The job is loaded and normalized once, every applicant profile is
+        fetched in a single query and scored in one pass, and fit indexes
+        are written back with one bulk UPDATE.
+
         Args:
             job_id: Job ID
             update_applications: If True, update application.fit_index
@@ -362,31 +411,27 @@ class CandidateRankingService:
         Returns:
             List of ranked candidates with fit details
         """
-        # Get all applications for job
-        applications = (
-            self.db.query(Application)
-            .options(joinedload(Application.user).joinedload(User.profile))
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise Exception("Job not found")
+
+        features = JobRankingFeatures.from_job(job)
+
+        # Get all applications for job with their candidate profiles
+        rows = (
+            self.db.query(Application.id, Application.user_id, Profile)
+            .outerjoin(Profile, Profile.user_id == Application.user_id)
             .filter(Application.job_id == job_id)
             .all()
         )
 
         results = []
-
-        for app in applications:
-            # Calculate fit index
-            fit_result = self.calculate_fit_index(
-                candidate_user_id=app.user_id, job_id=job_id
-            )
-
-            # Update application if requested
-            if update_applications:
-                app.fit_index = fit_result.fit_index
-                app.updated_at = datetime.utcnow()
-
+        for application_id, user_id, profile in rows:
+            fit_result = self._score_candidate(profile, features)
             results.append(
                 {
-                    "application_id": app.id,
-                    "candidate_id": app.user_id,
+                    "application_id": application_id,
+                    "candidate_id": user_id,
                     "fit_index": fit_result.fit_index,
                     "explanations": fit_result.explanations,
                     "strengths": fit_result.strengths,
@@ -394,7 +439,19 @@ class CandidateRankingService:
                 }
             )
 
-        if update_applications:
+        if update_applications and results:
+            now = datetime.utcnow()
+            self.db.execute(
+                update(Application),
+                [
+                    {
+                        "id": result["application_id"],
+                        "fit_index": result["fit_index"],
+                        "updated_at": now,
+                    }
+                    for result in results
+                ],
+            )
             self.db.commit()
 
         # Sort by fit_index descending
@@ -402,6 +459,65 @@ class CandidateRankingService:
 
         return results
 
+    def refresh_fit_indexes(
+        self,
+        job_ids: Optional[List[UUID]] = None,
+        user_ids: Optional[List[UUID]] = None,
+        application_ids: Optional[List[UUID]] = None,
+    ) -> int:
+        """
+        Recompute and store fit_index for applications matching any of the
+        given jobs, candidates or application IDs.
+
+        Applications are loaded with their job and profile in one query,
+        job features are built once per job, and scores are written with
+        one bulk UPDATE. Used for incremental refresh after Profile/Job
+        changes.
+
+        Returns:
+            Number of applications updated
+        """
+        conditions = []
+        if job_ids:
+            conditions.append(Application.job_id.in_(job_ids))
+        if user_ids:
+            conditions.append(Application.user_id.in_(user_ids))
+        if application_ids:
+            conditions.append(Application.id.in_(application_ids))
+        if not conditions:
+            return 0
+
+        rows = (
+            self.db.query(Application.id, Job, Profile)
+            .join(Job, Job.id == Application.job_id)
+            .outerjoin(Profile, Profile.user_id == Application.user_id)
+            .filter(or_(*conditions))
+            .all()
+        )
+        if not rows:
+            return 0
+
+        features_by_job: Dict[UUID, JobRankingFeatures] = {}
+        now = datetime.utcnow()
+        updates = []
+        for application_id, job, profile in rows:
+            features = features_by_job.get(job.id)
+            if features is None:
+                features = features_by_job[job.id] = JobRankingFeatures.from_job(job)
+
+            updates.append(
+                {
+                    "id": application_id,
+                    "fit_index": self._score_candidate(profile, features).fit_index,
+                    "updated_at": now,
+                }
+            )
+
+        self.db.execute(update(Application), updates)
+        self.db.commit()
+
+        return len(updates)
+
     def update_application_fit_index(self, application_id: UUID) -> Application:
         """
         Calculate and update fit index for a single application.
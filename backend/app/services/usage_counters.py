@@ -0,0 +1,320 @@
+"""
+Redis-backed usage counters for subscription limits
+
+Each company has one Redis hash holding its plan state (subscription
+active flag, per-resource limits, billing period) and per-resource
+``used``/``synced`` counters. A limit check-and-increment is a single
+Lua script call, so a candidate profile view costs one Redis round trip
+instead of loading Company and CompanySubscription and committing a
+counter bump.
+
+``used - synced`` is the part not yet written back. A periodic worker
+adds it to ``candidate_views_this_month`` / ``jobs_posted_this_month``
+in CompanySubscription. The plan state is reloaded from the database
+every USAGE_COUNTER_PLAN_TTL_SECONDS. It is also reloaded once the
+billing period has ended, which starts counters for the new period.
+"""
+
+import calendar
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ("jobs", "candidate_views")
+
+# Status codes returned by the consume script
+_RELOAD, _INACTIVE, _ALLOWED, _LIMIT_REACHED, _UNLIMITED = -1, 0, 1, 2, 3
+
+# KEYS: usage hash, dirty set
+# ARGV: resource, now (epoch), company id, count only ("1" = skip limit check)
+_CONSUME_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'plan_expires', 'period_end',
+    'active', 'limit:' .. ARGV[1], 'used:' .. ARGV[1])
+if not state[1] then
+    return {-1, 0, 0}
+end
+local now = tonumber(ARGV[2])
+local period_end = tonumber(state[2])
+if now >= tonumber(state[1]) or (period_end > 0 and now >= period_end) then
+    return {-1, 0, 0}
+end
+
+local limit = tonumber(state[4])
+local used = tonumber(state[5])
+if ARGV[4] ~= '1' then
+    if state[3] ~= '1' then
+        return {0, used, limit}
+    end
+    if limit < 0 then
+        return {3, used, limit}
+    end
+    if used >= limit then
+        return {2, used, limit}
+    end
+end
+
+redis.call('HINCRBY', KEYS[1], 'used:' .. ARGV[1], 1)
+redis.call('SADD', KEYS[2], ARGV[3])
+return {1, used, limit}
+"""
+
+# KEYS: usage hash
+# ARGV: period, period_end, plan_expires, active, ttl, then per resource
+#       (in RESOURCES order) limit and database count
+_PRIME_SCRIPT = """
+local same_period = redis.call('HGET', KEYS[1], 'period') == ARGV[1]
+local resources = {'jobs', 'candidate_views'}
+for i, resource in ipairs(resources) do
+    local limit = ARGV[4 + 2 * i]
+    local stored = tonumber(ARGV[5 + 2 * i])
+    local used = stored
+    if same_period then
+        -- Keep counts not yet written back on top of the database value
+        local current = redis.call('HMGET', KEYS[1],
+            'used:' .. resource, 'synced:' .. resource)
+        used = stored + (tonumber(current[1]) or stored)
+            - (tonumber(current[2]) or stored)
+    end
+    redis.call('HSET', KEYS[1], 'limit:' .. resource, limit,
+        'used:' .. resource, used, 'synced:' .. resource, stored)
+end
+redis.call('HSET', KEYS[1], 'period', ARGV[1], 'period_end', ARGV[2],
+    'plan_expires', ARGV[3], 'active', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+@dataclass
+class CounterResult:
+    """Outcome of a counter check-and-increment"""
+
+    active: bool
+    allowed: bool
+    unlimited: bool
+    current_usage: int  # Before this increment
+    limit: int
+
+
+def _epoch(value: Optional[datetime]) -> int:
+    return calendar.timegm(value.utctimetuple()) if value else 0
+
+
+def period_key(period_start: Optional[datetime]) -> str:
+    """Identifier of a billing period"""
+    return period_start.isoformat() if period_start else "open"
+
+
+def _decode(value) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# Hash fields read back for write-back: period, then used/synced per resource
+_COUNTER_FIELDS = ["period"] + [
+    f"{name}:{resource}" for resource in RESOURCES for name in ("used", "synced")
+]
+
+
+def _unsynced_counts(values: List) -> Dict[str, int]:
+    return {
+        resource: int(values[1 + 2 * i] or 0) - int(values[2 + 2 * i] or 0)
+        for i, resource in enumerate(RESOURCES)
+    }
+
+
+class UsageCounterStore:
+    """
+    Per-company usage counters in Redis.
+
+    All methods raise on Redis errors; callers fall back to the database.
+    After a failure the store reports itself unavailable for
+    ``retry_after_seconds`` so a Redis outage doesn't add a timeout to
+    every request.
+    """
+
+    KEY_PREFIX = "hireflux:usage:"
+    DIRTY_KEY = "hireflux:usage:dirty"
+    # Keep counters around after the period ends so write-back can finish
+    RETENTION_SECONDS = 7 * 24 * 3600
+
+    def __init__(
+        self,
+        redis_client=None,
+        plan_ttl_seconds: int = 300,
+        retry_after_seconds: float = 30.0,
+    ):
+        self._redis = redis_client
+        self.plan_ttl_seconds = plan_ttl_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._consume = self._prime = None
+        if redis_client is not None:
+            self._consume = redis_client.register_script(_CONSUME_SCRIPT)
+            self._prime = redis_client.register_script(_PRIME_SCRIPT)
+
+    @property
+    def available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._retry_at
+
+    def mark_failed(self, error: Exception) -> None:
+        """Skip Redis for a while after an error"""
+        logger.warning(f"Redis usage counters unavailable: {error}")
+        with self._lock:
+            self._retry_at = time.monotonic() + self.retry_after_seconds
+
+    def _key(self, company_id: UUID) -> str:
+        return self.KEY_PREFIX + str(company_id)
+
+    def consume(
+        self, company_id: UUID, resource: str, now: Optional[datetime] = None
+    ) -> Optional[CounterResult]:
+        """
+        Check the limit and count one use if allowed.
+
+        Returns:
+            CounterResult, or None when the plan state must be (re)loaded
+            with ``prime`` first
+        """
+        return self._run_consume(company_id, resource, now, count_only=False)
+
+    def increment(
+        self, company_id: UUID, resource: str, now: Optional[datetime] = None
+    ) -> bool:
+        """Count one use without a limit check (False if not primed)"""
+        result = self._run_consume(company_id, resource, now, count_only=True)
+        return result is not None
+
+    def _run_consume(
+        self,
+        company_id: UUID,
+        resource: str,
+        now: Optional[datetime],
+        count_only: bool,
+    ) -> Optional[CounterResult]:
+        status, used, limit = self._consume(
+            keys=[self._key(company_id), self.DIRTY_KEY],
+            args=[
+                resource,
+                _epoch(now or datetime.utcnow()),
+                str(company_id),
+                "1" if count_only else "0",
+            ],
+        )
+        if status == _RELOAD:
+            return None
+
+        return CounterResult(
+            active=status != _INACTIVE,
+            allowed=status in (_ALLOWED, _UNLIMITED),
+            unlimited=status == _UNLIMITED,
+            current_usage=int(used),
+            limit=int(limit),
+        )
+
+    def prime(
+        self,
+        company_id: UUID,
+        active: bool,
+        period_start: Optional[datetime],
+        period_end: Optional[datetime],
+        limits: Dict[str, int],
+        stored_usage: Dict[str, int],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Load plan state and database counts for the current period"""
+        now_epoch = _epoch(now or datetime.utcnow())
+        end_epoch = _epoch(period_end)
+        ttl = max(end_epoch - now_epoch, 0) + self.RETENTION_SECONDS
+
+        args = [
+            period_key(period_start),
+            end_epoch,
+            now_epoch + self.plan_ttl_seconds,
+            "1" if active else "0",
+            ttl,
+        ]
+        for resource in RESOURCES:
+            args.extend([limits[resource], stored_usage[resource] or 0])
+
+        self._prime(keys=[self._key(company_id)], args=args)
+
+    def unsynced(
+        self, company_id: UUID, period_start: Optional[datetime]
+    ) -> Dict[str, int]:
+        """Uses counted in Redis but not yet written back, per resource"""
+        values = self._redis.hmget(self._key(company_id), _COUNTER_FIELDS)
+
+        if _decode(values[0]) != period_key(period_start):
+            return {resource: 0 for resource in RESOURCES}
+        return _unsynced_counts(values)
+
+    def pop_dirty(self, limit: int) -> List[UUID]:
+        """Remove and return up to ``limit`` companies with unsynced counts"""
+        members = self._redis.spop(self.DIRTY_KEY, limit) or []
+        return [UUID(_decode(member)) for member in members]
+
+    def mark_dirty(self, company_ids: Iterable[UUID]) -> None:
+        members = [str(company_id) for company_id in company_ids]
+        if members:
+            self._redis.sadd(self.DIRTY_KEY, *members)
+
+    def pending_writes(
+        self, company_ids: List[UUID]
+    ) -> Dict[UUID, Tuple[str, Dict[str, int]]]:
+        """Period and unsynced count per resource for each company"""
+        pipe = self._redis.pipeline(transaction=False)
+        for company_id in company_ids:
+            pipe.hmget(self._key(company_id), _COUNTER_FIELDS)
+
+        return {
+            company_id: (_decode(values[0]), _unsynced_counts(values))
+            for company_id, values in zip(company_ids, pipe.execute())
+            if values[0] is not None
+        }
+
+    def mark_synced(self, written: Dict[UUID, Dict[str, int]]) -> None:
+        """Record counts written back to the database"""
+        pipe = self._redis.pipeline(transaction=False)
+        for company_id, deltas in written.items():
+            for resource, delta in deltas.items():
+                if delta:
+                    pipe.hincrby(self._key(company_id), f"synced:{resource}", delta)
+        pipe.execute()
+
+
+_store: Optional[UsageCounterStore] = None
+_store_lock = threading.Lock()
+
+
+def get_usage_counters() -> UsageCounterStore:
+    """Get the process-wide usage counter store"""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                redis_client = None
+                if settings.USAGE_COUNTERS_ENABLED:
+                    redis_client = get_redis_client()
+                _store = UsageCounterStore(
+                    redis_client,
+                    plan_ttl_seconds=settings.USAGE_COUNTER_PLAN_TTL_SECONDS,
+                )
+
+    return _store
+
+
+def set_usage_counters(store: Optional[UsageCounterStore]) -> None:
+    """Replace the shared store (None forces re-creation)"""
+    global _store
+    _store = store
@@ -4,14 +4,35 @@ Implements subscription plan limits for Issue #64
 Prevents revenue loss from free tier abuse
 """
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.db.models.company import Company, CompanySubscription
+from app.services.usage_counters import (
+    RESOURCES,
+    CounterResult,
+    UsageCounterStore,
+    get_usage_counters,
+    period_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# Subscription counter column and company limit attribute per resource
+USAGE_COLUMNS = {
+    "jobs": "jobs_posted_this_month",
+    "candidate_views": "candidate_views_this_month",
+}
+LIMIT_ATTRIBUTES = {
+    "jobs": "max_active_jobs",
+    "candidate_views": "max_candidate_views",
+}
 
 
 class UsageLimitError(Exception):
@@ -83,8 +104,25 @@ class UsageLimitService:
 
     WARNING_THRESHOLD = 0.8  # Warn at 80% usage
 
-    def __init__(self, db: Session):
+    # Messages per resource: inactive, unlimited, limit reached, warning
+    LIMIT_MESSAGES = {
+        "jobs": (
+            "Your subscription is not active. Please update your billing information.",
+            "Unlimited job postings with your Professional plan.",
+            "You've reached your job posting limit ({limit} jobs/month). Upgrade to Growth plan for 10 jobs/month.",
+            "You're approaching your job posting limit ({current_usage}/{limit} used). Consider upgrading to post more jobs.",
+        ),
+        "candidate_views": (
+            "Your subscription is not active.",
+            "Unlimited candidate views with your Professional plan.",
+            "You've reached your candidate view limit ({limit} views/month). Upgrade to Growth plan for 100 views/month.",
+            "You're approaching your candidate view limit ({current_usage}/{limit} used).",
+        ),
+    }
+
+    def __init__(self, db: Session, counters: Optional[UsageCounterStore] = None):
         self.db = db
+        self.counters = counters or get_usage_counters()
 
     def _get_company_and_subscription(
         self, company_id: UUID
@@ -112,33 +150,35 @@ class UsageLimitService:
         """Check if limit is unlimited (-1)"""
         return limit == -1
 
-    def check_job_posting_limit(self, company_id: UUID) -> UsageCheckResult:
-        """Check if company can post a job"""
-        company, subscription = self._get_company_and_subscription(company_id)
+    def _evaluate_limit(
+        self, resource: str, active: bool, current_usage: int, limit: int
+    ) -> UsageCheckResult:
+        """Build the check result for a resource's usage against its limit"""
+        inactive_message, unlimited_message, reached_message, warning_message = (
+            self.LIMIT_MESSAGES[resource]
+        )
 
         # Check subscription status
-        if not self._is_subscription_active(subscription):
+        if not active:
             return UsageCheckResult(
                 allowed=False,
-                current_usage=subscription.jobs_posted_this_month,
-                limit=company.max_active_jobs,
+                current_usage=current_usage,
+                limit=limit,
                 upgrade_required=True,
-                message="Your subscription is not active. Please update your billing information.",
+                message=inactive_message,
             )
 
         # Check if unlimited
-        if self._is_unlimited(company.max_active_jobs):
+        if self._is_unlimited(limit):
             return UsageCheckResult(
                 allowed=True,
-                current_usage=subscription.jobs_posted_this_month,
-                limit=company.max_active_jobs,
+                current_usage=current_usage,
+                limit=limit,
                 unlimited=True,
-                message="Unlimited job postings with your Professional plan.",
+                message=unlimited_message,
             )
 
         # Check limit
-        current_usage = subscription.jobs_posted_this_month
-        limit = company.max_active_jobs
         remaining = limit - current_usage
 
         if remaining <= 0:
@@ -147,14 +187,14 @@ class UsageLimitService:
                 current_usage=current_usage,
                 limit=limit,
                 upgrade_required=True,
-                message=f"You've reached your job posting limit ({limit} jobs/month). Upgrade to Growth plan for 10 jobs/month.",
+                message=reached_message.format(limit=limit),
             )
 
         # Warning at 80% usage
         warning = (current_usage / limit) >= self.WARNING_THRESHOLD
         message = ""
         if warning:
-            message = f"You're approaching your job posting limit ({current_usage}/{limit} used). Consider upgrading to post more jobs."
+            message = warning_message.format(current_usage=current_usage, limit=limit)
 
         return UsageCheckResult(
             allowed=True,
@@ -164,57 +204,22 @@ class UsageLimitService:
             message=message,
         )
 
-    def check_candidate_view_limit(self, company_id: UUID) -> UsageCheckResult:
-        """Check if company can view a candidate profile"""
+    def _check_limit(self, company_id: UUID, resource: str) -> UsageCheckResult:
         company, subscription = self._get_company_and_subscription(company_id)
+        return self._evaluate_limit(
+            resource,
+            self._is_subscription_active(subscription),
+            self._current_usage(company_id, subscription)[resource],
+            getattr(company, LIMIT_ATTRIBUTES[resource]),
+        )
 
-        # Check subscription status
-        if not self._is_subscription_active(subscription):
-            return UsageCheckResult(
-                allowed=False,
-                current_usage=subscription.candidate_views_this_month,
-                limit=company.max_candidate_views,
-                upgrade_required=True,
-                message="Your subscription is not active.",
-            )
-
-        # Check if unlimited
-        if self._is_unlimited(company.max_candidate_views):
-            return UsageCheckResult(
-                allowed=True,
-                current_usage=subscription.candidate_views_this_month,
-                limit=company.max_candidate_views,
-                unlimited=True,
-                message="Unlimited candidate views with your Professional plan.",
-            )
-
-        # Check limit
-        current_usage = subscription.candidate_views_this_month
-        limit = company.max_candidate_views
-        remaining = limit - current_usage
-
-        if remaining <= 0:
-            return UsageCheckResult(
-                allowed=False,
-                current_usage=current_usage,
-                limit=limit,
-                upgrade_required=True,
-                message=f"You've reached your candidate view limit ({limit} views/month). Upgrade to Growth plan for 100 views/month.",
-            )
-
-        # Warning at 80% usage
-        warning = (current_usage / limit) >= self.WARNING_THRESHOLD
-        message = ""
-        if warning:
-            message = f"You're approaching your candidate view limit ({current_usage}/{limit} used)."
+    def check_job_posting_limit(self, company_id: UUID) -> UsageCheckResult:
+        """Check if company can post a job"""
+        return self._check_limit(company_id, "jobs")
 
-        return UsageCheckResult(
-            allowed=True,
-            current_usage=current_usage,
-            limit=limit,
-            warning=warning,
-            message=message,
-        )
+    def check_candidate_view_limit(self, company_id: UUID) -> UsageCheckResult:
+        """Check if company can view a candidate profile"""
+        return self._check_limit(company_id, "candidate_views")
 
     def check_team_member_limit(
         self, company_id: UUID, current_members: int
@@ -260,30 +265,179 @@ class UsageLimitService:
 
     def increment_job_posting(self, company_id: UUID) -> None:
         """Increment job posting counter after successful post"""
-        _, subscription = self._get_company_and_subscription(company_id)
-        subscription.jobs_posted_this_month += 1
-        self.db.commit()
+        self._increment(company_id, "jobs")
 
     def increment_candidate_view(self, company_id: UUID) -> None:
         """Increment candidate view counter after successful view"""
-        _, subscription = self._get_company_and_subscription(company_id)
-        subscription.candidate_views_this_month += 1
-        self.db.commit()
+        self._increment(company_id, "candidate_views")
 
     def check_and_increment_job_posting(self, company_id: UUID) -> UsageCheckResult:
         """Atomic check and increment for job posting"""
-        result = self.check_job_posting_limit(company_id)
-        if result.allowed and not result.unlimited:
-            self.increment_job_posting(company_id)
-        return result
+        return self._check_and_increment(company_id, "jobs")
 
     def check_and_increment_candidate_view(self, company_id: UUID) -> UsageCheckResult:
         """Atomic check and increment for candidate view"""
-        result = self.check_candidate_view_limit(company_id)
+        return self._check_and_increment(company_id, "candidate_views")
+
+    def _check_and_increment(self, company_id: UUID, resource: str) -> UsageCheckResult:
+        # Fast path: one Redis script call checks the limit and counts the use
+        counted = self._consume_counter(company_id, resource)
+        if counted is not None:
+            return self._evaluate_limit(
+                resource, counted.active, counted.current_usage, counted.limit
+            )
+
+        result = self._check_limit(company_id, resource)
         if result.allowed and not result.unlimited:
-            self.increment_candidate_view(company_id)
+            self._increment_stored(company_id, resource)
         return result
 
+    def _increment(self, company_id: UUID, resource: str) -> None:
+        if self.counters.available:
+            try:
+                if self.counters.increment(company_id, resource):
+                    return
+            except Exception as e:
+                self.counters.mark_failed(e)
+
+        self._increment_stored(company_id, resource)
+
+    def _increment_stored(self, company_id: UUID, resource: str) -> None:
+        """Increment the subscription counter column in the database"""
+        _, subscription = self._get_company_and_subscription(company_id)
+        column = USAGE_COLUMNS[resource]
+        setattr(subscription, column, getattr(subscription, column) + 1)
+        self.db.commit()
+
+    def _consume_counter(
+        self, company_id: UUID, resource: str
+    ) -> Optional[CounterResult]:
+        """Check-and-increment in Redis, loading plan state on a miss
+
+        Returns None when Redis is unavailable (use the database path).
+        """
+        if not self.counters.available:
+            return None
+
+        try:
+            counted = self.counters.consume(company_id, resource)
+            if counted is not None:
+                return counted
+        except Exception as e:
+            self.counters.mark_failed(e)
+            return None
+
+        # Missing, stale plan state or a new billing period
+        self._prime_counters(company_id)
+        try:
+            return self.counters.consume(company_id, resource)
+        except Exception as e:
+            self.counters.mark_failed(e)
+            return None
+
+    def _prime_counters(self, company_id: UUID) -> None:
+        """Load plan state and stored counts into the Redis counters"""
+        company, subscription = self._get_company_and_subscription(company_id)
+
+        # Roll counters over when the billing period has ended
+        period_end = subscription.current_period_end
+        if period_end and period_end < datetime.utcnow():
+            self.reset_usage_if_new_period(company_id)
+
+        try:
+            self.counters.prime(
+                company_id,
+                active=self._is_subscription_active(subscription),
+                period_start=subscription.current_period_start,
+                period_end=subscription.current_period_end,
+                limits={
+                    resource: getattr(company, LIMIT_ATTRIBUTES[resource])
+                    for resource in RESOURCES
+                },
+                stored_usage={
+                    resource: getattr(subscription, USAGE_COLUMNS[resource])
+                    for resource in RESOURCES
+                },
+            )
+        except Exception as e:
+            self.counters.mark_failed(e)
+
+    def _current_usage(
+        self, company_id: UUID, subscription: CompanySubscription
+    ) -> Dict[str, int]:
+        """Stored usage plus uses counted in Redis but not yet written back"""
+        usage = {
+            resource: getattr(subscription, USAGE_COLUMNS[resource]) or 0
+            for resource in RESOURCES
+        }
+
+        if self.counters.available:
+            try:
+                unsynced = self.counters.unsynced(
+                    company_id, subscription.current_period_start
+                )
+                for resource in RESOURCES:
+                    usage[resource] += unsynced[resource]
+            except Exception as e:
+                self.counters.mark_failed(e)
+
+        return usage
+
+    def write_back_usage_counters(self, batch_size: int = 500) -> int:
+        """
+        Add usage counted in Redis to the subscription counter columns.
+
+        Returns:
+            Number of companies written back
+        """
+        if not self.counters.available:
+            return 0
+
+        company_ids = self.counters.pop_dirty(batch_size)
+        if not company_ids:
+            return 0
+
+        try:
+            pending = self.counters.pending_writes(company_ids)
+            subscriptions = (
+                self.db.query(CompanySubscription)
+                .filter(CompanySubscription.company_id.in_(list(pending)))
+                .all()
+            )
+
+            written = {}
+            for subscription in subscriptions:
+                period, deltas = pending[subscription.company_id]
+                # Counts from an earlier period were already reset
+                if period == period_key(subscription.current_period_start):
+                    values = {
+                        USAGE_COLUMNS[resource]: getattr(
+                            CompanySubscription, USAGE_COLUMNS[resource]
+                        )
+                        + delta
+                        for resource, delta in deltas.items()
+                        if delta
+                    }
+                    if values:
+                        self.db.execute(
+                            update(CompanySubscription)
+                            .where(CompanySubscription.id == subscription.id)
+                            .values(values)
+                            .execution_options(synchronize_session=False)
+                        )
+                written[subscription.company_id] = deltas
+
+            self.db.commit()
+            self.counters.mark_synced(written)
+
+            logger.info(f"Wrote back usage counters for {len(written)} companies")
+            return len(written)
+
+        except Exception:
+            self.db.rollback()
+            self.counters.mark_dirty(company_ids)
+            raise
+
     def reset_usage_if_new_period(self, company_id: UUID) -> bool:
         """Reset usage counters if we're in a new billing period"""
         _, subscription = self._get_company_and_subscription(company_id)
@@ -307,6 +461,7 @@ class UsageLimitService:
     def get_usage_summary(self, company_id: UUID) -> UsageSummary:
         """Get complete usage summary for a company"""
         company, subscription = self._get_company_and_subscription(company_id)
+        usage = self._current_usage(company_id, subscription)
 
         # Get current team member count
         from app.db.models.company import CompanyMember
@@ -320,19 +475,17 @@ class UsageLimitService:
         return UsageSummary(
             plan=company.subscription_tier,
             jobs=ResourceUsage(
-                used=subscription.jobs_posted_this_month,
+                used=usage["jobs"],
                 limit=company.max_active_jobs,
-                remaining=max(0, company.max_active_jobs - subscription.jobs_posted_this_month)
+                remaining=max(0, company.max_active_jobs - usage["jobs"])
                 if company.max_active_jobs > 0
                 else 0,
                 unlimited=self._is_unlimited(company.max_active_jobs),
             ),
             candidate_views=ResourceUsage(
-                used=subscription.candidate_views_this_month,
+                used=usage["candidate_views"],
                 limit=company.max_candidate_views,
-                remaining=max(
-                    0, company.max_candidate_views - subscription.candidate_views_this_month
-                )
+                remaining=max(0, company.max_candidate_views - usage["candidate_views"])
                 if company.max_candidate_views > 0
                 else 0,
                 unlimited=self._is_unlimited(company.max_candidate_views),
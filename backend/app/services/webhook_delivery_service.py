@@ -236,22 +236,7 @@ class WebhookDeliveryService:
         """
         # Prepare payload
         payload_str = json.dumps(payload, sort_keys=True)
-
-        # Compute HMAC signature
-        signature = self._compute_signature(webhook, payload_str)
-
-        # Prepare headers
-        headers = {
-            "Content-Type": "application/json",
-            "X-Webhook-Signature": signature,
-            "X-Webhook-Event": event_type,
-            "X-Webhook-ID": str(webhook.id),
-            "X-Webhook-Timestamp": datetime.utcnow().isoformat(),
-        }
-
-        # Add custom headers
-        if webhook.headers:
-            headers.update(webhook.headers)
+        headers = self.build_request_headers(webhook, event_type, payload_str)
 
         # Deliver webhook
         delivery_start = datetime.utcnow()
@@ -398,6 +383,37 @@ class WebhookDeliveryService:
         random_part = secrets.token_urlsafe(36)  # 48 chars when base64 encoded
         return f"whsec_{random_part}"
 
+    def build_request_headers(
+        self,
+        webhook: Webhook,
+        event_type: str,
+        payload_str: str,
+    ) -> Dict[str, str]:
+        """
+        Build the signed request headers for a webhook delivery
+
+        Args:
+            webhook: Webhook configuration
+            event_type: Event type
+            payload_str: JSON payload string (as sent)
+
+        Returns:
+            Headers including the HMAC signature and any custom headers
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": self._compute_signature(webhook, payload_str),
+            "X-Webhook-Event": event_type,
+            "X-Webhook-ID": str(webhook.id),
+            "X-Webhook-Timestamp": datetime.utcnow().isoformat(),
+        }
+
+        # Add custom headers
+        if webhook.headers:
+            headers.update(webhook.headers)
+
+        return headers
+
     def _compute_signature(
         self,
         webhook: Webhook,
@@ -425,7 +441,7 @@ class WebhookDeliveryService:
     # FAILURE HANDLING
     # ========================================================================
 
-    def record_failure(self, webhook: Webhook) -> None:
+    def record_failure(self, webhook: Webhook, commit: bool = True) -> None:
         """
         Record webhook delivery failure
 
@@ -433,6 +449,7 @@ class WebhookDeliveryService:
 
         Args:
             webhook: Webhook that failed
+            commit: Commit immediately (False when recording a batch)
         """
         webhook.failure_count += 1
 
@@ -441,9 +458,10 @@ class WebhookDeliveryService:
             webhook.is_active = False
             webhook.disabled_at = datetime.utcnow()
 
-        self.db.commit()
+        if commit:
+            self.db.commit()
 
-    def record_success(self, webhook: Webhook) -> None:
+    def record_success(self, webhook: Webhook, commit: bool = True) -> None:
         """
         Record webhook delivery success
 
@@ -451,10 +469,12 @@ class WebhookDeliveryService:
 
         Args:
             webhook: Webhook that succeeded
+            commit: Commit immediately (False when recording a batch)
         """
         webhook.failure_count = 0
         webhook.last_triggered_at = datetime.utcnow()
-        self.db.commit()
+        if commit:
+            self.db.commit()
 
     # ========================================================================
     # RETRY LOGIC
@@ -0,0 +1,471 @@
+"""Webhook dispatcher: durable delivery queue for outbound webhooks
+
+Events are fanned out into webhook_deliveries rows with one batch insert,
+so the request that raised the event returns immediately. The dispatch
+worker then claims due rows with SELECT ... FOR UPDATE SKIP LOCKED, sends
+them over one pooled HTTP client (keep-alive connections are reused per
+host) with a cap on concurrent requests per endpoint, and writes every
+outcome back in one commit.
+
+Delivery row lifecycle:
+- pending: queued, due at next_retry_at
+- delivering: claimed by a worker; next_retry_at is the lease expiry, after
+  which rows of a crashed worker are claimed again. A batch stops starting
+  requests early enough that its last one ends inside the lease, and
+  hands the rows it did not send back as pending, so a live worker's rows
+  are never claimed twice
+- retrying: attempt failed, the next attempt is due at next_retry_at
+- success / failed: final
+
+Each attempt keeps its own row (as WebhookDeliveryService.deliver_webhook
+does), so claiming a retrying row closes it as failed and queues the next
+attempt_number.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
+
+import httpx
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.api_key import Webhook, WebhookDelivery
+from app.services.webhook_delivery_service import WebhookDeliveryService
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DELIVERING = "delivering"
+RETRYING = "retrying"
+SUCCESS = "success"
+FAILED = "failed"
+
+# Statuses the claim query picks up once next_retry_at has passed
+DUE_STATUSES = (PENDING, DELIVERING, RETRYING)
+
+# Time kept back from the lease for recording outcomes after the last request
+LEASE_SAFETY_MARGIN_SECONDS = 15
+
+
+@dataclass
+class DeliveryRequest:
+    """A claimed delivery, detached from the session for the send phase"""
+
+    delivery_id: UUID
+    webhook_id: UUID
+    attempt_number: int
+    url: str
+    body: str
+    headers: Dict[str, str]
+
+
+@dataclass
+class DeliveryOutcome:
+    """Result of one HTTP attempt"""
+
+    request: DeliveryRequest
+    success: bool
+    http_status_code: Optional[int] = None
+    response_body: Optional[str] = None
+    response_time_ms: Optional[int] = None
+    error_message: Optional[str] = None
+
+
+class WebhookDispatcher:
+    """Queue webhook deliveries and send them in pooled, capped batches"""
+
+    def __init__(
+        self,
+        db: Session,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.db = db
+        self.webhooks = WebhookDeliveryService(db)
+        # Tests pass an httpx.MockTransport
+        self.transport = transport
+
+    # ========================================================================
+    # ENQUEUE
+    # ========================================================================
+
+    def enqueue_event(
+        self,
+        company_id: UUID,
+        event_type: str,
+        payload: Dict,
+        event_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Queue an event for every active webhook of a company subscribed to it
+
+        Args:
+            company_id: Company UUID
+            event_type: Event type (e.g., "application.created")
+            payload: Event payload data
+            event_id: Optional event ID
+
+        Returns:
+            Number of deliveries queued
+        """
+        webhooks = self.webhooks.get_webhooks_for_event(company_id, event_type)
+        return self.enqueue_deliveries(webhooks, event_type, payload, event_id)
+
+    def enqueue_deliveries(
+        self,
+        webhooks: Iterable[Webhook],
+        event_type: str,
+        payload: Dict,
+        event_id: Optional[UUID] = None,
+    ) -> int:
+        """Insert one pending delivery per webhook in a single statement"""
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "webhook_id": webhook.id,
+                "company_id": webhook.company_id,
+                "event_type": event_type,
+                "event_id": event_id,
+                "payload": payload,
+                "attempt_number": 1,
+                "status": PENDING,
+                "next_retry_at": now,
+                "created_at": now,
+            }
+            for webhook in webhooks
+        ]
+        if not rows:
+            return 0
+
+        self.db.execute(insert(WebhookDelivery), rows)
+        self.db.commit()
+        return len(rows)
+
+    # ========================================================================
+    # DISPATCH
+    # ========================================================================
+
+    def dispatch_due(
+        self, limit: Optional[int] = None, deadline: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Claim one batch of due deliveries, send it and record the outcomes
+
+        No request starts after the batch deadline: the lease expiry less
+        one delivery timeout and LEASE_SAFETY_MARGIN_SECONDS, or the
+        caller's deadline if that is sooner. Claimed rows left unsent are
+        released as pending and due immediately.
+
+        Args:
+            limit: Maximum deliveries to claim (WEBHOOK_DISPATCH_BATCH_SIZE)
+            deadline: Optional time.monotonic() value to stop sending at
+
+        Returns:
+            Dict with claimed, delivered, retrying, failed and released counts
+        """
+        claimed_at = time.monotonic()
+        requests = self.claim_due_deliveries(
+            limit or settings.WEBHOOK_DISPATCH_BATCH_SIZE
+        )
+        stats = {
+            "claimed": len(requests),
+            "delivered": 0,
+            "retrying": 0,
+            "failed": 0,
+            "released": 0,
+        }
+        if not requests:
+            return stats
+
+        send_until = (
+            claimed_at
+            + settings.WEBHOOK_CLAIM_LEASE_SECONDS
+            - settings.WEBHOOK_DELIVERY_TIMEOUT_SECONDS
+            - LEASE_SAFETY_MARGIN_SECONDS
+        )
+        if deadline is not None:
+            send_until = min(send_until, deadline)
+
+        outcomes = asyncio.run(self.send(requests, deadline=send_until))
+        stats.update(self.record_outcomes(outcomes))
+
+        sent = {outcome.request.delivery_id for outcome in outcomes}
+        stats["released"] = self.release_claims(
+            [request for request in requests if request.delivery_id not in sent]
+        )
+        return stats
+
+    def claim_due_deliveries(self, limit: int) -> List[DeliveryRequest]:
+        """
+        Lease due deliveries to this worker
+
+        Rows locked by a concurrent claim are skipped rather than waited on,
+        and the lease is committed before any HTTP request is made.
+
+        Args:
+            limit: Maximum deliveries to claim
+
+        Returns:
+            Requests ready to send, with signed headers
+        """
+        now = datetime.utcnow()
+        due = (
+            self.db.query(WebhookDelivery)
+            .filter(
+                WebhookDelivery.status.in_(DUE_STATUSES),
+                WebhookDelivery.next_retry_at <= now,
+            )
+            .order_by(WebhookDelivery.next_retry_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not due:
+            self.db.rollback()
+            return []
+
+        webhook_ids = {delivery.webhook_id for delivery in due}
+        webhooks = {
+            webhook.id: webhook
+            for webhook in self.db.query(Webhook).filter(Webhook.id.in_(webhook_ids))
+        }
+
+        lease_until = now + timedelta(seconds=settings.WEBHOOK_CLAIM_LEASE_SECONDS)
+        requests = []
+        for delivery in due:
+            webhook = webhooks[delivery.webhook_id]
+            if not webhook.is_active:
+                delivery.status = FAILED
+                delivery.next_retry_at = None
+                delivery.error_message = "Webhook disabled"
+                continue
+
+            if delivery.status == RETRYING:
+                # The failed attempt keeps its row; the retry gets a new one
+                delivery.status = FAILED
+                delivery.next_retry_at = None
+                delivery = WebhookDelivery(
+                    id=uuid4(),
+                    webhook_id=delivery.webhook_id,
+                    company_id=delivery.company_id,
+                    event_type=delivery.event_type,
+                    event_id=delivery.event_id,
+                    payload=delivery.payload,
+                    attempt_number=delivery.attempt_number + 1,
+                    created_at=now,
+                )
+                self.db.add(delivery)
+
+            delivery.status = DELIVERING
+            delivery.next_retry_at = lease_until
+
+            body = json.dumps(delivery.payload, sort_keys=True)
+            requests.append(
+                DeliveryRequest(
+                    delivery_id=delivery.id,
+                    webhook_id=webhook.id,
+                    attempt_number=delivery.attempt_number,
+                    url=webhook.url,
+                    body=body,
+                    headers=self.webhooks.build_request_headers(
+                        webhook, delivery.event_type, body
+                    ),
+                )
+            )
+
+        self.db.commit()
+        return requests
+
+    async def send(
+        self, requests: List[DeliveryRequest], deadline: Optional[float] = None
+    ) -> List[DeliveryOutcome]:
+        """
+        Send requests concurrently over one pooled client
+
+        Each endpoint gets up to WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT lanes
+        draining its own queue, so one slow or busy endpoint cannot hold
+        the slots other endpoints need; WEBHOOK_DISPATCH_MAX_IN_FLIGHT caps
+        the total. Lanes stop taking requests once time.monotonic() passes
+        deadline; requests not sent have no outcome.
+        """
+        per_endpoint = defaultdict(deque)
+        for request in requests:
+            per_endpoint[request.webhook_id].append(request)
+
+        max_in_flight = settings.WEBHOOK_DISPATCH_MAX_IN_FLIGHT
+        slots = asyncio.Semaphore(max_in_flight)
+        outcomes: List[DeliveryOutcome] = []
+
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+            timeout=settings.WEBHOOK_DELIVERY_TIMEOUT_SECONDS,
+            transport=self.transport,
+        ) as client:
+
+            def expired() -> bool:
+                return deadline is not None and time.monotonic() >= deadline
+
+            async def lane(pending: deque):
+                while pending and not expired():
+                    async with slots:
+                        # Waiting for a slot can outlast the deadline
+                        if expired():
+                            return
+                        request = pending.popleft()
+                        outcomes.append(await self._post(client, request))
+
+            lanes = [
+                lane(pending)
+                for pending in per_endpoint.values()
+                for _ in range(
+                    min(settings.WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT, len(pending))
+                )
+            ]
+            await asyncio.gather(*lanes)
+
+        return outcomes
+
+    async def _post(
+        self, client: httpx.AsyncClient, request: DeliveryRequest
+    ) -> DeliveryOutcome:
+        start = time.monotonic()
+
+        def elapsed_ms() -> int:
+            return int((time.monotonic() - start) * 1000)
+
+        timeout = settings.WEBHOOK_DELIVERY_TIMEOUT_SECONDS
+        try:
+            # httpx times each connect/read/write separately; a slow drip
+            # of bytes must not keep a request open past the lease
+            response = await asyncio.wait_for(
+                client.post(
+                    request.url, content=request.body, headers=request.headers
+                ),
+                timeout,
+            )
+        except (httpx.TimeoutException, asyncio.TimeoutError):
+            return DeliveryOutcome(
+                request=request,
+                success=False,
+                response_time_ms=elapsed_ms(),
+                error_message=f"Request timeout ({timeout:g}s)",
+            )
+        except httpx.HTTPError as e:
+            return DeliveryOutcome(
+                request=request,
+                success=False,
+                response_time_ms=elapsed_ms(),
+                error_message=f"Delivery error: {str(e)}",
+            )
+
+        success = 200 <= response.status_code < 300
+        return DeliveryOutcome(
+            request=request,
+            success=success,
+            http_status_code=response.status_code,
+            response_body=response.text,
+            response_time_ms=elapsed_ms(),
+            error_message=(
+                None
+                if success
+                else f"HTTP {response.status_code}: {response.text[:500]}"
+            ),
+        )
+
+    def release_claims(self, requests: List[DeliveryRequest]) -> int:
+        """
+        Hand unsent claimed deliveries back to the queue, due immediately
+
+        Returns:
+            Number of deliveries released
+        """
+        if not requests:
+            return 0
+
+        now = datetime.utcnow()
+        self.db.execute(
+            update(WebhookDelivery),
+            [
+                {"id": request.delivery_id, "status": PENDING, "next_retry_at": now}
+                for request in requests
+            ],
+        )
+        self.db.commit()
+        logger.info(f"Webhook dispatch: released {len(requests)} unsent deliveries")
+        return len(requests)
+
+    def record_outcomes(self, outcomes: List[DeliveryOutcome]) -> Dict[str, int]:
+        """
+        Write attempt results and webhook failure counts in one commit
+
+        Returns:
+            Dict with delivered, retrying and failed counts
+        """
+        counts = {"delivered": 0, "retrying": 0, "failed": 0}
+        if not outcomes:
+            return counts
+
+        webhook_ids = {outcome.request.webhook_id for outcome in outcomes}
+        webhooks = {
+            webhook.id: webhook
+            for webhook in self.db.query(Webhook).filter(Webhook.id.in_(webhook_ids))
+        }
+
+        now = datetime.utcnow()
+        rows = []
+        for outcome in outcomes:
+            request = outcome.request
+            webhook = webhooks.get(request.webhook_id)
+            if webhook is None:
+                # Deleted mid-flight; its deliveries went with it
+                continue
+
+            status, next_retry_at = SUCCESS, None
+            if outcome.success:
+                self.webhooks.record_success(webhook, commit=False)
+                counts["delivered"] += 1
+            else:
+                if self.webhooks.should_retry(webhook, request.attempt_number):
+                    status = RETRYING
+                    next_retry_at = self.webhooks.calculate_next_retry(
+                        webhook, request.attempt_number
+                    )
+                    counts["retrying"] += 1
+                else:
+                    status = FAILED
+                    counts["failed"] += 1
+                self.webhooks.record_failure(webhook, commit=False)
+
+            rows.append(
+                {
+                    "id": request.delivery_id,
+                    "status": status,
+                    "http_status_code": outcome.http_status_code,
+                    "response_body": outcome.response_body,
+                    "response_time_ms": outcome.response_time_ms,
+                    "error_message": outcome.error_message,
+                    "next_retry_at": next_retry_at,
+                    "delivered_at": now if outcome.success else None,
+                }
+            )
+
+        if rows:
+            self.db.execute(update(WebhookDelivery), rows)
+        self.db.commit()
+
+        logger.info(
+            f"Webhook dispatch: {counts['delivered']} delivered, "
+            f"{counts['retrying']} retrying, {counts['failed']} failed"
+        )
+        return counts
@@ -0,0 +1,355 @@
+"""
+Weekly digest pipeline
+
+Builds the digest_data that EmailService.build_weekly_digest_email expects
+for every opted-in job seeker whose digest day is today, and sends the
+emails in batches. Users are streamed in keyset pages (id > last id), and
+each page goes through these stages:
+
+- stats: new matches, applications sent and completed interviews of the
+  past week, one grouped query each
+- top_matches: each user's best new match_scores rows in one
+  window-function query; fit indexes are precomputed by the matching
+  pipeline, so no vector search happens at send time
+- render: users with the same top jobs share one rendered jobs block
+- send: EmailService.send_emails (Resend batch API, bulk delivery logs)
+
+Users with nothing to report, or who already got a digest in the past six
+days (a rerun of the same day), are skipped. Per-stage timings and
+throughput are returned and logged.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.application import Application
+from app.db.models.email_delivery import EmailDeliveryLog
+from app.db.models.job import Job, MatchScore
+from app.db.models.notification import NotificationPreference
+from app.db.models.user import Profile, User
+from app.db.models.webhook import InterviewSchedule
+from app.schemas.notification import EmailSend
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+DIGEST_EMAIL_TYPE = "weekly_digest"
+# NotificationPreference.digest_day default, also used for users without a row
+DEFAULT_DIGEST_DAY = "monday"
+
+DIGEST_STAGES = ("load_users", "stats", "top_matches", "render", "send")
+
+
+@dataclass
+class DigestRecipient:
+    """A job seeker due a digest"""
+
+    user_id: UUID
+    email: str
+    name: str
+
+
+@dataclass
+class DigestRunStats:
+    """Counters and per-stage timings of one digest run"""
+
+    pages: int = 0
+    users_scanned: int = 0
+    digests_built: int = 0
+    skipped: int = 0
+    render_groups: int = 0
+    emails_sent: int = 0
+    emails_failed: int = 0
+    stage_seconds: Dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(DIGEST_STAGES, 0.0)
+    )
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["stage_seconds"] = {
+            stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()
+        }
+        result["elapsed_seconds"] = round(self.elapsed_seconds, 3)
+        result["users_per_second"] = (
+            round(self.users_scanned / self.elapsed_seconds, 1)
+            if self.elapsed_seconds
+            else 0.0
+        )
+        return result
+
+
+class WeeklyDigestService:
+    """Build and send weekly digests for all due users"""
+
+    def __init__(self, db: Session, email_service: Optional[EmailService] = None):
+        self.db = db
+        self.email_service = email_service or EmailService(db)
+
+    def run(
+        self, now: Optional[datetime] = None, page_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Send the digests due today
+
+        Args:
+            now: Reference time (defaults to utcnow); the week is the 7 days
+                before it and its weekday selects the users
+            page_size: Users per page (WEEKLY_DIGEST_PAGE_SIZE)
+
+        Returns:
+            Run counters, per-stage seconds and users_per_second
+        """
+        now = now or datetime.utcnow()
+        since = now - timedelta(days=7)
+        weekday = now.strftime("%A").lower()
+        page_size = page_size or settings.WEEKLY_DIGEST_PAGE_SIZE
+
+        stats = DigestRunStats()
+        started = time.perf_counter()
+        after_id = None
+
+        while True:
+            with self._timed(stats, "load_users"):
+                page = self.load_recipients(weekday, now, after_id, page_size)
+            if not page:
+                break
+
+            stats.pages += 1
+            stats.users_scanned += len(page)
+            after_id = page[-1].user_id
+            self._process_page(page, since, now, stats)
+
+            if len(page) < page_size:
+                break
+
+        stats.elapsed_seconds = time.perf_counter() - started
+        result = stats.to_dict()
+        logger.info(
+            f"Weekly digest: {stats.emails_sent} sent, {stats.emails_failed} failed, "
+            f"{stats.skipped} skipped of {stats.users_scanned} users in "
+            f"{result['elapsed_seconds']}s ({result['users_per_second']} users/s); "
+            f"stages: {result['stage_seconds']}"
+        )
+        return result
+
+    def load_recipients(
+        self,
+        weekday: str,
+        now: datetime,
+        after_id: Optional[UUID],
+        limit: int,
+    ) -> List[DigestRecipient]:
+        """
+        One keyset page of opted-in job seekers whose digest day is weekday
+
+        Users who already got a digest in the past six days are left out.
+        """
+        already_sent = (
+            self.db.query(EmailDeliveryLog.id)
+            .filter(
+                EmailDeliveryLog.user_id == User.id,
+                EmailDeliveryLog.email_type == DIGEST_EMAIL_TYPE,
+                EmailDeliveryLog.status != "failed",
+                EmailDeliveryLog.created_at >= now - timedelta(days=6),
+            )
+            .exists()
+        )
+
+        query = (
+            self.db.query(User.id, User.email, Profile.first_name)
+            .outerjoin(Profile, Profile.user_id == User.id)
+            .outerjoin(
+                NotificationPreference, NotificationPreference.user_id == User.id
+            )
+            .filter(
+                User.user_type == "job_seeker",
+                func.coalesce(NotificationPreference.email_weekly_digest, True).is_(
+                    True
+                ),
+                func.lower(
+                    func.coalesce(NotificationPreference.digest_day, DEFAULT_DIGEST_DAY)
+                )
+                == weekday,
+                ~already_sent,
+            )
+        )
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+
+        return [
+            DigestRecipient(
+                user_id=user_id,
+                email=email,
+                name=first_name or email.split("@")[0],
+            )
+            for user_id, email, first_name in query.order_by(User.id).limit(limit)
+        ]
+
+    def _process_page(
+        self,
+        page: List[DigestRecipient],
+        since: datetime,
+        now: datetime,
+        stats: DigestRunStats,
+    ) -> None:
+        user_ids = [recipient.user_id for recipient in page]
+
+        with self._timed(stats, "stats"):
+            matched = self._count_by_user(
+                MatchScore.user_id,
+                user_ids,
+                MatchScore.created_at >= since,
+                MatchScore.fit_index >= settings.WEEKLY_DIGEST_MIN_FIT_INDEX,
+            )
+            applied = self._count_by_user(
+                Application.user_id,
+                user_ids,
+                Application.applied_at >= since,
+                Application.applied_at < now,
+            )
+            interviewed = self._count_by_user(
+                InterviewSchedule.user_id,
+                user_ids,
+                InterviewSchedule.status == "completed",
+                InterviewSchedule.scheduled_at >= since,
+                InterviewSchedule.scheduled_at < now,
+            )
+
+        with self._timed(stats, "top_matches"):
+            top_jobs = self.get_top_matches(user_ids, since)
+
+        with self._timed(stats, "render"):
+            rendered: Dict[Tuple, str] = {}
+            requests: List[EmailSend] = []
+            for recipient in page:
+                user_id = recipient.user_id
+                counts = (
+                    matched.get(user_id, 0),
+                    applied.get(user_id, 0),
+                    interviewed.get(user_id, 0),
+                )
+                if not any(counts):
+                    stats.skipped += 1
+                    continue
+
+                jobs = top_jobs.get(user_id, [])
+                jobs_key = tuple(
+                    (job["title"], job["company"], job["fit"]) for job in jobs
+                )
+                if jobs_key not in rendered:
+                    rendered[jobs_key] = self.email_service.render_digest_top_jobs(
+                        jobs
+                    )
+
+                digest_data = {
+                    "user_id": str(user_id),
+                    "jobs_matched": counts[0],
+                    "applications_sent": counts[1],
+                    "interviews_completed": counts[2],
+                    "top_jobs": jobs,
+                }
+                try:
+                    requests.append(
+                        self.email_service.build_weekly_digest_email(
+                            recipient.email,
+                            recipient.name,
+                            digest_data,
+                            top_jobs_html=rendered[jobs_key],
+                        )
+                    )
+                except ValidationError:
+                    logger.warning(
+                        f"Skipping digest for invalid email {recipient.email}"
+                    )
+                    stats.skipped += 1
+
+            stats.digests_built += len(requests)
+            stats.render_groups += len(rendered)
+
+        if not requests:
+            return
+
+        with self._timed(stats, "send"):
+            results = self.email_service.send_emails(requests)
+
+        sent = sum(1 for result in results if result["success"])
+        stats.emails_sent += sent
+        stats.emails_failed += len(results) - sent
+
+    def get_top_matches(
+        self, user_ids: List[UUID], since: datetime
+    ) -> Dict[UUID, List[Dict[str, Any]]]:
+        """
+        Best new matches of the week per user, from stored match scores
+
+        Returns:
+            Dict of user_id -> up to WEEKLY_DIGEST_TOP_JOBS jobs (title,
+            company, fit), best first
+        """
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=MatchScore.user_id,
+                order_by=(MatchScore.fit_index.desc(), MatchScore.job_id),
+            )
+            .label("rank")
+        )
+        ranked = (
+            self.db.query(
+                MatchScore.user_id,
+                MatchScore.fit_index,
+                Job.title,
+                Job.company,
+                rank,
+            )
+            .join(Job, Job.id == MatchScore.job_id)
+            .filter(
+                MatchScore.user_id.in_(user_ids),
+                MatchScore.created_at >= since,
+                MatchScore.fit_index >= settings.WEEKLY_DIGEST_MIN_FIT_INDEX,
+                Job.is_active.is_(True),
+            )
+            .subquery()
+        )
+
+        top_jobs: Dict[UUID, List[Dict[str, Any]]] = {}
+        rows = (
+            self.db.query(
+                ranked.c.user_id, ranked.c.fit_index, ranked.c.title, ranked.c.company
+            )
+            .filter(ranked.c.rank <= settings.WEEKLY_DIGEST_TOP_JOBS)
+            .order_by(ranked.c.user_id, ranked.c.rank)
+        )
+        for user_id, fit_index, title, company in rows:
+            top_jobs.setdefault(user_id, []).append(
+                {"title": title, "company": company, "fit": fit_index}
+            )
+        return top_jobs
+
+    def _count_by_user(self, user_column, user_ids: List[UUID], *criteria):
+        rows = (
+            self.db.query(user_column, func.count())
+            .filter(user_column.in_(user_ids), and_(*criteria))
+            .group_by(user_column)
+        )
+        return dict(rows.all())
+
+    @staticmethod
+    @contextmanager
+    def _timed(stats: DigestRunStats, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.stage_seconds[stage] += time.perf_counter() - started
@@ -0,0 +1,52 @@
+"""Celery worker tasks for analytics rollups"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.employer_analytics_service import EmployerAnalyticsService
+from app.services.peer_benchmark_service import PeerBenchmarkService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.analytics_worker.rollup_peer_benchmarks",
+    soft_time_limit=1800,
+    time_limit=1900,
+)
+def rollup_peer_benchmarks(self):
+    """Rebuild platform-wide peer benchmark histograms"""
+    db = SessionLocal()
+
+    try:
+        return PeerBenchmarkService(db).rollup()
+
+    except Exception as e:
+        logger.error(f"Peer benchmark rollup failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.analytics_worker.refresh_analytics_snapshots",
+    soft_time_limit=1800,
+    time_limit=1900,
+)
+def refresh_analytics_snapshots(self):
+    """Write missing and changed daily employer analytics snapshots"""
+    db = SessionLocal()
+
+    try:
+        return EmployerAnalyticsService(db).refresh_snapshots()
+
+    except Exception as e:
+        logger.error(f"Analytics snapshot refresh failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
@@ -0,0 +1,47 @@
+"""Celery worker tasks for bulk job uploads"""
+
+import logging
+import uuid
+
+from app.core.celery_app import celery_app
+from app.db.models.bulk_job_posting import BulkJobUpload, BulkUploadStatus
+from app.db.session import SessionLocal
+from app.services.bulk_job_upload_service import scan_upload_duplicates
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.bulk_upload_worker.detect_upload_duplicates",
+    autoretry_for=(),
+    soft_time_limit=540,
+    time_limit=600,
+)
+def detect_upload_duplicates(self, upload_id: str):
+    """Find duplicates in a stored CSV upload and mark it UPLOADED"""
+    db = SessionLocal()
+
+    try:
+        upload = scan_upload_duplicates(db, upload_id)
+        if upload is None:
+            return {"upload_id": upload_id, "status": None}
+        return {
+            "upload_id": upload_id,
+            "status": upload.status.value,
+            "duplicate_jobs": upload.duplicate_jobs,
+        }
+
+    except Exception as e:
+        logger.error(f"Duplicate detection failed for upload {upload_id}: {str(e)}")
+        db.rollback()
+        # Don't leave the upload VALIDATING forever
+        upload = db.get(BulkJobUpload, uuid.UUID(upload_id))
+        if upload is not None and upload.status == BulkUploadStatus.VALIDATING:
+            upload.status = BulkUploadStatus.FAILED
+            upload.error_message = "Duplicate detection failed"
+            db.commit()
+        raise
+
+    finally:
+        db.close()
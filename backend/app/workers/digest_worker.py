@@ -0,0 +1,32 @@
+"""Celery worker tasks for the weekly digest email"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.weekly_digest_service import WeeklyDigestService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.digest_worker.send_weekly_digests",
+    autoretry_for=(),
+    soft_time_limit=3300,
+    time_limit=3600,
+)
+def send_weekly_digests(self, page_size: int = None):
+    """Build and send today's weekly digests"""
+    db = SessionLocal()
+
+    try:
+        # A rerun skips users whose digest already went out
+        return WeeklyDigestService(db).run(page_size=page_size)
+
+    except Exception as e:
+        logger.error(f"Weekly digest run failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
@@ -0,0 +1,66 @@
+"""Celery worker tasks for incremental fit-index refresh"""
+
+import logging
+from typing import List, Set
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.fit_index_refresh_service import (
+    FitIndexRefreshService,
+    get_fit_index_queue,
+    refresh_fit_indexes_now,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.fit_index_worker.refresh_fit_indexes",
+    autoretry_for=(),
+)
+def refresh_fit_indexes(self, batch_size: int = None, keys: List[str] = None):
+    """
+    Recompute fit indexes for applications affected by recent changes
+
+    Args:
+        batch_size: Dirty keys per batch
+        keys: Keys to refresh directly, passed when the dirty queue could
+            not take them
+    """
+    queue = get_fit_index_queue()
+    # Commits from here on schedule a follow-up run
+    queue.release_schedule()
+
+    db = SessionLocal()
+
+    try:
+        service = FitIndexRefreshService(db, queue)
+        if keys:
+            updated = service.refresh(keys)
+            logger.info(f"Refreshed {updated} fit indexes for {len(keys)} keys")
+        return service.process_pending(batch_size)
+
+    except Exception as e:
+        logger.error(f"Fit index refresh failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
+
+
+def schedule_fit_index_refresh() -> None:
+    """Run refresh_fit_indexes after the coalescing delay"""
+    refresh_fit_indexes.apply_async(
+        countdown=settings.FIT_INDEX_REFRESH_DELAY_SECONDS
+    )
+
+
+def dispatch_fit_index_keys(keys: Set[str]) -> None:
+    """Send keys the dirty queue could not take straight to the worker"""
+    try:
+        refresh_fit_indexes.apply_async(kwargs={"keys": sorted(keys)})
+    except Exception as e:
+        logger.error(f"Failed to dispatch fit-index refresh, refreshing now: {e}")
+        refresh_fit_indexes_now(keys)
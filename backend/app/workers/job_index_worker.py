@@ -0,0 +1,95 @@
+"""Celery worker tasks for bulk job vector indexing"""
+
+import logging
+
+from celery.exceptions import Retry, SoftTimeLimitExceeded
+
+from app.core.celery_app import celery_app
+from app.core.redis import get_redis_client
+from app.db.session import SessionLocal
+from app.services.client_registry import save_local_indexes
+from app.services.job_reindex_service import JobReindexService, RedisCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.job_index_worker.reindex_jobs",
+    autoretry_for=(),
+    soft_time_limit=3300,
+    time_limit=3600,
+    max_retries=3,
+)
+def reindex_jobs(
+    self,
+    batch_size: int = JobReindexService.DEFAULT_BATCH_SIZE,
+    max_workers: int = JobReindexService.DEFAULT_MAX_WORKERS,
+    resume: bool = True,
+    include_inactive: bool = False,
+):
+    """
+    Rebuild the Pinecone jobs index from the database
+
+    A run that hits the soft time limit queues a new task that continues
+    from the Redis checkpoint, as long as it made progress. A run that stops on
+    a failed batch is retried from the checkpoint up to max_retries times.
+    """
+    db = SessionLocal()
+    redis_client = get_redis_client()
+    checkpoint = RedisCheckpoint(redis_client) if redis_client else None
+    resume_kwargs = {
+        "batch_size": batch_size,
+        "max_workers": max_workers,
+        "resume": True,
+        "include_inactive": include_inactive,
+    }
+
+    try:
+        started_at = checkpoint.load() if checkpoint else None
+        try:
+            report = JobReindexService(db, checkpoint=checkpoint).reindex(
+                batch_size=batch_size,
+                max_workers=max_workers,
+                resume=resume,
+                include_inactive=include_inactive,
+            )
+        except SoftTimeLimitExceeded:
+            # Batches already in flight finish (and checkpoint) before the
+            # executor lets the exception through
+            if checkpoint is None or checkpoint.load() == started_at:
+                raise
+            # A fresh task keeps its own retry budget for failed batches.
+            # Save first so it sees the vectors indexed so far
+            save_local_indexes()
+            last_job_id = checkpoint.load()
+            logger.info(
+                f"Job reindex hit its time limit after {last_job_id}; "
+                "continuing in a new task"
+            )
+            reindex_jobs.apply_async(kwargs=resume_kwargs)
+            return {"completed": False, "continued_after": last_job_id}
+
+        if not report.completed and checkpoint is not None:
+            logger.warning(
+                f"Job reindex stopped after {report.last_job_id}; retrying "
+                f"({self.request.retries + 1}/{self.max_retries})"
+            )
+            raise self.retry(kwargs=resume_kwargs, countdown=60)
+
+        return report.model_dump()
+
+    except Retry:
+        raise
+
+    except Exception as e:
+        logger.error(f"Job reindex failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
+        # A retry may run in another worker process
+        try:
+            save_local_indexes()
+        except Exception as e:
+            logger.error(f"Failed to save local vector indexes: {str(e)}")
@@ -0,0 +1,36 @@
+"""Celery worker tasks for subscription usage counters"""
+
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.usage_limit_service import UsageLimitService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.workers.usage_worker.write_back_usage_counters",
+    soft_time_limit=300,
+    time_limit=360,
+)
+def write_back_usage_counters(self, batch_size: int = 500):
+    """Write usage counted in Redis back to company subscriptions"""
+    db = SessionLocal()
+
+    try:
+        service = UsageLimitService(db)
+        written = 0
+        while True:
+            companies = service.write_back_usage_counters(batch_size)
+            written += companies
+            if companies < batch_size:
+                return written
+
+    except Exception as e:
+        logger.error(f"Usage counter write-back failed: {str(e)}")
+        raise
+
+    finally:
+        db.close()
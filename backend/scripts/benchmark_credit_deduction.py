@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent credit deductions: lost updates and throughput
+
+Creates a throwaway user and wallet, then runs parallel single-credit
+deductions from separate sessions through the atomic CreditService path
+and through the previous read-check-write pattern, reporting successful
+charges, the final balance and deductions per second for each.
+
+Usage:
+    python scripts/benchmark_credit_deduction.py [--workers 50]
+                                                 [--deductions 500]
+                                                 [--credits 400]
+                                                 [--database-url URL]
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path to import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.db.models  # noqa: F401,E402
+from app.core.config import settings  # noqa: E402
+from app.core.exceptions import ValidationError  # noqa: E402
+from app.db.models.billing import CreditLedger, CreditWallet  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.services.credit_service import CreditService  # noqa: E402
+
+
+def read_check_write(db, user_id: uuid.UUID) -> bool:
+    """The pre-atomic deduction: read, check in Python, write back"""
+    wallet = db.query(CreditWallet).filter(CreditWallet.user_id == user_id).first()
+    if wallet.auto_apply_credits < 1:
+        return False
+
+    wallet.auto_apply_credits -= 1
+    wallet.total_spent += 1
+    db.add(
+        CreditLedger(
+            user_id=user_id,
+            credit_type="auto_apply",
+            amount=-1,
+            balance_after=wallet.auto_apply_credits,
+            operation="deduct",
+            description="Benchmark",
+        )
+    )
+    db.commit()
+    return True
+
+
+def atomic(db, user_id: uuid.UUID) -> bool:
+    try:
+        return CreditService(db).deduct_credits(
+            user_id, "auto_apply", 1, "Benchmark"
+        )
+    except ValidationError:
+        return False
+
+
+def run(Session, deduct, credits: int, deductions: int, workers: int):
+    with Session() as db:
+        user = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        db.add(
+            CreditWallet(
+                user_id=user.id,
+                auto_apply_credits=credits,
+                total_earned=0,
+                total_spent=0,
+            )
+        )
+        db.commit()
+        user_id = user.id
+
+    def task(_):
+        with Session() as db:
+            try:
+                return deduct(db, user_id)
+            except Exception:
+                db.rollback()
+                return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        charged = sum(pool.map(task, range(deductions)))
+    elapsed = time.perf_counter() - start
+
+    with Session() as db:
+        wallet = db.query(CreditWallet).filter(CreditWallet.user_id == user_id).one()
+        balance = wallet.auto_apply_credits
+        ledger_rows = (
+            db.query(CreditLedger).filter(CreditLedger.user_id == user_id).count()
+        )
+        db.delete(db.get(User, user_id))
+        db.commit()
+
+    return charged, balance, ledger_rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--deductions", type=int, default=500)
+    parser.add_argument("--credits", type=int, default=400)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        args.database_url, pool_size=args.workers, max_overflow=args.workers
+    )
+    Session = sessionmaker(bind=engine)
+    expected = min(args.credits, args.deductions)
+
+    print(
+        f"🔧 {args.deductions} deductions of 1 credit from a {args.credits} "
+        f"credit wallet, {args.workers} workers"
+    )
+    for label, deduct in (("read-check-write", read_check_write), ("atomic", atomic)):
+        charged, balance, ledger_rows, elapsed = run(
+            Session, deduct, args.credits, args.deductions, args.workers
+        )
+        lost = (args.credits - balance) - charged
+        print(f"\n📊 {label}")
+        print(f"   charged {charged} (expected {expected}), ledger rows {ledger_rows}")
+        print(f"   final balance {balance}, lost updates {abs(lost)}")
+        print(f"   {args.deductions / elapsed:8.1f} deductions/s ({elapsed:.2f}s)")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark job description feature extraction: per-pattern vs single pass
+
+Generates a corpus of job descriptions of realistic size (required and
+preferred sections, responsibilities, benefits, salary and sponsorship
+lines), then extracts required/preferred skills, experience level,
+salary and visa sponsorship with the previous per-pattern regex approach
+and with the compiled JobTextScanner. Reports descriptions per second
+for each and how often the two disagree on the original skill set.
+
+Usage:
+    python scripts/benchmark_job_text_scanner.py [--descriptions 2000]
+                                                 [--repeat 3]
+                                                 [--seed 7]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.job_text_scanner import JobTextScanner  # noqa: E402
+
+# The per-pattern extraction JobNormalizationService used before the scanner
+LEGACY_SKILL_PATTERNS = {
+    "python": r"\bpython\b",
+    "javascript": r"\b(javascript|js|node\.?js|react|vue|angular)\b",
+    "typescript": r"\btypescript\b",
+    "java": r"\bjava\b(?!script)",
+    "golang": r"\b(golang?|go)\b",
+    "rust": r"\brust\b",
+    "c++": r"\bc\+\+\b",
+    "c#": r"\bc#\b",
+    "ruby": r"\bruby\b",
+    "php": r"\bphp\b",
+    "swift": r"\bswift\b",
+    "kotlin": r"\bkotlin\b",
+    "sql": r"\b(sql|postgres|mysql|mongodb)\b",
+    "aws": r"\b(aws|amazon web services)\b",
+    "gcp": r"\b(gcp|google cloud)\b",
+    "azure": r"\bazure\b",
+    "docker": r"\bdocker\b",
+    "kubernetes": r"\b(kubernetes|k8s)\b",
+    "terraform": r"\bterraform\b",
+    "ci/cd": r"\b(ci/cd|jenkins|github actions|gitlab)\b",
+    "machine learning": r"\b(machine learning|ml|deep learning|ai)\b",
+    "data science": r"\bdata science\b",
+    "react": r"\breact\b",
+    "vue": r"\bvue\.?js\b",
+    "angular": r"\bangular\b",
+    "django": r"\bdjango\b",
+    "flask": r"\bflask\b",
+    "fastapi": r"\bfastapi\b",
+    "graphql": r"\bgraphql\b",
+    "rest api": r"\b(rest|restful) api\b",
+    "microservices": r"\bmicroservices\b",
+    "agile": r"\b(agile|scrum|kanban)\b",
+    "git": r"\b(git|github|gitlab|version control)\b",
+}
+LEGACY_LEVEL_PATTERNS = {
+    "principal": r"\b(principal|distinguished|fellow)\b",
+    "staff": r"\b(staff|architect)\b",
+    "senior": r"\b(senior|sr\.|lead)\b",
+    "mid": r"\b(mid[\s\-]level|intermediate)\b",
+    "entry": r"\b(entry[\s\-]level|junior|new grad)\b",
+}
+LEGACY_SALARY_PATTERNS = [
+    r"\$\s?(\d{1,3}(?:,\d{3})+)\s?[-–to]+\s?\$?\s?(\d{1,3}(?:,\d{3})+)",
+    r"\$\s?(\d+)k?\s?[-–to]+\s?\$?\s?(\d+)k?",
+    r"(\d{1,3})k\s?[-–to]+\s?(\d{1,3})k",
+    r"salary:\s?\$?\s?(\d{1,3}(?:,\d{3})*)\s?[\-–to]+\s?\$?\s?(\d{1,3}(?:,\d{3})*)",
+]
+LEGACY_NO_SPONSORSHIP = [
+    r"(?:us|united states) work authorization required",
+    r"must (?:have|possess) work authorization",
+    r"no (?:visa )?sponsorship",
+    r"not sponsor",
+    r"cannot sponsor",
+]
+LEGACY_SPONSORSHIP = [
+    r"(?:will|can|provide|offer).*visa sponsorship",
+    r"h1b sponsor(?:ship)?",
+    r"eligible for (?:visa |work authorization )?(?:sponsorship|support)",
+    r"sponsor work visas",
+    r"work authorization support",
+]
+
+
+def legacy_skills(text: str, is_required: bool):
+    text_lower = text.lower()
+    if is_required:
+        match = re.search(
+            r"(required|must[\s\-]have|qualifications?|requirements?):?\s*(.*?)"
+            r"(?=\n\n|preferred|nice[\s\-]to[\s\-]have|$)",
+            text_lower,
+            re.DOTALL | re.IGNORECASE,
+        )
+        search_text = match.group(2) if match else text_lower
+    else:
+        match = re.search(
+            r"(preferred|nice[\s\-]to[\s\-]have|bonus|plus):?\s*(.*?)(?=\n\n|$)",
+            text_lower,
+            re.DOTALL | re.IGNORECASE,
+        )
+        search_text = match.group(2) if match else ""
+
+    return [
+        skill
+        for skill, pattern in LEGACY_SKILL_PATTERNS.items()
+        if re.search(pattern, search_text, re.IGNORECASE)
+    ][:20]
+
+
+def legacy_extract(text: str):
+    text_lower = text.lower()
+    level = next(
+        (
+            level
+            for level, pattern in LEGACY_LEVEL_PATTERNS.items()
+            if re.search(pattern, text_lower)
+        ),
+        None,
+    )
+
+    salary = None
+    for pattern in LEGACY_SALARY_PATTERNS:
+        match = re.search(pattern, text_lower, re.IGNORECASE)
+        if match:
+            salary = (match.group(1), match.group(2))
+            break
+
+    sponsorship = not any(
+        re.search(pattern, text_lower) for pattern in LEGACY_NO_SPONSORSHIP
+    ) and any(re.search(pattern, text_lower) for pattern in LEGACY_SPONSORSHIP)
+
+    return (
+        legacy_skills(text, True),
+        legacy_skills(text, False),
+        level,
+        salary,
+        sponsorship,
+    )
+
+
+SKILL_WORDS = [
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "Ruby", "PHP",
+    "Kotlin", "Swift", "SQL", "PostgreSQL", "MySQL", "MongoDB", "AWS", "GCP",
+    "Azure", "Docker", "Kubernetes", "Terraform", "Jenkins", "GitHub Actions",
+    "machine learning", "data science", "React", "Vue.js", "Angular", "Django",
+    "Flask", "FastAPI", "GraphQL", "REST API", "microservices", "Scrum", "Git",
+    "Kafka", "Redis", "Spark", "Airflow", "Snowflake", "PyTorch", "pandas",
+]
+FILLER = [
+    "You will partner with product, design and data teams to ship features "
+    "that matter to millions of customers.",
+    "We value ownership, clear written communication and a bias for action.",
+    "Our platform processes billions of events per day across several regions.",
+    "You will mentor engineers, review designs and improve our on-call health.",
+    "We offer a flexible hybrid schedule, generous parental leave and a "
+    "learning budget.",
+    "The team owns services end to end, from design through operations.",
+]
+LEVELS = ["Senior", "Staff", "Principal", "Junior", "Mid-level", "Lead", ""]
+SALARY_LINES = [
+    "The base salary range is $150,000 - $200,000.",
+    "Compensation: $120k - $160k plus equity.",
+    "Salary: 95,000 - 130,000",
+    "",
+]
+SPONSORSHIP_LINES = [
+    "We will provide visa sponsorship for qualified candidates.",
+    "We cannot sponsor work visas for this role.",
+    "H1B sponsorship available.",
+    "",
+]
+
+
+def make_description(rng: random.Random) -> str:
+    paragraphs = [
+        f"{rng.choice(LEVELS)} Software Engineer".strip(),
+        " ".join(rng.choice(FILLER) for _ in range(rng.randint(6, 12))),
+        "Responsibilities:\n"
+        + "\n".join(f"- {rng.choice(FILLER)}" for _ in range(rng.randint(5, 9))),
+        "Requirements:\n"
+        + "\n".join(
+            f"- {rng.randint(2, 8)}+ years of experience with "
+            f"{rng.choice(SKILL_WORDS)} and {rng.choice(SKILL_WORDS)}"
+            for _ in range(rng.randint(4, 8))
+        ),
+        "Preferred:\n"
+        + "\n".join(
+            f"- Experience with {rng.choice(SKILL_WORDS)}"
+            for _ in range(rng.randint(2, 5))
+        ),
+        " ".join(rng.choice(FILLER) for _ in range(rng.randint(4, 8))),
+        rng.choice(SALARY_LINES),
+        rng.choice(SPONSORSHIP_LINES),
+    ]
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+
+
+def run(label: str, func, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+
+    rate = len(corpus) / best
+    print(f"{label:<14} {best:8.3f}s  {rate:10.0f} descriptions/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--descriptions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_description(rng) for _ in range(args.descriptions)]
+    average = sum(len(text) for text in corpus) / len(corpus)
+    print(f"{len(corpus)} descriptions, {average:.0f} characters on average\n")
+
+    start = time.perf_counter()
+    scanner = JobTextScanner()
+    print(f"Compiled scanner in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    legacy_rate = run("per-pattern", legacy_extract, corpus, args.repeat)
+    scanner_rate = run("single pass", scanner.scan, corpus, args.repeat)
+    print(f"\nSpeedup: {scanner_rate / legacy_rate:.1f}x")
+
+    # The taxonomy is larger, so compare on the skills both versions know
+    known = set(LEGACY_SKILL_PATTERNS)
+    differing = 0
+    for text in corpus:
+        features = scanner.scan(text)
+        required, preferred = legacy_skills(text, True), legacy_skills(text, False)
+        if [s for s in features.required_skills if s in known] != required or [
+            s for s in features.preferred_skills if s in known
+        ] != preferred:
+            differing += 1
+    # Expected differences: the taxonomy also maps "PostgreSQL" to sql
+    print(f"Descriptions with different legacy skill sets: {differing}")
+
+
+if __name__ == "__main__":
+    main()
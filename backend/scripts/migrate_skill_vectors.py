@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Move per-skill job vectors into their own namespace
+
+Older indexing wrote per-skill vectors into the default namespace of the
+jobs index next to whole-job vectors. This copies them into
+PINECONE_JOB_SKILLS_NAMESPACE and deletes the originals, in batches.
+
+Usage:
+    python scripts/migrate_skill_vectors.py [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.exceptions import ServiceError  # noqa: E402
+from app.services.client_registry import (  # noqa: E402
+    get_pinecone_service,
+    reset_clients,
+)
+from app.services.pinecone_service import PineconeService  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--batch-size", type=int, default=PineconeService.MIGRATION_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count skill vectors left in the default namespace",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    try:
+        service = get_pinecone_service()
+        if args.dry_run:
+            count = service.migrate_skill_vectors(dry_run=True)
+            print(f"🔍 Skill vectors in default namespace: {count}")
+            return 0
+
+        # Runs until no legacy vectors are listed, or raises
+        moved = service.migrate_skill_vectors(batch_size=args.batch_size)
+    except ServiceError as e:
+        print(f"❌ {e}; re-run to finish")
+        return 1
+    finally:
+        reset_clients()
+
+    print(f"✅ Moved {moved} skill vectors to '{service.skills_namespace}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rebuild the Pinecone jobs index from the database
+
+Streams Job rows in id order, indexes them in batches with bounded
+concurrency, and checkpoints progress so an interrupted run resumes
+where it left off.
+
+Usage:
+    python scripts/reindex_jobs.py [--batch-size 100] [--workers 4]
+                                   [--checkpoint .reindex_checkpoint.json]
+                                   [--no-resume] [--include-inactive]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.db.models  # noqa: F401,E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.client_registry import reset_clients  # noqa: E402
+from app.services.job_reindex_service import (  # noqa: E402
+    FileCheckpoint,
+    JobReindexService,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--batch-size", type=int, default=JobReindexService.DEFAULT_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--workers", type=int, default=JobReindexService.DEFAULT_MAX_WORKERS
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Batches buffered ahead of the workers (default: 2x workers)",
+    )
+    parser.add_argument("--checkpoint", default=".reindex_checkpoint.json")
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Ignore any existing checkpoint"
+    )
+    parser.add_argument("--include-inactive", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    db = SessionLocal()
+
+    try:
+        service = JobReindexService(db, checkpoint=FileCheckpoint(args.checkpoint))
+        report = service.reindex(
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            resume=not args.no_resume,
+            include_inactive=args.include_inactive,
+        )
+    finally:
+        db.close()
+        # Persists the local vector index, when that backend is in use
+        reset_clients()
+
+    status = "✅ Reindex complete" if report.completed else "⚠️  Reindex stopped"
+    print(status)
+    if report.resumed_from:
+        print(f"   Resumed after job: {report.resumed_from}")
+    print(f"   Jobs indexed:      {report.jobs_indexed}")
+    print(f"   Vectors upserted:  {report.vectors_upserted}")
+    print(f"   Batches:           {report.batches} ({report.failed_batches} failed)")
+    print(f"   Duration:          {report.duration_seconds}s")
+    print(f"   Jobs/s:            {report.jobs_per_second}")
+    print(f"   Embeddings/s:      {report.embeddings_per_second}")
+    print(f"   Cache hit rate:    {report.cache_hit_rate:.1%}")
+    for error in report.errors:
+        print(f"   ❌ {error}")
+    if not report.completed:
+        print(f"\nRe-run to resume after job {report.last_job_id}")
+
+    return 0 if report.completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Unit tests for SQL-side job seeker analytics aggregation"""
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.db.models.application import Application
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.schemas.analytics import TimeRange
+from app.services.analytics_aggregation import aggregate_applications
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def seeker(db_session):
+    user = User(email="seeker@example.com", password_hash="hashed")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def job(db_session):
+    job = Job(title="Backend Engineer", company="TechCorp", source="employer")
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+def add_application(db_session, user, job, days_ago, status, response_days=None):
+    created_at = datetime.utcnow() - timedelta(days=days_ago, hours=1)
+    application = Application(
+        user_id=user.id,
+        job_id=job.id,
+        status=status,
+        created_at=created_at,
+        applied_at=created_at,
+        updated_at=(
+            created_at + timedelta(days=response_days, hours=2)
+            if response_days is not None
+            else created_at
+        ),
+    )
+    db_session.add(application)
+    return application
+
+
+@pytest.fixture
+def history(db_session, seeker, job):
+    """Applications on days 1-3 (streak of 3), 10 and 40 days ago"""
+    add_application(db_session, seeker, job, 1, "applied")
+    add_application(db_session, seeker, job, 1, "applied")
+    add_application(db_session, seeker, job, 2, "phone_screen", response_days=4)
+    add_application(db_session, seeker, job, 3, "offer", response_days=10)
+    add_application(db_session, seeker, job, 10, "rejected", response_days=2)
+    add_application(db_session, seeker, job, 40, "saved")
+    db_session.commit()
+    return seeker
+
+
+class TestAggregateApplications:
+    """Test the day x status grid"""
+
+    def test_buckets_group_by_day_and_status(self, db_session, history):
+        """Test that same-day, same-status applications share a bucket"""
+        now = datetime.utcnow()
+        aggregates = aggregate_applications(
+            db_session, history.id, now - timedelta(days=30), now, now=now
+        )
+
+        assert len(aggregates.buckets) == 4
+        assert aggregates.total == 5
+        assert aggregates.status_counts["applied"] == 2
+        assert aggregates.responses == 3
+        assert aggregates.last_7_days == 4
+        assert aggregates.last_30_days == 5
+
+    def test_streak_and_response_time(self, db_session, history):
+        """Test streaks over active days and average whole-day response time"""
+        now = datetime.utcnow()
+        aggregates = aggregate_applications(
+            db_session, history.id, now - timedelta(days=90), now, now=now
+        )
+
+        assert len(aggregates.active_days) == 5
+        assert aggregates.longest_streak == 3
+        assert aggregates.avg_response_days == pytest.approx((4 + 10 + 2) / 3)
+
+    def test_no_applications(self, db_session, seeker):
+        """Test empty results"""
+        now = datetime.utcnow()
+        aggregates = aggregate_applications(
+            db_session, seeker.id, now - timedelta(days=30), now, now=now
+        )
+
+        assert aggregates.total == 0
+        assert aggregates.longest_streak == 0
+        assert aggregates.avg_response_days is None
+
+
+class TestAnalyticsServiceMetrics:
+    """Test metrics built on the aggregates"""
+
+    def test_success_metrics(self, db_session, history):
+        """Test success metrics for the last 30 days"""
+        metrics = AnalyticsService(db_session).get_success_metrics(
+            history.id, TimeRange.LAST_30_DAYS
+        )
+
+        assert metrics.total_applications == 5
+        assert metrics.applications_last_7_days == 4
+        assert metrics.total_responses == 3
+        assert metrics.total_interviews == 1
+        assert metrics.total_offers == 1
+        assert metrics.total_rejections == 1
+        assert metrics.active_days == 4
+        assert metrics.longest_streak_days == 3
+        assert metrics.avg_response_time_days == 5.3
+
+    def test_pipeline_stats(self, db_session, history):
+        """Test pipeline counts and rates"""
+        stats = AnalyticsService(db_session).get_pipeline_stats(
+            history.id, TimeRange.LAST_90_DAYS
+        )
+
+        assert stats.total_applications == 6
+        assert stats.saved == 1
+        assert stats.applied == 2
+        assert stats.offer == 1
+        assert stats.interview_rate == pytest.approx(2 / 6 * 100)
+
+    def test_application_trends(self, db_session, history):
+        """Test one trend point per active day in date order"""
+        trends = AnalyticsService(db_session).get_application_trends(
+            history.id, TimeRange.LAST_7_DAYS
+        )
+
+        assert [t.applications_submitted for t in trends] == [1, 1, 2]
+        assert [t.offers_received for t in trends] == [1, 0, 0]
+        assert [t.interviews_scheduled for t in trends] == [0, 1, 0]
+        assert [t.responses_received for t in trends] == [1, 1, 0]
+
+
+class TestSharedAggregates:
+    """Test that one dashboard call aggregates applications once"""
+
+    def test_dashboard_overview_reads_applications_once(self, db_session, history):
+        """Test that sub-metrics share one aggregate query"""
+        user_id = history.id
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if "FROM applications" in statement:
+                statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            overview = AnalyticsService(db_session).get_dashboard_overview(user_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert overview.success_metrics.total_applications == 5
+        assert overview.pipeline_stats.total_applications == 5
+        # One aggregate query plus the stale-application count
+        assert len(statements) == 2
+
+    def test_results_not_shared_between_calls(self, db_session, history, job):
+        """Test that the memo only lives for one dashboard call"""
+        service = AnalyticsService(db_session)
+        service.get_dashboard_overview(history.id)
+
+        add_application(db_session, history, job, 0, "applied")
+        db_session.commit()
+
+        overview = service.get_dashboard_overview(history.id)
+        assert overview.success_metrics.total_applications == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
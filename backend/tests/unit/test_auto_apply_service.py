@@ -457,6 +457,62 @@ class TestJobProcessing:
 
                 assert auto_apply_job.status == AutoApplyStatus.FAILED
 
+    def test_process_job_publishes_application_created(
+        self, auto_apply_service, mock_db, mock_user
+    ):
+        """Test that a committed application raises an application.created event"""
+        auto_apply_job = Mock(spec=AutoApplyJob)
+        auto_apply_job.id = uuid.uuid4()
+        auto_apply_job.user_id = mock_user.id
+        auto_apply_job.attempts = 0
+        auto_apply_job.application_id = uuid.uuid4()
+        auto_apply_job.job = Mock(spec=Job)
+        auto_apply_job.job.id = uuid.uuid4()
+        auto_apply_job.job.company_id = uuid.uuid4()
+
+        mock_db.query().filter().first.return_value = auto_apply_job
+        mock_db.commit = Mock()
+
+        with patch.object(
+            auto_apply_service, "_submit_application", return_value=True
+        ), patch("app.services.auto_apply_service.AutoApplyJobResponse"), patch(
+            "app.services.auto_apply_service.publish_webhook_event",
+            side_effect=lambda *args: mock_db.commit.assert_called(),
+        ) as publish:
+            auto_apply_service.process_job(str(auto_apply_job.id))
+
+        publish.assert_called_once_with(
+            mock_db,
+            auto_apply_job.job.company_id,
+            "application.created",
+            {
+                "application_id": str(auto_apply_job.application_id),
+                "job_id": str(auto_apply_job.job.id),
+                "status": "applied",
+            },
+        )
+
+    def test_process_job_skips_event_for_external_jobs(
+        self, auto_apply_service, mock_db, mock_user
+    ):
+        """Test that jobs without a company raise no webhook event"""
+        auto_apply_job = Mock(spec=AutoApplyJob)
+        auto_apply_job.id = uuid.uuid4()
+        auto_apply_job.attempts = 0
+        auto_apply_job.job = Mock(spec=Job)
+        auto_apply_job.job.company_id = None
+
+        mock_db.query().filter().first.return_value = auto_apply_job
+
+        with patch.object(
+            auto_apply_service, "_submit_application", return_value=True
+        ), patch("app.services.auto_apply_service.AutoApplyJobResponse"), patch(
+            "app.services.auto_apply_service.publish_webhook_event"
+        ) as publish:
+            auto_apply_service.process_job(str(auto_apply_job.id))
+
+        publish.assert_not_called()
+
 
 class TestCreditManagement:
     """Test credit deduction and refund"""
@@ -0,0 +1,200 @@
+"""Unit tests for the Resend batch email sender"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.bulk_email_sender import BulkEmailSender, OutgoingEmail
+
+
+@pytest.fixture(autouse=True)
+def fast_rate_limit(monkeypatch):
+    """Keep the token bucket out of the way unless a test tightens it"""
+    monkeypatch.setattr(settings, "EMAIL_BULK_REQUESTS_PER_SECOND", 1000.0)
+    monkeypatch.setattr(settings, "EMAIL_BULK_RATE_BURST", 1000)
+
+
+def make_emails(count):
+    return [
+        OutgoingEmail(
+            to_email=f"user{i}@example.com",
+            subject="Weekly summary",
+            html=f"<p>Hi user {i}</p>",
+            text=f"Hi user {i}" if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def batch_ok(request):
+    emails = json.loads(request.content)
+    return httpx.Response(
+        200, json={"data": [{"id": f"msg_{email['to'][0]}"} for email in emails]}
+    )
+
+
+def send(emails, handler):
+    sender = BulkEmailSender(
+        "re_test", "HireFlux <noreply@hireflux.com>", httpx.MockTransport(handler)
+    )
+    return asyncio.run(sender.send(emails))
+
+
+class TestBatching:
+    """Test grouping emails into batch requests"""
+
+    def test_emails_are_sent_in_batches_of_100(self):
+        """Test that 250 emails take three batch requests"""
+        sizes = []
+
+        def handler(request):
+            assert request.url.path == "/emails/batch"
+            assert request.headers["authorization"] == "Bearer re_test"
+            sizes.append(len(json.loads(request.content)))
+            return batch_ok(request)
+
+        results = send(make_emails(250), handler)
+
+        assert sorted(sizes) == [50, 100, 100]
+        assert all(result.success for result in results)
+        assert [result.message_id for result in results] == [
+            f"msg_user{i}@example.com" for i in range(250)
+        ]
+
+    def test_payload_fields(self):
+        """Test the per-email payload sent to Resend"""
+        payloads = []
+
+        def handler(request):
+            payloads.extend(json.loads(request.content))
+            return batch_ok(request)
+
+        send(make_emails(2), handler)
+
+        assert payloads[0] == {
+            "from": "HireFlux <noreply@hireflux.com>",
+            "to": ["user0@example.com"],
+            "subject": "Weekly summary",
+            "html": "<p>Hi user 0</p>",
+        }
+        assert payloads[1]["text"] == "Hi user 1"
+
+    def test_batches_are_sent_concurrently(self, monkeypatch):
+        """Test that up to EMAIL_BULK_MAX_IN_FLIGHT batches overlap"""
+        monkeypatch.setattr(settings, "EMAIL_BULK_MAX_IN_FLIGHT", 3)
+        monkeypatch.setattr(settings, "EMAIL_BULK_BATCH_SIZE", 10)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return batch_ok(request)
+
+        results = send(make_emails(100), handler)
+
+        assert len(results) == 100
+        assert max_in_flight == 3
+
+
+class TestFailures:
+    """Test retries and failed batches"""
+
+    def test_rate_limited_batch_is_retried(self, monkeypatch):
+        """Test that a 429 is retried after Retry-After"""
+        monkeypatch.setattr(settings, "EMAIL_BULK_MAX_RETRIES", 2)
+        responses = iter([httpx.Response(429, headers={"Retry-After": "0"})])
+
+        def handler(request):
+            return next(responses, None) or batch_ok(request)
+
+        results = send(make_emails(3), handler)
+
+        assert all(result.success for result in results)
+
+    def test_rejected_batch_fails_every_email(self):
+        """Test that a 422 marks each email of that batch failed"""
+
+        def handler(request):
+            return httpx.Response(422, json={"message": "Invalid `to` field"})
+
+        results = send(make_emails(3), handler)
+
+        assert not any(result.success for result in results)
+        assert results[0].error.startswith("Resend batch error: HTTP 422")
+
+    def test_connection_error_after_retries(self, monkeypatch):
+        """Test that transport errors fail the batch once retries run out"""
+        monkeypatch.setattr(settings, "EMAIL_BULK_MAX_RETRIES", 0)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("connection refused")
+
+        results = send(make_emails(2), handler)
+
+        assert len(calls) == 1
+        assert results[1].error == "Resend batch error: connection refused"
+
+    def test_retry_reuses_idempotency_key(self, monkeypatch):
+        """Test that a batch resent after a timeout keeps its Idempotency-Key"""
+        monkeypatch.setattr(settings, "EMAIL_BULK_MAX_RETRIES", 1)
+        real_sleep = asyncio.sleep
+        monkeypatch.setattr(asyncio, "sleep", lambda _: real_sleep(0))
+        keys = []
+
+        def handler(request):
+            keys.append(request.headers["idempotency-key"])
+            if len(keys) == 1:
+                raise httpx.ReadTimeout("timed out", request=request)
+            return batch_ok(request)
+
+        results = send(make_emails(2), handler)
+
+        assert all(result.success for result in results)
+        assert len(keys) == 2
+        assert keys[0] == keys[1]
+
+    def test_batches_have_distinct_idempotency_keys(self):
+        """Test that each batch, and each send, gets its own key"""
+        keys = []
+
+        def handler(request):
+            keys.append(request.headers["idempotency-key"])
+            return batch_ok(request)
+
+        send(make_emails(150), handler)
+        send(make_emails(150), handler)
+
+        assert len(set(keys)) == 4
+
+
+class TestRateLimit:
+    """Test request pacing"""
+
+    def test_requests_are_paced(self, monkeypatch):
+        """Test that batches wait for the token bucket"""
+        monkeypatch.setattr(settings, "EMAIL_BULK_REQUESTS_PER_SECOND", 20.0)
+        monkeypatch.setattr(settings, "EMAIL_BULK_RATE_BURST", 1)
+        monkeypatch.setattr(settings, "EMAIL_BULK_BATCH_SIZE", 1)
+        loop_times = []
+
+        def handler(request):
+            loop_times.append(asyncio.get_running_loop().time())
+            return batch_ok(request)
+
+        send(make_emails(5), handler)
+
+        # 1 burst token, then 4 more at 20/s
+        assert loop_times[-1] - loop_times[0] >= 0.18
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
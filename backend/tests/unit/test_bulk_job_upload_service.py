@@ -1,19 +1,31 @@
 """Unit tests for BulkJobUploadService (Sprint 11-12 TDD)"""
 
+import io
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timedelta
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
 
-from app.services.bulk_job_upload_service import BulkJobUploadService
+from app.core.config import settings
+
+from app.services.bulk_job_upload_service import (
+    BulkJobUploadService,
+    scan_upload_duplicates,
+)
 from app.schemas.bulk_job_posting import (
     CSVJobRow,
     BulkUploadCreate,
     BulkUploadStatusEnum,
     DistributionChannelEnum,
 )
-from app.db.models.bulk_job_posting import BulkJobUpload, BulkUploadStatus
+from app.db.models.bulk_job_posting import (
+    BulkJobUpload,
+    BulkJobUploadRow,
+    BulkUploadStatus,
+)
+from app.db.models.job import Job
 
 
 @pytest.fixture
@@ -84,10 +96,13 @@ class TestBulkJobUploadService:
         company_id = str(uuid.uuid4())
         user_id = str(uuid.uuid4())
 
-        # Mock database add and commit
+        # Mock database add and commit (no active jobs to compare against)
         mock_db.add = Mock()
         mock_db.commit = AsyncMock()
         mock_db.refresh = AsyncMock()
+        mock_result = Mock()
+        mock_result.all.return_value = []
+        mock_db.execute = AsyncMock(return_value=mock_result)
 
         # Act
         result = await service.create_upload_session(
@@ -188,6 +203,64 @@ class TestBulkJobUploadService:
         if len(duplicate_info) > 0:
             assert duplicate_info[0].similarity_score >= 0.85
 
+    @pytest.mark.asyncio
+    async def test_detect_duplicates_reports_one_original_per_row(self, service):
+        """Test that each later copy is reported once, against the first copy"""
+        jobs = [
+            CSVJobRow(title="Data Engineer", location="Austin, TX"),
+            CSVJobRow(title="Product Manager", location="NY"),
+            CSVJobRow(title="Data Engineer", location="Austin, TX"),
+            CSVJobRow(title="Data Engineer", location="Austin"),
+        ]
+
+        duplicate_info = await service.detect_duplicates(jobs)
+
+        assert [(d.row_index, d.duplicate_of) for d in duplicate_info] == [
+            (2, 0),
+            (3, 0),
+        ]
+        assert duplicate_info[0].matching_fields == [
+            "title",
+            "location",
+            "department",
+            "experience_level",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_detect_duplicates_against_active_jobs(self, service, mock_db):
+        """Test that rows matching an active company job are flagged"""
+        existing_id = uuid.uuid4()
+        mock_result = Mock()
+        mock_result.all.return_value = [
+            Mock(
+                id=existing_id,
+                title="Senior Backend Engineer",
+                location="Remote",
+                department="Engineering",
+                experience_level="senior",
+            )
+        ]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        jobs = [
+            CSVJobRow(title="Product Manager", location="NY"),
+            CSVJobRow(
+                title="Senior Backend Engineer",
+                location="Remote",
+                department="Engineering",
+            ),
+        ]
+
+        duplicate_info = await service.detect_duplicates(
+            jobs, company_id=str(uuid.uuid4())
+        )
+
+        assert len(duplicate_info) == 1
+        assert duplicate_info[0].row_index == 1
+        assert duplicate_info[0].duplicate_of is None
+        assert duplicate_info[0].existing_job_id == str(existing_id)
+        assert duplicate_info[0].existing_job_title == "Senior Backend Engineer"
+        assert duplicate_info[0].matching_fields == ["title", "location", "department"]
+
     @pytest.mark.asyncio
     async def test_upload_exceeds_limit(self, service):
         """Test that uploads exceeding 500 jobs are rejected"""
@@ -247,6 +320,29 @@ class TestBulkJobUploadService:
         assert mock_upload.status == BulkUploadStatusEnum.VALIDATING
         assert mock_db.commit.called
 
+    @pytest.mark.asyncio
+    async def test_cannot_publish_while_validating(self, service, mock_db):
+        """Test that an upload awaiting duplicate detection cannot move on"""
+        mock_upload = Mock(spec=BulkJobUpload)
+        mock_upload.status = BulkUploadStatus.VALIDATING
+        mock_result = Mock()
+        mock_result.scalar_one_or_none = Mock(return_value=mock_upload)
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.commit = AsyncMock()
+
+        with pytest.raises(ValueError, match="checked for duplicates"):
+            await service.update_upload_status(
+                str(uuid.uuid4()), str(uuid.uuid4()), BulkUploadStatusEnum.PUBLISHING
+            )
+
+        assert mock_upload.status == BulkUploadStatus.VALIDATING
+        assert not mock_db.commit.called
+
+        await service.update_upload_status(
+            str(uuid.uuid4()), str(uuid.uuid4()), BulkUploadStatusEnum.CANCELLED
+        )
+        assert mock_upload.status == BulkUploadStatusEnum.CANCELLED
+
     @pytest.mark.asyncio
     async def test_list_uploads_by_company(self, service, mock_db):
         """Test listing uploads for a company"""
@@ -330,3 +426,309 @@ class TestBulkJobUploadService:
         # Act & Assert
         with pytest.raises(ValueError, match="cannot be cancelled"):
             await service.cancel_upload(upload_id, company_id)
+
+
+CSV_HEADER = "title,location,department,salary_min,salary_max\n"
+
+
+def csv_file(*lines):
+    return io.BytesIO((CSV_HEADER + "".join(f"{line}\n" for line in lines)).encode())
+
+
+@pytest.fixture
+def streaming_db(mock_db):
+    """Mock session recording the row chunks inserted by a streamed upload"""
+    mock_db.add = Mock()
+    mock_db.commit = AsyncMock()
+    mock_db.refresh = AsyncMock()
+    mock_db.inserted_chunks = []
+
+    async def execute(statement, params=None):
+        if isinstance(statement, Insert):
+            mock_db.inserted_chunks.append(params)
+        result = Mock()
+        result.all.return_value = []  # No active jobs
+        return result
+
+    mock_db.execute = AsyncMock(side_effect=execute)
+    return mock_db
+
+
+class TestStreamingCSVUpload:
+    """Test streamed CSV validation and chunked persistence"""
+
+    async def upload(self, service, file):
+        return await service.create_upload_session_from_csv(
+            company_id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            csv_file=file,
+            filename="jobs.csv",
+            distribution_channels=[DistributionChannelEnum.INTERNAL],
+        )
+
+    @pytest.mark.asyncio
+    async def test_rows_persisted_in_chunks(self, service, streaming_db, monkeypatch):
+        """Test that rows are validated and inserted one chunk at a time"""
+        monkeypatch.setattr(settings, "BULK_UPLOAD_CHUNK_SIZE", 2)
+        file = csv_file(
+            "Data Engineer,Austin TX,Data,100000,150000",
+            "Designer,Remote,Design,200000,100000",
+            "Data Engineer,Austin TX,Data,,",
+            "Product Manager,NY,Product,lots,",
+            "QA Analyst,Remote,Engineering,,",
+        )
+
+        upload = await self.upload(service, file)
+
+        chunks = streaming_db.inserted_chunks
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        rows = [row for chunk in chunks for row in chunk]
+        assert [row["row_index"] for row in rows] == [0, 1, 2, 3, 4]
+        assert [row["is_valid"] for row in rows] == [True, False, True, False, True]
+        assert rows[1]["validation_errors"][0]["field"] == "salary"
+        # Unparseable rows keep their raw values
+        assert rows[3]["job_data"]["salary_min"] == "lots"
+        assert rows[3]["validation_errors"][0]["field"] == "salary_min"
+
+        assert (upload.total_jobs, upload.processed_jobs) == (5, 5)
+        assert (upload.valid_jobs, upload.invalid_jobs) == (3, 2)
+        assert [e["row_index"] for e in upload.validation_errors] == [1, 3]
+        # Duplicate detection is left to the worker
+        assert upload.status == BulkUploadStatus.VALIDATING
+        assert upload.duplicate_info == []
+        assert upload.raw_jobs_data is None
+        # One commit for the session, one per chunk, one to finish
+        assert streaming_db.commit.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_error_preview_is_capped(self, service, streaming_db, monkeypatch):
+        """Test that only the first errors are kept on the upload"""
+        monkeypatch.setattr(settings, "BULK_UPLOAD_ERROR_PREVIEW_LIMIT", 3)
+        file = csv_file(*[f"Job {i},Remote,Eng,-1," for i in range(10)])
+
+        upload = await self.upload(service, file)
+
+        assert upload.invalid_jobs == 10
+        assert len(upload.validation_errors) == 3
+
+    @pytest.mark.asyncio
+    async def test_too_many_rows_fails_upload(self, service, streaming_db, monkeypatch):
+        """Test that exceeding the row limit marks the upload failed"""
+        monkeypatch.setattr(settings, "BULK_UPLOAD_CHUNK_SIZE", 2)
+        monkeypatch.setattr(settings, "BULK_UPLOAD_MAX_ROWS", 3)
+        file = csv_file(*[f"Job {i},Remote,Eng,," for i in range(5)])
+
+        with pytest.raises(ValueError, match="Maximum 3 jobs"):
+            await self.upload(service, file)
+
+        upload = streaming_db.add.call_args[0][0]
+        assert upload.status == BulkUploadStatus.FAILED
+        assert upload.processed_jobs == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_csv_rejected(self, service, streaming_db):
+        """Test that a header-only file creates no upload"""
+        with pytest.raises(ValueError, match="empty"):
+            await self.upload(service, csv_file())
+
+        assert not streaming_db.add.called
+
+    @pytest.mark.asyncio
+    async def test_missing_title_column_rejected(self, service, streaming_db):
+        """Test that the title column is required"""
+        file = io.BytesIO(b"name,location\nEngineer,Remote\n")
+
+        with pytest.raises(ValueError, match="Missing required CSV column"):
+            await self.upload(service, file)
+
+    @pytest.mark.asyncio
+    async def test_invalid_encoding_rejected(self, service, streaming_db):
+        """Test that non UTF-8 files are rejected"""
+        file = io.BytesIO(CSV_HEADER.encode() + "Ingénieur,Paris,,,\n".encode("latin-1"))
+
+        with pytest.raises(ValueError, match="Invalid file encoding"):
+            await self.upload(service, file)
+
+    @pytest.mark.asyncio
+    async def test_uploaded_file_left_open(self, service, streaming_db):
+        """Test that the caller's file object is not closed"""
+        file = csv_file("Designer,Remote,Design,,")
+
+        await self.upload(service, file)
+
+        assert not file.closed
+
+
+
+def stored_upload(db, rows, status=BulkUploadStatus.VALIDATING):
+    """Upload whose rows were stored by a streamed CSV upload"""
+    upload = BulkJobUpload(
+        id=uuid.uuid4(),
+        company_id=uuid.uuid4(),
+        uploaded_by_user_id=uuid.uuid4(),
+        filename="jobs.csv",
+        total_jobs=len(rows),
+        status=status,
+        validation_errors=[],
+        duplicate_info=[],
+        distribution_channels=["internal"],
+    )
+    db.add(upload)
+    for row_index, job_data in enumerate(rows):
+        db.add(
+            BulkJobUploadRow(
+                bulk_upload_id=upload.id,
+                row_index=row_index,
+                job_data=job_data,
+                is_valid=True,
+            )
+        )
+    db.commit()
+    return upload
+
+
+DATA_ENGINEER = CSVJobRow(title="Data Engineer", location="Austin, TX").model_dump()
+
+
+class TestScanUploadDuplicates:
+    """Test duplicate detection over stored upload rows (worker side)"""
+
+    def test_stored_rows_are_read_back(self, db_session):
+        """Test that matches are found across rows stored in separate chunks"""
+        upload = stored_upload(
+            db_session,
+            [DATA_ENGINEER, CSVJobRow(title="Designer", location="NY").model_dump()]
+            + [DATA_ENGINEER] * 2,
+        )
+
+        scan_upload_duplicates(db_session, str(upload.id))
+
+        db_session.refresh(upload)
+        assert [(d["row_index"], d["duplicate_of"]) for d in upload.duplicate_info] == [
+            (2, 0),
+            (3, 0),
+        ]
+        assert upload.duplicate_jobs == 2
+        assert upload.duplicate_info[0]["matching_fields"] == [
+            "title",
+            "location",
+            "department",
+            "experience_level",
+        ]
+
+    def test_unparseable_rows_are_skipped(self, db_session):
+        """Test that rows stored with raw CSV values take no part"""
+        raw = {"title": "Data Engineer", "location": "Austin, TX", "salary_min": "x"}
+        upload = stored_upload(db_session, [raw, DATA_ENGINEER, raw])
+
+        scan_upload_duplicates(db_session, str(upload.id))
+
+        db_session.refresh(upload)
+        assert upload.duplicate_info == []
+        assert upload.duplicate_jobs == 0
+
+    def test_matches_against_existing_jobs(self, db_session):
+        """Test that rows matching an active company job are flagged"""
+        upload = stored_upload(db_session, [DATA_ENGINEER])
+        existing = Job(
+            company_id=upload.company_id,
+            title="Data Engineer",
+            location="Austin, TX",
+            is_active=True,
+        )
+        other_company = Job(
+            company_id=uuid.uuid4(),
+            title="Data Engineer",
+            location="Austin, TX",
+            is_active=True,
+        )
+        closed = Job(
+            company_id=upload.company_id,
+            title="Data Engineer",
+            location="Austin, TX",
+            is_active=False,
+        )
+        db_session.add_all([existing, other_company, closed])
+        db_session.commit()
+
+        scan_upload_duplicates(db_session, str(upload.id))
+
+        db_session.refresh(upload)
+        [duplicate] = upload.duplicate_info
+        assert duplicate["row_index"] == 0
+        assert duplicate["duplicate_of"] is None
+        assert duplicate["existing_job_id"] == str(existing.id)
+        assert duplicate["existing_job_title"] == "Data Engineer"
+
+    def test_validating_upload_becomes_uploaded(self, db_session):
+        """Test the VALIDATING -> UPLOADED transition, including with no matches"""
+        upload = stored_upload(db_session, [DATA_ENGINEER])
+
+        result = scan_upload_duplicates(db_session, str(upload.id))
+
+        db_session.refresh(upload)
+        assert result is upload
+        assert upload.status == BulkUploadStatus.UPLOADED
+
+    def test_upload_not_validating_is_left_alone(self, db_session):
+        """Test that an upload cancelled before the worker ran is not reopened"""
+        upload = stored_upload(
+            db_session, [DATA_ENGINEER] * 2, status=BulkUploadStatus.CANCELLED
+        )
+
+        scan_upload_duplicates(db_session, str(upload.id))
+
+        db_session.refresh(upload)
+        assert upload.status == BulkUploadStatus.CANCELLED
+        assert upload.duplicate_info == []
+
+    def test_missing_upload(self, db_session):
+        """Test that a deleted upload is skipped"""
+        assert scan_upload_duplicates(db_session, str(uuid.uuid4())) is None
+
+
+class TestDetectUploadDuplicatesTask:
+    """Test the bulk upload worker task"""
+
+    @pytest.fixture
+    def worker_db(self, db_session, monkeypatch):
+        """Hand the task the test session and keep it open afterwards"""
+        monkeypatch.setattr(db_session, "close", lambda: None)
+        with patch(
+            "app.workers.bulk_upload_worker.SessionLocal", return_value=db_session
+        ):
+            yield db_session
+
+    def test_task_scans_upload(self, worker_db):
+        """Test that the task stores matches and reports the new status"""
+        from app.workers.bulk_upload_worker import detect_upload_duplicates
+
+        upload = stored_upload(worker_db, [DATA_ENGINEER] * 2)
+
+        result = detect_upload_duplicates(str(upload.id))
+
+        worker_db.refresh(upload)
+        assert result == {
+            "upload_id": str(upload.id),
+            "status": "uploaded",
+            "duplicate_jobs": 1,
+        }
+        assert upload.status == BulkUploadStatus.UPLOADED
+
+    def test_task_marks_upload_failed_when_detection_raises(self, worker_db):
+        """Test that a failed scan does not leave the upload VALIDATING"""
+        from app.workers.bulk_upload_worker import detect_upload_duplicates
+
+        upload = stored_upload(worker_db, [DATA_ENGINEER] * 2)
+
+        with patch(
+            "app.workers.bulk_upload_worker.scan_upload_duplicates",
+            side_effect=RuntimeError("boom"),
+        ):
+            with pytest.raises(RuntimeError):
+                detect_upload_duplicates(str(upload.id))
+
+        worker_db.refresh(upload)
+        assert upload.status == BulkUploadStatus.FAILED
+        assert upload.error_message == "Duplicate detection failed"
+        assert upload.duplicate_info == []
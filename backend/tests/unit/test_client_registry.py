@@ -0,0 +1,88 @@
+"""Unit tests for the shared client registry"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from app.services import client_registry
+from app.services.pinecone_service import PineconeService
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """Ensure each test starts without shared clients"""
+    client_registry.reset_clients()
+    yield
+    client_registry.reset_clients()
+
+
+class TestClientRegistry:
+    """Test process-wide client lifecycle"""
+
+    def test_pinecone_service_is_created_once(self):
+        """Test that repeated lookups share a single instance"""
+        with patch.object(
+            client_registry, "OpenAIService"
+        ) as mock_openai, patch.object(
+            client_registry, "PineconeService"
+        ) as mock_pinecone:
+            first = client_registry.get_pinecone_service()
+            second = client_registry.get_pinecone_service()
+
+        assert first is second
+        assert mock_pinecone.call_count == 1
+        assert mock_openai.call_count == 1
+        mock_pinecone.assert_called_once_with(
+            openai_service=mock_openai.return_value
+        )
+
+    def test_set_pinecone_service_swaps_in_fake(self):
+        """Test that tests can inject a fake service"""
+        fake = Mock()
+
+        client_registry.set_pinecone_service(fake)
+
+        assert client_registry.get_pinecone_service() is fake
+
+    def test_init_clients_tolerates_failures(self):
+        """Test that startup does not crash when Pinecone is unreachable"""
+        with patch.object(client_registry, "OpenAIService"), patch.object(
+            client_registry, "PineconeService", side_effect=Exception("unreachable")
+        ):
+            client_registry.init_clients()
+
+        assert client_registry._pinecone_service is None
+
+    def test_reset_clients(self):
+        """Test that reset drops shared instances"""
+        client_registry.set_pinecone_service(Mock())
+        client_registry.set_openai_service(Mock())
+
+        client_registry.reset_clients()
+
+        assert client_registry._pinecone_service is None
+        assert client_registry._openai_service is None
+
+
+class TestInjectedIndexes:
+    """Test building PineconeService around local index handles"""
+
+    def test_injected_indexes_skip_pinecone_init(self):
+        """Test that fake indexes avoid any Pinecone network calls"""
+        jobs_index, users_index, openai_service = Mock(), Mock(), Mock()
+
+        with patch("app.services.pinecone_service.pinecone") as mock_pc:
+            service = PineconeService(
+                jobs_index=jobs_index,
+                users_index=users_index,
+                openai_service=openai_service,
+            )
+
+        mock_pc.init.assert_not_called()
+        mock_pc.list_indexes.assert_not_called()
+        assert service.jobs_index is jobs_index
+        assert service.users_index is users_index
+        assert service.openai_service is openai_service
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
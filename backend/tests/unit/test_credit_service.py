@@ -0,0 +1,198 @@
+"""Unit tests for CreditService wallet operations"""
+
+import pytest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.exceptions import ValidationError
+from app.db.base import Base
+from app.db.models.billing import CreditLedger, CreditWallet
+from app.db.models.user import User
+from app.services.credit_service import CreditService
+
+
+def make_wallet(db_session, **balances):
+    user = User(email=f"{uuid.uuid4()}@example.com", password_hash="hashed")
+    db_session.add(user)
+    db_session.flush()
+
+    wallet = CreditWallet(
+        user_id=user.id,
+        ai_credits=0,
+        cover_letter_credits=3,
+        auto_apply_credits=0,
+        job_suggestion_credits=10,
+        total_earned=0,
+        total_spent=0,
+    )
+    for field, value in balances.items():
+        setattr(wallet, field, value)
+    db_session.add(wallet)
+    db_session.commit()
+    return user.id
+
+
+def wallet_of(db_session, user_id):
+    db_session.expire_all()
+    return db_session.query(CreditWallet).filter_by(user_id=user_id).one()
+
+
+class TestDeductCredits:
+    """Test the conditional single-statement deduction"""
+
+    def test_deduct_updates_balance_and_ledger(self, db_session):
+        """Test balance, lifetime total and ledger entry"""
+        user_id = make_wallet(db_session, auto_apply_credits=5)
+        reference_id = uuid.uuid4()
+
+        assert CreditService(db_session).deduct_credits(
+            user_id, "auto_apply", 2, "Auto-apply", reference_id
+        )
+
+        wallet = wallet_of(db_session, user_id)
+        assert wallet.auto_apply_credits == 3
+        assert wallet.total_spent == 2
+        entry = db_session.query(CreditLedger).one()
+        assert (entry.amount, entry.balance_after, entry.operation) == (-2, 3, "deduct")
+        assert entry.reference_id == reference_id
+
+    def test_insufficient_credits(self, db_session):
+        """Test that a short balance is left untouched"""
+        user_id = make_wallet(db_session, auto_apply_credits=1)
+
+        with pytest.raises(ValidationError, match="Required: 2, Available: 1"):
+            CreditService(db_session).deduct_credits(user_id, "auto_apply", 2, "x")
+
+        assert wallet_of(db_session, user_id).auto_apply_credits == 1
+        assert db_session.query(CreditLedger).count() == 0
+
+    def test_unlimited_plan(self, db_session):
+        """Test that unlimited balances are logged but not decremented"""
+        user_id = make_wallet(db_session, ai_credits=-1)
+
+        CreditService(db_session).deduct_credits(user_id, "ai", 1, "Resume")
+
+        wallet = wallet_of(db_session, user_id)
+        assert (wallet.ai_credits, wallet.total_spent) == (-1, 0)
+        entry = db_session.query(CreditLedger).one()
+        assert entry.description == "Resume (unlimited plan)"
+
+    def test_missing_wallet_and_invalid_type(self, db_session):
+        """Test validation errors"""
+        service = CreditService(db_session)
+
+        with pytest.raises(ValidationError, match="wallet not found"):
+            service.deduct_credits(uuid.uuid4(), "ai", 1, "x")
+        with pytest.raises(ValidationError, match="Invalid credit type"):
+            service.deduct_credits(uuid.uuid4(), "gold", 1, "x")
+
+
+class TestDeductCreditsBatch:
+    """Test charging several operations at once"""
+
+    def test_batch_charge(self, db_session):
+        """Test one decrement with a ledger row per reference"""
+        user_id = make_wallet(db_session, auto_apply_credits=5)
+        references = [uuid.uuid4() for _ in range(3)]
+
+        balance = CreditService(db_session).deduct_credits_batch(
+            user_id, "auto_apply", references, "Auto-apply job application"
+        )
+
+        assert balance == 2
+        assert wallet_of(db_session, user_id).total_spent == 3
+        entries = db_session.query(CreditLedger).all()
+        assert {e.reference_id: e.balance_after for e in entries} == dict(
+            zip(references, [4, 3, 2])
+        )
+
+    def test_batch_is_all_or_nothing(self, db_session):
+        """Test that nothing is charged when the batch doesn't fit"""
+        user_id = make_wallet(db_session, auto_apply_credits=2)
+
+        with pytest.raises(ValidationError, match="Insufficient"):
+            CreditService(db_session).deduct_credits_batch(
+                user_id, "auto_apply", [uuid.uuid4() for _ in range(3)], "x"
+            )
+
+        assert wallet_of(db_session, user_id).auto_apply_credits == 2
+        assert db_session.query(CreditLedger).count() == 0
+
+
+class TestAddAndRefund:
+    """Test relative balance increments"""
+
+    def test_add_and_refund(self, db_session):
+        """Test balance and lifetime totals"""
+        user_id = make_wallet(db_session, auto_apply_credits=1)
+        service = CreditService(db_session)
+
+        service.add_credits(user_id, "auto_apply", 10, "Purchase")
+        service.deduct_credits(user_id, "auto_apply", 3, "Auto-apply")
+        service.refund_credits(user_id, "auto_apply", 5, "Failed")
+
+        wallet = wallet_of(db_session, user_id)
+        assert wallet.auto_apply_credits == 13
+        assert wallet.total_earned == 10
+        assert wallet.total_spent == 0
+        assert db_session.query(CreditLedger).count() == 3
+
+    def test_add_to_unlimited(self, db_session):
+        """Test that unlimited balances are not changed"""
+        user_id = make_wallet(db_session, ai_credits=-1)
+
+        CreditService(db_session).add_credits(user_id, "ai", 5, "Bonus")
+
+        assert wallet_of(db_session, user_id).ai_credits == -1
+        entry = db_session.query(CreditLedger).one()
+        assert entry.description == "Bonus (unlimited plan - not applied)"
+
+
+class TestConcurrentDeductions:
+    """Test parallel deductions from separate sessions"""
+
+    def test_no_lost_updates(self, tmp_path):
+        """Test that 50 parallel deductions never overdraw or lose updates"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'credits.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        Base.metadata.create_all(
+            engine,
+            tables=[
+                User.__table__,
+                CreditWallet.__table__,
+                CreditLedger.__table__,
+            ],
+        )
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            user_id = make_wallet(db, auto_apply_credits=30)
+
+        def deduct(_):
+            with Session() as db:
+                try:
+                    return CreditService(db).deduct_credits(
+                        user_id, "auto_apply", 1, "Auto-apply"
+                    )
+                except ValidationError:
+                    return False
+
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            results = list(pool.map(deduct, range(50)))
+
+        with Session() as db:
+            wallet = wallet_of(db, user_id)
+            assert results.count(True) == 30
+            assert wallet.auto_apply_credits == 0
+            assert wallet.total_spent == 30
+            assert db.query(CreditLedger).count() == 30
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
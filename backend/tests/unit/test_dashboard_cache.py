@@ -0,0 +1,239 @@
+"""Unit tests for the employer dashboard counters cache"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from sqlalchemy import event
+
+from app.db.models.application import Application
+from app.db.models.company import Company
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.services.dashboard_cache import (
+    DashboardCache,
+    disable_dashboard_cache_invalidation,
+    enable_dashboard_cache_invalidation,
+    set_dashboard_cache,
+)
+from app.services.dashboard_service import DashboardService
+
+
+@pytest.fixture
+def cache():
+    """Fresh in-process cache with invalidation tracking enabled"""
+    cache = DashboardCache(ttl_seconds=60)
+    set_dashboard_cache(cache)
+    enable_dashboard_cache_invalidation()
+    yield cache
+    disable_dashboard_cache_invalidation()
+    set_dashboard_cache(None)
+
+
+@pytest.fixture
+def company_with_jobs(db_session):
+    """Company with two active jobs and one closed job"""
+    company = Company(name="TechCorp", max_active_jobs=10, max_candidate_views=100)
+    db_session.add(company)
+    db_session.flush()
+
+    now = datetime.utcnow()
+    jobs = [
+        Job(
+            title=title,
+            company="TechCorp",
+            source="employer",
+            company_id=company.id,
+            is_active=is_active,
+            posted_date=now - timedelta(days=10),
+        )
+        for title, is_active in [
+            ("Backend", True),
+            ("Frontend", True),
+            ("Closed", False),
+        ]
+    ]
+    db_session.add_all(jobs)
+    db_session.flush()
+
+    for index, (job, status, days_ago) in enumerate(
+        [
+            (jobs[0], "applied", 0),
+            (jobs[0], "interview", 3),
+            (jobs[0], "offered", 9),
+            (jobs[1], "hired", 8),
+            (jobs[2], "rejected", 20),
+        ]
+    ):
+        add_application(db_session, job, f"c{index}@example.com", status, days_ago)
+
+    db_session.commit()
+    return company, jobs
+
+
+def add_application(db_session, job, email, status="applied", days_ago=0):
+    user = User(email=email, password_hash="hashed")
+    db_session.add(user)
+    db_session.flush()
+
+    created_at = datetime.utcnow() - timedelta(days=days_ago)
+    db_session.add(
+        Application(
+            user_id=user.id,
+            job_id=job.id,
+            status=status,
+            created_at=created_at,
+            applied_at=created_at,
+        )
+    )
+
+
+def count_statements(db_session, func):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+class TestDashboardCounters:
+    """Test counters aggregated in grouped queries"""
+
+    def test_dashboard_stats(self, db_session, cache, company_with_jobs):
+        """Test counts, status breakdown, top jobs and time to first application"""
+        company, jobs = company_with_jobs
+        company_id = company.id
+
+        stats, statements = count_statements(
+            db_session,
+            lambda: DashboardService(db_session).get_dashboard_stats(company_id),
+        )
+
+        # Company + per-job + per-status queries
+        assert statements == 3
+        assert stats.active_jobs == 2
+        assert stats.total_jobs_posted == 3
+        assert stats.total_applications == 5
+        assert stats.new_applications_today == 1
+        assert stats.new_applications_this_week == 2
+        assert {s.status: s.count for s in stats.applications_by_status} == {
+            "applied": 1,
+            "interview": 1,
+            "offered": 1,
+            "hired": 1,
+            "rejected": 1,
+        }
+        assert [(j.job_title, j.total_applications) for j in stats.top_jobs] == [
+            ("Backend", 3),
+            ("Frontend", 1),
+        ]
+        assert stats.top_jobs[0].new_applications_24h == 1
+        # First applications 9, 8 and 20 days before posting + 10 days
+        assert stats.avg_time_to_first_application_hours == pytest.approx(
+            (24 + 48 - 240) / 3, abs=0.01
+        )
+
+    def test_pipeline_metrics(self, db_session, cache, company_with_jobs):
+        """Test conversion rates from the cached status counts"""
+        company, _ = company_with_jobs
+
+        pipeline = DashboardService(db_session).get_pipeline_metrics(company.id)
+
+        assert pipeline.total_applicants == 5
+        assert pipeline.interviewed_count == 1
+        assert pipeline.offered_count == 1
+        assert pipeline.hired_count == 1
+        assert pipeline.application_to_interview_rate == 20.0
+
+    def test_company_without_jobs(self, db_session, cache):
+        """Test empty counters"""
+        company = Company(name="Empty Co")
+        db_session.add(company)
+        db_session.commit()
+
+        stats = DashboardService(db_session).get_dashboard_stats(company.id)
+
+        assert stats.total_applications == 0
+        assert stats.applications_by_status == []
+        assert stats.avg_time_to_first_application_hours is None
+
+
+class TestDashboardCaching:
+    """Test caching and invalidation"""
+
+    def test_cached_dashboard_is_one_round_trip(
+        self, db_session, cache, company_with_jobs
+    ):
+        """Test that a warm cache leaves only the company lookup"""
+        company, _ = company_with_jobs
+        service = DashboardService(db_session)
+        service.get_dashboard_stats(company.id)
+
+        _, statements = count_statements(
+            db_session, lambda: service.get_dashboard_stats(company.id)
+        )
+        _, pipeline_statements = count_statements(
+            db_session, lambda: service.get_pipeline_metrics(company.id)
+        )
+
+        assert statements == 1
+        assert pipeline_statements == 0
+
+    def test_new_application_invalidates(self, db_session, cache, company_with_jobs):
+        """Test that committing an application drops the company's entry"""
+        company, jobs = company_with_jobs
+        service = DashboardService(db_session)
+        service.get_dashboard_stats(company.id)
+
+        add_application(db_session, jobs[1], "new@example.com")
+        db_session.commit()
+
+        assert cache.get(company.id) is None
+        assert service.get_dashboard_stats(company.id).total_applications == 6
+
+    def test_rollback_keeps_entry(self, db_session, cache, company_with_jobs):
+        """Test that rolled back applications don't invalidate"""
+        company, jobs = company_with_jobs
+        DashboardService(db_session).get_dashboard_stats(company.id)
+
+        add_application(db_session, jobs[1], "new@example.com")
+        db_session.flush()
+        db_session.rollback()
+
+        assert cache.get(company.id) is not None
+
+    def test_entries_expire(self, monkeypatch):
+        """Test TTL expiry of local entries"""
+        cache = DashboardCache(ttl_seconds=60)
+        cache.set("company", {"total_applications": 1})
+        assert cache.get("company") == {"total_applications": 1}
+
+        clock = Mock(return_value=10**9)
+        monkeypatch.setattr("app.services.dashboard_cache.time.monotonic", clock)
+
+        assert cache.get("company") is None
+
+    def test_redis_tier(self):
+        """Test that entries are shared through Redis as JSON"""
+        redis_client = Mock()
+        redis_client.get.return_value = b'{"total_applications": 3}'
+        cache = DashboardCache(ttl_seconds=30, redis_client=redis_client)
+
+        cache.set("company", {"total_applications": 3})
+        cache.invalidate(["company"])
+
+        redis_client.setex.assert_called_once_with(
+            "hireflux:dashboard:company", 30, '{"total_applications": 3}'
+        )
+        redis_client.delete.assert_called_once_with("hireflux:dashboard:company")
+        assert cache.get("company") == {"total_applications": 3}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
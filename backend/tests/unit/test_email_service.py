@@ -4,7 +4,8 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
-from app.services.email_service import EmailService
+from app.services.bulk_email_sender import BulkEmailSender, SendResult
+from app.services.email_service import EmailService, compile_template
 from app.schemas.notification import EmailSend
 from app.core.exceptions import ServiceError
 
@@ -274,6 +275,23 @@ class TestWeeklyDigest:
 class TestBulkEmail:
     """Test bulk email sending"""
 
+    @staticmethod
+    def patch_batch_send(outcomes=None):
+        """Patch the batch sender; outcomes maps an address to a SendResult"""
+        sent = []
+
+        async def fake_send(self, emails):
+            sent.extend(emails)
+            return [
+                (outcomes or {}).get(
+                    email.to_email,
+                    SendResult(success=True, message_id=f"msg_{email.to_email}"),
+                )
+                for email in emails
+            ]
+
+        return sent, patch.object(BulkEmailSender, "send", fake_send)
+
     def test_send_bulk_emails(self, email_service):
         """Test sending emails to multiple recipients"""
         recipients = [
@@ -281,40 +299,126 @@ class TestBulkEmail:
             {"email": "user2@example.com", "name": "User 2"},
             {"email": "user3@example.com", "name": "User 3"},
         ]
+        sent, patched = self.patch_batch_send()
 
-        with patch.object(email_service, "send_email") as mock_send:
-            mock_send.return_value = {"success": True}
-
+        with patched, patch.object(email_service, "send_email") as mock_send:
             results = email_service.send_bulk_emails(
                 recipients=recipients,
                 subject="System Update",
                 template_name="system_update",
+                message="We shipped it",
             )
 
             assert len(results) == 3
             assert all(r["success"] for r in results)
-            assert mock_send.call_count == 3
+            assert results[1]["message_id"] == "msg_user2@example.com"
+            assert mock_send.call_count == 0
+            assert sent[0].html == "<h1>User 1</h1><p>We shipped it</p>"
+            assert sent[2].template_name == "system_update"
 
     def test_bulk_email_handles_partial_failures(self, email_service):
         """Test bulk email with some failures"""
         recipients = [
             {"email": "success@example.com", "name": "Success User"},
             {"email": "fail@example.com", "name": "Fail User"},
+            {"email": "not-an-email", "name": "Invalid User"},
         ]
+        sent, patched = self.patch_batch_send(
+            {"fail@example.com": SendResult(success=False, error="Rejected")}
+        )
 
-        with patch.object(email_service, "send_email") as mock_send:
-            # First call succeeds, second fails
-            mock_send.side_effect = [
-                {"success": True, "message_id": "msg_1"},
-                {"success": False, "error": "Invalid email"},
-            ]
-
+        with patched:
             results = email_service.send_bulk_emails(
                 recipients=recipients, subject="Test", template_name="test"
             )
 
             assert results[0]["success"] is True
-            assert results[1]["success"] is False
+            assert results[1] == {
+                "success": False,
+                "message_id": None,
+                "error": "Rejected",
+            }
+            assert results[2]["error"] == "Invalid email address"
+            assert [email.to_email for email in sent] == [
+                "success@example.com",
+                "fail@example.com",
+            ]
+
+    def test_bulk_email_per_recipient_variables(self, email_service):
+        """Test that recipient variables override shared ones"""
+        recipients = [
+            {"email": "a@example.com", "name": "A", "variables": {"message": "Mine"}},
+            {"email": "b@example.com", "name": "B"},
+        ]
+        sent, patched = self.patch_batch_send()
+
+        with patched:
+            email_service.send_bulk_emails(
+                recipients, "Digest", "weekly_digest", message="Shared"
+            )
+
+            assert "Mine" in sent[0].html
+            assert "Shared" in sent[1].html
+
+    def test_send_emails_renders_each_request(self, email_service):
+        """Test batch sending of prepared EmailSend requests"""
+        requests = [
+            EmailSend(
+                to_email="user@example.com",
+                subject="Weekly digest",
+                html_body="<p>Hi</p><script>alert(1)</script>",
+                text_body="Hi",
+                email_type="weekly_digest",
+                user_id="user-1",
+            )
+        ]
+        sent, patched = self.patch_batch_send()
+
+        with patched:
+            results = email_service.send_emails(requests)
+
+            assert results[0]["success"] is True
+            assert sent[0].html == "<p>Hi</p>"
+            assert (sent[0].text, sent[0].email_type) == ("Hi", "weekly_digest")
+
+    def test_bulk_send_logs_deliveries_in_one_commit(self, email_service):
+        """Test that every attempt gets a log row from a single commit"""
+        email_service.db = MagicMock()
+        recipients = [
+            {"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(3)
+        ]
+        _, patched = self.patch_batch_send(
+            {"user2@example.com": SendResult(success=False, error="Rejected")}
+        )
+
+        with patched:
+            email_service.send_bulk_emails(
+                recipients, "Digest", "weekly_digest", email_type="weekly_digest"
+            )
+
+        email_service.db.execute.assert_called_once()
+        email_service.db.commit.assert_called_once()
+        email_service.db.add.assert_not_called()
+        rows = email_service.db.execute.call_args[0][1]
+        assert [row["status"] for row in rows] == ["sent", "sent", "failed"]
+        assert rows[0]["message_id"] == "msg_user0@example.com"
+        assert rows[2]["error_message"] == "Rejected"
+        assert all(row["email_type"] == "weekly_digest" for row in rows)
+
+    def test_template_is_compiled_once(self, email_service):
+        """Test that rendering reuses the compiled template"""
+        compile_template.cache_clear()
+        sent, patched = self.patch_batch_send()
+        recipients = [
+            {"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(5)
+        ]
+
+        with patched:
+            email_service.send_bulk_emails(recipients, "Digest", "weekly_digest")
+            email_service._render_template("weekly_digest", {"user_name": "X"})
+
+        info = compile_template.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
 
 
 class TestEmailValidation:
@@ -0,0 +1,138 @@
+"""Unit tests for EmbeddingCache"""
+
+import pytest
+from unittest.mock import Mock, patch
+import time
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache():
+    """Small local-only cache"""
+    return EmbeddingCache(max_entries=3, ttl_seconds=60)
+
+
+@pytest.fixture
+def mock_redis():
+    """Mock Redis client backed by a dict"""
+    store = {}
+    client = Mock()
+    client.get.side_effect = lambda key: store.get(key)
+    client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    client.store = store
+    return client
+
+
+class TestLocalTier:
+    """Test in-process LRU tier"""
+
+    def test_set_and_get_returns_float32(self, cache):
+        """Test vectors round-trip as float32 arrays"""
+        cache.set("a", [0.1, 0.2, 0.3])
+
+        vector = cache.get("a")
+
+        assert vector.dtype == np.float32
+        np.testing.assert_allclose(vector, [0.1, 0.2, 0.3], rtol=1e-6)
+
+    def test_miss_returns_none(self, cache):
+        """Test that unknown keys are misses"""
+        assert cache.get("missing") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test that the cache stays within max_entries"""
+        cache.set("a", [1.0])
+        cache.set("b", [2.0])
+        cache.set("c", [3.0])
+        cache.get("a")  # "b" is now least recently used
+        cache.set("d", [4.0])
+
+        assert len(cache) == 3
+        assert "b" not in cache
+        assert "a" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_are_misses(self, cache):
+        """Test TTL expiry"""
+        cache.set("a", [1.0])
+
+        with patch(
+            "app.services.embedding_cache.time.monotonic",
+            return_value=time.monotonic() + 120,
+        ):
+            assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["size"] == 0
+
+    def test_stats_counters(self, cache):
+        """Test hit/miss counters and hit rate"""
+        cache.set("a", [1.0])
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.6667, abs=1e-4)
+        assert stats["redis_enabled"] is False
+
+    def test_clear_resets_entries_and_counters(self, cache):
+        """Test clearing the cache"""
+        cache.set("a", [1.0])
+        cache.get("a")
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+
+
+class TestRedisTier:
+    """Test optional shared Redis tier"""
+
+    def test_set_writes_through_to_redis(self, mock_redis):
+        """Test that vectors are written to Redis with TTL"""
+        cache = EmbeddingCache(max_entries=3, ttl_seconds=60, redis_client=mock_redis)
+
+        cache.set("a", [1.0, 2.0])
+
+        key, ttl, value = mock_redis.setex.call_args[0]
+        assert key == "hireflux:embedding:a"
+        assert ttl == 60
+        assert value == np.asarray([1.0, 2.0], dtype=np.float32).tobytes()
+
+    def test_local_miss_falls_through_to_redis(self, mock_redis):
+        """Test that another process's embeddings are reused"""
+        writer = EmbeddingCache(redis_client=mock_redis)
+        reader = EmbeddingCache(redis_client=mock_redis)
+        writer.set("a", [1.0, 2.0])
+
+        vector = reader.get("a")
+
+        np.testing.assert_allclose(vector, [1.0, 2.0])
+        assert reader.stats()["redis_hits"] == 1
+        assert "a" in reader  # Promoted to local tier
+
+    def test_redis_errors_degrade_to_local_cache(self):
+        """Test that Redis failures do not break caching"""
+        broken_redis = Mock()
+        broken_redis.get.side_effect = ConnectionError("down")
+        broken_redis.setex.side_effect = ConnectionError("down")
+        cache = EmbeddingCache(redis_client=broken_redis)
+
+        cache.set("a", [1.0])
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.stats()["redis_errors"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
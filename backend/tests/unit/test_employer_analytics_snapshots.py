@@ -0,0 +1,244 @@
+"""Unit tests for snapshot-backed employer analytics"""
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.db.models.analytics import AnalyticsSnapshot, ApplicationStageHistory
+from app.db.models.application import Application
+from app.db.models.company import Company
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.services.employer_analytics_service import EmployerAnalyticsService
+from app.services.employer_analytics_snapshots import (
+    DAILY_ROLLUP_METRIC,
+    day_runs,
+    missing_day_ranges,
+)
+
+
+NOW = datetime.utcnow()
+TODAY = NOW.date()
+
+
+@pytest.fixture
+def company(db_session):
+    company = Company(name="TechCorp", created_at=NOW - timedelta(days=40))
+    db_session.add(company)
+    db_session.commit()
+    return company
+
+
+@pytest.fixture
+def hiring_history(db_session, company):
+    """Applications and stage transitions spread over the last 5 days"""
+    job = Job(
+        title="Engineer", company="TechCorp", source="employer", company_id=company.id
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    def apply(email, days_ago, source, status, fit_index):
+        user = User(email=email, password_hash="hashed")
+        db_session.add(user)
+        db_session.flush()
+        application = Application(
+            user_id=user.id,
+            job_id=job.id,
+            source=source,
+            status=status,
+            fit_index=fit_index,
+            created_at=NOW - timedelta(days=days_ago),
+        )
+        db_session.add(application)
+        db_session.flush()
+        return application
+
+    hired = apply("a@example.com", 5, "referral", "hired", 90)
+    apply("b@example.com", 3, "referral", "rejected", 70)
+    apply("c@example.com", 2, "auto_apply", "reviewing", None)
+    apply("d@example.com", 0, "auto_apply", "new", 60)
+
+    for days_ago, from_stage, to_stage in [
+        (5, None, "new"),
+        (4, "new", "reviewing"),
+        (2, "reviewing", "offer"),
+        (0, "offer", "hired"),
+    ]:
+        db_session.add(
+            ApplicationStageHistory(
+                application_id=hired.id,
+                from_stage=from_stage,
+                to_stage=to_stage,
+                changed_at=NOW - timedelta(days=days_ago),
+            )
+        )
+    db_session.commit()
+    return hired
+
+
+def expected_sourcing():
+    return {
+        "referral": {
+            "count": 2,
+            "avg_fit": 80.0,
+            "hires": 1,
+            "conversion_rate": 0.5,
+        },
+        "auto_apply": {
+            "count": 2,
+            "avg_fit": 60.0,
+            "hires": 0,
+            "conversion_rate": 0.0,
+        },
+    }
+
+
+class TestDayRanges:
+    """Test day range helpers"""
+
+    def test_missing_day_ranges(self):
+        """Test contiguous gaps between present days"""
+        present = [TODAY - timedelta(days=3), TODAY - timedelta(days=1)]
+
+        ranges = missing_day_ranges(present, TODAY - timedelta(days=5), TODAY)
+
+        assert ranges == [
+            (TODAY - timedelta(days=5), TODAY - timedelta(days=4)),
+            (TODAY - timedelta(days=2), TODAY - timedelta(days=2)),
+            (TODAY, TODAY),
+        ]
+
+    def test_day_runs(self):
+        """Test grouping unordered days into runs"""
+        days = [TODAY, TODAY - timedelta(days=1), TODAY - timedelta(days=5)]
+
+        assert day_runs(days) == [
+            (TODAY - timedelta(days=5), TODAY - timedelta(days=5)),
+            (TODAY - timedelta(days=1), TODAY),
+        ]
+
+
+class TestSnapshotRefresh:
+    """Test writing daily_rollup snapshots"""
+
+    def test_refresh_writes_every_closed_day(self, db_session, company, hiring_history):
+        """Test one row per closed day since the company was created"""
+        stats = EmployerAnalyticsService(db_session).refresh_snapshots()
+
+        assert stats == {"companies": 1, "days": 40}
+        rows = db_session.query(AnalyticsSnapshot).filter(
+            AnalyticsSnapshot.metric_type == DAILY_ROLLUP_METRIC
+        )
+        assert rows.count() == 40
+        assert max(row.snapshot_date for row in rows) == TODAY - timedelta(days=1)
+
+    def test_second_refresh_is_a_no_op(self, db_session, company, hiring_history):
+        """Test that unchanged days are not rewritten"""
+        service = EmployerAnalyticsService(db_session)
+        service.refresh_snapshots()
+
+        assert service.refresh_snapshots() == {"companies": 0, "days": 0}
+
+    def test_changed_application_rebuilds_its_day(
+        self, db_session, company, hiring_history
+    ):
+        """Test that a later status change is reflected in the closed day"""
+        service = EmployerAnalyticsService(db_session)
+        service.refresh_snapshots()
+
+        rejected = db_session.query(Application).filter_by(status="rejected").one()
+        rejected.status = "hired"
+        rejected.updated_at = datetime.utcnow() + timedelta(seconds=1)
+        db_session.commit()
+
+        assert service.refresh_snapshots() == {"companies": 1, "days": 1}
+        metrics = service.calculate_sourcing_metrics(
+            company.id, TODAY - timedelta(days=30), TODAY
+        )
+        assert metrics["referral"]["hires"] == 2
+
+
+class TestSnapshotBackedMetrics:
+    """Test that metrics are the same with and without snapshots"""
+
+    @pytest.mark.parametrize("with_snapshots", [False, True])
+    def test_sourcing_metrics(
+        self, db_session, company, hiring_history, with_snapshots
+    ):
+        """Test sourcing metrics over closed days plus today"""
+        service = EmployerAnalyticsService(db_session)
+        if with_snapshots:
+            service.refresh_snapshots()
+
+        metrics = service.calculate_sourcing_metrics(
+            company.id, TODAY - timedelta(days=30), TODAY
+        )
+
+        assert metrics == expected_sourcing()
+
+    @pytest.mark.parametrize("with_snapshots", [False, True])
+    def test_stage_metrics(self, db_session, company, hiring_history, with_snapshots):
+        """Test drop-off and time in stage across snapshot and live days"""
+        service = EmployerAnalyticsService(db_session)
+        if with_snapshots:
+            service.refresh_snapshots()
+
+        assert service.calculate_drop_off_rates(company.id) == {
+            "new": 0.0,
+            "reviewing": 0.0,
+            "offer": 0.0,
+        }
+        assert service.calculate_avg_days_per_stage(company.id) == {
+            "new": 1.0,
+            "reviewing": 2.0,
+            "offer": 2.0,
+        }
+
+    def test_closed_days_read_from_snapshots(
+        self, db_session, company, hiring_history
+    ):
+        """Test that only today's rows are aggregated from raw applications"""
+        service = EmployerAnalyticsService(db_session)
+        service.refresh_snapshots()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "sum(applications.fit_index)" in statement:
+                statements.append(parameters)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            metrics = service.calculate_sourcing_metrics(
+                company.id, TODAY - timedelta(days=30), TODAY
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert metrics == expected_sourcing()
+        # One live sourcing query, bounded to today
+        assert len(statements) == 1
+        assert str(TODAY) in str(statements[0])
+
+    def test_missing_snapshot_day_falls_back_to_raw(
+        self, db_session, company, hiring_history
+    ):
+        """Test gaps are filled from raw rows until the next refresh"""
+        service = EmployerAnalyticsService(db_session)
+        service.refresh_snapshots()
+        db_session.query(AnalyticsSnapshot).filter(
+            AnalyticsSnapshot.snapshot_date == TODAY - timedelta(days=3)
+        ).delete()
+        db_session.commit()
+
+        metrics = service.calculate_sourcing_metrics(
+            company.id, TODAY - timedelta(days=30), TODAY
+        )
+
+        assert metrics == expected_sourcing()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,286 @@
+"""Unit tests for incremental fit-index refresh"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from app.db.models.application import Application
+from app.db.models.job import Job
+from app.db.models.user import Profile, User
+from app.services.fit_index_refresh_service import (
+    FitIndexDirtyQueue,
+    FitIndexRefreshService,
+    disable_fit_index_tracking,
+    enable_fit_index_tracking,
+    refresh_fit_indexes_now,
+    set_fit_index_queue,
+)
+from app.core.exceptions import ServiceError
+
+
+@pytest.fixture
+def queue():
+    """In-process dirty queue installed as the shared queue"""
+    queue = FitIndexDirtyQueue()
+    set_fit_index_queue(queue)
+    yield queue
+    set_fit_index_queue(None)
+
+
+@pytest.fixture
+def on_enqueue(queue):
+    """Enable tracking with a mock scheduler"""
+    scheduler = Mock()
+    enable_fit_index_tracking(on_enqueue=scheduler)
+    yield scheduler
+    disable_fit_index_tracking()
+
+
+def make_job(db_session, title="Backend Engineer", **kwargs):
+    job = Job(
+        title=title,
+        company="TechCorp",
+        source="employer",
+        location="San Francisco, CA",
+        location_type="hybrid",
+        experience_min_years=3,
+        experience_max_years=8,
+        salary_min=120000,
+        salary_max=160000,
+        required_skills=["Python", "SQL", "AWS"],
+        **kwargs,
+    )
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+def make_candidate(db_session, email, skills):
+    user = User(email=email, password_hash="hashed")
+    db_session.add(user)
+    db_session.commit()
+
+    profile = Profile(
+        user_id=user.id,
+        skills=skills,
+        years_experience=5,
+        location="San Francisco, CA",
+        availability_status="actively_looking",
+    )
+    db_session.add(profile)
+    db_session.commit()
+    return user, profile
+
+
+@pytest.fixture
+def pipeline(db_session, queue, on_enqueue):
+    """Two jobs, two candidates, three scored applications, empty queue"""
+    job_a = make_job(db_session)
+    job_b = make_job(db_session, title="Data Engineer")
+    alice, alice_profile = make_candidate(db_session, "alice@example.com", ["Go"])
+    bob, _ = make_candidate(db_session, "bob@example.com", ["Python", "SQL", "AWS"])
+
+    applications = [
+        Application(user_id=alice.id, job_id=job_a.id, status="new"),
+        Application(user_id=alice.id, job_id=job_b.id, status="new"),
+        Application(user_id=bob.id, job_id=job_b.id, status="new"),
+    ]
+    db_session.add_all(applications)
+    db_session.commit()
+
+    # What the worker does for the runs scheduled during setup
+    queue.release_schedule()
+    FitIndexRefreshService(db_session, queue).process_pending()
+    on_enqueue.reset_mock()
+
+    return {
+        "jobs": (job_a, job_b),
+        "alice": alice,
+        "alice_profile": alice_profile,
+        "bob": bob,
+        "applications": applications,
+    }
+
+
+class TestDirtyTracking:
+    """Test marking keys dirty on committed changes"""
+
+    def test_new_applications_are_scored(self, db_session, pipeline):
+        """Test that new applications get a fit index from the worker"""
+        for application in pipeline["applications"]:
+            db_session.refresh(application)
+            assert application.fit_index is not None
+
+    def test_profile_scoring_field_marks_user(
+        self, db_session, queue, on_enqueue, pipeline
+    ):
+        """Test that a skills change marks the candidate dirty"""
+        pipeline["alice_profile"].skills = ["Python", "SQL"]
+        db_session.commit()
+
+        assert queue.drain(10) == [f"user:{pipeline['alice'].id}"]
+        on_enqueue.assert_called_once()
+
+    def test_job_requirement_change_marks_job(self, db_session, queue, pipeline):
+        """Test that a job requirement change marks the job dirty"""
+        job_a = pipeline["jobs"][0]
+        job_a.required_skills = ["Go"]
+        db_session.commit()
+
+        assert queue.drain(10) == [f"job:{job_a.id}"]
+
+    def test_unrelated_fields_are_ignored(self, db_session, queue, pipeline):
+        """Test that non-scoring fields don't queue work"""
+        pipeline["alice_profile"].first_name = "Alice"
+        pipeline["jobs"][0].description = "Updated description"
+        db_session.commit()
+
+        assert queue.pending() == 0
+
+    def test_changes_coalesce_per_key(self, db_session, queue, on_enqueue, pipeline):
+        """Test that repeated changes to one profile queue one key and one run"""
+        profile = pipeline["alice_profile"]
+        for years in (6, 7, 8):
+            profile.years_experience = years
+            db_session.commit()
+
+        assert queue.pending() == 1
+        on_enqueue.assert_called_once()
+
+    def test_queue_failure_hands_keys_to_fallback(self, db_session, pipeline):
+        """Test that a Redis error does not silently drop the refresh"""
+        redis_client = Mock()
+        redis_client.sadd.side_effect = Exception("Connection refused")
+        set_fit_index_queue(FitIndexDirtyQueue(redis_client))
+        on_enqueue, on_queue_failure = Mock(), Mock()
+        enable_fit_index_tracking(
+            on_enqueue=on_enqueue, on_queue_failure=on_queue_failure
+        )
+        try:
+            job = pipeline["jobs"][0]
+            job.required_skills = ["Go"]
+            db_session.commit()
+        finally:
+            disable_fit_index_tracking()
+            set_fit_index_queue(None)
+
+        on_queue_failure.assert_called_once_with({f"job:{job.id}"})
+        on_enqueue.assert_not_called()
+
+    def test_rollback_discards_keys(self, db_session, queue, pipeline):
+        """Test that rolled back changes are not queued"""
+        pipeline["alice_profile"].skills = ["Rust"]
+        db_session.flush()
+        db_session.rollback()
+
+        assert queue.pending() == 0
+
+
+class TestRefresh:
+    """Test recomputing only affected applications"""
+
+    def test_profile_change_updates_only_candidate_rows(
+        self, db_session, queue, pipeline
+    ):
+        """Test that only the changed candidate's applications are rescored"""
+        alice_a, alice_b, bob_b = pipeline["applications"]
+        for application in pipeline["applications"]:
+            db_session.refresh(application)
+        before = {a.id: a.fit_index for a in pipeline["applications"]}
+
+        pipeline["alice_profile"].skills = ["Python", "SQL", "AWS"]
+        db_session.commit()
+
+        stats = FitIndexRefreshService(db_session, queue).process_pending()
+
+        assert stats == {"keys": 1, "applications": 2}
+        for application in pipeline["applications"]:
+            db_session.refresh(application)
+        assert alice_a.fit_index > before[alice_a.id]
+        assert alice_b.fit_index > before[alice_b.id]
+        assert bob_b.fit_index == before[bob_b.id]
+
+    def test_job_change_updates_job_rows(self, db_session, queue, pipeline):
+        """Test that a job change rescores all of its applications"""
+        job_b = pipeline["jobs"][1]
+        job_b.required_skills = ["Go"]
+        db_session.commit()
+
+        stats = FitIndexRefreshService(db_session, queue).process_pending()
+
+        assert stats == {"keys": 1, "applications": 2}
+
+    def test_failed_batch_is_requeued(self, db_session, queue, pipeline):
+        """Test that keys are put back when recomputation fails"""
+        queue.mark([f"job:{pipeline['jobs'][0].id}"])
+        service = FitIndexRefreshService(db_session, queue)
+        service.ranking.refresh_fit_indexes = Mock(side_effect=Exception("DB down"))
+
+        with pytest.raises(ServiceError):
+            service.process_pending()
+
+        assert queue.pending() == 1
+
+    def test_refresh_now_without_the_queue(self, db_session, queue, pipeline):
+        """Test the synchronous fallback used when keys cannot be queued"""
+        bob_application = pipeline["applications"][2]
+        bob_application.fit_index = None
+        db_session.commit()
+        queue.drain(10)
+
+        with patch(
+            "app.services.fit_index_refresh_service.SessionLocal",
+            return_value=db_session,
+        ), patch.object(db_session, "close"):
+            refresh_fit_indexes_now({f"application:{bob_application.id}"})
+
+        db_session.refresh(bob_application)
+        assert bob_application.fit_index is not None
+
+    def test_malformed_keys_are_skipped(self, db_session, queue):
+        """Test that bad keys don't break the batch"""
+        queue.mark(["job:not-a-uuid", "team:123"])
+
+        stats = FitIndexRefreshService(db_session, queue).process_pending()
+
+        assert stats == {"keys": 2, "applications": 0}
+
+
+class TestDirtyQueue:
+    """Test the Redis-backed queue"""
+
+    def test_redis_drain_decodes_keys(self):
+        """Test that Redis SPOP results are decoded"""
+        redis_client = Mock()
+        redis_client.spop.return_value = [b"job:1", b"user:2"]
+        queue = FitIndexDirtyQueue(redis_client)
+
+        queue.mark(["job:1", "user:2"])
+
+        redis_client.sadd.assert_called_once_with(
+            FitIndexDirtyQueue.KEY, "job:1", "user:2"
+        )
+        assert queue.drain(10) == ["job:1", "user:2"]
+
+    def test_mark_reports_redis_failure(self):
+        """Test that keys Redis rejects are not parked in this process"""
+        redis_client = Mock()
+        redis_client.sadd.side_effect = Exception("Connection refused")
+        redis_client.spop.side_effect = Exception("Connection refused")
+        queue = FitIndexDirtyQueue(redis_client)
+
+        assert queue.mark(["job:1"]) is False
+        assert queue.drain(10) == []
+
+    def test_claim_schedule_once_per_window(self):
+        """Test that scheduling is coalesced until released"""
+        queue = FitIndexDirtyQueue()
+
+        assert queue.claim_schedule(60) is True
+        assert queue.claim_schedule(60) is False
+
+        queue.release_schedule()
+        assert queue.claim_schedule(60) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,215 @@
+"""Unit tests for the pooled async job board client"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.exceptions import ServiceError
+from app.services.greenhouse_service import GreenhouseService
+from app.services.job_board_client import (
+    AsyncBoardClient,
+    TokenBucket,
+    ValidatorStore,
+)
+from app.services.lever_service import LeverService
+
+
+def board_client(handler, **kwargs):
+    kwargs.setdefault("rate_per_host", 1000.0)
+    kwargs.setdefault("burst", 1000)
+    return AsyncBoardClient(
+        validator_store=ValidatorStore(),
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+class TestTokenBucket:
+    """Test per-host request pacing"""
+
+    @pytest.mark.asyncio
+    async def test_paces_after_burst(self):
+        """Test that requests beyond the burst wait for refill"""
+        bucket = TokenBucket(rate=50.0, capacity=2)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 2 immediately, then 4 more at 50/s
+        assert elapsed >= 0.07
+
+
+class TestConditionalRequests:
+    """Test ETag / If-Modified-Since revalidation"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_after_validators_saved(self):
+        """Test that saved validators turn the next fetch into a 304"""
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={"jobs": []},
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"},
+            )
+
+        async with board_client(handler) as http:
+            url = "https://boards.example.com/acme/jobs"
+            first = await http.get_json(url, conditional=True)
+            # Not saved yet, so the board is fetched again
+            second = await http.get_json(url, conditional=True)
+            http.save_validators(second.validators)
+            third = await http.get_json(url, conditional=True)
+
+        assert first.data == {"jobs": []}
+        assert second.not_modified is False
+        assert third.not_modified is True
+        assert third.data is None
+        assert seen_headers[2]["if-modified-since"] == "Mon, 01 Jan 2024"
+
+    @pytest.mark.asyncio
+    async def test_unconditional_request_ignores_validators(self):
+        """Test that non-incremental fetches always get the full body"""
+
+        def handler(request):
+            assert "if-none-match" not in request.headers
+            return httpx.Response(200, json=[], headers={"ETag": '"v1"'})
+
+        async with board_client(handler) as http:
+            response = await http.get_json("https://api.example.com/acme")
+
+        assert response.not_modified is False
+        assert response.validators is None
+
+
+class TestRetries:
+    """Test retry behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limited_response(self):
+        """Test that 429 is retried after Retry-After"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        async with board_client(handler) as http:
+            response = await http.get_json("https://api.example.com/acme")
+
+        assert response.data == {"ok": True}
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_client_error_raises(self):
+        """Test that 404 is not retried"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        async with board_client(handler) as http:
+            with pytest.raises(ServiceError, match="Job board API error"):
+                await http.get_json("https://api.example.com/missing")
+
+        assert len(calls) == 1
+
+
+class TestBoardServices:
+    """Test the async fetch paths of the board services"""
+
+    @pytest.mark.asyncio
+    async def test_greenhouse_fetch_jobs_async(self):
+        """Test that departments and offices are joined onto jobs"""
+
+        def handler(request):
+            path = request.url.path
+            if path.endswith("/departments"):
+                return httpx.Response(
+                    200, json={"departments": [{"id": 1, "name": "Engineering"}]}
+                )
+            if path.endswith("/offices"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "offices": [
+                            {"id": 2, "name": "HQ", "location": {"name": "Remote"}}
+                        ]
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "jobs": [
+                        {
+                            "id": 10,
+                            "title": "Engineer",
+                            "departments": [{"id": 1}],
+                            "offices": [{"id": 2}],
+                        }
+                    ]
+                },
+                headers={"ETag": '"abc"'},
+            )
+
+        async with board_client(handler) as http:
+            result, validators = await GreenhouseService(None).fetch_jobs_async(
+                http, "acme"
+            )
+
+        assert result.jobs[0].departments[0].name == "Engineering"
+        assert result.jobs[0].location_type == "remote"
+        assert validators.etag == '"abc"'
+
+    @pytest.mark.asyncio
+    async def test_lever_fetch_jobs_async_not_modified(self):
+        """Test that an unchanged Lever site returns no result"""
+
+        def handler(request):
+            return httpx.Response(304)
+
+        async with board_client(handler) as http:
+            result, validators = await LeverService(None).fetch_jobs_async(
+                http, "acme"
+            )
+
+        assert result is None
+        assert validators is None
+
+    @pytest.mark.asyncio
+    async def test_many_boards_fetched_concurrently(self):
+        """Test that boards overlap in flight over one client"""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=[])
+
+        lever = LeverService(None)
+        async with board_client(handler) as http:
+            results = await asyncio.gather(
+                *(lever.fetch_jobs_async(http, f"site-{i}") for i in range(20))
+            )
+
+        assert len(results) == 20
+        assert max_in_flight > 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
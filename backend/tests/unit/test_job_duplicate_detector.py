@@ -0,0 +1,150 @@
+"""Unit tests for blocked near-duplicate detection of job postings"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from app.services.job_duplicate_detector import (
+    DuplicateDetector,
+    PostingKey,
+    job_similarity,
+    minhash_signature,
+    normalize_title,
+    title_shingles,
+)
+
+
+def brute_force_matches(postings, threshold=0.85):
+    """Each posting's most similar earlier posting, earliest on ties"""
+    best = {}
+    for i, j in combinations(range(len(postings)), 2):
+        similarity = job_similarity(
+            postings[i].title,
+            postings[i].location,
+            postings[j].title,
+            postings[j].location,
+        )
+        if similarity >= threshold and similarity > best.get(j, (0, None))[0]:
+            best[j] = (similarity, i)
+    return {(i, j) for j, (_, i) in best.items()}
+
+
+class TestBlockingKeys:
+    """Test title normalization and MinHash signatures"""
+
+    def test_normalize_title(self):
+        """Test that case, punctuation and spacing are ignored"""
+        assert normalize_title("  Sr.  Software-Engineer ") == "sr software engineer"
+
+    def test_identical_titles_share_signature(self):
+        """Test that signatures are deterministic"""
+        first = minhash_signature(title_shingles("Backend Engineer"))
+        second = minhash_signature(title_shingles("backend engineer"))
+        assert first == second
+
+    def test_short_title_has_shingle(self):
+        """Test that very short titles still get a signature"""
+        assert title_shingles("a")
+        assert minhash_signature(title_shingles("a"))
+
+
+class TestDuplicateDetector:
+    """Test DuplicateDetector.find_duplicates"""
+
+    def test_matches_pairwise_scoring(self):
+        """Test that blocked detection finds the matches an all-pairs scan finds"""
+        rng = random.Random(11)
+        titles = [
+            "Senior Software Engineer",
+            "Sr. Software Engineer",
+            "Software Engineer II",
+            "Backend Engineer",
+            "Backend Engineer, Payments",
+            "Product Manager",
+            "Senior Product Manager",
+            "Data Scientist",
+            "Machine Learning Engineer",
+            "Site Reliability Engineer",
+        ]
+        locations = ["San Francisco, CA", "San Francisco", "Remote", "New York", None]
+        postings = [
+            PostingKey(rng.choice(titles), rng.choice(locations)) for _ in range(120)
+        ]
+
+        within, _ = DuplicateDetector().find_duplicates(postings)
+
+        found = {(pair.duplicate_of, pair.index) for pair in within}
+        assert found == brute_force_matches(postings)
+        assert len(within) == len(found)
+
+    def test_scores_and_order_match_original(self):
+        """Test one match per row, against the earliest equally similar row"""
+        postings = [
+            PostingKey("Software Engineer", "SF"),
+            PostingKey("Product Manager", "NY"),
+            PostingKey("Software Engineer", "SF"),
+            PostingKey("Software Engineers", "SF"),
+        ]
+
+        within, against = DuplicateDetector().find_duplicates(postings)
+
+        assert [(p.duplicate_of, p.index) for p in within] == [(0, 2), (0, 3)]
+        assert within[0].similarity == pytest.approx(1.0)
+        assert within[1].similarity == job_similarity(
+            "Software Engineer", "SF", "Software Engineers", "SF"
+        )
+        assert against == []
+
+    def test_missing_location_is_never_duplicate_at_default_threshold(self):
+        """Test that title alone cannot reach 0.85"""
+        postings = [PostingKey("Software Engineer"), PostingKey("Software Engineer")]
+
+        within, _ = DuplicateDetector().find_duplicates(postings)
+
+        assert within == []
+
+    def test_low_threshold_allows_missing_location(self):
+        """Test that rows without location are compared below TITLE_WEIGHT"""
+        postings = [PostingKey("Software Engineer"), PostingKey("Software Engineer")]
+
+        within, _ = DuplicateDetector(similarity_threshold=0.6).find_duplicates(
+            postings
+        )
+
+        assert [(p.duplicate_of, p.index) for p in within] == [(0, 1)]
+
+    def test_duplicates_against_existing(self):
+        """Test matches against existing postings, which are not compared together"""
+        postings = [
+            PostingKey("Data Engineer", "Remote"),
+            PostingKey("Designer", "Austin, TX"),
+        ]
+        existing = [
+            PostingKey("Designer", "Austin"),
+            PostingKey("Data Engineer", "Remote"),
+            PostingKey("Data Engineer", "Remote"),
+        ]
+
+        within, against = DuplicateDetector().find_duplicates(postings, existing)
+
+        assert within == []
+        assert [(p.index, p.duplicate_of) for p in against] == [(0, 1), (1, 0)]
+
+    def test_identical_rows_reported_against_first_copy(self):
+        """Test that n identical rows give n - 1 matches, not every pair"""
+        postings = [PostingKey("Data Engineer", "Remote")] * 3000
+        postings.append(PostingKey("Data Engineers", "Remote"))
+        existing = [PostingKey("Data Engineer", "Remote")] * 2
+
+        within, against = DuplicateDetector().find_duplicates(postings, existing)
+
+        assert len(within) == 3000
+        assert {p.duplicate_of for p in within} == {0}
+        assert [p.index for p in within] == list(range(1, 3001))
+        assert len(against) == 3001
+        assert {p.duplicate_of for p in against} == {0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,11 +1,14 @@
 """Unit tests for JobIngestionService"""
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from sqlalchemy import event, text
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timedelta
 import uuid
 
-from app.services.job_ingestion_service import JobIngestionService
+from app.services.job_ingestion_service import JobIngestionService, job_content_hash
+from app.services.job_board_client import CachedValidators, ValidatorStore
 from app.schemas.job_feed import (
     JobSource,
     JobIngestionRequest,
@@ -35,12 +38,30 @@ def ingestion_service(mock_db):
     with patch("app.services.job_ingestion_service.GreenhouseService"), patch(
         "app.services.job_ingestion_service.LeverService"
     ), patch("app.services.job_ingestion_service.JobNormalizationService"), patch(
-        "app.services.job_ingestion_service.PineconeService"
+        "app.services.job_ingestion_service.get_pinecone_service"
+    ), patch(
+        "app.services.job_ingestion_service.get_validator_store",
+        return_value=ValidatorStore(),
     ):
         service = JobIngestionService(mock_db)
         return service
 
 
+@pytest.fixture
+def db_ingestion_service(db_session):
+    """JobIngestionService on the SQLite test database"""
+    with patch("app.services.job_ingestion_service.GreenhouseService"), patch(
+        "app.services.job_ingestion_service.LeverService"
+    ), patch("app.services.job_ingestion_service.JobNormalizationService"), patch(
+        "app.services.job_ingestion_service.get_pinecone_service"
+    ), patch(
+        "app.services.job_ingestion_service.get_validator_store",
+        return_value=ValidatorStore(),
+    ):
+        service = JobIngestionService(db_session)
+    return service
+
+
 @pytest.fixture
 def sample_normalized_job():
     """Sample normalized job"""
@@ -88,9 +109,14 @@ class TestJobIngestion:
     """Test complete job ingestion flow"""
 
     def test_ingest_jobs_success(
-        self, ingestion_service, mock_db, sample_source_config, sample_normalized_job
+        self,
+        db_ingestion_service,
+        db_session,
+        sample_source_config,
+        sample_normalized_job,
     ):
         """Test successful job ingestion"""
+        service = db_ingestion_service
         # Mock greenhouse service
         mock_fetch_result = JobFetchResult(
             jobs=[Mock()],  # Mock greenhouse job
@@ -104,37 +130,43 @@ class TestJobIngestion:
             ),
             source=JobSource.GREENHOUSE,
         )
-        ingestion_service.greenhouse.fetch_jobs = Mock(return_value=mock_fetch_result)
-        ingestion_service.normalizer.normalize_greenhouse_job = Mock(
+        service.greenhouse.fetch_jobs_async = AsyncMock(
+            return_value=(mock_fetch_result, None)
+        )
+        service.normalizer.normalize_greenhouse_job = Mock(
             return_value=sample_normalized_job
         )
 
-        # Mock database query (no existing job)
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = None
-        mock_db.query.return_value = mock_query
-
-        # Mock pinecone
-        ingestion_service.pinecone.index_job = Mock()
-
         # Create request
         request = JobIngestionRequest(sources=[sample_source_config], incremental=True)
 
         # Execute
-        result = ingestion_service.ingest_jobs(request)
+        result = service.ingest_jobs(request)
 
         # Verify
         assert result.success is True
         assert result.metadata.new_jobs == 1
         assert result.metadata.updated_jobs == 0
         assert result.metadata.failed_jobs == 0
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called()
+        assert db_session.query(Job).count() == 1
+
+        # Saved jobs are indexed together in one batched call
+        service.pinecone.index_jobs.assert_called_once()
+        payloads = service.pinecone.index_jobs.call_args[0][0]
+        assert len(payloads) == 1
+        assert payloads[0]["job_title"] == sample_normalized_job.title
+
+        # A second run with the same content writes and re-embeds nothing
+        result = service.ingest_jobs(request)
+
+        assert result.metadata.new_jobs == 0
+        assert result.jobs_skipped == 1
+        service.pinecone.index_jobs.assert_called_once()
 
     def test_ingest_jobs_with_errors(self, ingestion_service, sample_source_config):
         """Test ingestion with errors"""
         # Mock greenhouse service to raise error
-        ingestion_service.greenhouse.fetch_jobs = Mock(
+        ingestion_service.greenhouse.fetch_jobs_async = AsyncMock(
             side_effect=Exception("API Error")
         )
 
@@ -159,8 +191,8 @@ class TestJobIngestion:
         lever_config.config = {"company_site": "company2", "company_name": "Company 2"}
 
         # Mock both services
-        ingestion_service.greenhouse.fetch_jobs = Mock(
-            return_value=JobFetchResult(
+        def empty_result(source):
+            return JobFetchResult(
                 jobs=[],
                 metadata=JobMetadata(
                     total_fetched=0,
@@ -170,22 +202,14 @@ class TestJobIngestion:
                     fetch_duration_seconds=0.0,
                     errors=[],
                 ),
-                source=JobSource.GREENHOUSE,
+                source=source,
             )
+
+        ingestion_service.greenhouse.fetch_jobs_async = AsyncMock(
+            return_value=(empty_result(JobSource.GREENHOUSE), None)
         )
-        ingestion_service.lever.fetch_jobs = Mock(
-            return_value=JobFetchResult(
-                jobs=[],
-                metadata=JobMetadata(
-                    total_fetched=0,
-                    new_jobs=0,
-                    updated_jobs=0,
-                    failed_jobs=0,
-                    fetch_duration_seconds=0.0,
-                    errors=[],
-                ),
-                source=JobSource.LEVER,
-            )
+        ingestion_service.lever.fetch_jobs_async = AsyncMock(
+            return_value=(empty_result(JobSource.LEVER), None)
         )
 
         request = JobIngestionRequest(
@@ -195,8 +219,98 @@ class TestJobIngestion:
         result = ingestion_service.ingest_jobs(request)
 
         # Both services should be called
-        ingestion_service.greenhouse.fetch_jobs.assert_called_once()
-        ingestion_service.lever.fetch_jobs.assert_called_once()
+        ingestion_service.greenhouse.fetch_jobs_async.assert_awaited_once()
+        ingestion_service.lever.fetch_jobs_async.assert_awaited_once()
+
+    def test_ingest_skips_unchanged_boards(
+        self, ingestion_service, mock_db, sample_source_config
+    ):
+        """Test that a 304 board is skipped without errors"""
+        ingestion_service.greenhouse.fetch_jobs_async = AsyncMock(
+            return_value=(None, None)
+        )
+
+        request = JobIngestionRequest(sources=[sample_source_config], incremental=True)
+        result = ingestion_service.ingest_jobs(request)
+
+        assert result.success is True
+        assert result.metadata.total_fetched == 0
+        assert ingestion_service.greenhouse.fetch_jobs_async.call_args.kwargs[
+            "conditional"
+        ]
+        mock_db.add.assert_not_called()
+
+    def test_fetch_sources_bounded_worker_pool(self, ingestion_service):
+        """Test that at most JOB_INGESTION_MAX_WORKERS boards are in flight"""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch_jobs_async(http, company_site, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return None, None
+
+        ingestion_service.lever.fetch_jobs_async = fetch_jobs_async
+        sources = []
+        for i in range(12):
+            config = Mock()
+            config.source = JobSource.LEVER
+            config.config = {"company_site": f"site-{i}"}
+            sources.append(config)
+
+        with patch(
+            "app.services.job_ingestion_service.settings.JOB_INGESTION_MAX_WORKERS", 4
+        ):
+            fetches = asyncio.run(ingestion_service._fetch_sources(sources))
+
+        assert [fetch.source_config for fetch in fetches] == sources
+        assert all(fetch.skipped for fetch in fetches)
+        assert max_in_flight == 4
+
+    def test_validators_saved_only_after_jobs_saved(
+        self, ingestion_service, sample_source_config, sample_normalized_job
+    ):
+        """Test that a board's ETag is kept only if its jobs were stored"""
+        validators = CachedValidators(key="techcorp-jobs", etag='"v1"')
+        fetch_result = JobFetchResult(
+            jobs=[Mock()],
+            metadata=JobMetadata(
+                total_fetched=1,
+                new_jobs=0,
+                updated_jobs=0,
+                failed_jobs=0,
+                fetch_duration_seconds=0.0,
+            ),
+            source=JobSource.GREENHOUSE,
+        )
+        ingestion_service.greenhouse.fetch_jobs_async = AsyncMock(
+            return_value=(fetch_result, validators)
+        )
+        ingestion_service.normalizer.normalize_greenhouse_job = Mock(
+            return_value=sample_normalized_job
+        )
+        request = JobIngestionRequest(sources=[sample_source_config], incremental=True)
+
+        with patch.object(
+            ingestion_service, "_save_jobs_batch", side_effect=Exception("db down")
+        ):
+            result = ingestion_service.ingest_jobs(request)
+
+        assert result.success is False
+        assert ingestion_service.validators.get("techcorp-jobs") is None
+
+        with patch.object(
+            ingestion_service,
+            "_save_jobs_batch",
+            return_value=(["new"], [Mock()]),
+        ):
+            result = ingestion_service.ingest_jobs(request)
+
+        assert result.success is True
+        assert ingestion_service.validators.get("techcorp-jobs").etag == '"v1"'
 
 
 class TestGreenhouseIngestion:
@@ -351,141 +465,180 @@ class TestLeverIngestion:
         assert "company_site required" in str(exc.value)
 
 
-class TestJobSaveOrUpdate:
-    """Test job saving and updating logic"""
+class TestSaveJobsBatch:
+    """Test batched job persistence"""
 
-    def test_save_new_job(self, ingestion_service, mock_db, sample_normalized_job):
-        """Test creating a new job"""
-        # Mock database query (no existing job)
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = None
-        mock_db.query.return_value = mock_query
+    def save(self, service, jobs):
+        return service._save_jobs_batch([job.model_copy() for job in jobs])
 
-        # Mock pinecone
-        ingestion_service.pinecone.index_job = Mock()
-        ingestion_service.normalizer.detect_visa_sponsorship = Mock(return_value=False)
+    def test_save_new_jobs(
+        self, db_ingestion_service, db_session, sample_normalized_job
+    ):
+        """Test creating new jobs in one batch"""
+        second = sample_normalized_job.model_copy(update={"external_id": "gh-2"})
 
-        # Execute
-        result = ingestion_service._save_or_update_job(sample_normalized_job)
+        outcomes, saved = self.save(
+            db_ingestion_service, [sample_normalized_job, second]
+        )
 
-        # Verify
-        assert result == "new"
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called()
-        ingestion_service.pinecone.index_job.assert_called_once()
+        assert outcomes == ["new", "new"]
+        assert {job.external_id for job in saved} == {"gh-123456", "gh-2"}
+        stored = db_session.query(Job).filter_by(external_id="gh-2").one()
+        assert stored.title == sample_normalized_job.title
+        assert stored.salary_max == 200000
+        assert len(stored.content_hash) == 64
 
-    def test_update_existing_job(
-        self, ingestion_service, mock_db, sample_normalized_job
+    def test_visa_sponsorship_comes_from_normalized_job(
+        self, db_ingestion_service, db_session, sample_normalized_job
     ):
-        """Test updating an existing job"""
-        # Mock existing job with different title
-        existing_job = Mock(spec=Job)
-        existing_job.id = uuid.uuid4()
-        existing_job.title = "Old Title"  # Different from sample
-        existing_job.description = sample_normalized_job.description
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = datetime.utcnow() - timedelta(days=10)
+        """Test that the saved flag is the normalizer's, without a rescan"""
+        sponsored = sample_normalized_job.model_copy(
+            update={"requires_visa_sponsorship": True}
+        )
 
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = existing_job
-        mock_db.query.return_value = mock_query
+        self.save(db_ingestion_service, [sponsored])
 
-        # Mock pinecone
-        ingestion_service.pinecone.index_job = Mock()
-        ingestion_service.normalizer.detect_visa_sponsorship = Mock(return_value=False)
+        assert db_session.query(Job).one().requires_visa_sponsorship is True
+        db_ingestion_service.normalizer.detect_visa_sponsorship.assert_not_called()
 
-        # Execute
-        result = ingestion_service._save_or_update_job(sample_normalized_job)
+    def test_update_changed_job(
+        self, db_ingestion_service, db_session, sample_normalized_job
+    ):
+        """Test that a changed job is updated in place"""
+        self.save(db_ingestion_service, [sample_normalized_job])
+        original = db_session.query(Job).one()
+        original_id, original_hash = original.id, original.content_hash
 
-        # Verify
-        assert result == "updated"
-        assert existing_job.title == sample_normalized_job.title
-        mock_db.commit.assert_called()
-        ingestion_service.pinecone.index_job.assert_called_once()
+        changed = sample_normalized_job.model_copy(update={"title": "Staff Engineer"})
+        outcomes, saved = self.save(db_ingestion_service, [changed])
+
+        assert outcomes == ["updated"]
+        assert [job.id for job in saved] == [original_id]
+        db_session.expire_all()
+        stored = db_session.query(Job).one()
+        assert stored.title == "Staff Engineer"
+        assert stored.content_hash != original_hash
 
     def test_skip_unchanged_job(
-        self, ingestion_service, mock_db, sample_normalized_job
+        self, db_ingestion_service, db_session, sample_normalized_job
     ):
-        """Test skipping job that hasn't changed"""
-        # Mock existing job with same data
-        existing_job = Mock(spec=Job)
-        existing_job.title = sample_normalized_job.title
-        existing_job.description = sample_normalized_job.description
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = sample_normalized_job.posted_date
+        """Test that unchanged jobs issue no write"""
+        self.save(db_ingestion_service, [sample_normalized_job])
 
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = existing_job
-        mock_db.query.return_value = mock_query
+        statements = []
 
-        # Execute
-        result = ingestion_service._save_or_update_job(sample_normalized_job)
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
 
-        # Verify
-        assert result == "skipped"
-        # Should not commit or reindex
-        assert mock_db.commit.call_count == 0
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            outcomes, saved = self.save(db_ingestion_service, [sample_normalized_job])
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
 
+        assert outcomes == ["skipped"]
+        assert saved == []
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT")
 
-class TestJobNeedsUpdate:
-    """Test job update detection logic"""
+    def test_missing_salary_keeps_stored_salary(
+        self, db_ingestion_service, db_session, sample_normalized_job
+    ):
+        """Test that a posting without salary doesn't erase it"""
+        self.save(db_ingestion_service, [sample_normalized_job])
 
-    def test_update_needed_title_changed(
-        self, ingestion_service, sample_normalized_job
+        no_salary = sample_normalized_job.model_copy(update={"salary": None})
+        outcomes, _ = self.save(db_ingestion_service, [no_salary])
+
+        assert outcomes == ["updated"]
+        db_session.expire_all()
+        assert db_session.query(Job).one().salary_min == 150000
+
+    def test_duplicate_in_batch_last_wins(
+        self, db_ingestion_service, db_session, sample_normalized_job
     ):
-        """Test update detection when title changes"""
-        existing_job = Mock()
-        existing_job.title = "Old Title"
-        existing_job.description = sample_normalized_job.description
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = sample_normalized_job.posted_date
-
-        assert (
-            ingestion_service._job_needs_update(existing_job, sample_normalized_job)
-            is True
+        """Test that repeated external ids in one batch are written once"""
+        newer = sample_normalized_job.model_copy(update={"title": "Newer Title"})
+
+        outcomes, saved = self.save(
+            db_ingestion_service, [sample_normalized_job, newer]
         )
 
-    def test_update_needed_description_changed(
-        self, ingestion_service, sample_normalized_job
+        assert outcomes == ["skipped", "new"]
+        assert len(saved) == 1
+        assert db_session.query(Job).one().title == "Newer Title"
+
+    def test_bad_row_fails_only_itself(
+        self,
+        db_ingestion_service,
+        db_session,
+        sample_source_config,
+        sample_normalized_job,
     ):
-        """Test update detection when description changes"""
-        existing_job = Mock()
-        existing_job.title = sample_normalized_job.title
-        existing_job.description = "Old description"
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = sample_normalized_job.posted_date
-
-        assert (
-            ingestion_service._job_needs_update(existing_job, sample_normalized_job)
-            is True
+        """Test that a failed batch is retried row by row"""
+        db_session.execute(
+            text(
+                "CREATE TRIGGER reject_broken_job BEFORE INSERT ON jobs "
+                "WHEN NEW.title = 'Broken' BEGIN SELECT RAISE(ABORT, 'bad row'); END"
+            )
+        )
+        jobs = [
+            sample_normalized_job.model_copy(update={"external_id": f"gh-{i}"})
+            for i in range(3)
+        ]
+        jobs[1] = jobs[1].model_copy(update={"title": "Broken"})
+        service = db_ingestion_service
+        service.greenhouse.fetch_jobs_async = AsyncMock(
+            return_value=(
+                JobFetchResult(
+                    jobs=[Mock()] * 3,
+                    metadata=JobMetadata(
+                        total_fetched=3,
+                        new_jobs=0,
+                        updated_jobs=0,
+                        failed_jobs=0,
+                        fetch_duration_seconds=0.0,
+                    ),
+                    source=JobSource.GREENHOUSE,
+                ),
+                CachedValidators(key="techcorp-jobs", etag='"v1"'),
+            )
         )
+        service.normalizer.normalize_greenhouse_job = Mock(side_effect=jobs)
 
-    def test_update_needed_posted_date_newer(
-        self, ingestion_service, sample_normalized_job
-    ):
-        """Test update detection when posted date is newer"""
-        existing_job = Mock()
-        existing_job.title = sample_normalized_job.title
-        existing_job.description = sample_normalized_job.description
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = datetime.utcnow() - timedelta(days=10)
-
-        assert (
-            ingestion_service._job_needs_update(existing_job, sample_normalized_job)
-            is True
+        result = service.ingest_jobs(
+            JobIngestionRequest(sources=[sample_source_config], incremental=True)
+        )
+
+        assert result.metadata.new_jobs == 2
+        assert len(result.metadata.errors) == 1
+        assert result.metadata.errors[0].startswith("Error saving job gh-1:")
+        assert "bad row" in result.metadata.errors[0]
+        assert {job.external_id for job in db_session.query(Job)} == {"gh-0", "gh-2"}
+        assert len(service.pinecone.index_jobs.call_args[0][0]) == 2
+        # The board is fetched in full again next time
+        assert service.validators.get("techcorp-jobs") is None
+
+
+class TestJobContentHash:
+    """Test change detection hashing"""
+
+    def test_hash_changes_with_ingested_fields(self):
+        """Test that any ingested column changes the hash"""
+        row = {"title": "Engineer", "description": "Build things"}
+
+        assert job_content_hash(row) == job_content_hash(dict(row))
+        assert job_content_hash(row) != job_content_hash(
+            dict(row, description="Build other things")
         )
 
-    def test_no_update_needed(self, ingestion_service, sample_normalized_job):
-        """Test when no update is needed"""
-        existing_job = Mock()
-        existing_job.title = sample_normalized_job.title
-        existing_job.description = sample_normalized_job.description
-        existing_job.location = sample_normalized_job.location
-        existing_job.posted_date = sample_normalized_job.posted_date
-
-        assert (
-            ingestion_service._job_needs_update(existing_job, sample_normalized_job)
-            is False
+    def test_hash_ignores_identity_columns(self):
+        """Test that ids and flags don't affect the hash"""
+        row = {"title": "Engineer"}
+
+        assert job_content_hash(row) == job_content_hash(
+            dict(row, id=uuid.uuid4(), is_active=False)
         )
 
 
@@ -513,6 +666,9 @@ class TestStaleJobDeactivation:
         for job in stale_jobs:
             assert job.is_active is False
         mock_db.commit.assert_called_once()
+        ingestion_service.pinecone.delete_jobs_vectors.assert_called_once_with(
+            [str(job.id) for job in stale_jobs]
+        )
 
     def test_deactivate_no_stale_jobs(self, ingestion_service, mock_db):
         """Test when no stale jobs exist"""
@@ -525,6 +681,7 @@ class TestStaleJobDeactivation:
         )
 
         assert count == 0
+        ingestion_service.pinecone.delete_jobs_vectors.assert_not_called()
 
 
 class TestSourceHealth:
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 import uuid
 from datetime import datetime
+import numpy as np
 
 from app.services.job_matching_service import JobMatchingService
 from app.schemas.job_matching import (
@@ -26,13 +27,16 @@ def mock_db():
 def job_matching_service(mock_db):
     """Create JobMatchingService instance with mocked dependencies"""
     with patch(
-        "app.services.job_matching_service.PineconeService"
-    ) as mock_pinecone_class:
-        # Configure the mock instance
-        mock_pinecone_instance = mock_pinecone_class.return_value
+        "app.services.job_matching_service.get_pinecone_service"
+    ) as mock_get_pinecone:
+        # Configure the shared mock instance
+        mock_pinecone_instance = mock_get_pinecone.return_value
         mock_pinecone_instance.calculate_semantic_similarity.return_value = (
             0.0  # Default low similarity
         )
+        mock_pinecone_instance.calculate_similarity_matrix.side_effect = (
+            lambda a, b: np.zeros((len(a), len(b)))  # Default low similarity
+        )
 
         service = JobMatchingService(mock_db)
         return service
@@ -155,6 +159,36 @@ class TestSkillMatching:
         assert score == 10  # 0 (no required matches) + 10 (no preferred gives full 10)
         assert all(not m.user_has for m in matches)
 
+    def test_transferable_skills_use_single_similarity_matrix(
+        self, job_matching_service, sample_user_skills
+    ):
+        """Test missing skills are scored with one batched similarity call"""
+        required_skills = ["Python", "Flask", "Rust"]  # Missing Flask and Rust
+
+        def fake_matrix(missing, user):
+            matrix = np.zeros((len(missing), len(user)))
+            matrix[0, 1] = 0.85  # Flask ~ FastAPI
+            matrix[1, 0] = 0.40  # Rust ~ Python
+            return matrix
+
+        job_matching_service.pinecone.calculate_similarity_matrix.side_effect = (
+            fake_matrix
+        )
+
+        score, matches = job_matching_service._calculate_skill_match(
+            sample_user_skills, required_skills, []
+        )
+
+        job_matching_service.pinecone.calculate_similarity_matrix.assert_called_once_with(
+            ["Flask", "Rust"], [s.skill for s in sample_user_skills]
+        )
+        job_matching_service.pinecone.calculate_semantic_similarity.assert_not_called()
+
+        flask, rust = matches[1], matches[2]
+        assert flask.is_transferable and flask.similarity_score == pytest.approx(0.85)
+        assert not rust.is_transferable and rust.similarity_score == pytest.approx(0.4)
+        assert score == 25 + 10  # int(50 * 1.5 / 3) + 10 (no preferred)
+
 
 class TestExperienceMatching:
     """Test experience matching logic"""
@@ -497,5 +531,127 @@ class TestRationaleGeneration:
         )
 
 
+class TestJobHydration:
+    """Test batched hydration of vector search hits"""
+
+    def _hit(self, job_id, score=0.9):
+        hit = Mock()
+        hit.id = str(job_id)
+        hit.score = score
+        hit.metadata = {"job_id": str(job_id)}
+        return hit
+
+    def test_hydrates_all_hits_in_single_query(
+        self, job_matching_service, mock_db, sample_job
+    ):
+        """Test that all hits are loaded with one IN query"""
+        other_job = Mock(spec=Job)
+        other_job.id = uuid.uuid4()
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            other_job,
+            sample_job,
+        ]
+
+        hits = [self._hit(sample_job.id), self._hit(other_job.id)]
+        jobs_by_id = job_matching_service._hydrate_jobs(hits)
+
+        assert mock_db.query.call_count == 1
+        assert list(jobs_by_id) == [str(sample_job.id), str(other_job.id)]
+        assert jobs_by_id[str(sample_job.id)] is sample_job
+        assert job_matching_service.last_hydration_stats["requested"] == 2
+        assert job_matching_service.last_hydration_stats["hydrated"] == 2
+        assert "duration_ms" in job_matching_service.last_hydration_stats
+
+    def test_drops_missing_and_invalid_ids(
+        self, job_matching_service, mock_db, sample_job
+    ):
+        """Test that inactive/missing jobs and malformed ids are dropped"""
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            sample_job
+        ]
+
+        hits = [
+            self._hit(sample_job.id),
+            self._hit(uuid.uuid4()),  # Inactive or deleted job
+            self._hit("not-a-uuid"),
+        ]
+        jobs_by_id = job_matching_service._hydrate_jobs(hits)
+
+        assert list(jobs_by_id) == [str(sample_job.id)]
+        assert job_matching_service.last_hydration_stats["requested"] == 2
+        assert job_matching_service.last_hydration_stats["hydrated"] == 1
+
+    def test_chunks_large_id_lists(self, job_matching_service, mock_db):
+        """Test that large hit lists are split into chunked IN queries"""
+        job_matching_service.HYDRATION_CHUNK_SIZE = 2
+        mock_db.query.return_value.filter.return_value.all.return_value = []
+
+        hits = [self._hit(uuid.uuid4()) for _ in range(5)]
+        job_matching_service._hydrate_jobs(hits)
+
+        assert mock_db.query.call_count == 3
+
+    def test_no_hits_skips_database(self, job_matching_service, mock_db):
+        """Test that an empty hit list issues no queries"""
+        assert job_matching_service._hydrate_jobs([]) == {}
+        mock_db.query.assert_not_called()
+
+
+class TestFindMatchesPaging:
+    """Test that pages stay full when hits are dropped after the vector query"""
+
+    @pytest.fixture
+    def service(self, job_matching_service):
+        job_matching_service._get_user_resume = Mock(return_value=Mock())
+        job_matching_service._extract_skills_from_resume = Mock(return_value=[])
+        job_matching_service._calculate_experience_years = Mock(return_value=5)
+        return job_matching_service
+
+    def _index(self, service, hit_count, kept):
+        """Vector index of hit_count hits where only ids in kept survive"""
+        hits = [Mock(id=f"job{i}", score=1 - i / 1000) for i in range(hit_count)]
+        service.pinecone.search_similar_jobs.side_effect = (
+            lambda user_skills, top_k, filters: Mock(matches=hits[:top_k])
+        )
+        service._score_vector_hits = Mock(
+            side_effect=lambda results, *args: [
+                Mock(job_id=hit.id, fit_index=80) for hit in results if hit.id in kept
+            ]
+        )
+
+    def test_widens_query_until_page_is_full(self, service):
+        """Test that dropped hits (inactive jobs, min_fit_index) are made up"""
+        # Only every 10th hit is an active job above min_fit_index
+        self._index(service, 500, {f"job{i}" for i in range(0, 500, 10)})
+
+        matches = service.find_matches(
+            uuid.uuid4(), JobMatchRequest(limit=10, offset=0)
+        )
+
+        assert len(matches) == 10
+        top_ks = [
+            call.kwargs["top_k"]
+            for call in service.pinecone.search_similar_jobs.call_args_list
+        ]
+        assert top_ks == [30, 60, 120]
+        # Hits already scored by an earlier query are not scored again
+        scored = [
+            hit.id for call in service._score_vector_hits.call_args_list
+            for hit in call.args[0]
+        ]
+        assert len(scored) == len(set(scored)) == 120
+
+    def test_stops_when_index_is_exhausted(self, service):
+        """Test that a short result from the index ends the search"""
+        self._index(service, 25, {"job1", "job2"})
+
+        matches = service.find_matches(
+            uuid.uuid4(), JobMatchRequest(limit=10, offset=0)
+        )
+
+        assert len(matches) == 2
+        assert service.pinecone.search_similar_jobs.call_count == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
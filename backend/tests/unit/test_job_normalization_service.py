@@ -392,6 +392,26 @@ class TestGreenhouseJobNormalization:
         normalized = normalization_service.normalize_greenhouse_job(gh_job, "Company")
 
         assert normalized.location_type == "remote"
+        assert normalized.requires_visa_sponsorship is False
+
+    def test_normalize_greenhouse_job_visa_sponsorship(self, normalization_service):
+        """Test that visa sponsorship is set from the description scan"""
+        gh_job = GreenhouseJob(
+            id="124",
+            title="Software Engineer",
+            location="Berlin",
+            absolute_url="https://example.com/jobs/124",
+            metadata=[],
+            departments=[],
+            offices=[],
+            content="We are hiring a Python engineer to build our data platform. "
+            "We provide visa sponsorship for qualified candidates and help "
+            "with relocation to Berlin.",
+        )
+
+        normalized = normalization_service.normalize_greenhouse_job(gh_job, "Company")
+
+        assert normalized.requires_visa_sponsorship is True
 
 
 class TestLeverJobNormalization:
@@ -458,6 +478,7 @@ class TestLeverJobNormalization:
 
         assert normalized.location == "Remote"  # Default
         assert normalized.department is None
+        assert normalized.requires_visa_sponsorship is False
 
 
 class TestExperienceRequirementExtraction:
@@ -0,0 +1,156 @@
+"""Unit tests for JobReindexService"""
+
+import pytest
+from unittest.mock import Mock
+from uuid import uuid4
+from datetime import datetime
+
+from app.db.models.job import Job
+from app.services.job_reindex_service import (
+    FileCheckpoint,
+    JobReindexService,
+)
+
+
+@pytest.fixture
+def jobs(db_session):
+    """Ten active jobs and one inactive job"""
+    rows = []
+    for i in range(11):
+        job = Job(
+            id=uuid4(),
+            title=f"Engineer {i}",
+            company="TechCorp",
+            description="Build things",
+            required_skills=["Python", "SQL"],
+            source="greenhouse",
+            is_active=i < 10,
+            posted_date=datetime.utcnow(),
+        )
+        db_session.add(job)
+        rows.append(job)
+    db_session.commit()
+    return sorted(rows[:10], key=lambda j: str(j.id))
+
+
+@pytest.fixture
+def mock_pinecone():
+    """Mock PineconeService that reports 3 vectors per job"""
+    pinecone = Mock()
+    pinecone.index_jobs.side_effect = lambda batch: len(batch) * 3
+    return pinecone
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    """File checkpoint in a temp directory"""
+    return FileCheckpoint(str(tmp_path / "checkpoint.json"))
+
+
+class TestReindex:
+    """Test streaming bulk re-index"""
+
+    def test_indexes_all_active_jobs_in_batches(
+        self, db_session, jobs, mock_pinecone, checkpoint
+    ):
+        """Test that active jobs are indexed in batch_size chunks"""
+        service = JobReindexService(db_session, mock_pinecone, checkpoint)
+
+        report = service.reindex(batch_size=4, max_workers=2)
+
+        assert report.completed is True
+        assert report.jobs_indexed == 10
+        assert report.vectors_upserted == 30
+        assert report.batches == 3
+        assert sorted(
+            len(call[0][0]) for call in mock_pinecone.index_jobs.call_args_list
+        ) == [2, 4, 4]
+        indexed_ids = [
+            payload["job_id"]
+            for call in mock_pinecone.index_jobs.call_args_list
+            for payload in call[0][0]
+        ]
+        assert sorted(indexed_ids) == [str(j.id) for j in jobs]
+        assert report.jobs_per_second >= 0
+
+    def test_include_inactive(self, db_session, jobs, mock_pinecone):
+        """Test indexing inactive jobs too"""
+        service = JobReindexService(db_session, mock_pinecone)
+
+        report = service.reindex(batch_size=100, include_inactive=True)
+
+        assert report.jobs_indexed == 11
+
+    def test_checkpoint_cleared_after_success(
+        self, db_session, jobs, mock_pinecone, checkpoint
+    ):
+        """Test that a finished run leaves no checkpoint"""
+        JobReindexService(db_session, mock_pinecone, checkpoint).reindex(
+            batch_size=3
+        )
+
+        assert checkpoint.load() is None
+
+    def test_failure_keeps_checkpoint_and_resumes(
+        self, db_session, jobs, mock_pinecone, checkpoint
+    ):
+        """Test that a failed run resumes after the last good batch"""
+        calls = {"count": 0}
+
+        def flaky_index(batch):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise Exception("Pinecone unavailable")
+            return len(batch)
+
+        mock_pinecone.index_jobs.side_effect = flaky_index
+        service = JobReindexService(db_session, mock_pinecone, checkpoint)
+
+        report = service.reindex(batch_size=4, max_workers=1, max_in_flight=1)
+
+        assert report.completed is False
+        assert report.failed_batches == 1
+        assert "Pinecone unavailable" in report.errors[0]
+        assert checkpoint.load() == str(jobs[3].id)
+
+        # Second run picks up after the checkpoint
+        mock_pinecone.index_jobs.side_effect = lambda batch: len(batch)
+        mock_pinecone.index_jobs.reset_mock()
+
+        resumed = service.reindex(batch_size=4, max_workers=1)
+
+        assert resumed.completed is True
+        assert resumed.resumed_from == str(jobs[3].id)
+        assert resumed.jobs_indexed == 6
+        assert checkpoint.load() is None
+
+    def test_no_resume_ignores_checkpoint(
+        self, db_session, jobs, mock_pinecone, checkpoint
+    ):
+        """Test forcing a full rebuild"""
+        checkpoint.save(str(jobs[5].id))
+
+        report = JobReindexService(db_session, mock_pinecone, checkpoint).reindex(
+            resume=False
+        )
+
+        assert report.resumed_from is None
+        assert report.jobs_indexed == 10
+
+
+class TestFileCheckpoint:
+    """Test file checkpoint store"""
+
+    def test_round_trip(self, checkpoint):
+        """Test saving, loading and clearing"""
+        assert checkpoint.load() is None
+
+        checkpoint.save("abc")
+        assert checkpoint.load() == "abc"
+
+        checkpoint.clear()
+        assert checkpoint.load() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
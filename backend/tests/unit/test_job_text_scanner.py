@@ -0,0 +1,90 @@
+"""Unit tests for the single-pass job description scanner"""
+
+import pytest
+
+from app.services.job_text_scanner import JobTextScanner, get_job_text_scanner
+
+
+@pytest.fixture
+def scanner():
+    return get_job_text_scanner()
+
+
+class TestSkills:
+    """Test skill extraction"""
+
+    def test_longer_alias_counts_for_contained_aliases(self, scanner):
+        """Test that "github actions" is both ci/cd and git"""
+        features = scanner.scan("Requirements: GitHub Actions, React Native")
+
+        assert features.required_skills == [
+            "javascript",
+            "ci/cd",
+            "react",
+            "git",
+            "react native",
+        ]
+
+    def test_word_boundaries(self, scanner):
+        """Test that aliases don't match inside other words"""
+        features = scanner.scan("Requirements: JavaScript, golf, mail, C++ and C#")
+
+        assert features.required_skills == ["javascript", "c++", "c#"]
+
+    def test_skills_attributed_to_sections(self, scanner):
+        """Test that required and preferred skills come from their sections"""
+        text = "Requirements: Python, Docker\n\nPreferred: Kafka, Redis"
+
+        features = scanner.scan(text)
+
+        assert features.required_skills == ["python", "docker"]
+        # Taxonomy order, not text order
+        assert features.preferred_skills == ["redis", "kafka"]
+
+    def test_custom_taxonomy(self):
+        """Test that the matcher is built from the given taxonomy"""
+        scanner = JobTextScanner({"data": ["dbt", "data build tool"]})
+
+        features = scanner.scan("Requirements: data-build tool and Python")
+
+        assert features.required_skills == ["data"]
+
+
+class TestLevelsSalaryAndSponsorship:
+    """Test the other features collected in the same scan"""
+
+    def test_highest_level_wins(self, scanner):
+        """Test that levels keep their priority order"""
+        def level(text):
+            return scanner.scan(text).experience_level
+
+        assert level("Junior role, reports to a staff engineer") == "staff"
+        assert level("Senior leadership") == "senior"
+        assert level("Leadership skills") is None
+        assert level("Mid-level engineer") == "mid"
+
+    def test_salary_pattern_priority(self, scanner):
+        """Test that a comma-formatted range beats an earlier k range"""
+        features = scanner.scan("Bonus 10k-20k. Base $150,000 - $200,000.")
+
+        assert (features.salary.min_salary, features.salary.max_salary) == (
+            150000,
+            200000,
+        )
+
+    def test_qualified_sponsorship_needs_offer_on_same_line(self, scanner):
+        """Test "visa sponsorship" is an offer only after will/can/provide/offer"""
+        assert scanner.scan("We provide visa sponsorship.").offers_visa_sponsorship
+        assert not scanner.scan(
+            "We provide lunch.\nVisa sponsorship: ask"
+        ).offers_visa_sponsorship
+
+    def test_negative_cue_wins(self, scanner):
+        """Test that any no-sponsorship cue overrides offers"""
+        text = "H1B sponsorship available. We are not sponsoring new visas."
+
+        assert scanner.scan(text).offers_visa_sponsorship is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
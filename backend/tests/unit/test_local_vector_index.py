@@ -0,0 +1,261 @@
+"""Unit tests for LocalVectorIndex"""
+
+import pytest
+from unittest.mock import Mock, patch
+import numpy as np
+
+from app.services.local_vector_index import LocalVectorIndex, matches_filter
+from app.services.pinecone_service import PineconeService
+
+
+@pytest.fixture
+def vectors():
+    """Random 16-dim vectors"""
+    return np.random.default_rng(42).normal(size=(200, 16)).astype(np.float32)
+
+
+@pytest.fixture
+def index(vectors):
+    """Local index with job-like metadata"""
+    index = LocalVectorIndex(dimension=16)
+    index.upsert(
+        [
+            (
+                f"job{i}",
+                vectors[i],
+                {
+                    "job_id": f"job{i}",
+                    "visa_sponsorship": i % 2 == 0,
+                    "salary_min": i * 1000,
+                    "experience_level": ["entry", "mid", "senior"][i % 3],
+                },
+            )
+            for i in range(len(vectors))
+        ]
+    )
+    return index
+
+
+def brute_force(vectors, query, top_k, rows=None):
+    """Reference cosine top-k"""
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    rows = np.arange(len(vectors)) if rows is None else np.asarray(rows)
+    ranked = rows[np.argsort(-scores[rows])]
+    return [f"job{i}" for i in ranked[:top_k]]
+
+
+class TestQuery:
+    """Test exact search"""
+
+    def test_exact_search_matches_brute_force(self, index, vectors):
+        """Test top-k order against NumPy brute force"""
+        query = vectors[7] + 0.1
+
+        result = index.query(vector=query, top_k=10, include_metadata=True)
+
+        assert [m.id for m in result.matches] == brute_force(vectors, query, 10)
+        assert result.matches[0].metadata["job_id"] == result.matches[0].id
+        assert result.matches[0].score >= result.matches[-1].score
+
+    def test_search_similar_jobs_filters(self, index, vectors):
+        """Test the metadata filters search_similar_jobs builds"""
+        flt = {
+            "visa_sponsorship": {"$eq": True},
+            "salary_min": {"$gte": 50000},
+            "experience_level": {"$in": ["mid", "senior"]},
+        }
+
+        result = index.query(vector=vectors[0], top_k=5, filter=flt)
+
+        allowed = [
+            i
+            for i in range(len(vectors))
+            if i % 2 == 0 and i * 1000 >= 50000 and i % 3 in (1, 2)
+        ]
+        assert [m.id for m in result.matches] == brute_force(
+            vectors, vectors[0], 5, allowed
+        )
+
+    def test_metadata_omitted_unless_requested(self, index, vectors):
+        """Test include_metadata=False"""
+        result = index.query(vector=vectors[0], top_k=1)
+
+        assert result.matches[0].metadata is None
+
+    def test_upsert_overwrites_existing_id(self, index, vectors):
+        """Test that re-upserting an id replaces vector and metadata"""
+        index.upsert([("job0", vectors[1], {"job_id": "job0", "updated": True})])
+
+        result = index.query(vector=vectors[1], top_k=2, include_metadata=True)
+
+        assert {m.id for m in result.matches} == {"job0", "job1"}
+        assert index.describe_index_stats().total_vector_count == 200
+
+    def test_dimension_mismatch_raises(self, index):
+        """Test rejecting vectors of the wrong size"""
+        with pytest.raises(ValueError):
+            index.upsert([("bad", [0.1] * 8, {})])
+
+
+class TestDelete:
+    """Test deletion"""
+
+    def test_delete_by_ids(self, index, vectors):
+        """Test deleted ids no longer match"""
+        index.delete(ids=["job3", "missing"])
+
+        result = index.query(vector=vectors[3], top_k=5)
+
+        assert "job3" not in [m.id for m in result.matches]
+        assert index.describe_index_stats().total_vector_count == 199
+
+    def test_delete_by_filter(self, index, vectors):
+        """Test filter-based deletes"""
+        index.delete(filter={"experience_level": {"$eq": "entry"}})
+
+        result = index.query(vector=vectors[0], top_k=200, include_metadata=True)
+
+        assert all(m.metadata["experience_level"] != "entry" for m in result.matches)
+
+
+class TestIVF:
+    """Test approximate search"""
+
+    def test_ivf_recall_with_all_probes_is_exact(self, index, vectors):
+        """Test that probing every list equals exact search"""
+        exact = [m.id for m in index.query(vector=vectors[5], top_k=10).matches]
+
+        index.build_ivf(n_lists=8, n_probe=8)
+        approx = [m.id for m in index.query(vector=vectors[5], top_k=10).matches]
+
+        assert approx == exact
+
+    def test_ivf_finds_self_and_new_vectors(self, index, vectors):
+        """Test that vectors upserted after training are assigned a list"""
+        index.build_ivf(n_lists=8, n_probe=2)
+        index.upsert([("new", vectors[10] * 3, {})])
+
+        result = index.query(vector=vectors[10], top_k=2)
+
+        assert {m.id for m in result.matches} == {"job10", "new"}
+
+
+class TestPersistence:
+    """Test save/load with memory mapping"""
+
+    def test_save_and_load(self, index, vectors, tmp_path):
+        """Test round trip drops tombstones and memory-maps vectors"""
+        index.delete(ids=["job0"])
+        index.save(str(tmp_path))
+
+        loaded = LocalVectorIndex.load(str(tmp_path), dimension=16)
+
+        assert loaded.describe_index_stats().total_vector_count == 199
+        assert isinstance(loaded._vectors, np.memmap)
+        assert [m.id for m in loaded.query(vector=vectors[9], top_k=3).matches] == [
+            m.id for m in index.query(vector=vectors[9], top_k=3).matches
+        ]
+
+    def test_loaded_index_accepts_upserts(self, index, vectors, tmp_path):
+        """Test copy-on-write out of the read-only memory map"""
+        index.save(str(tmp_path))
+        loaded = LocalVectorIndex.load(str(tmp_path), dimension=16)
+
+        loaded.upsert([("job1", vectors[2], {}), ("extra", vectors[3], {})])
+        loaded.save()
+
+        reloaded = LocalVectorIndex.load(str(tmp_path), dimension=16)
+        assert reloaded.describe_index_stats().total_vector_count == 201
+
+    def test_load_missing_path_returns_empty_index(self, tmp_path):
+        """Test opening a fresh index directory"""
+        loaded = LocalVectorIndex.load(str(tmp_path / "new"), dimension=16)
+
+        assert loaded.describe_index_stats().total_vector_count == 0
+        assert loaded.query(vector=[1.0] * 16, top_k=5).matches == []
+
+    def test_sync_merges_writes_from_other_processes(self, index, vectors, tmp_path):
+        """Test that two copies of one saved index keep each other's writes"""
+        index.save(str(tmp_path))
+        api = LocalVectorIndex.load(str(tmp_path), dimension=16)
+        worker = LocalVectorIndex.load(str(tmp_path), dimension=16)
+
+        worker.upsert([("reindexed", vectors[5], {"job_id": "reindexed"})])
+        worker.delete(ids=["job1"])
+        worker.sync()
+        api.upsert([("created", vectors[6], {})], namespace="job-skills")
+        api.sync()
+
+        reloaded = LocalVectorIndex.load(str(tmp_path), dimension=16)
+        assert reloaded.fetch(["reindexed", "job1"]).keys() == {"reindexed"}
+        assert reloaded.fetch(["created"], namespace="job-skills")
+        assert reloaded.describe_index_stats().total_vector_count == 201
+        # The API copy picked up the worker's writes when it synced
+        assert api.fetch(["reindexed"])
+        matches = api.query(vector=vectors[5], top_k=2).matches
+        assert "reindexed" in {m.id for m in matches}
+
+    def test_sync_without_changes_only_reloads(self, index, vectors, tmp_path):
+        """Test that a process with nothing to write does not rewrite the files"""
+        index.save(str(tmp_path))
+        writer = LocalVectorIndex.load(str(tmp_path), dimension=16)
+        reader = LocalVectorIndex.load(str(tmp_path), dimension=16)
+        written_at = (tmp_path / "vectors.npy").stat().st_mtime_ns
+
+        writer.upsert([("new", vectors[7], {})])
+        writer.sync()
+        assert (tmp_path / "vectors.npy").stat().st_mtime_ns != written_at
+        written_at = (tmp_path / "vectors.npy").stat().st_mtime_ns
+
+        reader.sync()
+
+        assert (tmp_path / "vectors.npy").stat().st_mtime_ns == written_at
+        assert reader.fetch(["new"])
+
+
+class TestFilterEvaluation:
+    """Test Pinecone filter semantics"""
+
+    def test_operators(self):
+        """Test supported comparison operators"""
+        metadata = {"salary_min": 120000, "level": "senior", "visa": True}
+
+        assert matches_filter(metadata, {"salary_min": {"$gte": 100000}})
+        assert not matches_filter(metadata, {"salary_min": {"$lt": 100000}})
+        assert matches_filter(metadata, {"level": {"$nin": ["entry"]}})
+        assert matches_filter(metadata, {"visa": True})
+        assert matches_filter(
+            metadata, {"$or": [{"level": "mid"}, {"salary_min": {"$gt": 0}}]}
+        )
+        assert not matches_filter(metadata, {"missing": {"$gte": 1}})
+
+
+class TestPineconeServiceBackend:
+    """Test LocalVectorIndex as a PineconeService backend"""
+
+    def test_search_similar_jobs_with_local_index(self):
+        """Test end-to-end search without any Pinecone calls"""
+        openai_service = Mock()
+        openai_service.create_embeddings_batch.side_effect = lambda batch: [
+            [float(len(text) % 7), 1.0, float(i)] for i, text in enumerate(batch)
+        ]
+        openai_service.create_embedding.return_value = [1.0, 1.0, 0.0]
+
+        with patch("app.services.pinecone_service.pinecone") as mock_pc:
+            service = PineconeService(
+                jobs_index=LocalVectorIndex(dimension=3),
+                users_index=LocalVectorIndex(dimension=3),
+                openai_service=openai_service,
+            )
+            service._embedding_cache.clear()
+
+            service.index_job("job1", "Backend", "APIs", ["Python"], {})
+            result = service.search_similar_jobs([], top_k=5)
+
+        mock_pc.init.assert_not_called()
+        assert [m.metadata["job_id"] for m in result.matches] == ["job1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,183 @@
+"""Unit tests for the per-participant thread inbox and keyset listing"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import BadRequestError
+from app.db.models.message import MessageThreadInbox
+from app.services.messaging_service import (
+    MessagingService,
+    decode_thread_cursor,
+    encode_thread_cursor,
+)
+
+
+@pytest.fixture
+def service(db_session):
+    return MessagingService(db=db_session)
+
+
+@pytest.fixture
+def employer_id():
+    return uuid4()
+
+
+def make_threads(service, employer_id, count, start=datetime(2025, 12, 1)):
+    """Threads with one message each, the last one most recent"""
+    threads = []
+    for i in range(count):
+        thread = service.create_thread(employer_id=employer_id, candidate_id=uuid4())
+        service._record_new_message(
+            thread.id, employer_id, start + timedelta(minutes=i)
+        )
+        threads.append(thread)
+    service.db.commit()
+    return threads
+
+
+class TestInboxMaintenance:
+    """Test that inbox rows follow thread changes"""
+
+    def test_create_thread_adds_row_per_participant(self, service, employer_id):
+        """Test one inbox row for the employer and one for the candidate"""
+        candidate_id = uuid4()
+        thread = service.create_thread(
+            employer_id=employer_id, candidate_id=candidate_id
+        )
+
+        rows = service.db.query(MessageThreadInbox).all()
+        assert {(row.user_id, row.role) for row in rows} == {
+            (employer_id, "employer"),
+            (candidate_id, "candidate"),
+        }
+        assert all(row.last_activity_at == thread.created_at for row in rows)
+
+    def test_new_message_and_read(self, service, employer_id):
+        """Test unread counts and activity time of both participants"""
+        candidate_id = uuid4()
+        thread = service.create_thread(
+            employer_id=employer_id, candidate_id=candidate_id
+        )
+        sent_at = datetime.utcnow() + timedelta(minutes=5)
+
+        service._record_new_message(thread.id, candidate_id, sent_at)
+        service._record_new_message(thread.id, candidate_id, sent_at)
+        service.db.commit()
+
+        assert service.get_unread_count(candidate_id) == 2
+        assert service.get_unread_count(employer_id) == 0
+        assert service._inbox_entry(thread.id, employer_id).one().last_activity_at == (
+            sent_at
+        )
+
+        for _ in range(3):
+            service._record_message_read(thread.id, candidate_id)
+        service.db.commit()
+        assert service.get_unread_count(candidate_id) == 0
+
+    def test_archive_is_per_participant(self, service, employer_id):
+        """Test archiving hides the thread for that participant only"""
+        candidate_id = uuid4()
+        thread = service.create_thread(
+            employer_id=employer_id, candidate_id=candidate_id
+        )
+
+        service.archive_thread(thread.id, employer_id)
+
+        assert service.list_threads(employer_id) == []
+        assert [t.id for t in service.list_threads(employer_id, archived=True)] == [
+            thread.id
+        ]
+        assert [t.id for t in service.list_threads(candidate_id)] == [thread.id]
+
+    def test_deleted_thread_leaves_inboxes(self, service, employer_id):
+        """Test soft deletion removes the thread from both inboxes"""
+        thread = service.create_thread(employer_id=employer_id, candidate_id=uuid4())
+
+        service.delete_thread(thread.id, employer_id)
+
+        assert service.db.query(MessageThreadInbox).count() == 0
+        assert service.list_threads(employer_id) == []
+
+
+class TestKeysetListing:
+    """Test cursor pagination over the inbox"""
+
+    def test_cursor_pages_cover_every_thread_once(self, service, employer_id):
+        """Test that following next_cursor walks all threads newest first"""
+        threads = make_threads(service, employer_id, 25)
+
+        seen = []
+        cursor = None
+        while True:
+            page = service.list_thread_page(employer_id, limit=10, cursor=cursor)
+            seen.extend(thread.id for thread in page.threads)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [thread.id for thread in reversed(threads)]
+
+    def test_page_numbers_still_work(self, service, employer_id):
+        """Test the page-number fallback for existing clients"""
+        make_threads(service, employer_id, 25)
+
+        assert len(service.list_threads(employer_id, page=1, limit=20)) == 20
+        assert len(service.list_threads(employer_id, page=2, limit=20)) == 5
+
+    def test_ties_are_broken_by_thread_id(self, service, employer_id):
+        """Test threads with the same activity time are neither lost nor repeated"""
+        threads = [
+            service.create_thread(employer_id=employer_id, candidate_id=uuid4())
+            for _ in range(6)
+        ]
+        same_time = datetime(2025, 12, 1, 12, 0)
+        for thread in threads:
+            service._record_new_message(thread.id, employer_id, same_time)
+        service.db.commit()
+
+        first = service.list_thread_page(employer_id, limit=4)
+        second = service.list_thread_page(employer_id, limit=4, cursor=first.next_cursor)
+
+        ids = [thread.id for thread in first.threads + second.threads]
+        assert sorted(ids) == sorted(thread.id for thread in threads)
+        assert second.next_cursor is None
+
+    def test_filters(self, service, employer_id):
+        """Test unread and application filters"""
+        application_id = uuid4()
+        with_app = service.create_thread(
+            employer_id=employer_id, candidate_id=uuid4(), application_id=application_id
+        )
+        unread = service.create_thread(employer_id=employer_id, candidate_id=uuid4())
+        service._record_new_message(unread.id, employer_id, datetime.utcnow())
+        service.db.commit()
+
+        assert [
+            t.id for t in service.list_threads(employer_id, unread_only=True)
+        ] == [unread.id]
+        assert [
+            t.id for t in service.list_threads(employer_id, application_id=application_id)
+        ] == [with_app.id]
+        assert service.get_unread_thread_count(employer_id) == 1
+
+    def test_invalid_cursor(self, service, employer_id):
+        """Test that a malformed cursor is a bad request"""
+        with pytest.raises(BadRequestError):
+            service.list_thread_page(employer_id, cursor="not-a-cursor")
+
+    def test_cursor_round_trip(self):
+        """Test cursor encoding"""
+        thread_id = uuid4()
+        at = datetime(2025, 12, 1, 9, 30, 15, 123456)
+
+        assert decode_thread_cursor(encode_thread_cursor(at, thread_id)) == (
+            at,
+            thread_id,
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,154 @@
+"""Unit tests for platform-wide peer benchmarks"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from app.core.exceptions import ServiceError
+from app.db.models.analytics import PeerBenchmark
+from app.db.models.application import Application
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.services.analytics_service import AnalyticsService
+from app.services.peer_benchmark_service import (
+    RATE_BIN_EDGES,
+    Histogram,
+    PeerBenchmarkService,
+)
+
+
+@pytest.fixture
+def job(db_session):
+    job = Job(title="Backend Engineer", company="TechCorp", source="employer")
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+def make_seeker(db_session, job, email, statuses, days_ago=1):
+    user = User(email=email, password_hash="hashed")
+    db_session.add(user)
+    db_session.commit()
+
+    created_at = datetime.utcnow() - timedelta(days=days_ago)
+    for status in statuses:
+        db_session.add(
+            Application(
+                user_id=user.id, job_id=job.id, status=status, created_at=created_at
+            )
+        )
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def platform(db_session, job):
+    """Four active seekers with 0%, 25%, 50% and 100% response rates"""
+    return [
+        make_seeker(db_session, job, "a@example.com", ["applied"] * 4),
+        make_seeker(db_session, job, "b@example.com", ["in_review"] + ["applied"] * 3),
+        make_seeker(db_session, job, "c@example.com", ["phone_screen", "applied"]),
+        make_seeker(db_session, job, "d@example.com", ["offer"] * 2),
+        # Outside the 30 day window
+        make_seeker(db_session, job, "e@example.com", ["offer"] * 8, days_ago=60),
+    ]
+
+
+class TestHistogram:
+    """Test histogram building"""
+
+    def test_values_clamped_into_edge_bins(self):
+        """Test that out-of-range values land in the first/last bin"""
+        histogram = Histogram([0.0, 10.0, 20.0])
+
+        for value in (-5.0, 5.0, 20.0, 500.0):
+            histogram.add(value)
+
+        assert histogram.counts == [2, 2]
+        assert histogram.cumulative_counts() == [2, 4]
+        assert histogram.mean == pytest.approx(130.0)
+
+
+class TestRollup:
+    """Test the nightly rollup"""
+
+    def test_rollup_stores_distributions(self, db_session, platform):
+        """Test that one row per metric is stored for active users"""
+        counts = PeerBenchmarkService(db_session).rollup()
+
+        assert counts["response_rate"] == 4
+        benchmarks = PeerBenchmarkService(db_session).get_benchmarks()
+        assert set(benchmarks) == {
+            "total_applications",
+            "response_rate",
+            "interview_rate",
+            "offer_rate",
+        }
+        assert benchmarks["response_rate"].mean == pytest.approx(43.75)
+        assert benchmarks["total_applications"].cumulative_counts[-1] == 4
+
+    def test_rollup_replaces_previous_rows(self, db_session, platform, job):
+        """Test that rerunning updates rows in place"""
+        service = PeerBenchmarkService(db_session)
+        service.rollup()
+        make_seeker(db_session, job, "f@example.com", ["rejected"])
+
+        service.rollup()
+
+        assert db_session.query(PeerBenchmark).count() == 4
+        assert service.get_benchmarks()["offer_rate"].sample_size == 5
+
+    def test_rollup_failure_raises_service_error(self, db_session):
+        """Test error wrapping"""
+        service = PeerBenchmarkService(db_session)
+        service._user_counts = Mock(side_effect=Exception("DB down"))
+
+        with pytest.raises(ServiceError):
+            service.rollup()
+
+
+class TestPercentile:
+    """Test percentile lookup"""
+
+    def test_percentile_interpolates_within_bin(self):
+        """Test percentile of a value against stored cumulative counts"""
+        benchmark = PeerBenchmark(
+            bin_edges=[0.0, 10.0, 20.0, 30.0],
+            cumulative_counts=[2, 6, 10],
+        )
+
+        assert PeerBenchmarkService.percentile(benchmark, 0.0) == 0.0
+        assert PeerBenchmarkService.percentile(benchmark, 15.0) == pytest.approx(40.0)
+        assert PeerBenchmarkService.percentile(benchmark, 30.0) == 100.0
+
+    def test_empty_benchmark(self):
+        """Test neutral percentile without data"""
+        benchmark = PeerBenchmark(bin_edges=RATE_BIN_EDGES, cumulative_counts=[])
+
+        assert PeerBenchmarkService.percentile(benchmark, 42.0) == 50.0
+
+
+class TestPeerComparison:
+    """Test AnalyticsService.get_peer_comparison"""
+
+    def test_uses_rollup(self, db_session, platform):
+        """Test that percentiles and averages come from the rollup"""
+        PeerBenchmarkService(db_session).rollup()
+
+        comparison = AnalyticsService(db_session).get_peer_comparison(platform[2].id)
+
+        assert comparison.response_rate.user_value == 50.0
+        assert comparison.response_rate.platform_average == 43.75
+        assert comparison.response_rate.percentile == 50.0
+        assert comparison.offer_rate.percentile == 0.0
+
+    def test_falls_back_without_rollup(self, db_session, platform):
+        """Test static estimates before the first rollup"""
+        comparison = AnalyticsService(db_session).get_peer_comparison(platform[3].id)
+
+        assert comparison.response_rate.platform_average == 35.0
+        assert comparison.response_rate.percentile == 90.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
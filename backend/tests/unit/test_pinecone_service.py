@@ -4,12 +4,23 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 import hashlib
+import time
+import numpy as np
 
+from app.services.embedding_cache import get_embedding_cache
 from app.services.pinecone_service import PineconeService
 from app.core.exceptions import ServiceError
 from app.schemas.job_matching import SkillVector
 
 
+@pytest.fixture(autouse=True)
+def clear_embedding_cache():
+    """Reset the process-wide embedding cache between tests"""
+    get_embedding_cache().clear()
+    yield
+    get_embedding_cache().clear()
+
+
 @pytest.fixture
 def mock_pinecone_module():
     """Mock pinecone module"""
@@ -196,38 +207,123 @@ class TestEmbeddingGeneration:
         assert "Failed to generate batch embeddings" in str(exc_info.value)
 
 
+class TestSimilarityMatrix:
+    """Test batched similarity calculation"""
+
+    def test_generate_embeddings_batches_cache_misses(
+        self, pinecone_service, mock_openai_service
+    ):
+        """Test that only uncached texts are sent in a single batch"""
+        pinecone_service.generate_embedding("Python")
+        mock_openai_service.create_embeddings_batch.return_value = [[0.2] * 1536] * 2
+
+        result = pinecone_service.generate_embeddings(["Python", "Go", "Rust", "Go"])
+
+        assert len(result) == 4
+        mock_openai_service.create_embeddings_batch.assert_called_once_with(
+            ["Go", "Rust"]
+        )
+
+    def test_similarity_matrix_shape_and_values(
+        self, pinecone_service, mock_openai_service
+    ):
+        """Test cosine matrix from one batched embedding call"""
+        mock_openai_service.create_embeddings_batch.return_value = [
+            [1.0, 0.0],
+            [0.0, 2.0],
+            [3.0, 0.0],
+            [1.0, 1.0],
+            [0.0, 5.0],
+        ]
+
+        matrix = pinecone_service.calculate_similarity_matrix(
+            ["a", "b"], ["c", "d", "e"]
+        )
+
+        assert matrix.shape == (2, 3)
+        assert mock_openai_service.create_embeddings_batch.call_count == 1
+        assert mock_openai_service.create_embedding.call_count == 0
+        np.testing.assert_allclose(
+            matrix,
+            [[1.0, 0.7071068, 0.0], [0.0, 0.7071068, 1.0]],
+            rtol=1e-5,
+        )
+
+    def test_similarity_matrix_empty_inputs(
+        self, pinecone_service, mock_openai_service
+    ):
+        """Test that empty inputs skip embedding calls"""
+        matrix = pinecone_service.calculate_similarity_matrix([], ["Python"])
+
+        assert matrix.shape == (0, 1)
+        mock_openai_service.create_embeddings_batch.assert_not_called()
+
+
 class TestCacheManagement:
     """Test embedding cache management"""
 
-    def test_cache_stores_timestamp(self, pinecone_service, mock_openai_service):
-        """Test that cache stores timestamp"""
+    def test_cache_stores_float32_vector(self, pinecone_service, mock_openai_service):
+        """Test that cache stores compact float32 arrays"""
         text = "test text"
         cache_key = hashlib.sha256(text.encode()).hexdigest()
 
         pinecone_service.generate_embedding(text)
 
         assert cache_key in pinecone_service._embedding_cache
-        vector, timestamp = pinecone_service._embedding_cache[cache_key]
-        assert isinstance(timestamp, datetime)
+        vector = pinecone_service._embedding_cache.get(cache_key)
+        assert vector.dtype == np.float32
+        assert vector.shape == (1536,)
 
     def test_cache_expires_after_ttl(self, pinecone_service, mock_openai_service):
         """Test cache expiration"""
         text = "test text"
-        cache_key = hashlib.sha256(text.encode()).hexdigest()
 
         # First call
         pinecone_service.generate_embedding(text)
 
-        # Manually set old timestamp
-        vector, _ = pinecone_service._embedding_cache[cache_key]
-        old_time = datetime.utcnow() - timedelta(hours=25)
-        pinecone_service._embedding_cache[cache_key] = (vector, old_time)
-
-        # Second call should regenerate
-        pinecone_service.generate_embedding(text)
+        # Second call after the TTL should regenerate
+        with patch(
+            "app.services.embedding_cache.time.monotonic",
+            return_value=time.monotonic() + 25 * 3600,
+        ):
+            pinecone_service.generate_embedding(text)
 
         assert mock_openai_service.create_embedding.call_count == 2
 
+    def test_cache_is_shared_across_instances(
+        self, pinecone_service, mock_pinecone_module, mock_openai_service
+    ):
+        """Test that a new service instance reuses cached embeddings"""
+        pinecone_service.generate_embedding("shared text")
+
+        with patch(
+            "app.services.pinecone_service.OpenAIService",
+            return_value=mock_openai_service,
+        ):
+            other_service = PineconeService()
+        other_service.generate_embedding("shared text")
+
+        assert mock_openai_service.create_embedding.call_count == 1
+
+    def test_stats_include_cache_counters(self, pinecone_service):
+        """Test that get_stats exposes hit/miss/eviction counters"""
+        pinecone_service.jobs_index.describe_index_stats.return_value = Mock(
+            total_vector_count=10, dimension=1536
+        )
+        pinecone_service.users_index.describe_index_stats.return_value = Mock(
+            total_vector_count=5, dimension=1536
+        )
+
+        pinecone_service.generate_embedding("text")
+        pinecone_service.generate_embedding("text")
+
+        stats = pinecone_service.get_stats()
+
+        assert stats["cache_size"] == 1
+        assert stats["embedding_cache"]["hits"] == 1
+        assert stats["embedding_cache"]["misses"] == 1
+        assert stats["embedding_cache"]["evictions"] == 0
+
 
 class TestUserSkillsIndexing:
     """Test user skills indexing"""
@@ -345,9 +441,11 @@ class TestJobIndexing:
         first_call = pinecone_service.jobs_index.upsert.call_args_list[0]
         assert len(first_call[1]["vectors"]) == 1
 
-        # Second call for skill vectors
+        # Second call for skill vectors, in their own namespace
         second_call = pinecone_service.jobs_index.upsert.call_args_list[1]
         assert len(second_call[1]["vectors"]) == 3  # 3 skills
+        assert second_call[1]["namespace"] == pinecone_service.skills_namespace
+        assert "namespace" not in first_call[1]
 
     def test_index_job_includes_metadata(self, pinecone_service):
         """Test job metadata is properly included"""
@@ -386,6 +484,73 @@ class TestJobIndexing:
         assert "Failed to index job" in str(exc_info.value)
 
 
+class TestBatchJobIndexing:
+    """Test batched multi-job indexing"""
+
+    def _jobs(self, count, skills):
+        return [
+            {
+                "job_id": f"job{i}",
+                "job_title": f"Developer {i}",
+                "job_description": "Test",
+                "required_skills": skills,
+                "metadata": {"company": "Tech Corp"},
+            }
+            for i in range(count)
+        ]
+
+    def test_index_jobs_batches_and_dedupes_embeddings(
+        self, pinecone_service, mock_openai_service
+    ):
+        """Test one embedding request for all job texts and unique skills"""
+        mock_openai_service.create_embeddings_batch.side_effect = lambda batch: [
+            [0.1] * 1536 for _ in batch
+        ]
+
+        upserted = pinecone_service.index_jobs(self._jobs(3, ["Python", "SQL"]))
+
+        # 3 job texts + 2 unique skills in a single batched call
+        assert mock_openai_service.create_embeddings_batch.call_count == 1
+        assert len(mock_openai_service.create_embeddings_batch.call_args[0][0]) == 5
+        assert mock_openai_service.create_embedding.call_count == 0
+        assert upserted == 3 + 6
+
+    def test_index_jobs_skips_cached_skills(
+        self, pinecone_service, mock_openai_service
+    ):
+        """Test that previously embedded skills are not re-embedded"""
+        mock_openai_service.create_embeddings_batch.side_effect = lambda batch: [
+            [0.1] * 1536 for _ in batch
+        ]
+        pinecone_service.generate_embedding("Python")
+
+        pinecone_service.index_jobs(self._jobs(1, ["Python", "SQL"]))
+
+        batch = mock_openai_service.create_embeddings_batch.call_args[0][0]
+        assert "Python" not in batch
+        assert "SQL" in batch
+
+    def test_index_jobs_chunks_upserts(self, pinecone_service, mock_openai_service):
+        """Test that upserts are split into UPSERT_BATCH_SIZE chunks"""
+        mock_openai_service.create_embeddings_batch.side_effect = lambda batch: [
+            [0.1] * 1536 for _ in batch
+        ]
+        pinecone_service.UPSERT_BATCH_SIZE = 2
+
+        pinecone_service.index_jobs(self._jobs(3, ["Python"]))
+
+        sizes = [
+            len(call[1]["vectors"])
+            for call in pinecone_service.jobs_index.upsert.call_args_list
+        ]
+        assert sizes == [2, 1, 2, 1]  # 3 job vectors, then 3 skill vectors
+
+    def test_index_jobs_empty(self, pinecone_service, mock_openai_service):
+        """Test that an empty batch does nothing"""
+        assert pinecone_service.index_jobs([]) == 0
+        pinecone_service.jobs_index.upsert.assert_not_called()
+
+
 class TestJobSearch:
     """Test job search functionality"""
 
@@ -408,23 +573,18 @@ class TestJobSearch:
         assert result.matches[0].id == "job123"
         assert result.matches[0].score == 0.95
 
-    def test_search_filters_skill_vectors(self, pinecone_service, sample_skill_vectors):
-        """Test that skill vectors are filtered out from results"""
-        # Mock results with both job and skill vectors
-        job_match = Mock(id="job123", score=0.95, metadata={"is_skill_vector": False})
-        skill_match = Mock(
-            id="job123_skill", score=0.90, metadata={"is_skill_vector": True}
-        )
+    def test_search_excludes_skill_vectors_in_query(
+        self, pinecone_service, sample_skill_vectors
+    ):
+        """Test that skill vectors are excluded by the query, not afterwards"""
+        pinecone_service.jobs_index.query.return_value = Mock(matches=[])
 
-        pinecone_service.jobs_index.query.return_value = Mock(
-            matches=[job_match, skill_match]
-        )
+        pinecone_service.search_similar_jobs(sample_skill_vectors, top_k=10)
 
-        result = pinecone_service.search_similar_jobs(sample_skill_vectors, top_k=10)
-
-        # Should only return job vector, not skill vector
-        assert len(result.matches) == 1
-        assert result.matches[0].id == "job123"
+        call_args = pinecone_service.jobs_index.query.call_args[1]
+        assert call_args["top_k"] == 10
+        assert call_args["filter"] == {"is_skill_vector": {"$ne": True}}
+        assert "namespace" not in call_args
 
     def test_search_with_filters(self, pinecone_service, sample_skill_vectors):
         """Test search with metadata filters"""
@@ -488,6 +648,162 @@ class TestJobSearch:
         assert result.matches[0].metadata["company"] == "Tech Corp"
 
 
+class TestSkillVectorNamespace:
+    """Test skill vector namespace separation against a local index"""
+
+    @pytest.fixture
+    def local_service(self, mock_openai_service):
+        """PineconeService over in-process indexes"""
+        from app.services.local_vector_index import LocalVectorIndex
+
+        mock_openai_service.create_embeddings_batch.side_effect = lambda batch: [
+            [float(i + 1), 1.0] + [0.5] * 1534 for i in range(len(batch))
+        ]
+        return PineconeService(
+            jobs_index=LocalVectorIndex(dimension=1536),
+            users_index=LocalVectorIndex(dimension=1536),
+            openai_service=mock_openai_service,
+        )
+
+    def _index(self, service, count):
+        service.index_jobs(
+            [
+                {
+                    "job_id": f"job{i}",
+                    "job_title": f"Engineer {i}",
+                    "job_description": "Build things",
+                    "required_skills": ["Python", "SQL", "Docker", f"Skill{i}"],
+                    "metadata": {},
+                }
+                for i in range(count)
+            ]
+        )
+
+    def test_search_returns_top_k_jobs(self, local_service, sample_skill_vectors):
+        """Test that top_k is filled with job vectors only"""
+        self._index(local_service, 5)
+
+        result = local_service.search_similar_jobs(sample_skill_vectors, top_k=3)
+
+        assert len(result.matches) == 3
+        assert all(m.id.startswith("job") for m in result.matches)
+        assert all("skill" not in m.metadata for m in result.matches)
+
+        stats = local_service.jobs_index.describe_index_stats()
+        assert stats.namespaces[""]["vector_count"] == 5
+        assert stats.namespaces[local_service.skills_namespace]["vector_count"] == 20
+
+    def _move_to_legacy_layout(self, service):
+        """Simulate the legacy layout: skill vectors in the default namespace"""
+        index = service.jobs_index
+        skill_ns = service.skills_namespace
+        legacy = index.query(
+            vector=[1.0] * 1536,
+            top_k=100,
+            include_metadata=True,
+            include_values=True,
+            namespace=skill_ns,
+        ).matches
+        index.delete(delete_all=True, namespace=skill_ns)
+        index.upsert(vectors=[(m.id, m.values, m.metadata) for m in legacy])
+
+    def _lag_default_namespace_deletes(self, index, monkeypatch, queries):
+        """Apply id deletes in the default namespace only after more queries"""
+        pending = []
+        lag = {"queries": queries}
+        delete, query = index.delete, index.query
+
+        def lagging_delete(ids=None, namespace="", **kwargs):
+            if ids is not None and not namespace:
+                pending.append(list(ids))
+                return None
+            return delete(ids=ids, namespace=namespace, **kwargs)
+
+        def lagging_query(**kwargs):
+            if pending:
+                if lag["queries"] > 0:
+                    lag["queries"] -= 1
+                else:
+                    for ids in pending:
+                        delete(ids=ids)
+                    pending.clear()
+            return query(**kwargs)
+
+        monkeypatch.setattr(index, "delete", lagging_delete)
+        monkeypatch.setattr(index, "query", lagging_query)
+        monkeypatch.setattr(PineconeService, "MIGRATION_STALE_WAIT_SECONDS", 0)
+
+    def test_migrate_skill_vectors(self, local_service, sample_skill_vectors):
+        """Test moving legacy skill vectors out of the default namespace"""
+        self._index(local_service, 3)
+        index = local_service.jobs_index
+        skill_ns = local_service.skills_namespace
+        self._move_to_legacy_layout(local_service)
+
+        assert local_service.migrate_skill_vectors(dry_run=True) == 12
+
+        moved = local_service.migrate_skill_vectors(batch_size=5)
+
+        assert moved == 12
+        assert local_service.migrate_skill_vectors(dry_run=True) == 0
+        stats = index.describe_index_stats()
+        assert stats.namespaces[""]["vector_count"] == 3
+        assert stats.namespaces[skill_ns]["vector_count"] == 12
+        assert local_service.migrate_skill_vectors() == 0
+
+    def test_migrate_waits_for_stale_query_results(
+        self, local_service, monkeypatch
+    ):
+        """Test that queries returning only moved vectors do not end the run"""
+        self._index(local_service, 3)
+        self._move_to_legacy_layout(local_service)
+        self._lag_default_namespace_deletes(
+            local_service.jobs_index, monkeypatch, queries=3
+        )
+
+        moved = local_service.migrate_skill_vectors(batch_size=5)
+
+        assert moved == 12
+        assert local_service.migrate_skill_vectors(dry_run=True) == 0
+        stats = local_service.jobs_index.describe_index_stats()
+        assert stats.namespaces[local_service.skills_namespace]["vector_count"] == 12
+
+    def test_migrate_raises_when_deletes_never_land(
+        self, local_service, monkeypatch
+    ):
+        """Test that leftover legacy vectors are reported, not ignored"""
+        self._index(local_service, 1)
+        self._move_to_legacy_layout(local_service)
+        self._lag_default_namespace_deletes(
+            local_service.jobs_index, monkeypatch, queries=100
+        )
+
+        with pytest.raises(ServiceError, match="still listed"):
+            local_service.migrate_skill_vectors()
+
+    def test_delete_job_vectors_clears_legacy_skill_vectors(self, local_service):
+        """Test that unmigrated skill vectors are deleted with their job"""
+        self._index(local_service, 2)
+        self._move_to_legacy_layout(local_service)
+
+        local_service.delete_jobs_vectors(["job0"])
+
+        # job1 and its 4 legacy skill vectors stay in the default namespace
+        stats = local_service.jobs_index.describe_index_stats()
+        assert stats.namespaces[""]["vector_count"] == 5
+        assert local_service.migrate_skill_vectors() == 4
+
+    def test_delete_job_vectors_clears_both_namespaces(self, local_service):
+        """Test deleting a job removes its skill vectors too"""
+        self._index(local_service, 2)
+
+        local_service.delete_job_vectors("job0")
+
+        stats = local_service.jobs_index.describe_index_stats()
+        assert stats.namespaces[""]["vector_count"] == 1
+        assert stats.namespaces[local_service.skills_namespace]["vector_count"] == 4
+
+
 class TestVectorOperations:
     """Test vector database operations"""
 
@@ -501,6 +501,102 @@ def test_rank_multiple_candidates(
     assert ranked_results[0]["application_id"] == app1.id
 
 
+def test_rank_candidates_matches_individual_scores(
+    db_session: Session,
+    sample_job,
+    high_fit_candidate,
+    medium_fit_candidate,
+    low_fit_candidate,
+):
+    """
+    GIVEN: Applications from candidates with different profiles
+    WHEN: rank_candidates_for_job() scores them in one pass
+    THEN: Each result equals calculate_fit_index() for that candidate
+    """
+    service = CandidateRankingService(db_session)
+
+    for candidate in (high_fit_candidate, medium_fit_candidate, low_fit_candidate):
+        db_session.add(
+            Application(user_id=candidate.id, job_id=sample_job.id, status="new")
+        )
+    db_session.commit()
+
+    ranked_results = service.rank_candidates_for_job(job_id=sample_job.id)
+
+    for result in ranked_results:
+        individual = service.calculate_fit_index(
+            candidate_user_id=result["candidate_id"], job_id=sample_job.id
+        )
+        assert result["fit_index"] == individual.fit_index
+        assert result["strengths"] == individual.strengths
+        assert result["concerns"] == individual.concerns
+
+
+def test_rank_candidates_query_count_is_constant(
+    db_session: Session, sample_job, high_fit_candidate
+):
+    """
+    GIVEN: A job with many applicants (some without profiles)
+    WHEN: rank_candidates_for_job() runs
+    THEN: Queries don't grow with applicants and all fit indexes are written
+    """
+    from sqlalchemy import event
+
+    applicants = [high_fit_candidate]
+    for i in range(30):
+        user = User(email=f"applicant{i}@example.com", password_hash="hashed")
+        db_session.add(user)
+        applicants.append(user)
+    db_session.commit()
+
+    for user in applicants:
+        db_session.add(
+            Application(user_id=user.id, job_id=sample_job.id, status="new")
+        )
+    db_session.commit()
+
+    job_id = sample_job.id
+    statements = []
+    engine = db_session.get_bind()
+
+    def count_statement(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        ranked_results = CandidateRankingService(db_session).rank_candidates_for_job(
+            job_id=job_id
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len(ranked_results) == 31
+    # Job, applications + profiles, one bulk UPDATE
+    assert len(statements) == 3
+
+    fit_indexes = [
+        fit_index
+        for (fit_index,) in db_session.query(Application.fit_index).filter(
+            Application.job_id == sample_job.id
+        )
+    ]
+    assert None not in fit_indexes
+    assert ranked_results[0]["candidate_id"] == high_fit_candidate.id
+
+
+def test_rank_candidates_unknown_job(db_session: Session):
+    """
+    GIVEN: A job ID that does not exist
+    WHEN: rank_candidates_for_job() is called
+    THEN: An error is raised
+    """
+    from uuid import uuid4
+
+    with pytest.raises(Exception, match="Job not found"):
+        CandidateRankingService(db_session).rank_candidates_for_job(job_id=uuid4())
+
+
 # ============================================================================
 # Update Application Fit Index Tests
 # ============================================================================
@@ -0,0 +1,227 @@
+"""Unit tests for Redis-backed subscription usage counters"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from uuid import uuid4
+from sqlalchemy import event
+
+from app.db.models.company import Company, CompanySubscription
+from app.services.usage_counters import UsageCounterStore
+from app.services.usage_limit_service import UsageLimitService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def counters():
+    return UsageCounterStore(fakeredis.FakeRedis())
+
+
+@pytest.fixture
+def starter_company(db_session):
+    """Starter plan company (1 job, 10 views) with 7 views used"""
+    company = Company(
+        id=uuid4(),
+        name="Test Startup",
+        subscription_tier="starter",
+        max_active_jobs=1,
+        max_candidate_views=10,
+        max_team_members=1,
+    )
+    subscription = CompanySubscription(
+        company_id=company.id,
+        plan_tier="starter",
+        status="active",
+        jobs_posted_this_month=0,
+        candidate_views_this_month=7,
+        current_period_start=datetime.utcnow() - timedelta(days=3),
+        current_period_end=datetime.utcnow() + timedelta(days=27),
+    )
+    db_session.add_all([company, subscription])
+    db_session.commit()
+    return company
+
+
+def stored_views(db_session, company_id):
+    db_session.expire_all()
+    return (
+        db_session.query(CompanySubscription)
+        .filter_by(company_id=company_id)
+        .one()
+        .candidate_views_this_month
+    )
+
+
+def count_statements(db_session, func):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+class TestCheckAndIncrement:
+    """Test the Redis check-and-increment path"""
+
+    def test_counts_in_redis_until_limit(self, db_session, counters, starter_company):
+        """Test that views are enforced without touching the subscription row"""
+        service = UsageLimitService(db_session, counters)
+
+        results = [
+            service.check_and_increment_candidate_view(starter_company.id)
+            for _ in range(4)
+        ]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.current_usage for r in results] == [7, 8, 9, 10]
+        assert results[1].warning is True
+        assert "candidate view limit (10 views/month)" in results[3].message
+        # Not written back yet
+        assert stored_views(db_session, starter_company.id) == 7
+
+    def test_warm_path_issues_no_sql(self, db_session, counters, starter_company):
+        """Test that a primed counter costs no database round trips"""
+        service = UsageLimitService(db_session, counters)
+        company_id = starter_company.id
+        service.check_and_increment_candidate_view(company_id)
+
+        result, statements = count_statements(
+            db_session,
+            lambda: service.check_and_increment_candidate_view(company_id),
+        )
+
+        assert result.allowed is True
+        assert statements == 0
+
+    def test_checks_include_unsynced_uses(self, db_session, counters, starter_company):
+        """Test that limit checks and summaries see Redis counts"""
+        service = UsageLimitService(db_session, counters)
+        service.check_and_increment_candidate_view(starter_company.id)
+        service.increment_job_posting(starter_company.id)
+
+        assert service.check_candidate_view_limit(starter_company.id).current_usage == 8
+        assert service.check_job_posting_limit(starter_company.id).allowed is False
+        summary = service.get_usage_summary(starter_company.id)
+        assert summary.candidate_views.used == 8
+        assert summary.jobs.used == 1
+
+    def test_inactive_subscription(self, db_session, counters, starter_company):
+        """Test that inactive plans are blocked from the cached plan state"""
+        subscription = (
+            db_session.query(CompanySubscription)
+            .filter_by(company_id=starter_company.id)
+            .one()
+        )
+        subscription.status = "past_due"
+        db_session.commit()
+
+        result = UsageLimitService(
+            db_session, counters
+        ).check_and_increment_candidate_view(starter_company.id)
+
+        assert result.allowed is False
+        assert "not active" in result.message
+
+    def test_falls_back_to_database(self, db_session, starter_company):
+        """Test the database path when Redis errors"""
+        redis_client = Mock()
+        redis_client.register_script.return_value = Mock(
+            side_effect=ConnectionError("down")
+        )
+        counters = UsageCounterStore(redis_client)
+
+        result = UsageLimitService(
+            db_session, counters
+        ).check_and_increment_candidate_view(starter_company.id)
+
+        assert result.allowed is True
+        assert stored_views(db_session, starter_company.id) == 8
+        assert counters.available is False
+
+
+class TestWriteBack:
+    """Test periodic write-back to the subscription row"""
+
+    def test_write_back_adds_unsynced_uses(
+        self, db_session, counters, starter_company
+    ):
+        """Test that deltas are added once"""
+        service = UsageLimitService(db_session, counters)
+        for _ in range(2):
+            service.check_and_increment_candidate_view(starter_company.id)
+
+        assert service.write_back_usage_counters() == 1
+        assert stored_views(db_session, starter_company.id) == 9
+        assert service.write_back_usage_counters() == 0
+        assert service.check_candidate_view_limit(starter_company.id).current_usage == 9
+
+    def test_write_back_keeps_database_increments(
+        self, db_session, counters, starter_company
+    ):
+        """Test that uses counted on the database path are not overwritten"""
+        service = UsageLimitService(db_session, counters)
+        service.check_and_increment_candidate_view(starter_company.id)
+        subscription = (
+            db_session.query(CompanySubscription)
+            .filter_by(company_id=starter_company.id)
+            .one()
+        )
+        subscription.candidate_views_this_month += 1
+        db_session.commit()
+
+        service.write_back_usage_counters()
+
+        assert stored_views(db_session, starter_company.id) == 9
+
+
+class TestPeriodRollover:
+    """Test counters across billing periods"""
+
+    def test_new_period_starts_from_stored_counts(self, counters):
+        """Test that the counters reload after the period ends"""
+        company_id = uuid4()
+        start = datetime(2025, 1, 1)
+        limits = {"jobs": 1, "candidate_views": 10}
+        counters.prime(
+            company_id,
+            True,
+            start,
+            start + timedelta(days=31),
+            limits,
+            {"jobs": 0, "candidate_views": 9},
+            now=start + timedelta(days=20),
+        )
+        counters.consume(company_id, "candidate_views", now=start + timedelta(days=20))
+
+        assert (
+            counters.consume(
+                company_id, "candidate_views", now=start + timedelta(days=31)
+            )
+            is None
+        )
+
+        counters.prime(
+            company_id,
+            True,
+            start + timedelta(days=31),
+            start + timedelta(days=59),
+            limits,
+            {"jobs": 0, "candidate_views": 0},
+            now=start + timedelta(days=31),
+        )
+        result = counters.consume(
+            company_id, "candidate_views", now=start + timedelta(days=31, minutes=1)
+        )
+        assert (result.allowed, result.current_usage) == (True, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
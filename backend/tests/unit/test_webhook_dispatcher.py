@@ -0,0 +1,383 @@
+"""Unit tests for the webhook delivery queue and dispatcher"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.db.models.api_key import Webhook, WebhookDelivery
+from app.services import webhook_dispatcher
+from app.services.webhook_dispatcher import WebhookDispatcher
+
+
+@pytest.fixture
+def company_id():
+    return uuid4()
+
+
+def make_webhook(db, company_id, url, events=("application.created",), **kwargs):
+    webhook = Webhook(
+        company_id=company_id,
+        url=url,
+        events=list(events),
+        secret="whsec_test",
+        is_active=kwargs.pop("is_active", True),
+        retry_policy={"max_attempts": 3, "backoff_seconds": [60, 300, 900]},
+        failure_count=kwargs.pop("failure_count", 0),
+    )
+    db.add(webhook)
+    db.commit()
+    return webhook
+
+
+def dispatcher_for(db, handler):
+    return WebhookDispatcher(db, transport=httpx.MockTransport(handler))
+
+
+def deliveries(db, webhook):
+    return (
+        db.query(WebhookDelivery)
+        .filter(WebhookDelivery.webhook_id == webhook.id)
+        .order_by(WebhookDelivery.attempt_number)
+        .all()
+    )
+
+
+class TestEnqueue:
+    """Test fan-out into the delivery queue"""
+
+    def test_enqueue_event_queues_subscribed_active_webhooks(
+        self, db_session, company_id
+    ):
+        """Test one pending row per subscribed, active webhook"""
+        subscribed = [
+            make_webhook(db_session, company_id, f"https://hooks{i}.example.com")
+            for i in range(3)
+        ]
+        make_webhook(
+            db_session, company_id, "https://other.example.com", events=["job.published"]
+        )
+        make_webhook(
+            db_session, company_id, "https://off.example.com", is_active=False
+        )
+
+        queued = WebhookDispatcher(db_session).enqueue_event(
+            company_id, "application.created", {"application_id": "a1"}
+        )
+
+        rows = db_session.query(WebhookDelivery).all()
+        assert queued == 3
+        assert {row.webhook_id for row in rows} == {wh.id for wh in subscribed}
+        assert all(row.status == "pending" for row in rows)
+        assert all(row.next_retry_at is not None for row in rows)
+
+    def test_enqueue_without_subscribers(self, db_session, company_id):
+        """Test that nothing is inserted when no webhook is subscribed"""
+        assert (
+            WebhookDispatcher(db_session).enqueue_event(
+                company_id, "application.created", {}
+            )
+            == 0
+        )
+
+
+class TestDispatch:
+    """Test claiming, sending and recording deliveries"""
+
+    def test_successful_delivery(self, db_session, company_id):
+        """Test that a delivery is signed, sent and marked successful"""
+        webhook = make_webhook(
+            db_session, company_id, "https://hooks.example.com", failure_count=2
+        )
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, text="ok")
+
+        dispatcher = dispatcher_for(db_session, handler)
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        stats = dispatcher.dispatch_due()
+
+        [delivery] = deliveries(db_session, webhook)
+        db_session.refresh(webhook)
+        assert stats == {
+            "claimed": 1,
+            "delivered": 1,
+            "retrying": 0,
+            "failed": 0,
+            "released": 0,
+        }
+        assert delivery.status == "success"
+        assert delivery.delivered_at is not None
+        assert delivery.next_retry_at is None
+        assert seen[0].headers["x-webhook-signature"].startswith("sha256=")
+        assert seen[0].headers["x-webhook-event"] == "application.created"
+        assert webhook.failure_count == 0
+
+    def test_failed_delivery_is_retried_as_new_attempt(self, db_session, company_id):
+        """Test that a failure schedules a retry that the next claim sends"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+        responses = iter([httpx.Response(500, text="boom"), httpx.Response(204)])
+
+        dispatcher = dispatcher_for(db_session, lambda request: next(responses))
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+
+        assert dispatcher.dispatch_due()["retrying"] == 1
+        [first] = deliveries(db_session, webhook)
+        assert first.status == "retrying"
+        assert first.error_message == "HTTP 500: boom"
+        assert first.next_retry_at > datetime.utcnow()
+
+        # Not due yet
+        assert dispatcher.dispatch_due()["claimed"] == 0
+
+        first.next_retry_at = datetime.utcnow() - timedelta(seconds=1)
+        db_session.commit()
+        assert dispatcher.dispatch_due()["delivered"] == 1
+
+        first, second = deliveries(db_session, webhook)
+        assert (first.status, first.next_retry_at) == ("failed", None)
+        assert (second.attempt_number, second.status) == (2, "success")
+
+    def test_last_attempt_failure_is_final(self, db_session, company_id):
+        """Test that no retry is scheduled past max_attempts"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+        dispatcher = dispatcher_for(db_session, lambda request: httpx.Response(400))
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        [delivery] = deliveries(db_session, webhook)
+        delivery.attempt_number = 3
+        db_session.commit()
+
+        stats = dispatcher.dispatch_due()
+
+        db_session.refresh(delivery)
+        assert stats["failed"] == 1
+        assert (delivery.status, delivery.next_retry_at) == ("failed", None)
+
+    def test_connection_error_is_recorded(self, db_session, company_id):
+        """Test that transport errors become failed attempts"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        dispatcher = dispatcher_for(db_session, handler)
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        dispatcher.dispatch_due()
+
+        [delivery] = deliveries(db_session, webhook)
+        assert delivery.status == "retrying"
+        assert delivery.error_message.startswith("Delivery error:")
+
+    def test_disabled_webhook_is_not_sent(self, db_session, company_id):
+        """Test that deliveries of a webhook disabled after queueing fail"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+
+        def handler(request):
+            raise AssertionError("disabled webhook must not be called")
+
+        dispatcher = dispatcher_for(db_session, handler)
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        webhook.is_active = False
+        db_session.commit()
+
+        assert dispatcher.dispatch_due()["claimed"] == 0
+        [delivery] = deliveries(db_session, webhook)
+        assert delivery.status == "failed"
+        assert delivery.error_message == "Webhook disabled"
+
+
+class TestClaim:
+    """Test delivery leases"""
+
+    def test_claimed_deliveries_are_leased(self, db_session, company_id):
+        """Test that a claimed row is not claimed again until its lease expires"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+        dispatcher = WebhookDispatcher(db_session)
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+
+        assert len(dispatcher.claim_due_deliveries(10)) == 1
+        assert dispatcher.claim_due_deliveries(10) == []
+
+        # The worker holding the lease died
+        [delivery] = deliveries(db_session, webhook)
+        assert delivery.status == "delivering"
+        delivery.next_retry_at = datetime.utcnow() - timedelta(seconds=1)
+        db_session.commit()
+        assert len(dispatcher.claim_due_deliveries(10)) == 1
+
+    def test_claim_respects_limit(self, db_session, company_id):
+        """Test that a claim takes at most limit rows"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+        dispatcher = WebhookDispatcher(db_session)
+        for i in range(5):
+            dispatcher.enqueue_deliveries([webhook], "application.created", {"id": i})
+
+        assert len(dispatcher.claim_due_deliveries(3)) == 3
+        assert len(dispatcher.claim_due_deliveries(3)) == 2
+
+    def test_batch_stops_at_deadline_and_releases_unsent(
+        self, db_session, company_id, monkeypatch
+    ):
+        """Test that rows not sent before the deadline go back to pending"""
+        monkeypatch.setattr(settings, "WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT", 1)
+        webhook = make_webhook(db_session, company_id, "https://slow.example.com")
+        sent = []
+
+        async def handler(request):
+            sent.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200)
+
+        dispatcher = dispatcher_for(db_session, handler)
+        for i in range(5):
+            dispatcher.enqueue_deliveries([webhook], "application.created", {"id": i})
+
+        stats = dispatcher.dispatch_due(deadline=time.monotonic() + 0.07)
+
+        rows = deliveries(db_session, webhook)
+        pending = [row for row in rows if row.status == "pending"]
+        assert stats["delivered"] == len(sent) == 2
+        assert stats["released"] == len(pending) == 3
+        assert all(row.next_retry_at <= datetime.utcnow() for row in pending)
+        # Released rows are due again at once
+        assert len(dispatcher.claim_due_deliveries(10)) == 3
+
+    def test_batch_deadline_fits_inside_the_lease(
+        self, db_session, company_id, monkeypatch
+    ):
+        """Test that a batch never sends past its lease expiry"""
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+        monkeypatch.setattr(settings, "WEBHOOK_CLAIM_LEASE_SECONDS", 300)
+        monkeypatch.setattr(settings, "WEBHOOK_DELIVERY_TIMEOUT_SECONDS", 30.0)
+        dispatcher = dispatcher_for(db_session, lambda request: httpx.Response(200))
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        deadlines = []
+        send = dispatcher.send
+
+        async def recording_send(requests, deadline=None):
+            deadlines.append(deadline - time.monotonic())
+            return await send(requests, deadline=deadline)
+
+        monkeypatch.setattr(dispatcher, "send", recording_send)
+        dispatcher.dispatch_due()
+
+        margin = webhook_dispatcher.LEASE_SAFETY_MARGIN_SECONDS
+        assert 0 < deadlines[0] <= 300 - 30 - margin
+
+    def test_slow_response_is_cut_off_at_the_delivery_timeout(
+        self, db_session, company_id, monkeypatch
+    ):
+        """Test that one request cannot outlast WEBHOOK_DELIVERY_TIMEOUT_SECONDS"""
+        monkeypatch.setattr(settings, "WEBHOOK_DELIVERY_TIMEOUT_SECONDS", 0.05)
+        webhook = make_webhook(db_session, company_id, "https://drip.example.com")
+
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        dispatcher = dispatcher_for(db_session, handler)
+        dispatcher.enqueue_event(company_id, "application.created", {"id": 1})
+        dispatcher.dispatch_due()
+
+        [delivery] = deliveries(db_session, webhook)
+        assert delivery.status == "retrying"
+        assert delivery.error_message.startswith("Request timeout")
+
+
+class TestConcurrency:
+    """Test per-endpoint concurrency caps"""
+
+    def test_per_endpoint_cap_with_cross_endpoint_overlap(
+        self, db_session, company_id, monkeypatch
+    ):
+        """Test that a busy endpoint is capped while others proceed"""
+        monkeypatch.setattr(settings, "WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT", 2)
+        busy = make_webhook(db_session, company_id, "https://busy.example.com")
+        quiet = make_webhook(db_session, company_id, "https://quiet.example.com")
+        in_flight = defaultdict(int)
+        max_in_flight = defaultdict(int)
+        max_total = 0
+
+        async def handler(request):
+            nonlocal max_total
+            host = request.url.host
+            in_flight[host] += 1
+            max_in_flight[host] = max(max_in_flight[host], in_flight[host])
+            max_total = max(max_total, sum(in_flight.values()))
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return httpx.Response(200)
+
+        dispatcher = dispatcher_for(db_session, handler)
+        for i in range(10):
+            dispatcher.enqueue_deliveries([busy], "application.created", {"id": i})
+        for i in range(3):
+            dispatcher.enqueue_deliveries([quiet], "application.created", {"id": i})
+
+        stats = dispatcher.dispatch_due()
+
+        assert stats["delivered"] == 13
+        assert max_in_flight["busy.example.com"] == 2
+        assert max_total > 2
+
+
+class TestPublishEvent:
+    """Test the helper API endpoints call after a change is committed"""
+
+    def test_publish_queues_and_schedules_dispatch(self, db_session, company_id):
+        """Test that subscribed webhooks get a delivery and a dispatch is queued"""
+        from app.workers.webhook_worker import publish_webhook_event
+
+        webhook = make_webhook(
+            db_session, company_id, "https://hooks.example.com", events=["job.closed"]
+        )
+
+        with patch(
+            "app.workers.webhook_worker.schedule_webhook_dispatch"
+        ) as schedule:
+            queued = publish_webhook_event(
+                db_session, company_id, "job.closed", {"job_id": "j1"}
+            )
+            publish_webhook_event(db_session, company_id, "job.published", {})
+
+        [delivery] = deliveries(db_session, webhook)
+        assert queued == 1
+        assert delivery.payload == {"job_id": "j1"}
+        schedule.assert_called_once()
+
+    def test_publish_never_raises(self, db_session, company_id):
+        """Test that queue or broker errors do not fail the caller's request"""
+        from app.workers.webhook_worker import publish_webhook_event
+
+        webhook = make_webhook(db_session, company_id, "https://hooks.example.com")
+
+        with patch(
+            "app.workers.webhook_worker.schedule_webhook_dispatch",
+            side_effect=ConnectionError("broker down"),
+        ):
+            queued = publish_webhook_event(
+                db_session, company_id, "application.created", {}
+            )
+        with patch.object(
+            WebhookDispatcher, "enqueue_event", side_effect=RuntimeError("db down")
+        ):
+            failed = publish_webhook_event(
+                db_session, company_id, "application.created", {}
+            )
+
+        # Left for the beat schedule to send
+        assert queued == 1
+        assert [row.status for row in deliveries(db_session, webhook)] == ["pending"]
+        assert failed == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,218 @@
+"""Unit tests for the weekly digest pipeline"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.db.models.application import Application
+from app.db.models.email_delivery import EmailDeliveryLog
+from app.db.models.job import Job, MatchScore
+from app.db.models.notification import NotificationPreference
+from app.db.models.user import Profile, User
+from app.db.models.webhook import InterviewSchedule
+from app.services.bulk_email_sender import BulkEmailSender, SendResult
+from app.services.email_service import EmailService
+from app.services.weekly_digest_service import WeeklyDigestService
+
+# A Monday, the default digest day
+NOW = datetime(2025, 12, 8, 14, 0)
+
+
+@pytest.fixture
+def sent():
+    """Capture batch sends instead of calling Resend"""
+    emails = []
+
+    async def fake_send(self, batch):
+        emails.extend(batch)
+        return [
+            SendResult(success=True, message_id=f"msg_{uuid4().hex}") for _ in batch
+        ]
+
+    with patch.object(BulkEmailSender, "send", fake_send):
+        yield emails
+
+
+@pytest.fixture
+def digest_service(db_session):
+    with patch("app.services.email_service.settings.RESEND_API_KEY", "test_key"):
+        yield WeeklyDigestService(db_session, EmailService(db_session))
+
+
+@pytest.fixture
+def jobs(db_session):
+    created = [
+        Job(title=f"Engineer {i}", company=f"Company {i}", is_active=True)
+        for i in range(5)
+    ]
+    db_session.add_all(created)
+    db_session.commit()
+    return created
+
+
+def make_user(db_session, email, first_name=None, **kwargs):
+    user = User(email=email, user_type=kwargs.pop("user_type", "job_seeker"))
+    db_session.add(user)
+    db_session.flush()
+    if first_name:
+        db_session.add(Profile(user_id=user.id, first_name=first_name))
+    db_session.commit()
+    return user
+
+
+def add_matches(db_session, user, jobs_and_fits, created_at=NOW - timedelta(days=1)):
+    db_session.add_all(
+        MatchScore(
+            user_id=user.id, job_id=job.id, fit_index=fit, created_at=created_at
+        )
+        for job, fit in jobs_and_fits
+    )
+    db_session.commit()
+
+
+class TestDigestData:
+    """Test the digest built for each user"""
+
+    def test_counts_and_top_matches(self, db_session, digest_service, jobs, sent):
+        """Test weekly counts and best-first top jobs from match scores"""
+        user = make_user(db_session, "ada@example.com", first_name="Ada")
+        add_matches(
+            db_session,
+            user,
+            [(jobs[0], 75), (jobs[1], 95), (jobs[2], 88), (jobs[3], 91), (jobs[4], 40)],
+        )
+        # Older than a week
+        add_matches(db_session, user, [(jobs[4], 99)], NOW - timedelta(days=9))
+        db_session.add_all(
+            [
+                Application(user_id=user.id, applied_at=NOW - timedelta(days=2)),
+                Application(user_id=user.id, applied_at=NOW - timedelta(days=20)),
+            ]
+        )
+        application = Application(user_id=user.id, applied_at=NOW - timedelta(days=3))
+        db_session.add(application)
+        db_session.flush()
+        db_session.add(
+            InterviewSchedule(
+                application_id=application.id,
+                user_id=user.id,
+                interview_type="technical",
+                scheduled_at=NOW - timedelta(days=1),
+                status="completed",
+            )
+        )
+        db_session.commit()
+
+        with patch.object(
+            digest_service.email_service,
+            "build_weekly_digest_email",
+            wraps=digest_service.email_service.build_weekly_digest_email,
+        ) as build:
+            stats = digest_service.run(now=NOW)
+
+        digest_data = build.call_args[0][2]
+        assert digest_data["jobs_matched"] == 4
+        assert digest_data["applications_sent"] == 2
+        assert digest_data["interviews_completed"] == 1
+        assert [job["fit"] for job in digest_data["top_jobs"]] == [95, 91, 88]
+        assert digest_data["top_jobs"][0]["title"] == "Engineer 1"
+        assert stats["emails_sent"] == 1
+        assert sent[0].to_email == "ada@example.com"
+        assert "Hi Ada" in sent[0].html
+
+    def test_users_without_activity_are_skipped(
+        self, db_session, digest_service, jobs, sent
+    ):
+        """Test that an empty week sends nothing"""
+        make_user(db_session, "idle@example.com")
+
+        stats = digest_service.run(now=NOW)
+
+        assert (stats["users_scanned"], stats["skipped"]) == (1, 1)
+        assert sent == []
+
+    def test_identical_job_sets_share_rendering(
+        self, db_session, digest_service, jobs, sent
+    ):
+        """Test that users with the same top jobs render the block once"""
+        for i in range(4):
+            user = make_user(db_session, f"same{i}@example.com")
+            add_matches(db_session, user, [(jobs[0], 90), (jobs[1], 80)])
+        user = make_user(db_session, "other@example.com")
+        add_matches(db_session, user, [(jobs[2], 85)])
+
+        with patch.object(
+            EmailService,
+            "render_digest_top_jobs",
+            wraps=EmailService.render_digest_top_jobs,
+        ) as render:
+            stats = digest_service.run(now=NOW)
+
+        assert stats["digests_built"] == 5
+        assert stats["render_groups"] == 2
+        assert render.call_count == 2
+
+
+class TestRecipients:
+    """Test who gets a digest today"""
+
+    def test_preferences_and_user_type(self, db_session, digest_service, jobs, sent):
+        """Test opt-outs, digest days and employers"""
+        due = make_user(db_session, "due@example.com")
+        opted_out = make_user(db_session, "out@example.com")
+        tuesday = make_user(db_session, "tuesday@example.com")
+        employer = make_user(db_session, "boss@example.com", user_type="employer")
+        db_session.add_all(
+            [
+                NotificationPreference(user_id=opted_out.id, email_weekly_digest=False),
+                NotificationPreference(user_id=tuesday.id, digest_day="tuesday"),
+            ]
+        )
+        db_session.commit()
+        for user in (due, opted_out, tuesday, employer):
+            add_matches(db_session, user, [(jobs[0], 90)])
+
+        digest_service.run(now=NOW)
+        assert [email.to_email for email in sent] == ["due@example.com"]
+
+        sent.clear()
+        digest_service.run(now=NOW + timedelta(days=1))
+        assert [email.to_email for email in sent] == ["tuesday@example.com"]
+
+    def test_rerun_skips_users_already_sent(
+        self, db_session, digest_service, jobs, sent
+    ):
+        """Test that a second run the same day sends nothing"""
+        user = make_user(db_session, "once@example.com")
+        add_matches(db_session, user, [(jobs[0], 90)])
+
+        assert digest_service.run(now=NOW)["emails_sent"] == 1
+        log = db_session.query(EmailDeliveryLog).one()
+        assert log.email_type == "weekly_digest"
+
+        assert digest_service.run(now=NOW)["users_scanned"] == 0
+
+    def test_pages_cover_every_user(self, db_session, digest_service, jobs, sent):
+        """Test keyset paging with a page size smaller than the user count"""
+        for i in range(7):
+            user = make_user(db_session, f"user{i}@example.com")
+            add_matches(db_session, user, [(jobs[i % 5], 90)])
+
+        stats = digest_service.run(now=NOW, page_size=3)
+
+        assert stats["pages"] == 3
+        assert stats["emails_sent"] == 7
+        assert len({email.to_email for email in sent}) == 7
+        assert set(stats["stage_seconds"]) == {
+            "load_users",
+            "stats",
+            "top_matches",
+            "render",
+            "send",
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -43,7 +43,9 @@ interface ValidationError {
 
 interface DuplicateInfo {
   row_index: number;
-  duplicate_of: number;
+  duplicate_of: number | null;
+  existing_job_id?: string | null;
+  existing_job_title?: string | null;
   similarity_score: number;
   matching_fields: string[];
 }
@@ -80,9 +82,20 @@ interface UploadResponse {
   status: string;
   validation_errors?: ValidationError[];
   duplicate_info?: DuplicateInfo[];
-  raw_jobs_data?: JobRow[];
+  error_message?: string | null;
 }
 
+interface UploadRow {
+  row_index: number;
+  job_data: JobRow;
+  is_valid: boolean;
+  validation_errors?: ValidationError[];
+}
+
+// Duplicate detection runs in a background worker after the upload is stored
+const STATUS_POLL_INTERVAL_MS = 2000;
+const PREVIEW_ROW_COUNT = 10;
+
 type UploadStage = 'idle' | 'uploading' | 'validating' | 'review' | 'complete' | 'error';
 
 export default function BulkJobUploadPage() {
@@ -103,6 +116,15 @@ export default function BulkJobUploadPage() {
   const [selectedChannels, setSelectedChannels] = useState<string[]>(['INTERNAL']);
   const [isDragging, setIsDragging] = useState(false);
   const [removedDuplicates, setRemovedDuplicates] = useState<Set<number>>(new Set());
+  const [previewRows, setPreviewRows] = useState<UploadRow[]>([]);
+  const isMounted = useRef(true);
+
+  useEffect(() => {
+    isMounted.current = true;
+    return () => {
+      isMounted.current = false;
+    };
+  }, []);
 
   // Handle file selection
   const handleFileSelect = (event: ChangeEvent<HTMLInputElement>) => {
@@ -142,6 +164,18 @@ export default function BulkJobUploadPage() {
     }
   };
 
+  // Poll the upload until the worker has finished duplicate detection
+  const waitForDuplicateCheck = async (upload: UploadResponse): Promise<UploadResponse | null> => {
+    let current = upload;
+    while (current.status === 'validating') {
+      await new Promise((resolve) => setTimeout(resolve, STATUS_POLL_INTERVAL_MS));
+      if (!isMounted.current) return null;
+      const response = await bulkJobPostingApi.getUploadDetail(upload.id);
+      current = response.data.data;
+    }
+    return current;
+  };
+
   // Upload file to backend
   const handleUpload = async () => {
     if (!selectedFile) return;
@@ -152,10 +186,29 @@ export default function BulkJobUploadPage() {
     try {
       const channelsStr = selectedChannels.join(',');
       const response = await bulkJobPostingApi.uploadCSV(selectedFile, channelsStr);
-
+      const upload: UploadResponse = response.data.data;
+
+      setUploadResponse(upload);
+      setUploadProgress(50);
+      setUploadStage('validating');
+
+      const checked = await waitForDuplicateCheck(upload);
+      if (!checked) return;
+      if (checked.status === 'failed') {
+        setUploadStage('error');
+        setErrorMessage(checked.error_message || 'Validation failed. Please try again.');
+        return;
+      }
+
+      const rowsResponse = await bulkJobPostingApi.getUploadRows(upload.id, {
+        limit: PREVIEW_ROW_COUNT,
+      });
+      if (!isMounted.current) return;
+
+      setPreviewRows(rowsResponse.data.data.rows);
+      setUploadResponse(checked);
       setUploadProgress(100);
       setUploadStage('review');
-      setUploadResponse(response.data.data);
     } catch (error: unknown) {
       setUploadStage('error');
       setErrorMessage(getErrorMessage(error, 'Upload failed. Please try again.'));
@@ -335,6 +388,24 @@ export default function BulkJobUploadPage() {
         </Card>
       )}
 
+      {/* Upload Stage: Validating (duplicate detection in the background) */}
+      {uploadStage === 'validating' && (
+        <Card>
+          <CardHeader>
+            <CardTitle>Checking for Duplicates</CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="space-y-4">
+              <Progress value={uploadProgress} className="w-full" data-testid="upload-progress" />
+              <p className="text-center text-gray-600">
+                {uploadResponse?.total_jobs ?? 0} jobs stored. Comparing them with each other
+                and with your active jobs...
+              </p>
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Upload Stage: Review */}
       {uploadStage === 'review' && uploadResponse && (
         <div className="space-y-6">
@@ -461,7 +532,9 @@ export default function BulkJobUploadPage() {
                             <span className="font-medium">Row {dup.row_index + 1}</span>
                             <span className="text-gray-600">
                               {' '}
-                              is similar to Row {dup.duplicate_of + 1}
+                              {dup.duplicate_of !== null
+                                ? `is similar to Row ${dup.duplicate_of + 1}`
+                                : `is similar to existing job "${dup.existing_job_title}"`}
                             </span>
                             {dup.matching_fields.length > 0 && (
                               <p className="text-sm text-gray-600 mt-1">
@@ -511,17 +584,15 @@ export default function BulkJobUploadPage() {
                     </TableRow>
                   </TableHeader>
                   <TableBody>
-                    {uploadResponse.raw_jobs_data?.slice(0, 10).map((job, idx) => {
-                      const hasError = uploadResponse.validation_errors?.some(
-                        (e) => e.row_index === idx
-                      );
+                    {previewRows.map((row) => {
+                      const job = row.job_data;
                       const isDuplicate = uploadResponse.duplicate_info?.some(
-                        (d) => d.row_index === idx
+                        (d) => d.row_index === row.row_index
                       );
 
                       return (
-                        <TableRow key={idx}>
-                          <TableCell>{idx + 1}</TableCell>
+                        <TableRow key={row.row_index}>
+                          <TableCell>{row.row_index + 1}</TableCell>
                           <TableCell className="font-medium">{job.title}</TableCell>
                           <TableCell>{job.department || '-'}</TableCell>
                           <TableCell>{job.location || '-'}</TableCell>
@@ -532,7 +603,7 @@ export default function BulkJobUploadPage() {
                               : '-'}
                           </TableCell>
                           <TableCell>
-                            {hasError ? (
+                            {!row.is_valid ? (
                               <Badge variant="destructive">Error</Badge>
                             ) : isDuplicate ? (
                               <Badge variant="outline" className="border-yellow-500 text-yellow-700">
@@ -549,9 +620,9 @@ export default function BulkJobUploadPage() {
                     })}
                   </TableBody>
                 </Table>
-                {uploadResponse.raw_jobs_data && uploadResponse.raw_jobs_data.length > 10 && (
+                {uploadResponse.total_jobs > previewRows.length && (
                   <p className="text-center text-sm text-gray-500 mt-4">
-                    Showing 10 of {uploadResponse.raw_jobs_data.length} jobs
+                    Showing {previewRows.length} of {uploadResponse.total_jobs} jobs
                   </p>
                 )}
               </div>
@@ -566,6 +637,8 @@ export default function BulkJobUploadPage() {
                 setUploadStage('idle');
                 setSelectedFile(null);
                 setUploadResponse(null);
+                setPreviewRows([]);
+                setRemovedDuplicates(new Set());
               }}
             >
               Upload Another File
@@ -583,7 +656,9 @@ export default function BulkJobUploadPage() {
                   // In a real implementation, this would trigger publishing
                   setTimeout(() => router.push('/employer/jobs'), 1500);
                 }}
-                disabled={uploadResponse.valid_jobs === 0}
+                disabled={
+                  uploadResponse.valid_jobs === 0 || uploadResponse.status === 'validating'
+                }
                 data-testid="publish-button"
               >
                 Publish {uploadResponse.valid_jobs} Jobs
@@ -581,6 +581,16 @@ export const bulkJobPostingApi = {
   getUploadDetail: (uploadId: string) =>
     apiClient.get<ApiResponse>(`/bulk-job-posting/uploads/${uploadId}`),
 
+  // Page through the stored rows of a CSV upload
+  getUploadRows: (
+    uploadId: string,
+    params?: {
+      offset?: number;
+      limit?: number;
+      invalid_only?: boolean;
+    }
+  ) => apiClient.get<ApiResponse>(`/bulk-job-posting/uploads/${uploadId}/rows`, { params }),
+
   // Update upload status
   updateUploadStatus: (uploadId: string, newStatus: string) =>
     apiClient.patch<ApiResponse>(`/bulk-job-posting/uploads/${uploadId}/status`, {